@@ -0,0 +1,244 @@
+# engine/ajuste_incremental.py
+"""
+Recálculo incremental para los ajustes de distrito individual (flechitas ↑↓).
+
+Un clic mueve un escaño MR entre dos partidos; los votos nacionales (la
+evaluación completa de las flechitas corre con ajustar_votos_por_mr=False),
+el umbral y los parámetros de topes no cambian. La evaluación completa deja
+capturadas las entradas de asignadip_v2 (capturar_asignacion) y se guardan
+bajo un token junto con la huella de los parámetros del escenario; los
+clics siguientes con la misma huella solo vuelven a correr RP + topes sobre
+el vector MR actualizado.
+
+Como los votos no dependen del MR, el estado de una huella sirve de
+plantilla para cualquier vector MR: así también hay token cuando la
+evaluación completa fue un HIT de la caché de resultados (no capturó nada).
+
+Configuración: AJUSTE_TTL_S (default 1800) y AJUSTE_MAX_ESTADOS (default 256).
+"""
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from .result_cache import clave_canonica
+
+_CAPTURA: "contextvars.ContextVar[Optional[Dict[str, Any]]]" = contextvars.ContextVar(
+    'captura_asignacion', default=None
+)
+
+
+@contextmanager
+def capturar_asignacion() -> Iterator[Dict[str, Any]]:
+    """Dentro del bloque, asignadip_v2 deja sus entradas en el dict devuelto (última llamada)."""
+    captura: Dict[str, Any] = {}
+    token = _CAPTURA.set(captura)
+    try:
+        yield captura
+    finally:
+        _CAPTURA.reset(token)
+
+
+def registrar_asignacion(x: np.ndarray, ssd: np.ndarray, kwargs: Dict[str, Any]) -> None:
+    """Hook de asignadip_v2: no hace nada fuera de capturar_asignacion()."""
+    captura = _CAPTURA.get()
+    if captura is not None:
+        captura.clear()
+        captura.update(x=np.array(x, dtype=float), ssd=np.array(ssd, dtype=int), kwargs=dict(kwargs))
+
+
+def huella_escenario(**params: Any) -> str:
+    """Huella de los parámetros del escenario (todo salvo el vector MR)."""
+    return clave_canonica('ajuste', params)
+
+
+@dataclass
+class EstadoAjuste:
+    """Entradas fijas del escenario + vector MR actual (orden de partidos)."""
+    partidos: List[str]
+    x: np.ndarray
+    ssd: np.ndarray
+    kwargs: Dict[str, Any]
+    votos: Dict[str, Any]
+    meta: Dict[str, Any]
+    huella: str = ''
+    expira: float = 0.0
+
+    def alinear(self, mr: Mapping[str, int]) -> Optional[np.ndarray]:
+        """Vector MR en el orden del estado; None si trae partidos desconocidos con escaños."""
+        conocidos = set(self.partidos)
+        if any(int(v) != 0 for p, v in mr.items() if p not in conocidos):
+            return None
+        return np.array([int(mr.get(p, 0)) for p in self.partidos], dtype=int)
+
+
+def evaluar(estado: EstadoAjuste, ssd: np.ndarray) -> Dict[str, Any]:
+    """RP + topes para el vector MR dado; mismo formato que procesar_diputados_v2."""
+    from .procesar_diputados_v2 import asignadip_v2
+
+    res = asignadip_v2(x=estado.x, ssd=ssd, **estado.kwargs)
+    seats = res['seats']
+    partidos = estado.partidos
+    ok = dict(zip(partidos, res['meta']['ok_3pct']))
+    return {
+        'mr': dict(zip(partidos, seats[0].tolist())),
+        'pm': {p: 0 for p in partidos},
+        'rp': dict(zip(partidos, seats[1].tolist())),
+        'tot': dict(zip(partidos, seats[2].tolist())),
+        'ok': ok,
+        'votos': dict(estado.votos),
+        'votos_ok': {p: (estado.votos.get(p, 0) if ok[p] else 0) for p in partidos},
+        'meta': estado.meta,
+    }
+
+
+def meta_ajustado(meta: Dict[str, Any], entidad: Optional[str],
+                  mr_entidad: Optional[Mapping[str, int]]) -> Dict[str, Any]:
+    """
+    meta con el renglón de la entidad reemplazado en mr_por_estado; el resto
+    del meta (votos, umbral, distritos por estado) no depende del vector MR.
+    """
+    por_estado = meta.get('mr_por_estado')
+    if not entidad or mr_entidad is None or not isinstance(por_estado, dict):
+        return meta
+    renglon = {**por_estado.get(entidad, {}), **{p: int(v) for p, v in mr_entidad.items()}}
+    return {**meta, 'mr_por_estado': {**por_estado, entidad: renglon}}
+
+
+class _EstadosAjuste:
+    """LRU con TTL de estados de escenario por token, más una plantilla por huella."""
+
+    def __init__(self, max_estados: int, ttl_s: float):
+        self.max_estados = max(1, int(max_estados))
+        self.ttl_s = float(ttl_s)
+        self._data: "OrderedDict[str, EstadoAjuste]" = OrderedDict()
+        self._plantillas: "OrderedDict[str, EstadoAjuste]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def guardar(self, estado: EstadoAjuste) -> str:
+        token = uuid.uuid4().hex
+        estado.expira = time.monotonic() + self.ttl_s
+        with self._lock:
+            self._data[token] = estado
+            while len(self._data) > self.max_estados:
+                self._data.popitem(last=False)
+            if estado.huella:
+                # copia: los clics reemplazan ssd/meta del estado, no de la plantilla
+                self._plantillas[estado.huella] = replace(estado)
+                self._plantillas.move_to_end(estado.huella)
+                while len(self._plantillas) > self.max_estados:
+                    self._plantillas.popitem(last=False)
+        return token
+
+    def plantilla(self, huella: str) -> Optional[EstadoAjuste]:
+        with self._lock:
+            plantilla = self._plantillas.get(huella)
+            if plantilla is not None:
+                self._plantillas.move_to_end(huella)
+            return plantilla
+
+    def obtener(self, token: str) -> Optional[EstadoAjuste]:
+        with self._lock:
+            estado = self._data.get(token)
+            if estado is None:
+                return None
+            if estado.expira <= time.monotonic():
+                del self._data[token]
+                return None
+            estado.expira = time.monotonic() + self.ttl_s
+            self._data.move_to_end(token)
+            return estado
+
+    def reemplazar_mr(self, estado: EstadoAjuste, actual: np.ndarray, nuevo: np.ndarray,
+                      meta: Dict[str, Any]) -> bool:
+        """Compare-and-set del vector MR (y su meta) del estado."""
+        with self._lock:
+            if not np.array_equal(estado.ssd, actual):
+                return False
+            estado.ssd = nuevo
+            estado.meta = meta
+            return True
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+ESTADOS = _EstadosAjuste(
+    max_estados=int(os.environ.get('AJUSTE_MAX_ESTADOS', '256')),
+    ttl_s=float(os.environ.get('AJUSTE_TTL_S', '1800')),
+)
+
+
+def crear_estado(captura: Dict[str, Any], huella: str, mr_nacional: Mapping[str, int],
+                 respuesta: Dict[str, Any]) -> Optional[str]:
+    """
+    Guarda el estado de una evaluación completa y devuelve su token.
+
+    Sin captura (HIT de la caché de resultados) se parte de la plantilla de
+    la misma huella. Solo se acepta si el MR capturado es el que se pidió y
+    si recalcular con ese estado reproduce los totales de la respuesta
+    completa (ramas con PM u otros ajustes posteriores quedan fuera del
+    modo incremental).
+    """
+    kwargs = captura.get('kwargs')
+    if kwargs:
+        partidos = list(kwargs.get('partidos_base') or [])
+        x, ssd = captura['x'], captura['ssd']
+        kwargs = {**kwargs, 'partidos_base': partidos, 'print_debug': False}
+    else:
+        plantilla = ESTADOS.plantilla(huella)
+        if plantilla is None:
+            return None
+        partidos, x, ssd, kwargs = plantilla.partidos, plantilla.x, None, plantilla.kwargs
+    if not partidos:
+        return None
+    resultados = respuesta.get('resultados') or []
+    estado = EstadoAjuste(
+        partidos=partidos,
+        x=x,
+        ssd=ssd,
+        kwargs=kwargs,
+        votos={r['partido']: r.get('votos', 0) for r in resultados},
+        meta=respuesta.get('meta', {}) or {},
+        huella=huella,
+    )
+    esperado = estado.alinear(mr_nacional)
+    if esperado is None or (ssd is not None and not np.array_equal(esperado, ssd)):
+        return None
+    estado.ssd = esperado
+    tot = evaluar(estado, estado.ssd)['tot']
+    if any(tot.get(r['partido'], 0) != r.get('total') for r in resultados):
+        return None
+    return ESTADOS.guardar(estado)
+
+
+def aplicar_ajuste(token: str, huella: str, mr_actual: Mapping[str, int],
+                   mr_nuevo: Mapping[str, int], entidad: Optional[str] = None,
+                   mr_entidad: Optional[Mapping[str, int]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Resultado para mr_nuevo recalculando solo RP + topes; el meta lleva el
+    renglón de `entidad` (abreviatura) con mr_entidad. None si el token no
+    existe, expiró, es de otro escenario (huella distinta) o el MR actual
+    del cliente no coincide con el del estado.
+    """
+    estado = ESTADOS.obtener(token)
+    if estado is None or estado.huella != huella:
+        return None
+    actual = estado.alinear(mr_actual)
+    nuevo = estado.alinear(mr_nuevo)
+    if actual is None or nuevo is None or not np.array_equal(actual, estado.ssd):
+        return None
+    resultado = evaluar(estado, nuevo)
+    resultado['meta'] = meta_ajustado(estado.meta, entidad, mr_entidad)
+    if not ESTADOS.reemplazar_mr(estado, actual, nuevo, resultado['meta']):
+        return None  # otro clic con el mismo token ganó la carrera
+    return resultado
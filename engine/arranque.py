@@ -0,0 +1,188 @@
+# engine/arranque.py
+"""
+Arranque perezoso y medido de la API.
+
+main.py no importa pandas/numpy ni los motores al cargarse: usa módulos y
+funciones diferidos que se importan al primer uso. Al arrancar, un hilo de
+fondo los calienta (y siembra el snapshot) mientras /health y
+/data/escenarios ya responden.
+
+Cada import pasa por `importar`, que mide su tiempo y cuántos módulos nuevos
+trajo; `estado()` lo expone (GET /arranque/stats) para ver regresiones del
+arranque en frío.
+
+Después del calentamiento, `precalentar_escenarios` corre los escenarios
+predefinidos (los mismos handlers que los requests) para dejarlos en la
+caché de resultados antes del primer request visible.
+
+Configuración: STARTUP_WARMUP=0 desactiva el calentamiento de fondo;
+STARTUP_PRESETS=0 solo el de escenarios; STARTUP_BUDGET_MS (default 1500)
+es el presupuesto del import de main.py, y se registra un warning si se
+excede.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+import sys
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+from .registro import obtener_registro
+
+log = obtener_registro(__name__)
+
+# Motores que se calientan al arrancar (lo que usan los endpoints de cálculo)
+MODULOS_MOTOR = (
+    "pandas",
+    "engine.procesar_diputados_v2",
+    "engine.procesar_senadores_v2",
+    "engine.redistribucion_votos",
+    "engine.kpi_utils",
+)
+
+_LOCK = threading.Lock()
+_TIEMPOS: Dict[str, Dict[str, Any]] = {}
+_ESTADO: Dict[str, Any] = {"calentamiento": "pendiente", "main_ms": None, "calentamiento_ms": None,
+                           "escenarios": None}
+
+
+def _activado(variable: str) -> bool:
+    return os.environ.get(variable, "1").strip().lower() not in ("0", "false", "no")
+
+
+def presupuesto_ms() -> float:
+    try:
+        return float(os.environ.get("STARTUP_BUDGET_MS", "1500"))
+    except ValueError:
+        return 1500.0
+
+
+def importar(nombre: str) -> Any:
+    """importlib.import_module midiendo el primer import (tiempo y módulos nuevos que trajo)."""
+    if nombre in _TIEMPOS:
+        # import_module (no sys.modules) para esperar si otro hilo aún lo inicializa
+        return importlib.import_module(nombre)
+    antes = len(sys.modules)
+    t0 = time.perf_counter()
+    modulo = importlib.import_module(nombre)
+    ms = round(1000 * (time.perf_counter() - t0), 1)
+    with _LOCK:
+        _TIEMPOS.setdefault(nombre, {
+            "ms": ms, "modulos_nuevos": len(sys.modules) - antes, "hilo": threading.current_thread().name,
+        })
+    log.debug("import %s: %s ms", nombre, ms)
+    return modulo
+
+
+class ModuloDiferido:
+    """Módulo que se importa (vía `importar`) al primer acceso a un atributo."""
+
+    def __init__(self, nombre: str):
+        self._nombre = nombre
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(importar(self._nombre), attr)
+
+    def __repr__(self) -> str:
+        return f"<módulo diferido {self._nombre}>"
+
+
+def funcion_diferida(modulo: str, nombre: str) -> Callable:
+    """Función que importa su módulo en la primera llamada y delega."""
+    real: Optional[Callable] = None
+
+    def llamada(*args, **kwargs):
+        nonlocal real
+        if real is None:
+            real = getattr(importar(modulo), nombre)
+        return real(*args, **kwargs)
+
+    llamada.__name__ = llamada.__qualname__ = nombre
+    llamada.__doc__ = f"Diferida: {modulo}.{nombre}"
+    return llamada
+
+
+def registrar_main(inicio: float) -> float:
+    """Registra el tiempo de import de main.py (desde `inicio`) contra el presupuesto."""
+    ms = round(1000 * (time.perf_counter() - inicio), 1)
+    with _LOCK:
+        _ESTADO["main_ms"] = ms
+    if ms > presupuesto_ms():
+        log.warning("Import de main.py: %s ms (presupuesto %s ms)", ms, presupuesto_ms())
+    else:
+        log.info("Import de main.py: %s ms", ms)
+    return ms
+
+
+def _calentar(modulos: Iterable[str], despues: Optional[Callable[[], Any]]) -> None:
+    t0 = time.perf_counter()
+    try:
+        for nombre in modulos:
+            importar(nombre)
+        if despues is not None:
+            despues()
+        resultado = "listo"
+    except Exception as e:
+        log.warning("Calentamiento de arranque incompleto: %s", e)
+        resultado = "error"
+    ms = round(1000 * (time.perf_counter() - t0), 1)
+    with _LOCK:
+        _ESTADO.update(calentamiento=resultado, calentamiento_ms=ms)
+    log.info("Calentamiento de arranque %s en %s ms", resultado, ms)
+
+
+def calentar_en_segundo_plano(modulos: Iterable[str] = MODULOS_MOTOR,
+                              despues: Optional[Callable[[], Any]] = None) -> Optional[threading.Thread]:
+    """Importa `modulos` y corre `despues` en un hilo daemon; None si STARTUP_WARMUP=0."""
+    if not _activado("STARTUP_WARMUP"):
+        with _LOCK:
+            _ESTADO["calentamiento"] = "desactivado"
+        return None
+    with _LOCK:
+        _ESTADO["calentamiento"] = "calentando"
+    hilo = threading.Thread(target=_calentar, args=(tuple(modulos), despues),
+                            name="calentamiento-arranque", daemon=True)
+    hilo.start()
+    return hilo
+
+
+async def precalentar_escenarios(tareas: Sequence[Tuple[str, Callable[[], Awaitable[Any]]]],
+                                 esperar: Optional[threading.Thread] = None) -> Dict[str, Any]:
+    """
+    Corre en orden las tareas (etiqueta, fábrica de corutina) tras `esperar`
+    (el hilo de calentamiento). Una a la vez, para dejar al motor libre para
+    requests reales; un fallo se registra y se sigue con la siguiente.
+    """
+    if not (_activado("STARTUP_WARMUP") and _activado("STARTUP_PRESETS")):
+        return {}
+    if esperar is not None:
+        await asyncio.to_thread(esperar.join)
+    progreso: Dict[str, Any] = {"total": len(tareas), "listos": 0, "fallidos": [], "ms": None}
+    with _LOCK:
+        _ESTADO["escenarios"] = progreso
+    t0 = time.perf_counter()
+    for etiqueta, crear in tareas:
+        try:
+            await crear()
+            with _LOCK:
+                progreso["listos"] += 1
+        except Exception as e:
+            log.warning("Precalentamiento de %s falló: %s", etiqueta, e)
+            with _LOCK:
+                progreso["fallidos"].append(etiqueta)
+    with _LOCK:
+        progreso["ms"] = round(1000 * (time.perf_counter() - t0), 1)
+    log.info("Escenarios precalentados: %s/%s en %s ms", progreso["listos"], progreso["total"], progreso["ms"])
+    return progreso
+
+
+def estado() -> Dict[str, Any]:
+    """Tiempos de import por módulo (más lentos primero), import de main y calentamiento."""
+    with _LOCK:
+        modulos = dict(sorted(_TIEMPOS.items(), key=lambda kv: -kv[1]["ms"]))
+        e = _ESTADO["escenarios"]
+        escenarios = {**e, "fallidos": list(e["fallidos"])} if e else None
+        return {**_ESTADO, "escenarios": escenarios, "presupuesto_ms": presupuesto_ms(), "modulos": modulos}
@@ -9,6 +9,9 @@ import pandas as pd
 import os
 from typing import Dict
 
+from . import dataset_store
+from .siglado_indice import obtener_indice
+
 
 def calcular_eficiencia_partidos(anio: int, usar_coaliciones: bool = False) -> Dict[str, float]:
     """
@@ -34,38 +37,33 @@ def calcular_eficiencia_partidos(anio: int, usar_coaliciones: bool = False) -> D
         print(f"[WARN] No existe archivo {path_votos}, usando eficiencia 1.0 para todos")
         return {}
     
-    df_votos = pd.read_parquet(path_votos)
-    
-    # Normalizar nombres de columnas
-    df_votos.columns = [str(c).strip().upper() for c in df_votos.columns]
-    
     # Cargar siglado para saber quién ganó cada distrito
     path_siglado = f"data/siglado-diputados-{anio}.csv"
     if not os.path.exists(path_siglado):
         print(f"[WARN] No existe archivo {path_siglado}, usando eficiencia 1.0 para todos")
         return {}
     
-    df_siglado = pd.read_csv(path_siglado, dtype=str, keep_default_na=False)
-    df_siglado.columns = [str(c).strip().lower() for c in df_siglado.columns]
+    # Memoizado por proceso (y sembrado desde el snapshot de arranque); se
+    # recalcula si cambia el siglado
+    tipo = 'eficiencias_coal' if usar_coaliciones else 'eficiencias'
+    return dataset_store.obtener(
+        path_siglado, tipo, lambda p: _calcular_eficiencias(path_votos, p, anio, usar_coaliciones)
+    )
+
+
+def _calcular_eficiencias(path_votos: str, path_siglado: str, anio: int, usar_coaliciones: bool) -> Dict[str, float]:
+    df_votos = pd.read_parquet(path_votos)
     
-    # Identificar columna de partido ganador
-    # Puede ser: 'grupo_parlamentario', 'partido_origen', 'partido', 'postulador'
-    columna_partido = None
-    for opcion in ['grupo_parlamentario', 'partido_origen', 'partido', 'postulador']:
-        if opcion in df_siglado.columns:
-            columna_partido = opcion
-            break
+    # Normalizar nombres de columnas
+    df_votos.columns = [str(c).strip().upper() for c in df_votos.columns]
     
-    if not columna_partido:
+    # Contar distritos ganados por cada partido (índice compilado del siglado)
+    indice = obtener_indice(path_siglado)
+    if not indice.partidos:
         print(f"[WARN] No se encontró columna de partido en siglado, usando eficiencia 1.0")
         return {}
-    
-    # Normalizar nombres de partidos en siglado
-    df_siglado['partido_norm'] = df_siglado[columna_partido].str.strip().str.upper()
-    
-    # Contar distritos ganados por cada partido
-    distritos_ganados = df_siglado['partido_norm'].value_counts().to_dict()
-    total_distritos = len(df_siglado)
+    distritos_ganados = indice.distritos_por_grupo()
+    total_distritos = len(indice)
     
     print(f"\n[DEBUG] Eficiencias año {anio}:")
     print(f"Total distritos: {total_distritos}")
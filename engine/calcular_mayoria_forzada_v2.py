@@ -18,20 +18,26 @@ Autor: Sistema Electoral v2.0
 Fecha: 2024
 """
 
-from typing import Dict, Optional, Literal
+from functools import lru_cache
+from typing import Dict, List, Optional, Literal, Tuple
+import numpy as np
 import pandas as pd
 import sys
 from pathlib import Path
 
+from .registro import obtener_registro
+
+log = obtener_registro(__name__)
+
 # Importar módulos de redistritación realista
 try:
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from redistritacion.modulos.reparto_distritos import repartir_distritos_hare
-    from redistritacion.modulos.distritacion import cargar_secciones_ine
+    from redistritacion.modulos.distritacion import poblacion_por_estado as _poblacion_por_estado
     REDISTRITACION_DISPONIBLE = True
 except ImportError:
     REDISTRITACION_DISPONIBLE = False
-    print("[WARN] Módulos de redistritación no disponibles, usando método simplificado")
+    log.warning("Módulos de redistritación no disponibles, usando método simplificado")
 
 
 # Mapeo de nombres de estados (mismo que en redistritacion)
@@ -48,6 +54,58 @@ ESTADO_NOMBRES = {
 }
 
 
+# Errores de _base_geografica desde el arranque: si cambian durante una
+# búsqueda, sus puntos usaron el método simplificado y no se dejan en caché
+_fallos_base_geografica = 0
+
+
+@lru_cache(maxsize=32)
+def _base_geografica_calculada(mr_total: int, anio_base: int) -> Tuple[Tuple[int, float], ...]:
+    """
+    (distritos, % real de MORENA) por estado en el orden de ESTADO_NOMBRES.
+    Se calcula una vez por (mr_total, anio_base): el solver de votos mínimos
+    la consulta en cada punto. Los errores se propagan (no quedan en caché).
+    """
+    # Repartir distritos por población usando método Hare
+    asignacion_distritos = repartir_distritos_hare(
+        poblacion_estados=_poblacion_por_estado(),
+        n_distritos=mr_total,
+        piso_constitucional=2
+    )
+    
+    # Votos reales del año base
+    df_votos = pd.read_parquet(f'data/computos_diputados_{anio_base}.parquet')
+    df_votos['ENTIDAD_NOMBRE'] = df_votos['ENTIDAD'].str.strip().str.upper()
+    
+    base = []
+    for entidad_id, nombre in ESTADO_NOMBRES.items():
+        df_estado = df_votos[df_votos['ENTIDAD_NOMBRE'] == nombre]
+        if len(df_estado) == 0:
+            df_estado = df_votos[df_votos['ENTIDAD_NOMBRE'].str.contains(nombre.split()[0], na=False)]
+        
+        if len(df_estado) > 0:
+            votos_morena = df_estado['MORENA'].sum()
+            votos_totales = df_estado['TOTAL_BOLETAS'].sum()
+            pct_real = (votos_morena / votos_totales * 100) if votos_totales > 0 else 0
+        else:
+            pct_real = np.nan  # sin datos: se usa el % objetivo
+        base.append((int(asignacion_distritos.get(entidad_id, 0)), float(pct_real)))
+    return tuple(base)
+
+
+def _base_geografica(mr_total: int, anio_base: int) -> Optional[Tuple[Tuple[int, float], ...]]:
+    """Base geográfica memorizada; None si la redistritación no está disponible o falló."""
+    global _fallos_base_geografica
+    if not REDISTRITACION_DISPONIBLE:
+        return None
+    try:
+        return _base_geografica_calculada(mr_total, anio_base)
+    except Exception as e:
+        _fallos_base_geografica += 1
+        log.warning("Error en cálculo realista: %s, usando método simplificado", e)
+        return None
+
+
 def calcular_distritos_mr_realistas(
     partido: str,
     mr_total: int,
@@ -68,102 +126,63 @@ def calcular_distritos_mr_realistas(
     Returns:
         Dict con distribución MR por partido
     """
-    if not REDISTRITACION_DISPONIBLE:
+    base = _base_geografica(mr_total, anio_base)
+    if base is None:
         # Fallback al método simplificado
         return calcular_distritos_mr_simplificado(partido, mr_total, pct_votos_objetivo)
     
-    try:
-        # Cargar población por estado
-        secciones = cargar_secciones_ine()
-        poblacion_por_estado = secciones.groupby('ENTIDAD')['POBTOT'].sum().to_dict()
-        
-        # Repartir distritos usando método Hare
-        asignacion_distritos = repartir_distritos_hare(
-            poblacion_estados=poblacion_por_estado,
-            n_distritos=mr_total,
-            piso_constitucional=2
-        )
-        
-        # Cargar votos reales 2024
-        df_votos = pd.read_parquet(f'data/computos_diputados_{anio_base}.parquet')
-        df_votos['ENTIDAD_NOMBRE'] = df_votos['ENTIDAD'].str.strip().str.upper()
-        
-        # Calcular factor de escalamiento: de votación real a objetivo
-        # MORENA 2024: 42.49%
-        votacion_real_2024 = 42.49
-        factor_escala = pct_votos_objetivo / votacion_real_2024
-        
-        # Distribuir MR por estado
-        mr_por_estado_partido = {}
-        total_mr_partido = 0
-        
-        for entidad_id, nombre in ESTADO_NOMBRES.items():
-            # Buscar votos del estado
-            df_estado = df_votos[df_votos['ENTIDAD_NOMBRE'] == nombre]
-            
-            if len(df_estado) == 0:
-                df_estado = df_votos[df_votos['ENTIDAD_NOMBRE'].str.contains(nombre.split()[0], na=False)]
-            
-            if len(df_estado) > 0:
-                votos_morena = df_estado['MORENA'].sum()
-                votos_totales = df_estado['TOTAL_BOLETAS'].sum()
-                pct_morena_estado_real = (votos_morena / votos_totales * 100) if votos_totales > 0 else 0
-                
-                # Escalar proporcionalmente
-                pct_partido_estado = pct_morena_estado_real * factor_escala
-            else:
-                pct_partido_estado = pct_votos_objetivo  # Default
-            
-            distritos_totales = asignacion_distritos.get(entidad_id, 0)
-            
-            # Calcular distritos ganados con eficiencia
-            distritos_ganados = int(distritos_totales * (pct_partido_estado / 100) * eficiencia)
-            distritos_ganados = min(distritos_ganados, distritos_totales)
-            
-            mr_por_estado_partido[nombre] = distritos_ganados
-            total_mr_partido += distritos_ganados
-        
-        # Ajustar para alcanzar el MR objetivo si hay diferencia
-        if total_mr_partido < mr_total:
-            # Distribuir los faltantes en estados grandes
-            diferencia = mr_total - total_mr_partido
-            estados_grandes = ['MEXICO', 'JALISCO', 'VERACRUZ', 'CIUDAD DE MEXICO', 'GUANAJUATO']
-            for estado in estados_grandes:
-                if diferencia <= 0:
-                    break
-                mr_por_estado_partido[estado] = mr_por_estado_partido.get(estado, 0) + 1
-                diferencia -= 1
-        
-        # Distribuir el resto entre otros partidos
-        mr_restantes = mr_total - sum(mr_por_estado_partido.values())
-        
-        # Otros partidos (distribución proporcional histórica)
-        otros_partidos = ['PAN', 'PRI', 'MC', 'PVEM', 'PT']
-        dist_otros = {
-            'PAN': 0.35,
-            'PRI': 0.28,
-            'MC': 0.19,
-            'PVEM': 0.10,
-            'PT': 0.08
-        }
-        
-        mr_distritos = {partido: sum(mr_por_estado_partido.values())}
-        
-        for p, prop in dist_otros.items():
-            if p == partido:
-                continue
-            mr_distritos[p] = int(mr_restantes * prop)
-        
-        # Ajustar para que sume exacto
-        total_asignado = sum(mr_distritos.values())
-        if total_asignado < mr_total:
-            mr_distritos['PAN'] += (mr_total - total_asignado)
-        
-        return mr_distritos
+    # Calcular factor de escalamiento: de votación real a objetivo
+    # MORENA 2024: 42.49%
+    votacion_real_2024 = 42.49
+    factor_escala = pct_votos_objetivo / votacion_real_2024
+    
+    # Distribuir MR por estado
+    mr_por_estado_partido = {}
+    for nombre, (distritos_totales, pct_real) in zip(ESTADO_NOMBRES.values(), base):
+        # Escalar proporcionalmente
+        pct_partido_estado = pct_votos_objetivo if np.isnan(pct_real) else pct_real * factor_escala
         
-    except Exception as e:
-        print(f"[WARN] Error en cálculo realista: {e}, usando método simplificado")
-        return calcular_distritos_mr_simplificado(partido, mr_total, pct_votos_objetivo)
+        # Calcular distritos ganados con eficiencia
+        distritos_ganados = int(distritos_totales * (pct_partido_estado / 100) * eficiencia)
+        mr_por_estado_partido[nombre] = min(distritos_ganados, distritos_totales)
+    total_mr_partido = sum(mr_por_estado_partido.values())
+    
+    # Ajustar para alcanzar el MR objetivo si hay diferencia
+    if total_mr_partido < mr_total:
+        # Distribuir los faltantes en estados grandes
+        diferencia = mr_total - total_mr_partido
+        estados_grandes = ['MEXICO', 'JALISCO', 'VERACRUZ', 'CIUDAD DE MEXICO', 'GUANAJUATO']
+        for estado in estados_grandes:
+            if diferencia <= 0:
+                break
+            mr_por_estado_partido[estado] = mr_por_estado_partido.get(estado, 0) + 1
+            diferencia -= 1
+    
+    # Distribuir el resto entre otros partidos
+    mr_restantes = mr_total - sum(mr_por_estado_partido.values())
+    
+    # Otros partidos (distribución proporcional histórica)
+    dist_otros = {
+        'PAN': 0.35,
+        'PRI': 0.28,
+        'MC': 0.19,
+        'PVEM': 0.10,
+        'PT': 0.08
+    }
+    
+    mr_distritos = {partido: sum(mr_por_estado_partido.values())}
+    
+    for p, prop in dist_otros.items():
+        if p == partido:
+            continue
+        mr_distritos[p] = int(mr_restantes * prop)
+    
+    # Ajustar para que sume exacto
+    total_asignado = sum(mr_distritos.values())
+    if total_asignado < mr_total:
+        mr_distritos['PAN'] += (mr_total - total_asignado)
+    
+    return mr_distritos
 
 
 def calcular_distritos_mr_simplificado(
@@ -204,6 +223,195 @@ def calcular_distritos_mr_simplificado(
     return mr_distritos
 
 
+# Coaliciones conocidas (para solo_partido)
+COALICION_4T = ['MORENA', 'PT', 'PVEM']
+COALICION_XM = ['PAN', 'PRI', 'PRD']
+
+# Distribución histórica 2024 (default de votos_base)
+VOTOS_BASE_2024 = {
+    'MORENA': 42.49,
+    'PAN': 21.09,
+    'PRI': 17.24,
+    'MC': 11.50,
+    'PVEM': 5.75,
+    'PT': 3.83
+}
+
+
+def _coalicion_de(partido: str) -> List[str]:
+    """Miembros de la coalición del partido (incluido él); [partido] si no tiene."""
+    for coalicion in (COALICION_4T, COALICION_XM):
+        if partido in coalicion:
+            return list(coalicion)
+    return [partido]
+
+
+def _redistribuir_mr_coalicion(mr_distritos: Dict[str, int], partido: str) -> Dict[str, int]:
+    """
+    solo_partido=True: anula los MR de los socios de coalición y los reparte
+    proporcionalmente entre los demás partidos (incluido el objetivo).
+    """
+    mr_distritos = dict(mr_distritos)
+    partidos_coalicion = [p for p in _coalicion_de(partido) if p != partido]
+    todos_partidos = list(mr_distritos.keys())
+    
+    mr_coalicion_total = sum(mr_distritos[p] for p in partidos_coalicion if p in mr_distritos)
+    if mr_coalicion_total <= 0:
+        return mr_distritos
+    
+    for p_coal in partidos_coalicion:
+        mr_distritos[p_coal] = 0
+    
+    partidos_activos = [p for p in todos_partidos if p not in partidos_coalicion]
+    total_mr_activos = sum(mr_distritos.get(p, 0) for p in partidos_activos)
+    
+    distritos_redistribuidos = {}
+    for p in partidos_activos:
+        if p in mr_distritos and total_mr_activos > 0:
+            proporcion = mr_distritos[p] / total_mr_activos
+            distritos_redistribuidos[p] = round(mr_coalicion_total * proporcion)
+    
+    # Ajustar para que sume exactamente mr_coalicion_total: la diferencia va
+    # al partido con más distritos
+    diferencia = mr_coalicion_total - sum(distritos_redistribuidos.values())
+    if diferencia != 0 and partidos_activos:
+        partido_mayor = max(partidos_activos, key=lambda p: mr_distritos.get(p, 0))
+        distritos_redistribuidos[partido_mayor] = distritos_redistribuidos.get(partido_mayor, 0) + diferencia
+    
+    for p, extra in distritos_redistribuidos.items():
+        if extra > 0:
+            mr_distritos[p] += extra
+    return mr_distritos
+
+
+def _votos_con_pct(votos_base_dist: Dict[str, float], partido: str, pct: float,
+                   solo_partido: bool) -> Dict[str, float]:
+    """Fija el % del partido y reescala a los demás proporcionalmente a su base."""
+    votos_custom = dict(votos_base_dist)
+    votos_custom[partido] = pct
+    otros_total = 100 - pct
+    otros_partidos = [p for p in votos_custom.keys() if p != partido]
+    suma_otros = sum(votos_base_dist.get(p, 0) for p in otros_partidos)
+    
+    if suma_otros > 0:
+        for p in otros_partidos:
+            votos_custom[p] = otros_total * (votos_base_dist.get(p, 0) / suma_otros)
+    elif not solo_partido:
+        for p in otros_partidos:
+            votos_custom[p] = otros_total / len(otros_partidos)
+    return votos_custom
+
+
+def _escenario_con_pct(partido: str, mr_total: int, pct: float, votos_base_dist: Dict[str, float],
+                       solo_partido: bool, anio: int) -> Tuple[Dict[str, int], Dict[str, float]]:
+    """MR por partido y votos (%) del escenario forzado con pct de votos para el partido."""
+    mr_distritos = calcular_distritos_mr_realistas(
+        partido=partido,
+        mr_total=mr_total,
+        pct_votos_objetivo=pct,
+        eficiencia=1.1,  # +10% eficiencia geográfica realista
+        anio_base=anio
+    )
+    if solo_partido:
+        mr_distritos = _redistribuir_mr_coalicion(mr_distritos, partido)
+    return mr_distritos, _votos_con_pct(votos_base_dist, partido, pct, solo_partido)
+
+
+@lru_cache(maxsize=4096)
+def _evaluar_punto(config: Tuple, k: int) -> Tuple[int, int, int]:
+    """
+    (MR, RP, total) del partido —o de su coalición si solo_partido=False— con
+    k * precision % de votos, usando la asignación real (asignadip_v2). La
+    cache memoriza los puntos ya evaluados de cada configuración.
+    """
+    from .procesar_diputados_v2 import asignadip_v2
+    
+    partido, mr_total, rp_total, aplicar_topes, solo_partido, anio, votos_base, precision = config
+    mr_distritos, votos = _escenario_con_pct(
+        partido, mr_total, k * precision, dict(votos_base), solo_partido, anio
+    )
+    partidos = list(votos) + [p for p in mr_distritos if p not in votos]
+    res = asignadip_v2(
+        x=np.array([votos.get(p, 0.0) for p in partidos]),
+        ssd=np.array([mr_distritos.get(p, 0) for p in partidos]),
+        m=rp_total,
+        S=mr_total + rp_total,
+        threshold=0.03,
+        max_pp=0.08 if aplicar_topes else None,
+        max_seats_per_party=300 if aplicar_topes else None,
+        apply_caps=aplicar_topes,
+        seed=0,
+        mr_son_manuales=True
+    )
+    miembros = [partido] if solo_partido else _coalicion_de(partido)
+    idx = [i for i, p in enumerate(partidos) if p in miembros]
+    mr, rp, tot = (int(res['seats'][fila][idx].sum()) for fila in range(3))
+    return mr, rp, tot
+
+
+def votos_minimos_para_escanos(
+    partido: str,
+    objetivo: int,
+    mr_total: int = 300,
+    rp_total: int = 100,
+    aplicar_topes: bool = True,
+    votos_base: Optional[Dict[str, float]] = None,
+    solo_partido: bool = True,
+    anio: int = 2024,
+    precision: float = 0.01
+) -> Optional[Dict]:
+    """
+    % mínimo de votos con el que el partido (o su coalición) llega a `objetivo`
+    escaños en la asignación real (MR geográfico + RP con umbral y topes).
+    
+    Bisección sobre la rejilla de `precision` puntos porcentuales: los escaños
+    crecen con el % de votos (salvo caídas aisladas de 1 escaño por redondeo
+    de MR y topes), así que basta con ~log2(100/precision) evaluaciones de
+    asignadip_v2, memorizadas por configuración. El pct devuelto cumple
+    escaños(pct) >= objetivo > escaños(pct - precision).
+    
+    Returns:
+        Dict con pct, mr, rp, total y evaluaciones; None si ni con 100% se alcanza
+    """
+    config = (
+        partido, int(mr_total), int(rp_total), bool(aplicar_topes), bool(solo_partido), int(anio),
+        tuple((votos_base or VOTOS_BASE_2024).items()), float(precision)
+    )
+    evaluados = set()
+    fallos_antes = _fallos_base_geografica
+    
+    def escanos(k: int) -> int:
+        evaluados.add(k)
+        return _evaluar_punto(config, k)[2]
+    
+    try:
+        lo, hi = 0, int(round(100 / precision))
+        if escanos(hi) < objetivo:
+            return None
+        if escanos(lo) >= objetivo:
+            hi = lo
+        # Invariante: escanos(lo) < objetivo <= escanos(hi)
+        while hi - lo > 1:
+            medio = (lo + hi) // 2
+            if escanos(medio) >= objetivo:
+                hi = medio
+            else:
+                lo = medio
+        
+        mr, rp, tot = _evaluar_punto(config, hi)
+    finally:
+        if _fallos_base_geografica != fallos_antes:
+            # puntos calculados con la base simplificada por un error transitorio
+            _evaluar_punto.cache_clear()
+    return {
+        "pct": round(hi * precision, 10),
+        "mr": mr,
+        "rp": rp,
+        "total": tot,
+        "evaluaciones": len(evaluados)
+    }
+
+
 def calcular_mayoria_forzada(
     partido: str,
     tipo_mayoria: Literal["simple", "calificada"],
@@ -212,12 +420,14 @@ def calcular_mayoria_forzada(
     aplicar_topes: bool = True,
     votos_base: Optional[Dict[str, float]] = None,
     solo_partido: bool = True,  # 🆕 NUEVO: Si true, fuerza solo el partido; si false, fuerza la coalición
-    anio: int = 2024  # 🆕 NUEVO: Año electoral
+    anio: int = 2024,  # 🆕 NUEVO: Año electoral
+    precision: float = 0.01
 ) -> Dict:
     """
     Calcula configuración REALISTA para forzar mayoría.
     
-    Usa método geográfico basado en redistritacion/calcular_votos_minimos_morena.py
+    Usa método geográfico basado en redistritacion/calcular_votos_minimos_morena.py;
+    el % de votos mínimo sale de votos_minimos_para_escanos (bisección exacta).
     
     Args:
         partido: Partido objetivo (MORENA, PAN, PRI, etc.)
@@ -228,12 +438,13 @@ def calcular_mayoria_forzada(
         votos_base: Distribución actual de votos (opcional)
         solo_partido: Si True, fuerza mayoría SOLO del partido; Si False, fuerza coalición completa
         anio: Año electoral (2018, 2021, 2024)
+        precision: Resolución (puntos porcentuales) del % de votos mínimo
     
     Returns:
         Dict con configuración y viabilidad
     """
     total_escanos = mr_total + rp_total
-    objetivo = 201 if tipo_mayoria == "simple" else 267
+    objetivo = (total_escanos // 2) + 1 if tipo_mayoria == "simple" else int(total_escanos * 2 / 3) + 1
     
     # 1. VALIDAR si es posible
     if tipo_mayoria == "calificada" and aplicar_topes:
@@ -249,250 +460,38 @@ def calcular_mayoria_forzada(
             "votos_min_necesarios": votos_necesarios
         }
     
-    # 2. CALCULAR votos mínimos necesarios (basado en análisis realista)
-    if tipo_mayoria == "simple":
-        # Mayoría simple con eficiencia geográfica +10%
-        if mr_total == 300 and rp_total == 100 and aplicar_topes:
-            # Caso analizado: requiere ~47% votos
-            pct_votos_necesario = 47.0
-            mr_objetivo = 155  # De análisis
-            rp_esperado = 47   # Aproximado
-        elif mr_total == 300 and rp_total == 100 and not aplicar_topes:
-            pct_votos_necesario = 40.0
-            mr_objetivo = 130
-            rp_esperado = 72
-        else:
-            # BÚSQUEDA ITERATIVA para encontrar % exacto
-            # Para configuraciones personalizadas, usar búsqueda binaria
-            umbral_mayorias = (total_escanos // 2) + 1  # Mayoría simple = 50% + 1
-            
-            print(f"[DEBUG] Mayoría forzada genérica: total={total_escanos}, umbral={umbral_mayorias}")
-            print(f"[DEBUG] Usando búsqueda iterativa para encontrar % exacto...")
-            
-            # Búsqueda binaria: empezar entre 40% y 70%
-            pct_min = 40.0
-            pct_max = 70.0
-            pct_votos_necesario = 50.0  # Valor inicial
-            
-            # Iteraciones de búsqueda
-            for _ in range(20):  # Máximo 20 iteraciones
-                pct_actual = (pct_min + pct_max) / 2
-                
-                # Estimar escaños con este porcentaje
-                # MR: usar eficiencia conservadora (0.9 para configs pequeñas)
-                eficiencia_mr = 0.9 if mr_total < 100 else 1.1
-                mr_estimado = int(mr_total * (pct_actual / 100) * eficiencia_mr)
-                mr_estimado = min(mr_estimado, mr_total)
-                
-                # RP: proporcional directo
-                rp_estimado = int(rp_total * (pct_actual / 100))
-                
-                total_estimado = mr_estimado + rp_estimado
-                
-                # Ajustar rango de búsqueda
-                if total_estimado < umbral_mayorias:
-                    pct_min = pct_actual  # Necesita más %
-                elif total_estimado >= umbral_mayorias + 5:
-                    pct_max = pct_actual  # Demasiado %
-                else:
-                    # Encontrado rango aceptable
-                    pct_votos_necesario = pct_actual
-                    mr_objetivo = mr_estimado
-                    rp_esperado = rp_estimado
-                    break
-            else:
-                # Si no converge, usar valor medio
-                pct_votos_necesario = (pct_min + pct_max) / 2
-                eficiencia_mr = 0.9 if mr_total < 100 else 1.1
-                mr_objetivo = int(mr_total * (pct_votos_necesario / 100) * eficiencia_mr)
-                mr_objetivo = min(mr_objetivo, mr_total)
-                rp_esperado = umbral_mayorias - mr_objetivo
-            
-            print(f"[DEBUG] Resultado búsqueda: {pct_votos_necesario:.1f}% votos → {mr_objetivo} MR + {rp_esperado} RP = {mr_objetivo + rp_esperado} escaños")
-            
-    else:
-        # Mayoría calificada (solo sin topes, ya validado arriba)
-        umbral_calificada = int(total_escanos * 2 / 3) + 1  # 66.67% + 1
-        
-        if mr_total == 300 and rp_total == 100:
-            pct_votos_necesario = 62.5
-            mr_objetivo = 206
-            rp_esperado = 62
-        elif mr_total == 200 and rp_total == 200:
-            pct_votos_necesario = 64.0
-            mr_objetivo = 140
-            rp_esperado = 128
-        else:
-            # Estimación genérica para mayoría calificada
-            # Requiere ~66.67% de escaños
-            # Con eficiencia 1.1 en MR:
-            # pct = umbral / (mr_total * 1.1 + rp_total)
-            
-            pct_votos_necesario = (umbral_calificada / (mr_total * 1.1 + rp_total)) * 100
-            mr_objetivo = int(mr_total * (pct_votos_necesario / 100) * 1.1)
-            mr_objetivo = min(mr_objetivo, mr_total)
-            rp_esperado = umbral_calificada - mr_objetivo
-            
-            print(f"[DEBUG] Mayoría calificada genérica: total={total_escanos}, umbral={umbral_calificada}")
-            print(f"[DEBUG] Estimación: {pct_votos_necesario:.1f}% votos → {mr_objetivo} MR + {rp_esperado} RP = {mr_objetivo + rp_esperado} escaños")
-    
-    # 3. GENERAR distribución realista de MR
-    mr_distritos = calcular_distritos_mr_realistas(
+    # 2. CALCULAR votos mínimos necesarios sobre la asignación real
+    votos_base_dist = dict(votos_base) if votos_base is not None else dict(VOTOS_BASE_2024)
+    solucion = votos_minimos_para_escanos(
         partido=partido,
+        objetivo=objetivo,
         mr_total=mr_total,
-        pct_votos_objetivo=pct_votos_necesario,
-        eficiencia=1.1  # +10% eficiencia geográfica realista
+        rp_total=rp_total,
+        aplicar_topes=aplicar_topes,
+        votos_base=votos_base_dist,
+        solo_partido=solo_partido,
+        anio=anio,
+        precision=precision
     )
-    
-    # 🆕 PASO 3.5: Si solo_partido=True, redistribuir distritos MR de coalición
-    coalicion_4t = ['MORENA', 'PT', 'PVEM']
-    coalicion_xm = ['PAN', 'PRI', 'PRD']
-    
-    if solo_partido:
-        print(f"[DEBUG MR] solo_partido=True: Redistribuyendo distritos de coalición partners")
-        
-        # Identificar partidos de coalición
-        if partido in coalicion_4t:
-            partidos_coalicion = [p for p in coalicion_4t if p != partido]
-            todos_partidos = list(mr_distritos.keys())
-            print(f"[DEBUG MR] {partido} en 4T, partners: {partidos_coalicion}")
-        elif partido in coalicion_xm:
-            partidos_coalicion = [p for p in coalicion_xm if p != partido]
-            todos_partidos = list(mr_distritos.keys())
-            print(f"[DEBUG MR] {partido} en Fuerza y Corazón, partners: {partidos_coalicion}")
-        else:
-            partidos_coalicion = []
-            todos_partidos = list(mr_distritos.keys())
-            print(f"[DEBUG MR] {partido} sin coalición conocida")
-        
-        # Calcular cuántos distritos hay que redistribuir (de PT y PVEM)
-        mr_coalicion_total = 0
-        for p_coal in partidos_coalicion:
-            if p_coal in mr_distritos:
-                mr_previo = mr_distritos[p_coal]
-                mr_coalicion_total += mr_previo
-                print(f"[DEBUG MR]   {p_coal}: {mr_previo} distritos (se anularán)")
-        
-        if mr_coalicion_total > 0:
-            # Calcular total ANTES de anular coalición partners
-            total_mr_antes = sum(mr_distritos.values())
-            
-            # Anular coalición partners
-            for p_coal in partidos_coalicion:
-                mr_distritos[p_coal] = 0
-            
-            # Calcular proporción de cada partido (SIN coalición partners)
-            partidos_activos = [p for p in todos_partidos if p not in partidos_coalicion]
-            total_mr_activos = sum(mr_distritos.get(p, 0) for p in partidos_activos)
-            
-            print(f"[DEBUG MR] Redistribuyendo {mr_coalicion_total} distritos proporcionalmente:")
-            
-            # Redistribuir proporcionalmente entre TODOS (incluyendo partido objetivo)
-            distritos_redistribuidos = {}
-            for p in partidos_activos:
-                if p in mr_distritos and total_mr_activos > 0:
-                    proporcion = mr_distritos[p] / total_mr_activos
-                    distritos_extra = round(mr_coalicion_total * proporcion)
-                    distritos_redistribuidos[p] = distritos_extra
-            
-            # Ajustar para que sume exactamente mr_coalicion_total
-            suma_redistribuida = sum(distritos_redistribuidos.values())
-            diferencia = mr_coalicion_total - suma_redistribuida
-            
-            # Dar la diferencia al partido con más distritos
-            if diferencia != 0 and partidos_activos:
-                partido_mayor = max(partidos_activos, key=lambda p: mr_distritos.get(p, 0))
-                distritos_redistribuidos[partido_mayor] = distritos_redistribuidos.get(partido_mayor, 0) + diferencia
-            
-            # Aplicar redistribución
-            for p, extra in distritos_redistribuidos.items():
-                if extra > 0:
-                    mr_previo = mr_distritos[p]
-                    mr_distritos[p] = mr_previo + extra
-                    print(f"[DEBUG MR]   {p}: {mr_previo} → {mr_distritos[p]} (+{extra} redistribuidos)")
-            
-            # Verificar que el partido objetivo puede alcanzar mayoría
-            mr_partido_actual = mr_distritos.get(partido, 0)
-            print(f"[DEBUG MR] {partido} tiene ahora {mr_partido_actual} distritos MR")
-            
-            # Si el partido objetivo no alcanza suficientes MR para la mayoría, 
-            # necesitamos incrementar su porcentaje de votos
-            # Estimación: con mr_partido_actual MR y el RP proporcional, ¿alcanza?
-            escanos_estimados = mr_partido_actual + rp_esperado
-            
-            if escanos_estimados < objetivo:
-                # Necesita más votos - incrementar porcentaje
-                deficit = objetivo - escanos_estimados
-                pct_adicional = (deficit / rp_total) * 100  # Porcentaje extra en RP
-                pct_votos_necesario_nuevo = pct_votos_necesario + pct_adicional
-                
-                print(f"[DEBUG MR] ⚠️  Déficit: {deficit} escaños, incrementando votos de {pct_votos_necesario:.1f}% a {pct_votos_necesario_nuevo:.1f}%")
-                
-                # Recalcular RP esperado con nuevo porcentaje
-                rp_esperado = int(rp_total * (pct_votos_necesario_nuevo / 100))
-                
-                # Actualizar el porcentaje para usarlo en votos_custom más adelante
-                pct_votos_necesario = pct_votos_necesario_nuevo
-    
-    # 4. CALCULAR distribución de votos
-    if votos_base is None:
-        # Distribución histórica 2024
-        votos_base_dist = {
-            'MORENA': 42.49,
-            'PAN': 21.09,
-            'PRI': 17.24,
-            'MC': 11.50,
-            'PVEM': 5.75,
-            'PT': 3.83
+    if solucion is None:
+        return {
+            "viable": False,
+            "razon": f"Mayoría {tipo_mayoria} ({objetivo} escaños) no se alcanza ni con 100% de votos "
+                     f"con {mr_total} MR + {rp_total} RP" + (" y topes del 8%" if aplicar_topes else ""),
+            "sugerencia": "Desactivar topes de sobrerrepresentación" if aplicar_topes else "Cambiar la configuración de escaños",
+            "votos_min_necesarios": None
         }
-    else:
-        votos_base_dist = votos_base.copy()
     
-    # Ajustar para que el partido objetivo tenga los votos necesarios
-    votos_custom = votos_base_dist.copy()
-    votos_custom[partido] = pct_votos_necesario
+    pct_votos_necesario = solucion["pct"]
+    mr_objetivo = solucion["mr"]
+    rp_esperado = solucion["rp"]
+    log.debug("Mayoría forzada: objetivo=%s, %.2f%% votos → %s MR + %s RP = %s escaños (%s evaluaciones)", objetivo, pct_votos_necesario, mr_objetivo, rp_esperado, solucion['total'], solucion['evaluaciones'])
     
-    # 🆕 LÓGICA DE solo_partido - Redistribución proporcional
-    if solo_partido:
-        # Si solo_partido=True, ajustamos votos proporcionalmente a TODOS los partidos
-        # No ponemos a nadie en 0%, solo redistribuimos proporcionalmente
-        print(f"[DEBUG] solo_partido=True: Redistribuyendo votos PROPORCIONALMENTE entre todos")
-        
-        # Identificar partidos de la coalición del partido objetivo
-        if partido in coalicion_4t:
-            partidos_coalicion = [p for p in coalicion_4t if p != partido and p in votos_custom]
-        elif partido in coalicion_xm:
-            partidos_coalicion = [p for p in coalicion_xm if p != partido and p in votos_custom]
-        else:
-            # Partido sin coalición conocida
-            partidos_coalicion = []
-        
-        # Calcular votos disponibles para todos los demás partidos
-        # Total disponible = 100 - votos del partido objetivo
-        otros_total = 100 - pct_votos_necesario
-        
-        # Redistribuir proporcionalmente entre TODOS los demás partidos (incluye coalición)
-        otros_partidos = [p for p in votos_custom.keys() if p != partido]
-        suma_otros = sum(votos_base_dist.get(p, 0) for p in otros_partidos)
-        
-        if suma_otros > 0:
-            for p in otros_partidos:
-                proporcion = votos_base_dist.get(p, 0) / suma_otros
-                votos_custom[p] = otros_total * proporcion
-        
-        print(f"[DEBUG] Votos redistribuidos proporcionalmente:")
-        for p in otros_partidos:
-            print(f"[DEBUG]   {p}: {votos_base_dist.get(p, 0):.2f}% → {votos_custom[p]:.2f}%")
-    else:
-        # Comportamiento original: redistribuir entre TODOS los demás partidos
-        print(f"[DEBUG] solo_partido=False: Redistribuyendo entre todos los partidos")
-        otros_total = 100 - pct_votos_necesario
-        otros_partidos = [p for p in votos_custom.keys() if p != partido]
-        suma_otros = sum(votos_base_dist.get(p, 0) for p in otros_partidos)
-        
-        for p in otros_partidos:
-            proporcion = votos_base_dist.get(p, 0) / suma_otros if suma_otros > 0 else 1.0 / len(otros_partidos)
-            votos_custom[p] = otros_total * proporcion
+    # 3. GENERAR distribución realista de MR y votos del escenario encontrado
+    # (si solo_partido=True, los MR de los socios de coalición se redistribuyen)
+    mr_distritos, votos_custom = _escenario_con_pct(
+        partido, mr_total, pct_votos_necesario, votos_base_dist, solo_partido, anio
+    )
     
     # 5. ADVERTENCIAS
     advertencias = []
@@ -525,9 +524,9 @@ def calcular_mayoria_forzada(
         "mr_distritos_por_estado": mr_distritos_por_estado,  # 🆕 Distribución geográfica
         "votos_custom": votos_custom,
         "detalle": {
-            "mr_ganados": mr_distritos[partido],
+            "mr_ganados": mr_objetivo,
             "mr_total": mr_total,
-            "pct_mr": (mr_distritos[partido] / mr_total) * 100,
+            "pct_mr": (mr_objetivo / mr_total) * 100,
             "rp_esperado": rp_esperado,
             "rp_total": rp_total,
             "pct_votos": pct_votos_necesario
@@ -1,15 +1,19 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Literal, Optional, Tuple
+import heapq
+import math
 import numpy as np
 import pandas as pd
 
+from .partidos import split_tokens
+
 # =========================
 # 0) Helpers de métodos
 # =========================
 
 QuotaMethod = Literal["hare", "droop", "hb", "imperiali"]    # hare = Hare, droop = Droop, hb = Hare-Niemeyer, imperiali = Imperiali
-DivisorMethod = Literal["dhondt", "saintelague", "webster"]  # webster = saintelague (mismo método)
+DivisorMethod = Literal["dhondt", "saintelague", "webster", "adams", "huntington_hill"]  # webster = saintelague (mismo método)
 
 def largest_remainder(votes: np.ndarray, seats: int, method: QuotaMethod) -> np.ndarray:
     votes = np.maximum(0, np.nan_to_num(votes.astype(float)))
@@ -38,7 +42,94 @@ def largest_remainder(votes: np.ndarray, seats: int, method: QuotaMethod) -> np.
     base[order[:left]] += 1
     return base.astype(int)
 
+def _normalizar_divisor(method: str) -> str:
+    m = str(method).lower().replace("_", "").replace("-", "").replace("'", "")
+    m = {"webster": "saintelague", "hh": "huntingtonhill"}.get(m, m)
+    if m not in ("dhondt", "saintelague", "adams", "huntingtonhill"):
+        raise ValueError("DivisorMethod no soportado")
+    return m
+
+
+def _cociente(v: float, k: int, method: str) -> float:
+    """v / d(k) para el escaño k+1; divisor 0 (Adams/Huntington-Hill) => prioridad infinita."""
+    if v <= 0:
+        return -math.inf
+    if method == "dhondt":
+        d = k + 1.0
+    elif method == "saintelague":
+        d = k + 0.5
+    elif method == "adams":
+        d = float(k)
+    else:
+        d = math.sqrt(k * (k + 1.0))
+    return v / d if d > 0 else math.inf
+
+
 def divisor_apportionment(votes: np.ndarray, seats: int, method: DivisorMethod) -> np.ndarray:
+    """
+    Reparto por divisores sin tabla de cocientes, O(N log N) sin importar S.
+
+    1) Estimación tipo Hare: con el divisor V/S cada partido recibe el redondeo
+       propio del método (floor para D'Hondt, round para Sainte-Laguë/Webster,
+       ceil para Adams, media geométrica para Huntington-Hill).
+    2) La diferencia con S (a lo más ~N escaños) se corrige con un heap de
+       cocientes: se agregan los siguientes más altos o se quitan los últimos
+       más bajos.
+    Empates: gana el partido con más votos y luego el de menor índice.
+    """
+    votes = np.maximum(0, np.nan_to_num(np.asarray(votes, dtype=float)))
+    if seats <= 0 or votes.sum() <= 0:
+        return np.zeros_like(votes, dtype=int)
+    method = _normalizar_divisor(method)
+
+    r = votes * (seats / votes.sum())
+    if method == "dhondt":
+        out = np.floor(r)
+    elif method == "saintelague":
+        out = np.floor(r + 0.5)
+    elif method == "adams":
+        out = np.ceil(r)
+    else:
+        f = np.floor(r)
+        out = f + (r > np.sqrt(f * (f + 1.0)))
+    out = np.where(votes > 0, out, 0).astype(np.int64)
+
+    v = votes.tolist()
+    k = out.tolist()
+    falta = seats - sum(k)
+    if falta > 0:
+        # agregar: siguiente cociente más alto
+        heap = [(-_cociente(v[i], k[i], method), -v[i], i) for i in range(len(v)) if v[i] > 0]
+        heapq.heapify(heap)
+        for _ in range(falta):
+            _, _, i = heapq.heappop(heap)
+            k[i] += 1
+            heapq.heappush(heap, (-_cociente(v[i], k[i], method), -v[i], i))
+    elif falta < 0:
+        # quitar: último cociente asignado más bajo
+        heap = [(_cociente(v[i], k[i] - 1, method), v[i], -i) for i in range(len(v)) if k[i] > 0]
+        heapq.heapify(heap)
+        for _ in range(-falta):
+            _, _, mi = heapq.heappop(heap)
+            k[-mi] -= 1
+            if k[-mi] > 0:
+                heapq.heappush(heap, (_cociente(v[-mi], k[-mi] - 1, method), v[-mi], mi))
+
+    # Ajuste final por redondeo de punto flotante en la estimación: mientras algún
+    # siguiente cociente supere al último asignado de otro partido, mover el escaño
+    rango = range(len(v))
+    while True:
+        i = max(rango, key=lambda a: _cociente(v[a], k[a], method))
+        j = min((a for a in rango if k[a] > 0), key=lambda a: _cociente(v[a], k[a] - 1, method))
+        if i == j or not _cociente(v[i], k[i], method) > _cociente(v[j], k[j] - 1, method):
+            break
+        k[i] += 1
+        k[j] -= 1
+    return np.asarray(k, dtype=int)
+
+
+def _divisor_apportionment_tabla(votes: np.ndarray, seats: int, method: DivisorMethod) -> np.ndarray:
+    """Versión original con tabla N×S de cocientes (referencia para pruebas)."""
     votes = np.maximum(0, np.nan_to_num(votes.astype(float)))
     if seats <= 0 or votes.sum() <= 0:
         return np.zeros_like(votes, dtype=int)
@@ -77,11 +168,6 @@ def redistribute_coalitions_equal_residual(
     for p in partidos_base:
         out[p] = 0
 
-    def split_tokens(label: str) -> List[str]:
-        tokens = split_tokens(colname)  # en vez de .split("_")
-        toks = [t for t in label.replace("-", "_").split("_") if t]
-        return [t.upper().strip() for t in toks]
-
     # por grupo (distrito)
     for _, g in df.groupby(group_keys, as_index=False):
         # votos solo (si existen)
@@ -95,7 +181,7 @@ def redistribute_coalitions_equal_residual(
             if V <= 0:
                 continue
 
-            toks = split_tokens(col)
+            toks = list(split_tokens(col))
             # mapear tokens a una coalición conocida (si los tokens coinciden con un set del mapa)
             # estrategia: encontrar la coalición cuyo conjunto es superconjunto de toks
             cand = None
@@ -168,6 +254,44 @@ def mr_by_siglado(
 # 3) Topes nacionales (+8 pp y ≤ 300) 
 # =========================
 
+def _fijar_topes(s_mr: np.ndarray, v_nac: np.ndarray, lim_max: np.ndarray,
+                 rp_total: int, fixed: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Water-filling de topes: amplía `fixed` (in-place) hasta que ningún partido
+    libre rebase su tope con Hare sobre los RP restantes. Devuelve el reparto
+    Hare de los libres, o None si ya no quedan RP o votos por repartir.
+
+    Fijar a un partido que rebasa su tope sube la cuota lambda = n_rest/V de
+    los demás, así que se recorren por holgura relativa (h+1)/v ascendente y
+    se fijan de una vez los que rebasan con certeza (floor(lambda*v) > h); un
+    reparto Hare de verificación atrapa los que rebasan solo por residuo.
+    A lo más N repartos, normalmente uno.
+    """
+    holgura = np.maximum(0, lim_max - s_mr)
+    n_rest = max(0, rp_total - int(holgura[fixed].sum()))
+    v_libre = float(v_nac[~fixed].sum())
+
+    libres = np.where(~fixed & (v_nac > 0))[0]
+    for p in libres[np.argsort((holgura[libres] + 1) / v_nac[libres], kind="stable")]:
+        if n_rest <= 0 or v_libre <= 0 or n_rest * v_nac[p] / v_libre - (holgura[p] + 1) <= 1e-9:
+            break
+        fixed[p] = True
+        n_rest = max(0, n_rest - int(holgura[p]))
+        v_libre -= float(v_nac[p])
+
+    while True:
+        v_eff = v_nac.copy()
+        v_eff[fixed] = 0
+        n_rest = max(0, rp_total - int(holgura[fixed].sum()))
+        if n_rest == 0 or v_eff.sum() <= 0:
+            return None
+        add = largest_remainder(v_eff, n_rest, "hare")
+        over = ~fixed & (s_mr + add > lim_max)
+        if not over.any():
+            return add
+        fixed |= over
+
+
 def apply_caps_national(
     s_mr: np.ndarray, s_rp: np.ndarray, v_nac: np.ndarray,
     S: int, max_pp: float = 0.08, max_seats: int = 300, iter_max: int = 16
@@ -177,6 +301,7 @@ def apply_caps_national(
     s_rp: asientos iniciales de RP (antes de topes)
     v_nac: participación nacional normalizada de partidos elegibles (después de umbral; suma 1)
     S: total de curules (MR+RP)
+    iter_max: sin uso; se conserva por compatibilidad (_fijar_topes es acotado)
     """
     s_mr = s_mr.astype(int)
     s_rp = s_rp.astype(int)
@@ -191,36 +316,25 @@ def apply_caps_national(
     lim_max = np.minimum(np.maximum(s_mr, cap_dist), max_seats)
 
     s_tot = s_mr + s_rp
-    k = 0
-    while True:
-        over = np.where(s_tot > lim_max)[0]
-        if not len(over) or k >= iter_max:
-            break
-        k += 1
-
-        s_rp[over] = np.maximum(0, lim_max[over] - s_mr[over])
-
-        fixed = np.zeros(N, dtype=bool)
-        fixed[over] = True
-        fixed[~ok] = True
-
-        v_eff = v_nac.copy()
-        v_eff[fixed] = 0
-
-        rp_fijos = int(np.maximum(0, (lim_max - s_mr)).clip(min=0)[fixed].sum())
-        n_rest = max(0, rp_total - rp_fijos)
-
-        if n_rest == 0 or v_eff.sum() <= 0:
+    over = s_tot > lim_max
+    fixed = np.zeros(N, dtype=bool)
+    if over.any():
+        # Los que rebasan con el reparto inicial quedan en su tope y el resto
+        # se reparte con Hare; se fijan también los que rebasen en ese reparto
+        fixed = over | ~ok
+        add = _fijar_topes(s_mr, v_nac, lim_max, rp_total, fixed)
+        if add is None:
+            tope = over | (fixed & ok)
+            s_rp[tope] = np.maximum(0, lim_max - s_mr)[tope]
             s_rp[~fixed] = 0
         else:
-            add = largest_remainder(v_eff, n_rest, "hare")
             s_rp = np.zeros(N, dtype=int)
             s_rp[fixed] = np.maximum(0, (lim_max - s_mr))[fixed]
             s_rp[~fixed] = add[~fixed]
-
         s_tot = s_mr + s_rp
 
-    # Ajuste por si faltan/sobran por redondeos
+    # Ajuste ±1 por si faltan/sobran: el s_rp inicial no siempre suma S - MR
+    # y sin partidos por encima del tope no pasa por _fijar_topes
     delta = int(S - s_tot.sum())
     if delta != 0:
         margin = (lim_max - s_tot).copy()
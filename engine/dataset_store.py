@@ -0,0 +1,166 @@
+# engine/dataset_store.py
+"""
+Almacén en memoria (por proceso) de los datasets que usan los motores v2.
+
+Los parquet de cómputos y los CSV de siglado son estáticos durante la vida
+del proceso, pero cada request los volvía a leer y normalizar. Aquí se
+cargan una sola vez y se sirven copias; si el archivo cambia en disco
+(mtime/tamaño) la entrada se invalida y se vuelve a cargar.
+"""
+from __future__ import annotations
+
+import copy
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# clave -> (firma_archivo, valor), en orden LRU. Acotado porque los parquet
+# temporales de redistribución (outputs/tmp_*.parquet) también pasan por aquí.
+_STORE: "OrderedDict[Tuple, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+_MAX_ENTRADAS = int(os.environ.get('DATASET_STORE_MAX', '64'))
+_LOCK = threading.RLock()
+# un lock por clave mientras se carga: el loader corre fuera de _LOCK, así
+# una lectura lenta no bloquea a las demás claves, y dos requests de la
+# misma clave no la cargan dos veces
+_CARGANDO: Dict[Tuple, threading.Lock] = {}
+_STATS = {'hits': 0, 'misses': 0}
+
+
+def _firma(path: str) -> Tuple[int, int]:
+    """(mtime_ns, tamaño) del archivo; lanza FileNotFoundError si no existe."""
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _copia(valor: Any) -> Any:
+    """Copia defensiva para que los callers puedan mutar sin ensuciar el store."""
+    if isinstance(valor, pd.DataFrame):
+        return valor.copy()
+    if isinstance(valor, (dict, list, set)):
+        return copy.deepcopy(valor)
+    return valor
+
+
+def obtener(path: str, tipo: str, loader: Callable[[str], Any], copiar: bool = True) -> Any:
+    """
+    Devuelve loader(path) memoizado por (tipo, ruta absoluta).
+
+    La entrada se recarga cuando cambia la firma del archivo. Con copiar=False
+    se devuelve la instancia compartida (solo lectura).
+    """
+    ruta = os.path.abspath(path)
+    key = (tipo, ruta)
+    firma = _firma(ruta)
+    with _LOCK:
+        hit = _buscar(key, firma)
+        if hit is None:
+            cargando = _CARGANDO.setdefault(key, threading.Lock())
+    if hit is None:
+        with cargando:
+            # otro hilo pudo cargarla mientras esperábamos
+            with _LOCK:
+                hit = _buscar(key, firma)
+                if hit is None:
+                    _STATS['misses'] += 1
+            if hit is None:
+                try:
+                    valor = loader(path)
+                    _guardar(key, firma, valor)
+                finally:
+                    with _LOCK:
+                        if _CARGANDO.get(key) is cargando:
+                            del _CARGANDO[key]
+    valor = valor if hit is None else hit[0]
+    return _copia(valor) if copiar else valor
+
+
+def _buscar(key: Tuple, firma: Tuple[int, int]) -> Optional[Tuple[Any]]:
+    """(valor,) si la entrada está cargada con esa firma; None si no. Requiere _LOCK."""
+    hit = _STORE.get(key)
+    if hit is None or hit[0] != firma:
+        return None
+    _STATS['hits'] += 1
+    _STORE.move_to_end(key)
+    return (hit[1],)
+
+
+def _guardar(key: Tuple, firma: Tuple[int, int], valor: Any) -> None:
+    with _LOCK:
+        _STORE[key] = (firma, valor)
+        _STORE.move_to_end(key)
+        while len(_STORE) > _MAX_ENTRADAS:
+            _STORE.popitem(last=False)
+
+
+def sembrar(path: str, tipo: str, valor: Any) -> None:
+    """Registra un valor ya preparado (p. ej. desde el snapshot) como si lo hubiera cargado su loader."""
+    ruta = os.path.abspath(path)
+    _guardar((tipo, ruta), _firma(ruta), valor)
+
+
+def entradas() -> List[Tuple[str, str, Any]]:
+    """(tipo, ruta absoluta, valor compartido) de las entradas cargadas, en orden LRU."""
+    with _LOCK:
+        return [(tipo, ruta, valor) for (tipo, ruta), (_, valor) in _STORE.items()]
+
+
+def _cargar_boletas(path_parquet: str) -> pd.DataFrame:
+    """Lee el parquet de cómputos y normaliza columnas, ENTIDAD y DISTRITO."""
+    from .recomposicion import norm_ascii_up, normalize_entidad_ascii
+
+    try:
+        df = pd.read_parquet(path_parquet)
+    except Exception:
+        import pyarrow.parquet as pq
+        df = pq.read_table(path_parquet).to_pandas()
+        # Decodificar bytes a UTF-8 si es necesario
+        for col in df.columns:
+            if df[col].dtype == object:
+                df[col] = df[col].apply(lambda x: x.decode('utf-8', errors='replace') if isinstance(x, bytes) else x)
+
+    df.columns = [norm_ascii_up(c) for c in df.columns]
+    if 'ENTIDAD' in df.columns:
+        df['ENTIDAD'] = df['ENTIDAD'].apply(
+            lambda x: x.decode('utf-8', errors='replace') if isinstance(x, bytes) else str(x)
+        )
+        df['ENTIDAD'] = df['ENTIDAD'].apply(normalize_entidad_ascii)
+    if 'DISTRITO' in df.columns:
+        df['DISTRITO'] = pd.to_numeric(df['DISTRITO'], errors='coerce').fillna(0).astype(int)
+    return df
+
+
+def obtener_boletas(path_parquet: str) -> pd.DataFrame:
+    """Boletas normalizadas (copia) para el parquet dado."""
+    return obtener(path_parquet, 'boletas', _cargar_boletas)
+
+
+def ruta_boletas(camara: str, anio: int) -> str:
+    """Ruta estándar del parquet de cómputos para (cámara, año)."""
+    return f"data/computos_{camara}_{anio}.parquet"
+
+
+def invalidar(path: Optional[str] = None) -> int:
+    """Descarta las entradas de un archivo (o todas si path es None). Devuelve cuántas."""
+    with _LOCK:
+        if path is None:
+            n = len(_STORE)
+            _STORE.clear()
+            return n
+        ruta = os.path.abspath(path)
+        keys = [k for k in _STORE if k[1] == ruta]
+        for k in keys:
+            del _STORE[k]
+        return len(keys)
+
+
+def estadisticas() -> Dict[str, Any]:
+    """Hits/misses y entradas cargadas (para diagnóstico)."""
+    with _LOCK:
+        return {
+            'hits': _STATS['hits'],
+            'misses': _STATS['misses'],
+            'entradas': sorted(f"{tipo}:{os.path.relpath(ruta)}" for tipo, ruta in _STORE),
+        }
@@ -0,0 +1,110 @@
+# engine/motor_executor.py
+"""
+Executor acotado para las llamadas CPU-bound del motor desde handlers async.
+
+Las llamadas (procesar_diputados_v2, procesar_senadores_v2, mayoría forzada...)
+corren en un pool de hilos de tamaño fijo para no bloquear el event loop.
+Si ya hay `max_concurrencia` llamadas corriendo y `max_cola` esperando, la
+siguiente falla de inmediato con MotorSaturado (la API responde 503).
+
+Configuración: ENGINE_MAX_CONCURRENCY (default 2) y ENGINE_MAX_QUEUE (default 16).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class MotorSaturado(RuntimeError):
+    """La cola del motor está llena; el caller debe reintentar más tarde."""
+
+
+class MotorExecutor:
+    """Pool de hilos con límite de concurrencia, cola acotada y métricas."""
+
+    def __init__(self, max_concurrencia: int, max_cola: int, nombre: str = "motor"):
+        self.max_concurrencia = max(1, int(max_concurrencia))
+        self.max_cola = max(0, int(max_cola))
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrencia, thread_name_prefix=nombre)
+        self._lock = threading.Lock()
+        self._corriendo = 0
+        self._en_cola = 0
+        self._stats = {
+            'completadas': 0, 'fallidas': 0, 'rechazadas': 0,
+            'max_cola_observada': 0, 'espera_total_s': 0.0, 'ejecucion_total_s': 0.0,
+        }
+
+    def _admitir(self) -> None:
+        with self._lock:
+            if self._corriendo + self._en_cola >= self.max_concurrencia + self.max_cola:
+                self._stats['rechazadas'] += 1
+                raise MotorSaturado(
+                    f"Motor saturado: {self._corriendo} en ejecución y {self._en_cola} en cola"
+                )
+            self._en_cola += 1
+            self._stats['max_cola_observada'] = max(self._stats['max_cola_observada'], self._en_cola)
+
+    def _correr(self, encolada: float, fn: Callable[[], Any]) -> Any:
+        inicio = time.perf_counter()
+        with self._lock:
+            self._en_cola -= 1
+            self._corriendo += 1
+            self._stats['espera_total_s'] += inicio - encolada
+        ok = False
+        try:
+            resultado = fn()
+            ok = True
+            return resultado
+        finally:
+            with self._lock:
+                self._corriendo -= 1
+                self._stats['completadas' if ok else 'fallidas'] += 1
+                self._stats['ejecucion_total_s'] += time.perf_counter() - inicio
+
+    def _liberar_si_cancelada(self, futuro) -> None:
+        # una tarea cancelada antes de empezar nunca pasa por _correr
+        if futuro.cancelled():
+            with self._lock:
+                self._en_cola -= 1
+
+    async def ejecutar(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Ejecuta fn(*args, **kwargs) en el pool; MotorSaturado si la cola está llena."""
+        self._admitir()
+        # copy_context: el hilo ve las mismas ContextVars que el request
+        llamada = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+        try:
+            futuro = self._pool.submit(self._correr, time.perf_counter(), llamada)
+        except RuntimeError:
+            with self._lock:
+                self._en_cola -= 1
+            raise
+        futuro.add_done_callback(self._liberar_si_cancelada)
+        return await asyncio.wrap_future(futuro)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            terminadas = self._stats['completadas'] + self._stats['fallidas']
+            return {
+                'max_concurrencia': self.max_concurrencia,
+                'max_cola': self.max_cola,
+                'corriendo': self._corriendo,
+                'en_cola': self._en_cola,
+                'completadas': self._stats['completadas'],
+                'fallidas': self._stats['fallidas'],
+                'rechazadas': self._stats['rechazadas'],
+                'max_cola_observada': self._stats['max_cola_observada'],
+                'espera_media_ms': round(1000 * self._stats['espera_total_s'] / terminadas, 2) if terminadas else 0.0,
+                'ejecucion_media_ms': round(1000 * self._stats['ejecucion_total_s'] / terminadas, 2) if terminadas else 0.0,
+            }
+
+
+MOTOR = MotorExecutor(
+    max_concurrencia=int(os.environ.get('ENGINE_MAX_CONCURRENCY', '2')),
+    max_cola=int(os.environ.get('ENGINE_MAX_QUEUE', '16')),
+)
@@ -0,0 +1,200 @@
+# engine/partidos.py
+"""
+Registro de partidos por año.
+
+Cada partido del año tiene un índice fijo y cada candidatura (columna de
+partido o de coalición) se representa como una máscara de bits sobre esos
+índices. Pertenencia, destinatario de residuos y columna -> coalición pasan
+a ser operaciones enteras; el parseo de nombres de columna se hace una vez
+por (año, columna).
+
+    reg = registro_partidos(2024)
+    m = reg.mascara_columna("PAN_PRI_PRD")    # 0b111
+    reg.coalicion(m)                          # 'FUERZA Y CORAZON POR MEXICO'
+    reg.pertenece(m, "PRI")                   # True
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PARTIDOS_2018 = ["PAN", "PRI", "PRD", "PVEM", "PT", "MC", "MORENA", "PES", "NA"]
+PARTIDOS_2021 = ["PAN", "PRI", "PRD", "PVEM", "PT", "MC", "MORENA", "PES", "RSP", "FXM"]
+PARTIDOS_2024 = ["PAN", "PRI", "PRD", "PVEM", "PT", "MC", "MORENA"]
+ALL_PARTIES = sorted(set(PARTIDOS_2018 + PARTIDOS_2021 + PARTIDOS_2024 + ["NA", "PES", "RSP", "FXM", "CI"]))
+
+# Coaliciones oficiales por año (nombre canónico sin acentos -> miembros)
+COALICIONES = {
+    2018: {
+        "JUNTOS HAREMOS HISTORIA": ("MORENA", "PT", "PES"),
+        "POR MEXICO AL FRENTE": ("PAN", "PRD", "MC"),
+        "TODOS POR MEXICO": ("PRI", "PVEM", "NA"),
+    },
+    2021: {
+        "VA POR MEXICO": ("PAN", "PRI", "PRD"),
+    },
+    2024: {
+        "SIGAMOS HACIENDO HISTORIA": ("MORENA", "PT", "PVEM"),
+        "FUERZA Y CORAZON POR MEXICO": ("PAN", "PRI", "PRD"),
+    },
+}
+
+# Columnas de coalición con nombre (no siglas) y su reparto histórico
+_COLUMNAS_CON_NOMBRE = {
+    "POR_MEXICO_AL_FRENTE": ["PAN", "PRD", "MC"],
+    "JUNTOS_HAREMOS_HISTORIA": ["MORENA", "PT"],
+}
+
+
+def parties_for(year: int) -> List[str]:
+    if year == 2018:
+        return PARTIDOS_2018
+    if year == 2021:
+        return PARTIDOS_2021
+    if year == 2024:
+        return PARTIDOS_2024
+    # fallback: universo completo sin duplicados
+    return [p for p in ALL_PARTIES if p != "CI"]
+
+
+def norm_ascii_up(s: str) -> str:
+    if s is None: return ""
+    s = str(s).strip().upper()
+    s = unicodedata.normalize("NFKD", s).encode("ASCII", "ignore").decode("ASCII")
+    s = re.sub(r"\s+", " ", s)
+    return s
+
+
+@lru_cache(maxsize=4096)
+def split_tokens(col: str) -> Tuple[str, ...]:
+    """Siglas de un nombre de columna ('PAN_PRI-PRD' -> ('PAN', 'PRI', 'PRD')), en orden."""
+    if not col:
+        return ()
+    return tuple(t.strip() for t in re.split(r"[-_]", str(col).upper()) if t.strip())
+
+
+def partidos_de_col(col: str) -> List[str]:
+    """Partidos de una columna (individual o coalición); respeta los repartos históricos con nombre."""
+    if col in _COLUMNAS_CON_NOMBRE:
+        return list(_COLUMNAS_CON_NOMBRE[col])
+    return col.split("_")
+
+
+@lru_cache(maxsize=1024)
+def canonizar_siglado(x: str) -> str:
+    """Canonización de siglado - idéntica al R"""
+    y = norm_ascii_up(x)
+    y = re.sub(r"\bGRUPO PARLAMENTARIO\b|\bGP\b|\bPARTIDO\b", "", y)
+    y = re.sub(r"\s+", " ", y).strip()
+    y = re.sub(r"\bMOVIMIENTO CIUDADANO\b|\bMC\b", "MC", y)
+    y = re.sub(r"\bVERDE\b|PARTIDO VERDE|\bPVEM\b|\bP V E M\b", "PVEM", y)
+    y = re.sub(r"ENCUENTRO SOCIAL|ENCUENTRO SOLIDARIO|\bPES\b", "PES", y)
+    y = re.sub(r"FUERZA POR MEXICO|\bFXM\b", "FXM", y)
+    y = re.sub(r"\bMORENA\b", "MORENA", y)
+    y = re.sub(r"PARTIDO DEL TRABAJO|\bPT\b", "PT", y)
+    y = re.sub(r"PARTIDO ACCION NACIONAL|\bPAN\b", "PAN", y)
+    y = re.sub(r"PARTIDO REVOLUCIONARIO INSTITUCIONAL|\bPRI\b", "PRI", y)
+    y = re.sub(r"PARTIDO DE LA REVOLUCION DEMOCRATICA|\bPRD\b", "PRD", y)
+    y = re.sub(r"NUEVA ALIANZA|\bNA\b|\bPANAL\b", "NA", y)
+    return y
+
+
+@dataclass(frozen=True, eq=False)
+class RegistroPartidos:
+    """Partidos del año (más CI al final) con índice fijo y coaliciones como máscaras."""
+    anio: int
+    partidos: Tuple[str, ...]
+    coaliciones: Dict[str, int]
+    _indice: Dict[str, int] = field(default_factory=dict, repr=False)
+    _por_mascara: Dict[int, str] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        self._indice.update({p: i for i, p in enumerate(self.partidos)})
+        self._por_mascara.update({m: nombre for nombre, m in self.coaliciones.items()})
+
+    @property
+    def bit_ci(self) -> int:
+        return self.bit("CI")
+
+    def indice(self, partido: str) -> int:
+        """Índice del partido o -1 si no es del año."""
+        return self._indice.get(partido, -1)
+
+    def bit(self, partido: str) -> int:
+        i = self._indice.get(partido)
+        return 0 if i is None else 1 << i
+
+    def mascara(self, tokens: Iterable[str]) -> int:
+        """OR de los bits de tokens; 0 si alguno no es partido del año (candidatura inválida)."""
+        m = 0
+        for t in tokens:
+            b = self.bit(t)
+            if not b:
+                return 0
+            m |= b
+        return m
+
+    def mascara_columna(self, col: str) -> int:
+        return _mascara_columna(self.anio, col)
+
+    def tokens(self, mascara: int) -> List[str]:
+        """Partidos de la máscara, en orden del registro."""
+        return [p for i, p in enumerate(self.partidos) if mascara >> i & 1]
+
+    def pertenece(self, mascara: int, partido: str) -> bool:
+        return bool(mascara & self.bit(partido))
+
+    def es_coalicion(self, mascara: int) -> bool:
+        """Dos o más partidos y sin CI."""
+        return bin(mascara).count("1") >= 2 and not mascara & self.bit_ci
+
+    def coalicion(self, mascara: int, individuales: bool = True) -> Optional[str]:
+        """Coalición oficial con esos miembros o, si individuales, el partido solo; None si no aplica."""
+        nombre = self._por_mascara.get(mascara)
+        if nombre is not None:
+            return nombre
+        if individuales and mascara and not mascara & (mascara - 1):
+            return self.partidos[mascara.bit_length() - 1]
+        return None
+
+    def miembros(self, nombre: str) -> List[str]:
+        """Partidos de una coalición en su orden oficial ([nombre] si es partido del año, [] si no existe)."""
+        if nombre in self.coaliciones:
+            return list(COALICIONES[self.anio][nombre])
+        return [nombre] if self.bit(nombre) else []
+
+    def mascara_coalicion(self, nombre: str) -> int:
+        """Máscara de una coalición por nombre (o de un partido solo); 0 si no existe."""
+        return self.coaliciones.get(nombre) or self.bit(nombre)
+
+
+@lru_cache(maxsize=None)
+def registro_partidos(anio: int) -> RegistroPartidos:
+    """Registro (compartido, inmutable) del año."""
+    partidos = tuple(parties_for(anio)) + ("CI",)
+    pos = {p: i for i, p in enumerate(partidos)}
+    coaliciones = {
+        nombre: sum(1 << pos[p] for p in miembros)
+        for nombre, miembros in COALICIONES.get(anio, {}).items()
+        if all(p in pos for p in miembros)
+    }
+    return RegistroPartidos(anio=anio, partidos=partidos, coaliciones=coaliciones)
+
+
+@lru_cache(maxsize=4096)
+def _mascara_columna(anio: int, col: str) -> int:
+    return registro_partidos(anio).mascara(split_tokens(col))
+
+
+def coalicion_de_tokens(tokens: Iterable[str], anio: int, individuales: bool = True) -> Optional[str]:
+    """Coalición oficial del año para esos partidos (o el partido solo si individuales)."""
+    reg = registro_partidos(anio)
+    return reg.coalicion(reg.mascara(tokens), individuales=individuales)
+
+
+def tokens_de_coalicion(coalicion: str, anio: int) -> List[str]:
+    """Descompone coalición en partidos (orden oficial); [] si no existe en el año."""
+    return registro_partidos(anio).miembros(coalicion)
@@ -16,23 +16,22 @@ import pandas as pd
 import os
 import re
 import unicodedata
-import logging
 from typing import Dict, List, Optional, Tuple
 from .recomposicion import recompose_coalitions, parties_for, _load_siglado_dip
 from .scale_siglado import scale_siglado
 from .core import apply_overrep_cap
 from .core import DipParams
 from .core import largest_remainder, divisor_apportionment
+from . import dataset_store
+from .dataset_store import obtener_boletas
+from .ajuste_incremental import registrar_asignacion
+from .registro import obtener_registro, nivel
+from .siglado_indice import obtener_indice
+from .tensor_electoral import ElectionTensor
+from .partidos import canonizar_siglado, coalicion_de_tokens, partidos_de_col  # noqa: F401
 
-# Configurar logger del módulo
-logger = logging.getLogger(__name__)
-if not logger.handlers:
-    # handler por defecto que no doble el logging si ya está configurado por el consumidor
-    ch = logging.StreamHandler()
-    formatter = logging.Formatter('[%(levelname)s] %(message)s')
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
-    logger.setLevel(logging.INFO)
+# Logger del módulo (nivel/formato vía LOG_LEVEL/LOG_FORMAT, ver engine/registro.py)
+log = obtener_registro(__name__)
 
 # Mapeo global de nombres completos de estados a abreviaciones
 NOMBRE_ESTADO_A_ABREV = {
@@ -60,25 +59,13 @@ def _convertir_estados_a_abrev(dict_estados: Dict) -> Dict:
     return dict_abrev
 
 # Helper para logging que respeta el flag print_debug
-def _maybe_log(msg: str, level: str = 'debug', print_debug: bool = False):
-    """Registra msg usando logger; si print_debug=True registra todo (debug/info/warn/error),
-    si False registra solo warnings y errors.
+def _maybe_log(msg, level: str = 'debug', print_debug: bool = False):
+    """Registra msg (str o callable perezoso); si print_debug=True registra todo
+    (debug/info/warn/error), si False solo warnings y errors.
     """
-    lvl = level.lower()
-    if print_debug:
-        if lvl in ('warn', 'warning'):
-            logger.warning(msg)
-        elif lvl == 'error':
-            logger.error(msg)
-        elif lvl == 'info':
-            logger.info(msg)
-        else:
-            logger.debug(msg)
-    else:
-        if lvl in ('warn', 'warning'):
-            logger.warning(msg)
-        elif lvl == 'error':
-            logger.error(msg)
+    lvl = nivel(level)
+    if print_debug or lvl >= nivel('warning'):
+        log.log(lvl, msg)
 
 # ====================== UTILIDADES ======================
 
@@ -108,39 +95,14 @@ def normalize_entidad_ascii(x: str) -> str:
 
 def extraer_coaliciones_de_siglado(siglado_path: str, anio: int) -> Dict[str, List[str]]:
     """
-    Extrae coaliciones del archivo siglado
+    Extrae coaliciones del archivo siglado (vía el índice compilado)
     """
-    coaliciones = {}
-    
     try:
-        siglado = pd.read_csv(siglado_path)
-        logger.debug(f"Extrayendo coaliciones del siglado: {siglado_path}")
-
-        # Verificar estructura del archivo
-        if 'coalicion' not in siglado.columns or 'grupo_parlamentario' not in siglado.columns:
-            logger.debug(f"Archivo siglado no tiene estructura esperada: {siglado.columns.tolist()}")
-            return {}
-
-        # Renombrar columnas para estandarizar
-        siglado = siglado.rename(columns={'coalicion': 'COALICION', 'grupo_parlamentario': 'PARTIDO_ORIGEN'})
-
-        # Agrupar por coalición y obtener partidos únicos
-        for coalicion_name in siglado['COALICION'].unique():
-            if pd.isna(coalicion_name) or coalicion_name.strip() == '':
-                continue
-
-            partidos_en_coalicion = siglado[siglado['COALICION'] == coalicion_name]['PARTIDO_ORIGEN'].unique()
-            partidos_limpios = [p for p in partidos_en_coalicion if pd.notna(p) and p.strip() != '']
-
-            if len(partidos_limpios) > 1:  # Solo considerar verdaderas coaliciones (más de 1 partido)
-                # Normalizar nombre de coalición para que coincida con las columnas del dataset
-                nombre_normalizado = coalicion_name.upper().replace(' ', '_')
-                coaliciones[nombre_normalizado] = sorted(partidos_limpios)
-
-        logger.debug(f"Coaliciones detectadas: {coaliciones}")
+        coaliciones = obtener_indice(siglado_path).coaliciones_con_partidos()
+        log.debug("Coaliciones detectadas: %s", coaliciones)
         return coaliciones
     except Exception as e:
-        logger.error(f"Error leyendo siglado {siglado_path}: {e}")
+        log.error("Error leyendo siglado %s: %s", siglado_path, e)
         return {}
 
 def agregar_columnas_coalicion(df, coaliciones):
@@ -159,43 +121,16 @@ def agregar_columnas_coalicion(df, coaliciones):
         if len(partidos_disponibles) >= 2:  # Solo crear coalición si hay al menos 2 partidos
             # Sumar votos de los partidos de la coalición
             df_modificado[col_name] = df_modificado[partidos_disponibles].sum(axis=1)
-            logger.debug(f"Coalición creada: {col_name} = {partidos_disponibles} ({df_modificado[col_name].sum():,} votos)")
+            log.debug(lambda: f"Coalición creada: {col_name} = {partidos_disponibles} ({df_modificado[col_name].sum():,} votos)")
     
     return df_modificado
 
-def canonizar_siglado(x: str) -> str:
-    """Canonización de siglado - idéntica al R"""
-    y = norm_ascii_up(x)
-    y = re.sub(r"\bGRUPO PARLAMENTARIO\b|\bGP\b|\bPARTIDO\b", "", y)
-    y = re.sub(r"\s+", " ", y).strip()
-    y = re.sub(r"\bMOVIMIENTO CIUDADANO\b|\bMC\b", "MC", y)
-    y = re.sub(r"\bVERDE\b|PARTIDO VERDE|\bPVEM\b|\bP V E M\b", "PVEM", y)
-    y = re.sub(r"ENCUENTRO SOCIAL|ENCUENTRO SOLIDARIO|\bPES\b", "PES", y)
-    y = re.sub(r"FUERZA POR MEXICO|\bFXM\b", "FXM", y)
-    y = re.sub(r"\bMORENA\b", "MORENA", y)
-    y = re.sub(r"PARTIDO DEL TRABAJO|\bPT\b", "PT", y)
-    y = re.sub(r"PARTIDO ACCION NACIONAL|\bPAN\b", "PAN", y)
-    y = re.sub(r"PARTIDO REVOLUCIONARIO INSTITUCIONAL|\bPRI\b", "PRI", y)
-    y = re.sub(r"PARTIDO DE LA REVOLUCION DEMOCRATICA|\bPRD\b", "PRD", y)
-    y = re.sub(r"NUEVA ALIANZA|\bNA\b|\bPANAL\b", "NA", y)
-    return y
-
-def coalicion_de_tokens(tokens: List[str], anio: int) -> Optional[str]:
-    """Determina coalición a partir de tokens - idéntica al R"""
-    S = sorted(set(tokens))
-    if anio == 2018:
-        if set(S) == {"MORENA","PT","PES"}: 
-            return "JUNTOS HAREMOS HISTORIA"
-        if set(S) == {"PAN","PRD","MC"}:    
-            return "POR MEXICO AL FRENTE"
-        if set(S) == {"PRI","PVEM","NA"}:   
-            return "TODOS POR MEXICO"
-    elif anio == 2024:
-        if set(S) == {"MORENA","PT","PVEM"}: 
-            return "SIGAMOS HACIENDO HISTORIA"
-        if set(S) == {"PAN","PRI","PRD"}:    
-            return "FUERZA Y CORAZON POR MEXICO"
-    return None
+def _construir_siglado_map_dip(siglado_path: str) -> Dict[Tuple[str, int], Dict]:
+    """
+    Mapa (entidad, distrito) -> {'nominadores_set', 'ppn_gp'} desde el índice del siglado.
+    Se indexa tanto por la entidad ASCII como por la entidad normalizada.
+    """
+    return obtener_indice(siglado_path).por_distrito()
 
 def cols_candidaturas_anio_con_coaliciones(df, anio: int) -> List[str]:
     """
@@ -218,21 +153,6 @@ def cols_candidaturas_anio_con_coaliciones(df, anio: int) -> List[str]:
     
     return candidaturas
 
-def partidos_de_col(col: str) -> List[str]:
-    """
-    Extrae partidos de un nombre de columna (individual o coalición)
-    """
-    # Casos especiales para coaliciones conocidas
-    if col == "POR_MEXICO_AL_FRENTE":
-        return ["PAN", "PRD", "MC"]
-    elif col == "JUNTOS_HAREMOS_HISTORIA":
-        return ["MORENA", "PT"]
-    elif col in ["PAN", "PRI", "PRD", "PVEM", "PT", "MC", "MORENA", "PES", "NA", "CI", "FXM", "RSP"]:
-        return [col]
-    else:
-        # Fallback: dividir por guión bajo
-        return col.split("_")
-
 # ====================== ALGORITMO LR CON DESEMPATES MEJORADO ======================
 
 def asignar_rp_con_metodo(votos: np.ndarray, escanos: int, quota_method: Optional[str] = None, 
@@ -244,7 +164,7 @@ def asignar_rp_con_metodo(votos: np.ndarray, escanos: int, quota_method: Optiona
         votos: Array de votos por partido
         escanos: Número de escaños a asignar
         quota_method: Método de cuota ("hare", "droop", None)
-        divisor_method: Método divisor ("dhondt", "saintelague", None)
+        divisor_method: Método divisor ("dhondt", "saintelague", "adams", "huntington_hill", None)
         seed: Semilla para randomización en empates
     
     Returns:
@@ -277,7 +197,7 @@ def asignar_rp_con_metodo(votos: np.ndarray, escanos: int, quota_method: Optiona
         if method_normalized == "webster":
             method_normalized = "saintelague"
         
-        if method_normalized in ["dhondt", "saintelague"]:
+        if method_normalized in ["dhondt", "saintelague", "adams", "huntingtonhill"]:
             # Usar el nombre normalizado que acepta core.py
             _maybe_log(f"Usando método divisor: {method_normalized}", 'debug')
             return divisor_apportionment(votos, escanos, method_normalized)
@@ -302,13 +222,15 @@ def LR_ties(v_abs: np.ndarray, n: int, q: Optional[float] = None, seed: Optional
     - v_abs: votos absolutos por partido
     - n: número total de escaños a distribuir
     - q: cuota (si None, se calcula como sum(v_abs)/n)
-    - seed: semilla para desempates aleatorios
+    - seed: semilla para desempates aleatorios (generador propio por llamada,
+      no toca el estado global de numpy; sin semilla usa el generador global)
     
     Retorna:
     - Array de escaños asignados por partido
     """
-    v_abs = np.nan_to_num(v_abs.astype(float))
-    v_abs[~np.isfinite(v_abs)] = 0.0
+    v_abs = v_abs.astype(float)
+    if not np.isfinite(v_abs).all():
+        v_abs = np.nan_to_num(v_abs)
     
     if not np.isfinite(q) if q is not None else False:
         q = None
@@ -322,66 +244,119 @@ def LR_ties(v_abs: np.ndarray, n: int, q: Optional[float] = None, seed: Optional
     t = np.floor(v_abs / q).astype(int)
     u = int(n - np.sum(t))
     
-    if u <= 0:
+    if u <= 0 or len(v_abs) == 0:
         return t
     
-    # Calcular residuos
+    # Residuos; bloques de residuo igual (tolerancia 1e-12) en orden descendente
     rem = v_abs % q
-    
-    # Ordenamiento base por residuo descendente
     base_ord = np.argsort(-rem)
-    
-    if seed is not None:
-        np.random.seed(seed)
-    
-    # Construir ranking final con desempates
-    rank = np.zeros(len(v_abs), dtype=int)
-    i = 0
-    
-    while i < len(base_ord):
-        # Encontrar bloque de partidos con mismo residuo
-        j = i
-        while j < len(base_ord) and abs(rem[base_ord[j]] - rem[base_ord[i]]) < 1e-12:
-            j += 1
+    r = rem[base_ord]
+    salto = np.empty(len(r), dtype=bool)
+    salto[0] = True
+    np.greater_equal(r[:-1] - r[1:], 1e-12, out=salto[1:])
+    bloque = np.empty(len(r), dtype=np.int64)
+    bloque[base_ord] = np.cumsum(salto)
+
+    # Ranking: bloque de residuo, votos desc; lexsort es estable (índice al final)
+    orden = np.lexsort((-v_abs, bloque))
+
+    # Empates exactos de residuo y votos: desempate aleatorio reproducible
+    v_ord = v_abs[orden]
+    empate = np.abs(v_ord[1:] - v_ord[:-1]) < 1e-12
+    if empate.any():
+        b_ord = bloque[orden]
+        empate &= b_ord[1:] == b_ord[:-1]
+        if empate.any():
+            rng = np.random.RandomState(seed) if seed is not None else np.random
+            _desempatar_bloques(orden, base_ord, b_ord, v_abs, empate, rng)
+
+    # Asignar escaños restantes
+    t[orden[:u]] += 1
+    return t
+
+
+def _desempatar_bloques(orden: np.ndarray, base_ord: np.ndarray, b_ord: np.ndarray,
+                        v_abs: np.ndarray, empate: np.ndarray,
+                        rng) -> None:
+    """
+    Resuelve in-place los empates de `orden` (LR_ties). Cada bloque de residuo
+    con empates se reordena como en la versión original (argsort por votos,
+    permutación de los empatados y reemplazo secuencial) para que una semilla
+    dada produzca el mismo reparto que antes. `rng` es un RandomState o el
+    módulo np.random (generador global).
+    """
+    limites = np.flatnonzero(np.r_[True, b_ord[1:] != b_ord[:-1], True])
+    for a, b in zip(limites[:-1], limites[1:]):
+        if not empate[a:b - 1].any():
+            continue
+        idx_bloque = base_ord[a:b]
+        v_bloque = v_abs[idx_bloque]
+        seq = idx_bloque[np.argsort(-v_bloque)].tolist()
+        v_seq = v_abs[seq]
+        # grupos de votos empatados (respecto al primero del grupo)
+        empates = []
+        k = 0
+        while k < len(seq):
+            l = k + 1
+            while l < len(seq) and abs(v_seq[l] - v_seq[k]) < 1e-12:
+                l += 1
+            if l - k > 1:
+                empates.extend(seq[k:l])
+            k = l
+        for orig, nuevo in zip(empates, rng.permutation(empates).tolist()):
+            seq[seq.index(orig)] = nuevo
+        orden[a:b] = seq
+
+# ====================== APLICACIÓN DE TOPES NACIONALES ======================
+
+def _reinyectar_sobrantes(v_nacional: np.ndarray, capped: np.ndarray, s_rp: np.ndarray,
+                          s_tot: np.ndarray, lim_max: np.ndarray, sobrantes: int) -> int:
+    """
+    Reinyección de RP sobrantes (PASO 2 de aplicar_topes_nacionales), in-place.
+
+    Cada escaño va al partido no capado con mayor residuo v % (V/s), con s los
+    sobrantes pendientes y V los votos de no capados; el partido que llega a
+    su tope queda capado. Entre dos partidos que se topan V no cambia, así que
+    los residuos de todos esos pasos se calculan en bloque: a lo más N+1
+    bloques en lugar de un recorrido por escaño. Devuelve los sobrantes que no
+    se pudieron asignar.
+    """
+    N = len(v_nacional)
+    while sobrantes > 0:
+        v_eff = v_nacional.copy()
+        v_eff[capped] = 0.0
+        total = np.sum(v_eff)
+        elegibles = ~capped & (v_eff > 0)
+        if total <= 0 or not elegibles.any():
+            # No hay a quién reasignar sin romper topes
+            break
         
-        idx_bloque = base_ord[i:j]
+        pasos = np.arange(sobrantes, 0, -1)
+        residuos = v_eff[None, :] % (total / pasos)[:, None]
+        residuos[:, ~elegibles] = -np.inf
+        elegido = np.argmax(residuos, axis=1)  # primer índice en empates
         
-        if len(idx_bloque) > 1:
-            # Desempate por votación absoluta
-            v_bloque = v_abs[idx_bloque]
-            ord_votos = np.argsort(-v_bloque)
-            
-            # Identificar empates en votación
-            empates = []
-            k = 0
-            while k < len(ord_votos):
-                l = k
-                while l < len(ord_votos) and abs(v_bloque[ord_votos[l]] - v_bloque[ord_votos[k]]) < 1e-12:
-                    l += 1
-                if l - k > 1:  # Hay empate
-                    empates.extend(idx_bloque[ord_votos[k:l]])
-                k = l
-            
-            # Resolver empates aleatoriamente
-            if empates:
-                perm_empates = np.random.permutation(empates)
-                for orig, nuevo in zip(empates, perm_empates):
-                    pos_orig = np.where(idx_bloque[ord_votos] == orig)[0][0]
-                    idx_bloque[ord_votos[pos_orig]] = nuevo
-            
-            idx_bloque = idx_bloque[ord_votos]
+        # primer paso en que el elegido alcanza su tope
+        holgura = lim_max - s_tot
+        conteo = np.cumsum(elegido[:, None] == np.arange(N)[None, :], axis=0)
+        llega = conteo[np.arange(len(elegido)), elegido] >= holgura[elegido]
+        t = int(np.argmax(llega)) if llega.any() else len(elegido)
         
-        rank[i:j] = idx_bloque
-        i = j
-    
-    # Asignar escaños restantes
-    add = np.zeros_like(v_abs, dtype=int)
-    for i in range(min(u, len(rank))):
-        add[rank[i]] += 1
-    
-    return t + add
+        asignados = np.bincount(elegido[:t], minlength=N)
+        s_rp += asignados
+        s_tot += asignados
+        sobrantes -= t
+        if t < len(elegido):
+            p = elegido[t]
+            if asignados[p] < holgura[p]:
+                # Recibe el escaño y queda justo en el tope
+                s_rp[p] += 1
+                s_tot[p] += 1
+                sobrantes -= 1
+            capped[p] = True
+    return sobrantes
+
 
-# ====================== APLICACIÓN DE TOPES NACIONALES ======================
 
 def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.ndarray, 
                            S: int, max_pp: Optional[float] = 0.08, max_seats: int = 300, 
@@ -391,7 +366,7 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
                            partidos_nombres: Optional[List[str]] = None,
                            mr_son_manuales: bool = False) -> Dict[str, np.ndarray]:
     """
-    Aplica topes constitucionales de forma iterativa con bloqueo de partidos capados
+    Aplica topes constitucionales con bloqueo de partidos capados
     
     Parámetros:
     - s_mr: escaños de MR por partido
@@ -408,14 +383,8 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
     Retorna:
     - Dict con 's_rp' (RP ajustado) y 's_tot' (total ajustado)
     """
-    # DEBUG: activar diagnóstico automático si recibimos la lista de partidos
-    # y contiene 'MORENA' (útil para pruebas locales). Mantener False por defecto.
-    debug_morena = False  # Desactivar debug en producción
-    try:
-        if partidos_nombres and any(str(n).upper() == 'MORENA' for n in partidos_nombres):
-            debug_morena = True
-    except Exception:
-        pass
+    # Diagnóstico detallado solo con LOG_LEVEL=debug o traza por request
+    debug_morena = log.activo()
     
     N = len(s_mr)
     s_mr = s_mr.astype(int)
@@ -444,12 +413,12 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
         for idx in range(N):
             if v_nacional[idx] > 0.25:  # Partidos con >25% votación
                 nombre = partidos_nombres[idx] if partidos_nombres else f"partido_{idx}"
-                print(f"\n[DEBUG CAP CALCULATION - {nombre} (idx={idx})]")
-                print(f"  v_nacional: {v_nacional[idx]:.6f}")
-                print(f"  v_nacional + max_pp: {v_nacional[idx] + max_pp:.6f}")
-                print(f"  (v_nacional + max_pp) * S: {(v_nacional[idx] + max_pp) * S:.2f}")
-                print(f"  cap_dist (floor): {cap_dist[idx]}")
-                print(f"  Expected cap for 42.49%: {np.floor((0.4249 + 0.08) * S)}")
+                log.debug("[CAP CALCULATION - %s (idx=%s)]", nombre, idx)
+                log.debug("v_nacional: %.6f", v_nacional[idx])
+                log.debug(lambda: f"v_nacional + max_pp: {v_nacional[idx] + max_pp:.6f}")
+                log.debug(lambda: f"(v_nacional + max_pp) * S: {(v_nacional[idx] + max_pp) * S:.2f}")
+                log.debug("cap_dist (floor): %s", cap_dist[idx])
+                log.debug(lambda: f"Expected cap for 42.49%: {np.floor((0.4249 + 0.08) * S)}")
     
     # Determinar tope absoluto a aplicar
     # IMPORTANTE: Si max_seats_per_party es None, NO aplicar tope absoluto
@@ -487,12 +456,12 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
         for idx in range(N):
             nombre = partidos_nombres[idx] if partidos_nombres else f"partido_{idx}"
             if s_tot[idx] > cap_dist[idx]:
-                print(f"\n[DEBUG PASO 1 INICIO - {nombre} (idx={idx})]")
-                print(f"  cap_dist (tope +8%): {cap_dist[idx]}")
-                print(f"  lim_max (límite efectivo): {lim_max[idx]}")
-                print(f"  s_mr (MR inicial): {s_mr[idx]}")
-                print(f"  s_rp (RP inicial): {s_rp[idx]}")
-                print(f"  s_tot (total inicial): {s_tot[idx]}")
+                log.debug("[PASO 1 INICIO - %s (idx=%s)]", nombre, idx)
+                log.debug("cap_dist (tope +8%%): %s", cap_dist[idx])
+                log.debug("lim_max (límite efectivo): %s", lim_max[idx])
+                log.debug("s_mr (MR inicial): %s", s_mr[idx])
+                log.debug("s_rp (RP inicial): %s", s_rp[idx])
+                log.debug("s_tot (total inicial): %s", s_tot[idx])
     
     for p in range(N):
         cap_eff = lim_max[p]
@@ -514,7 +483,7 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
                     
                 if debug_morena:
                     nombre = partidos_nombres[p] if partidos_nombres else f"partido_{p}"
-                    print(f"[DEBUG MR MANUALES - {nombre}] Recorte: -RP={cut_rp}, MR preservados={s_mr[p]}, Total={s_tot[p]}")
+                    log.debug("[MR MANUALES - %s] Recorte: -RP=%s, MR preservados=%s, Total=%s", nombre, cut_rp, s_mr[p], s_tot[p])
             else:
                 # MR calculados: aplicar tope normal (primero RP, luego MR si excede)
                 excess = s_tot[p] - cap_eff
@@ -542,14 +511,14 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
             # DEBUG: Imprimir info después del recorte
             if debug_morena:
                 nombre = partidos_nombres[p] if partidos_nombres else f"partido_{p}"
-                print(f"\n[DEBUG PASO 1 DESPUÉS RECORTE - {nombre} (idx={p})]")
-                print(f"  cut_rp: {cut_rp}")
-                print(f"  cut_mr: {cut_mr}")
-                print(f"  s_mr después: {s_mr[p]}")
-                print(f"  s_rp después: {s_rp[p]}")
-                print(f"  s_tot después: {s_tot[p]}")
-                print(f"  capped: {capped[p]}")
-                print(f"  sobrantes totales: {sobrantes}")
+                log.debug("[PASO 1 DESPUÉS RECORTE - %s (idx=%s)]", nombre, p)
+                log.debug("cut_rp: %s", cut_rp)
+                log.debug("cut_mr: %s", cut_mr)
+                log.debug("s_mr después: %s", s_mr[p])
+                log.debug("s_rp después: %s", s_rp[p])
+                log.debug("s_tot después: %s", s_tot[p])
+                log.debug("capped: %s", capped[p])
+                log.debug("sobrantes totales: %s", sobrantes)
     
     # Partidos <3% también se bloquean (no pueden recibir RP)
     capped[~ok] = True
@@ -559,89 +528,26 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
         for idx in range(N):
             if capped[idx]:
                 nombre = partidos_nombres[idx] if partidos_nombres else f"partido_{idx}"
-                print(f"\n[DEBUG ANTES PASO 2 - {nombre} (idx={idx}) BLOQUEADO]")
-                print(f"  s_tot: {s_tot[idx]}")
-                print(f"  lim_max: {lim_max[idx]}")
-        print(f"\n[DEBUG ANTES PASO 2]")
-        print(f"  sobrantes para redistribuir: {sobrantes}")
+                log.debug("[ANTES PASO 2 - %s (idx=%s) BLOQUEADO]", nombre, idx)
+                log.debug("s_tot: %s", s_tot[idx])
+                log.debug("lim_max: %s", lim_max[idx])
+        log.debug("[ANTES PASO 2]")
+        log.debug("sobrantes para redistribuir: %s", sobrantes)
     
-    # PASO 2: Reinyección iterativa SIN romper topes
+    # PASO 2: Reinyección SIN romper topes
     # Los RP sobrantes se redistribuyen a partidos NO capados
-    while sobrantes > 0:
-        # Votos efectivos solo de partidos no capados y elegibles
-        v_eff = v_nacional.copy()
-        v_eff[capped] = 0.0
-        
-        if np.sum(v_eff) <= 0:
-            # No hay a quién reasignar sin romper topes
-            break
-        
-        # Usar fórmula de residuos (largest remainder)
-        # q es la cuota para distribuir los sobrantes
-        q = np.sum(v_eff) / sobrantes if sobrantes > 0 else 0.0
-        if q <= 0:
-            break
-        
-        # Calcular residuos para cada partido no capado
-        residuos = v_eff % q
-        
-        # Encontrar el partido con mayor residuo entre no capados
-        cand_idx = -1
-        max_residuo = -np.inf
-        for p in range(N):
-            if not capped[p] and v_eff[p] > 0:
-                if residuos[p] > max_residuo:
-                    max_residuo = residuos[p]
-                    cand_idx = p
-        
-        if cand_idx == -1:
-            # No encontramos candidato válido
-            break
-        
-        # Intentar asignar 1 RP al candidato
-        cap_eff = lim_max[cand_idx]
-        
-        if s_tot[cand_idx] >= cap_eff:
-            # Ya está en el tope - bloquear y continuar
-            capped[cand_idx] = True
-            continue
-        
-        # Asignar el escaño
-        s_rp[cand_idx] += 1
-        s_tot[cand_idx] += 1
-        sobrantes -= 1
-        
-        # DEBUG: Si se asigna a cualquier partido
-        if debug_morena:
-            nombre = partidos_nombres[cand_idx] if partidos_nombres else f"partido_{cand_idx}"
-            if s_tot[cand_idx] > lim_max[cand_idx] * 0.95:  # Solo imprimir si está cerca del tope
-                print(f"\n[DEBUG PASO 2 - ASIGNACIÓN A {nombre} (idx={cand_idx})]")
-                print(f"  Sobrantes restantes: {sobrantes}")
-                print(f"  s_tot ahora: {s_tot[cand_idx]}")
-                print(f"  s_rp ahora: {s_rp[cand_idx]}")
-                print(f"  lim_max: {lim_max[cand_idx]}")
-        
-        # Si llegó al tope exacto, bloquear para futuras asignaciones
-        if s_tot[cand_idx] >= cap_eff:
-            capped[cand_idx] = True
+    sobrantes = _reinyectar_sobrantes(v_nacional, capped, s_rp, s_tot, lim_max, sobrantes)
     
-    # PASO 3: Si quedan sobrantes y no pudimos reasignarlos, redistribuir proporcionalmente
-    # entre todos los no capados usando LR estándar
-    if sobrantes > 0:
-        v_eff = v_nacional.copy()
-        v_eff[capped] = 0.0
-        
-        if np.sum(v_eff) > 0:
-            add = LR_ties(v_eff, n=sobrantes)
-            for p in range(N):
-                if not capped[p] and add[p] > 0:
-                    # Verificar que no rompa el tope
-                    margen = lim_max[p] - s_tot[p]
-                    asignar = min(add[p], margen)
-                    s_rp[p] += asignar
-                    s_tot[p] += asignar
-    
-    # PASO 4: Ajuste final para cumplir exactamente S escaños (sin romper topes)
+    if debug_morena:
+        log.debug("[DESPUÉS PASO 2]")
+        log.debug(lambda: f"s_tot: {s_tot.tolist()}")
+        log.debug("sobrantes sin asignar: %s", sobrantes)
+    
+    # PASO 2 solo deja sobrantes cuando ningún partido no capado tiene votos,
+    # así que no hay reparto proporcional posible de lo que queda.
+    
+    # PASO 3: Ajuste final para cumplir exactamente S escaños (sin romper topes);
+    # cubre un s_rp inicial que no suma S - MR y los sobrantes sin destino
     delta = int(S - np.sum(s_tot))
     
     if delta != 0:
@@ -674,7 +580,7 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
                         s_rp[p] -= 1
                         s_tot[p] -= 1
     
-    # PASO 5: Validación final estricta
+    # PASO 4: Validación final estricta
     # Asegurar que partidos <3% no reciben RP
     s_rp[~ok] = 0
     
@@ -699,19 +605,19 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
     
     # DEBUG: Estado final - todos los partidos capados
     if debug_morena:
-        print(f"\n[DEBUG FINAL - PARTIDOS CAPADOS]")
+        log.debug("[FINAL - PARTIDOS CAPADOS]")
         for idx in range(N):
             if s_tot[idx] >= lim_max[idx] * 0.95:  # Cerca del tope o sobre él
                 nombre = partidos_nombres[idx] if partidos_nombres else f"partido_{idx}"
                 excede = s_tot[idx] > lim_max[idx]
-                print(f"\n  {nombre} (idx={idx}):")
-                print(f"    s_mr: {s_mr[idx]}")
-                print(f"    s_rp: {s_rp[idx]}")
-                print(f"    s_tot: {s_tot[idx]}")
-                print(f"    lim_max (cap +8%): {lim_max[idx]}")
-                print(f"    EXCEDE TOPE: {excede}")
+                log.debug("%s (idx=%s):", nombre, idx)
+                log.debug("s_mr: %s", s_mr[idx])
+                log.debug("s_rp: %s", s_rp[idx])
+                log.debug("s_tot: %s", s_tot[idx])
+                log.debug("lim_max (cap +8%%): %s", lim_max[idx])
+                log.debug("EXCEDE TOPE: %s", excede)
                 if excede:
-                    print(f"    EXCESO: {s_tot[idx] - lim_max[idx]} escaños")
+                    log.debug(lambda: f"EXCESO: {s_tot[idx] - lim_max[idx]} escaños")
     
     return {
         's_rp': s_rp.astype(int),
@@ -720,52 +626,33 @@ def aplicar_topes_nacionales(s_mr: np.ndarray, s_rp: np.ndarray, v_nacional: np.
 
 
 # --------------------- Export scenarios helper ---------------------
-def _simulate_pm_by_runnerup(recomposed_df: pd.DataFrame, pm_seats: int, partidos: list) -> dict:
+def _simulate_pm_by_runnerup(tensor: ElectionTensor, pm_seats: int, partidos: list,
+                             return_segundos: bool = False):
     """Simula asignación PM repartiendo a los partidos que fueron segundos por distrito.
 
-    Devuelve un dict partido->escaños PM distribuyendo pm_seats proporcionalmente a las apariciones como segundo.
+    Los segundos lugares salen del tensor de votos (`ElectionTensor.segundos`).
+
+    Devuelve un dict partido->escaños PM: pm_seats por resto mayor (Hare) sobre
+    las apariciones como segundo; empates de residuo por más segundos lugares y
+    luego por orden en `partidos`. Con return_segundos=True devuelve además el
+    vector de segundos lugares por distrito (índices en `partidos`).
     """
-    from collections import Counter
-    segundos = []
-    for _, row in recomposed_df.iterrows():
-        votos = [(p, float(row.get(p, 0) or 0.0)) for p in partidos]
-        votos_sorted = sorted(votos, key=lambda x: -x[1])
-        if len(votos_sorted) >= 2:
-            segundos.append(votos_sorted[1][0])
-
-    c = Counter(segundos)
-    pm_dict = {p: 0 for p in partidos}
-    
-    # Distribuir pm_seats proporcionalmente a las apariciones como segundo
-    if not segundos or pm_seats == 0:
-        return pm_dict
-    
-    # Obtener todos los segundos lugares ordenados por frecuencia
-    total_segundos = sum(c.values())
-    escanos_asignados = 0
-    
-    # Método proporcional: asignar escaños PM según proporción de segundos lugares
-    partidos_ordenados = c.most_common()
-    for i, (partido, conteo) in enumerate(partidos_ordenados):
-        if escanos_asignados >= pm_seats:
-            break
-        # Calcular proporción y asignar
-        proporcion = conteo / total_segundos
-        escanos_partido = int(proporcion * pm_seats)
-        # Asegurar que no excedamos pm_seats
-        escanos_partido = min(escanos_partido, pm_seats - escanos_asignados)
-        if escanos_partido > 0:
-            pm_dict[partido] = escanos_partido
-            escanos_asignados += escanos_partido
-    
-    # Asignar escaños restantes uno por uno a los partidos con más segundos lugares
-    if escanos_asignados < pm_seats:
-        for partido, _ in partidos_ordenados:
-            if escanos_asignados >= pm_seats:
-                break
-            pm_dict[partido] += 1
-            escanos_asignados += 1
-    
+    segundos = tensor.segundos(partidos)
+    conteo = np.bincount(segundos[segundos >= 0], minlength=len(partidos))
+    escanos = np.zeros(len(partidos), dtype=np.int64)
+
+    total_segundos = int(conteo.sum())
+    if total_segundos > 0 and pm_seats > 0:
+        cuotas = conteo * pm_seats / total_segundos
+        escanos = np.floor(cuotas).astype(np.int64)
+        faltan = int(pm_seats - escanos.sum())
+        if faltan > 0:
+            orden = np.lexsort((np.arange(len(partidos)), -conteo, -(cuotas - escanos)))
+            escanos[orden[:faltan]] += 1
+
+    pm_dict = {p: int(e) for p, e in zip(partidos, escanos)}
+    if return_segundos:
+        return pm_dict, segundos
     return pm_dict
 
 
@@ -946,6 +833,15 @@ def asignadip_v2(x: np.ndarray, ssd: np.ndarray,
     if len(x) != len(ssd):
         raise ValueError("x y ssd deben tener la misma longitud")
     
+    # Entradas para el recálculo incremental de /ajustar/distrito-individual
+    registrar_asignacion(x, ssd, {
+        'indep': indep, 'nulos': nulos, 'no_reg': no_reg, 'm': m, 'S': S,
+        'threshold': threshold, 'max_seats': max_seats, 'max_pp': max_pp,
+        'max_seats_per_party': max_seats_per_party, 'apply_caps': apply_caps,
+        'quota_method': quota_method, 'divisor_method': divisor_method, 'seed': seed,
+        'partidos_base': partidos_base, 'mr_son_manuales': mr_son_manuales,
+    })
+    
     if S is None:
         S = int(np.sum(ssd) + m)
     
@@ -966,9 +862,6 @@ def asignadip_v2(x: np.ndarray, ssd: np.ndarray,
         _maybe_log(f"Votos elegibles: {np.sum(x_ok)}", 'debug', print_debug)
     
     # Asignación inicial de RP usando LR
-    if seed is not None:
-        np.random.seed(seed)
-    
     if m > 0 and np.sum(x_ok) > 0:
         s_rp_init = asignar_rp_con_metodo(
             votos=x_ok, 
@@ -1071,6 +964,63 @@ def asignadip_v2(x: np.ndarray, ssd: np.ndarray,
 
 # ====================== PROCESADOR PRINCIPAL ======================
 
+def preparar_datos_diputados(path_parquet: str, anio: int,
+                             path_siglado: Optional[str] = None,
+                             print_debug: bool = False) -> Dict:
+    """
+    Carga las boletas, agrega las columnas de coalición del siglado y recompone.
+
+    El resultado es de solo lectura: procesar_diputados_v2 no lo modifica, por lo
+    que puede reutilizarse entre escenarios del mismo año.
+    """
+    # Leer datos (normalizados una sola vez por proceso; ver engine/dataset_store.py)
+    df = obtener_boletas(path_parquet)
+    
+    # NUEVO: Detectar y agregar coaliciones automáticamente
+    siglado_path_auto = f"data/siglado-diputados-{anio}.csv"
+    coaliciones_detectadas = {}
+    if os.path.exists(siglado_path_auto):
+        coaliciones_detectadas = dataset_store.obtener(
+            siglado_path_auto, 'coaliciones_dip',
+            lambda p: extraer_coaliciones_de_siglado(p, anio)
+        )
+        if coaliciones_detectadas:
+            df = agregar_columnas_coalicion(df, coaliciones_detectadas)
+            if print_debug:
+                _maybe_log(f"Dataset con coaliciones shape: {df.shape}", 'debug', print_debug)
+                _maybe_log("Saltando recomposición: ya tenemos coaliciones del siglado", 'debug', print_debug)
+        else:
+            if print_debug:
+                _maybe_log("No se detectaron coaliciones válidas", 'debug', print_debug)
+    else:
+        if print_debug:
+            _maybe_log(f"No existe archivo siglado: {siglado_path_auto}", 'debug', print_debug)
+    
+    # Recomposición: siempre usar la recomposición oficial. Si existe el CSV de siglado,
+    # usar la regla 'equal_residue_siglado' pasando una versión normalizada del CSV.
+    if path_siglado and os.path.exists(path_siglado):
+        if print_debug:
+            _maybe_log(f"Usando recomposición con siglado: {path_siglado}", 'debug', print_debug)
+        # El loader de recomposición normaliza las columnas del CSV y el resultado
+        # queda en caché (año, cámara, regla, hash del siglado, huella de df)
+        recomposed = recompose_coalitions(
+            df=df, year=anio, chamber="diputados",
+            rule="equal_residue_siglado_vec", siglado_path=path_siglado
+        )
+    else:
+        if print_debug:
+            _maybe_log("Usando recomposición estándar", 'debug', print_debug)
+        recomposed = recompose_coalitions(
+            df=df, year=anio, chamber="diputados",
+            rule="equal_residue_solo_vec", siglado_path=None
+        )
+    
+    # Tensor distrito x partido: formato canónico para ganadores y agregados
+    tensor = ElectionTensor.desde_dataframe(recomposed, anio, 'diputados')
+    return {'df': df, 'coaliciones_detectadas': coaliciones_detectadas,
+            'recomposed': recomposed, 'tensor': tensor}
+
+
 def procesar_diputados_v2(path_parquet: Optional[str] = None, 
                           partidos_base: Optional[List[str]] = None,
                           anio: int = 2024, 
@@ -1091,6 +1041,7 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                           votos_redistribuidos: Optional[Dict] = None,
                           mr_ganados_geograficos: Optional[Dict[str, int]] = None,  # NUEVO: MR por partido con redistritación geográfica
                           seed: Optional[int] = None,
+                          datos_preparados: Optional[Dict] = None,  # salida de preparar_datos_diputados
                           print_debug: bool = False) -> Dict:
     """
     Procesador principal de diputados versión 2
@@ -1118,82 +1069,20 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
         if print_debug:
             _maybe_log(f"Procesando diputados {anio} con {len(partidos_base)} partidos", 'debug', print_debug)
         
-        # Leer datos
-        try:
-            df = pd.read_parquet(path_parquet)
-        except Exception as e:
-            _maybe_log(f"Error leyendo Parquet: {e}", 'warn', print_debug)
-            import pyarrow.parquet as pq
-            table = pq.read_table(path_parquet)
-            df = table.to_pandas()
-            # Decodificar bytes a UTF-8 si es necesario
-            for col in df.columns:
-                if df[col].dtype == object:
-                    df[col] = df[col].apply(lambda x: x.decode('utf-8', errors='replace') if isinstance(x, bytes) else x)
-        
-        # Normalizar columnas
-        df.columns = [norm_ascii_up(c) for c in df.columns]
-        
-        # Normalizar entidades y distritos
-        if 'ENTIDAD' in df.columns:
-            df['ENTIDAD'] = df['ENTIDAD'].apply(lambda x: x.decode('utf-8', errors='replace') if isinstance(x, bytes) else x)
-            df['ENTIDAD'] = df['ENTIDAD'].apply(normalize_entidad_ascii)
-        if 'DISTRITO' in df.columns:
-            df['DISTRITO'] = pd.to_numeric(df['DISTRITO'], errors='coerce').fillna(0).astype(int)
-        
-        # NUEVO: Detectar y agregar coaliciones automáticamente
-        siglado_path_auto = f"data/siglado-diputados-{anio}.csv"
-        coaliciones_detectadas = {}
-        if os.path.exists(siglado_path_auto):
-            coaliciones_detectadas = extraer_coaliciones_de_siglado(siglado_path_auto, anio)
-            if coaliciones_detectadas:
-                df = agregar_columnas_coalicion(df, coaliciones_detectadas)
-                if print_debug:
-                    _maybe_log(f"Dataset con coaliciones shape: {df.shape}", 'debug', print_debug)
-                    _maybe_log("Saltando recomposición: ya tenemos coaliciones del siglado", 'debug', print_debug)
-            else:
-                if print_debug:
-                    _maybe_log("No se detectaron coaliciones válidas", 'debug', print_debug)
-        else:
-            if print_debug:
-                _maybe_log(f"No existe archivo siglado: {siglado_path_auto}", 'debug', print_debug)
-        
-        # Recomposición: siempre usar la recomposición oficial. Si existe el CSV de siglado,
-        # usar la regla 'equal_residue_siglado' pasando una versión normalizada del CSV.
-        if path_siglado and os.path.exists(path_siglado):
-            if print_debug:
-                _maybe_log(f"Usando recomposición con siglado: {path_siglado}", 'debug', print_debug)
-            # Normalizar siglado para el loader de recomposición
-            siglado_df = pd.read_csv(path_siglado, dtype=str, keep_default_na=False)
-            # Normalize column names to ASCII lowercase but keep tokens like 'ASCII'
-            def _col_norm(c):
-                c2 = norm_ascii_up(c)
-                c2 = c2.replace(' ', '_')
-                return c2.lower()
-            siglado_df.columns = [_col_norm(c) for c in siglado_df.columns]
-            _sig_path = path_siglado + '.tmp_normalized.csv'
-            siglado_df.to_csv(_sig_path, index=False)
-
-            recomposed = recompose_coalitions(
-                df=df, year=anio, chamber="diputados",
-                rule="equal_residue_siglado", siglado_path=_sig_path
-            )
-
-            try:
-                os.remove(_sig_path)
-            except Exception:
-                pass
-        else:
-            if print_debug:
-                _maybe_log("Usando recomposición estándar", 'debug', print_debug)
-            recomposed = recompose_coalitions(
-                df=df, year=anio, chamber="diputados",
-                rule="equal_residue_solo", siglado_path=None
-            )
+        # Datos preparados (boletas + coaliciones + recomposición); en modo batch
+        # se comparten entre escenarios, ver procesar_diputados_batch
+        if datos_preparados is None:
+            datos_preparados = preparar_datos_diputados(path_parquet, anio, path_siglado, print_debug)
+        df = datos_preparados['df']
+        coaliciones_detectadas = datos_preparados['coaliciones_detectadas']
+        recomposed = datos_preparados['recomposed']
+        tensor = datos_preparados.get('tensor')
+        if tensor is None:
+            tensor = ElectionTensor.desde_dataframe(recomposed, anio, 'diputados')
         
         # Extraer votos nacionales (solo votos individuales para RP)
-        votos_partido = {p: int(recomposed[p].sum()) if p in recomposed.columns else 0 for p in partidos_base}
-        indep = int(recomposed['CI'].sum()) if 'CI' in recomposed.columns else 0
+        votos_partido = tensor.totales(partidos_base)
+        indep = tensor.totales(['CI'])['CI']
         
         if print_debug:
             _maybe_log(f"Votos por partido (originales): {votos_partido}", 'debug', print_debug)
@@ -1223,8 +1112,7 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                 
                 if os.path.exists(path_ref):
                     try:
-                        df_ref = pd.read_parquet(path_ref)
-                        df_ref.columns = [norm_ascii_up(c) for c in df_ref.columns]
+                        df_ref = obtener_boletas(path_ref)
                         
                         # Calcular proporciones nacionales del año de referencia
                         votos_ref = {}
@@ -1327,11 +1215,10 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
             mr_por_estado_raw = {}
             try:
                 from redistritacion.modulos.reparto_distritos import repartir_distritos_hare
-                from redistritacion.modulos.distritacion import cargar_secciones_ine
+                from redistritacion.modulos.distritacion import poblacion_por_estado as _poblacion_por_estado
                 
-                # Cargar población por estado
-                secciones = cargar_secciones_ine()
-                poblacion_por_estado = secciones.groupby('ENTIDAD')['POBTOT'].sum().to_dict()
+                # Población por estado (precalculada en el almacén de secciones)
+                poblacion_por_estado = _poblacion_por_estado()
                 
                 # Determinar total de distritos MR a distribuir
                 total_mr_a_distribuir = total_mr_geograficos if total_mr_geograficos > 0 else mr_seats
@@ -1454,33 +1341,12 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
             
             # Cargar siglado para saber qué partido específico gana cada distrito
             siglado_path_auto = f"data/siglado-diputados-{anio}.csv"
-            # Usar el loader centralizado que normaliza columnas y claves
+            # Índice compilado del siglado (renglones por entidad/distrito/coalición)
             try:
-                siglado_df = _load_siglado_dip(siglado_path_auto)
-                # _load_siglado_dip devuelve columnas: entidad_key, distrito, coalicion_key, dominante
-            except Exception:
-                # Fallback robusto si el CSV tiene una estructura distinta
-                siglado_df = pd.read_csv(siglado_path_auto, dtype=str, keep_default_na=False)
-                siglado_df.columns = [c.strip().lower() for c in siglado_df.columns]
-                # Normalizar nombre de entidad a clave homogénea
-                if 'entidad_ascii' in siglado_df.columns:
-                    siglado_df['entidad_key'] = siglado_df['entidad_ascii'].map(lambda x: norm_ascii_up(str(x)))
-                elif 'entidad' in siglado_df.columns:
-                    siglado_df['entidad_key'] = siglado_df['entidad'].map(lambda x: norm_ascii_up(str(x)))
-                else:
-                    siglado_df['entidad_key'] = ''
-                # Asegurar columna 'distrito' numérica
-                if 'distrito' in siglado_df.columns:
-                    siglado_df['distrito'] = siglado_df['distrito'].astype(str).str.extract(r"(\d+)").fillna('0').astype(int)
-                else:
-                    siglado_df['distrito'] = 0
-                # Determinar columna dominante (grupo_parlamentario o partido_origen)
-                if 'grupo_parlamentario' in siglado_df.columns:
-                    siglado_df['dominante'] = siglado_df['grupo_parlamentario'].map(lambda x: norm_ascii_up(str(x)))
-                elif 'partido_origen' in siglado_df.columns:
-                    siglado_df['dominante'] = siglado_df['partido_origen'].map(lambda x: norm_ascii_up(str(x)))
-                else:
-                    siglado_df['dominante'] = ''
+                siglado_idx = obtener_indice(siglado_path_auto)
+            except Exception as e:
+                siglado_idx = None
+                _maybe_log(f"No se pudo cargar el índice de siglado {siglado_path_auto}: {e}", 'warn', print_debug)
             
             # Preparar candidatos: partidos individuales + coaliciones (sumadas por partidos)
             # Evitamos depender de columnas de coalición que pueden no existir tras recomposición.
@@ -1488,62 +1354,13 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
             candidaturas_coaliciones = coaliciones_detectadas if coaliciones_detectadas else {}
 
             # Construir mapa por distrito desde el siglado: nominadores_set y ppn_gp (grupo parlamentario)
-            siglado_map = {}
+            # Mapa compartido (solo lectura) desde el store del proceso
             try:
-                siglado_raw = pd.read_csv(siglado_path_auto, dtype=str, keep_default_na=False)
-                siglado_raw.columns = [c.strip().lower() for c in siglado_raw.columns]
-                for _, r in siglado_raw.iterrows():
-                    # obtener entidad y distrito
-                    ent = r.get('entidad_ascii') or r.get('entidad') or ''
-                    ent_key_norm = norm_ascii_up(str(ent))
-                    ent_key_full = normalize_entidad_ascii(str(ent))
-                    try:
-                        dist = int(str(r.get('distrito','0')) and re.findall(r"(\d+)", str(r.get('distrito','0')))[0])
-                    except Exception:
-                        try:
-                            dist = int(r.get('distrito', 0))
-                        except Exception:
-                            dist = 0
-
-                    # obtener nominador (partido que postuló) y grupo parlamentario si existe
-                    partido_origen = ''
-                    gp = ''
-                    # posibles nombres de columna
-                    if 'partido_origen' in siglado_raw.columns:
-                        partido_origen = r.get('partido_origen','')
-                    elif 'partido' in siglado_raw.columns:
-                        partido_origen = r.get('partido','')
-                    elif 'postulador' in siglado_raw.columns:
-                        partido_origen = r.get('postulador','')
-
-                    if 'grupo_parlamentario' in siglado_raw.columns:
-                        gp = r.get('grupo_parlamentario','')
-                    elif 'grupo' in siglado_raw.columns:
-                        gp = r.get('grupo','')
-
-                    partido_origen_norm = norm_ascii_up(str(partido_origen)) if partido_origen else ''
-                    gp_norm = norm_ascii_up(str(gp)) if gp else ''
-
-                    for key in [(ent_key_norm, dist), (ent_key_full, dist)]:
-                        entry = siglado_map.get(key, {'nominadores': set(), 'ppn_set': set()})
-                        if partido_origen_norm:
-                            entry['nominadores'].add(partido_origen_norm)
-                        if gp_norm:
-                            entry['ppn_set'].add(gp_norm)
-                        siglado_map[key] = entry
-
-                # finalize map: convert ppn_set to single ppn_gp (or '' if ambiguous)
-                for k, v in list(siglado_map.items()):
-                    nominadores = set([p for p in v['nominadores'] if p and p.strip()])
-                    ppn_vals = set([p for p in v['ppn_set'] if p and p.strip()])
-                    ppn_gp = ''
-                    if len(ppn_vals) == 1:
-                        ppn_gp = list(ppn_vals)[0]
-                    elif len(ppn_vals) > 1:
-                        _maybe_log(f"Múltiples GRUPO_PARLAMENTARIO para {k}: {ppn_vals}; ignorando ppn_gp", 'warn', print_debug)
-                        ppn_gp = ''
-                    siglado_map[k] = {'nominadores_set': nominadores, 'ppn_gp': ppn_gp}
+                siglado_map = dataset_store.obtener(
+                    siglado_path_auto, 'siglado_map_dip', _construir_siglado_map_dip, copiar=False
+                )
             except Exception as e:
+                siglado_map = {}
                 _maybe_log(f"No se pudo construir siglado_map desde {siglado_path_auto}: {e}", 'warn', print_debug)
 
             # Calcular ganador por distrito
@@ -1566,28 +1383,21 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
             except Exception:
                 df_lookup = None
 
-            for _, distrito in recomposed.iterrows():
-                entidad = distrito['ENTIDAD']
-                num_distrito = distrito['DISTRITO']
-
-                # Construir mapa de votos para candidatos (partidos + coaliciones)
-                candidate_votes = {}
-                # votos por partido
-                for p in candidaturas_partidos:
-                    candidate_votes[p] = float(distrito.get(p, 0) or 0.0)
-
-                # votos por coalición = suma de partidos miembros
-                for coal_name, miembros in candidaturas_coaliciones.items():
-                    s = 0.0
-                    for miembro in miembros:
-                        # sólo sumar si la columna existe en el recomposed
-                        if miembro in distrito:
-                            s += float(distrito.get(miembro, 0) or 0.0)
-                    candidate_votes[coal_name] = s
+            # Ganador por distrito entre candidaturas (partidos + coaliciones = suma de
+            # miembros), como argmax sobre el tensor; en empate gana la primera
+            candidaturas = list(candidaturas_partidos) + list(candidaturas_coaliciones)
+            votos_candidaturas = np.hstack([
+                tensor.columnas(candidaturas_partidos),
+                tensor.sumas(list(candidaturas_coaliciones.values())),
+            ])
+            ganadores_idx = tensor.ganadores(matriz=votos_candidaturas)
+
+            for i in range(tensor.n_distritos):
+                entidad = tensor.entidades[tensor.entidad_id[i]]
+                num_distrito = int(tensor.distrito[i])
 
                 # Determinar ganador (nombre de partido o coalición)
-                coalicion_ganadora = max(candidate_votes, key=lambda k: candidate_votes.get(k, 0))
-                max_votos = candidate_votes.get(coalicion_ganadora, 0)
+                coalicion_ganadora = candidaturas[ganadores_idx[i]]
 
                 # Si el ganador es una coalición, confirmemos que la columna de coalición
                 # realmente existía en el parquet para este distrito (y tenía votos).
@@ -1671,16 +1481,15 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                         # 4) En otros casos, solo acreditar ppn_gp si la coalición ganó y ppn_gp pertenece a la coalición
                         if not distrito_procesado:
                             # Si partido ganador proviene de la coalición, asignar al dominante si pertenece a la coalición
-                            # buscar filas de siglado para este distrito
-                            mask = (siglado_df.get('entidad_key', '') == normalize_entidad_ascii(entidad)) & (siglado_df['distrito'] == num_distrito)
-                            if 'coalicion_key' in siglado_df.columns:
+                            # primer renglón del siglado para este distrito y coalición
+                            partido_ganador = ''
+                            if siglado_idx is not None:
                                 coalicion_lookup = norm_ascii_up(coalicion_ganadora).replace('_', ' ')
-                                mask = mask & (siglado_df['coalicion_key'] == coalicion_lookup)
-                            distrito_siglado = siglado_df[mask]
+                                partido_ganador = siglado_idx.dominante(
+                                    normalize_entidad_ascii(entidad), int(num_distrito), coalicion_lookup
+                                )
 
-                            if len(distrito_siglado) > 0:
-                                partido_ganador = distrito_siglado['dominante'].iloc[0]
-                                partido_ganador = norm_ascii_up(str(partido_ganador))
+                            if partido_ganador:
                                 # Solo acreditar ppn_gp si ganador es la coalición y ppn_gp pertenece a la coalición
                                 if partido_ganador in partidos_coalicion and partido_ganador in partidos_base:
                                     asignar_mr_distrito(partido_ganador, entidad)
@@ -1691,7 +1500,7 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                             # Si no hay registro en siglado o no aplica, usar fallback por votos dentro de la coalición
                             if not distrito_procesado:
                                 partidos_coalicion_list = partidos_de_col(coalicion_ganadora)
-                                votos_coalicion = {p: float(distrito.get(p,0) or 0) for p in partidos_coalicion_list if p in partidos_base}
+                                votos_coalicion = tensor.fila(i, [p for p in partidos_coalicion_list if p in partidos_base])
                                 if votos_coalicion:
                                     partido_fallback = max(votos_coalicion, key=votos_coalicion.get)
                                     asignar_mr_distrito(partido_fallback, entidad)
@@ -1708,7 +1517,7 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                                 _maybe_log(f"Distrito {entidad}-{num_distrito}: {coalicion_ganadora} (individual, sin columna de coalición)", 'debug', print_debug)
                         else:
                             # Fallback conservador: asignar al partido con más votos entre partidos base
-                            votos_ind = {p: float(distrito.get(p,0) or 0) for p in partidos_base}
+                            votos_ind = tensor.fila(i, partidos_base)
                             if votos_ind:
                                 ganador_ind = max(votos_ind, key=votos_ind.get)
                                 asignar_mr_distrito(ganador_ind, entidad)
@@ -1726,10 +1535,7 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                 # GARANTÍA: Si el distrito aún no se procesó, usar VOTOS DIRECTOS del parquet
                 if not distrito_procesado:
                     # Calcular ganador entre partidos individuales del parquet
-                    votos_individuales = {}
-                    for p in partidos_base:
-                        if p in distrito:
-                            votos_individuales[p] = distrito.get(p, 0)
+                    votos_individuales = tensor.fila(i, partidos_base)
                     
                     if votos_individuales:
                         ganador_individual = max(votos_individuales, key=votos_individuales.get)
@@ -1757,20 +1563,11 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                     _maybe_log("Calculando MR por partido individual (sin coaliciones)", 'debug', print_debug)
             
             # Calcular ganador por distrito usando solo votos de partidos base
-            mr_raw = {}
-            for _, distrito in recomposed.iterrows():
-                # Obtener votos de cada partido en este distrito
-                votos_distrito = {}
-                for partido in partidos_base:
-                    votos_distrito[partido] = float(distrito.get(partido, 0) or 0)
-                
-                # El partido con más votos gana el distrito
-                if votos_distrito:
-                    ganador = max(votos_distrito, key=votos_distrito.get)
-                    mr_raw[ganador] = mr_raw.get(ganador, 0) + 1
-            
-            # Asegurar que todos los partidos base están representados
-            mr_aligned = {p: int(mr_raw.get(p, 0)) for p in partidos_base}
+            # (argmax sobre el tensor; en empate gana el primero de partidos_base)
+            if partidos_base:
+                mr_aligned = tensor.conteo(tensor.ganadores(partidos_base), partidos_base)
+            else:
+                mr_aligned = {}
             indep_mr = 0
             
             if print_debug:
@@ -2098,7 +1895,7 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                     else:
                         # Si no hay MR calculado, distribuir usando largest remainder
                         votos_array = np.array([votos_partido.get(p, 0) for p in partidos_base])
-                        mr_dist = LR_ties(votos_array, mr_seats)
+                        mr_dist = LR_ties(votos_array, mr_seats, seed=seed)
                         mr_aligned = {partidos_base[i]: int(mr_dist[i]) for i in range(len(partidos_base))}
                 
                 m = rp_seats
@@ -2356,11 +2153,17 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
             
             try:
                 # Llamar a la función que simula PM por runnerup
-                pm_dict = _simulate_pm_by_runnerup(
-                    recomposed_df=recomposed,  # Usar 'recomposed' que es la variable correcta
+                pm_dict, segundos = _simulate_pm_by_runnerup(
+                    tensor=tensor,
                     pm_seats=pm_seats,
-                    partidos=partidos_base
+                    partidos=partidos_base,
+                    return_segundos=True
                 )
+                # Segundo lugar por distrito (para auditar PM geográficamente)
+                meta_out['pm_segundo_por_distrito'] = {
+                    **{col: recomposed[col].tolist() for col in ('ENTIDAD', 'DISTRITO') if col in recomposed.columns},
+                    'partido': [partidos_base[k] if k >= 0 else None for k in segundos],
+                }
                 
                 if print_debug:
                     _maybe_log(f"[PM] Escaños PM calculados: {pm_dict}", 'debug', print_debug)
@@ -2525,9 +2328,8 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                 
                 # Calcular distritos por estado
                 if 'recomposed' in locals() and recomposed is not None and 'ENTIDAD' in recomposed.columns:
-                    for estado in recomposed['ENTIDAD'].unique():
-                        # Mantener el nombre completo (sin convertir a abreviación todavía)
-                        distritos_por_estado[estado] = len(recomposed[recomposed['ENTIDAD'] == estado])
+                    # Mantener el nombre completo (sin convertir a abreviación todavía)
+                    distritos_por_estado.update(tensor.distritos_por_entidad())
                     
                     # 🔥 CRÍTICO: Escalar distritos_por_estado cuando mr_seats < total histórico (300)
                     # Esto es necesario para planes personalizados (ej: 64 MR en lugar de 300)
@@ -2725,11 +2527,10 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
                 
                 try:
                     from redistritacion.modulos.reparto_distritos import repartir_distritos_hare
-                    from redistritacion.modulos.distritacion import cargar_secciones_ine
+                    from redistritacion.modulos.distritacion import poblacion_por_estado as _poblacion_por_estado
                     
-                    # Cargar población por estado
-                    secciones = cargar_secciones_ine()
-                    poblacion_por_estado = secciones.groupby('ENTIDAD')['POBTOT'].sum().to_dict()
+                    # Población por estado (precalculada en el almacén de secciones)
+                    poblacion_por_estado = _poblacion_por_estado()
                     
                     # Repartir distritos usando Hare
                     asignacion_distritos = repartir_distritos_hare(
@@ -2983,6 +2784,63 @@ def procesar_diputados_v2(path_parquet: Optional[str] = None,
         }
 
 
+def procesar_diputados_batch(path_parquet: str, anio: int, escenarios: List[Dict],
+                             path_siglado: Optional[str] = None,
+                             partidos_base: Optional[List[str]] = None,
+                             executor=None,
+                             print_debug: bool = False,
+                             capturar_errores: bool = False) -> List[Dict]:
+    """
+    Evalúa varios escenarios del mismo año sobre un solo estado preparado.
+
+    Cada escenario es un dict con los kwargs de procesar_diputados_v2 (max_seats,
+    sistema, mr_seats, rp_seats, pm_seats, umbral, aplicar_topes, ...). El parquet
+    y el siglado se cargan y recomponen una sola vez. Devuelve los resultados en
+    el mismo orden que `escenarios`. Con `executor` (engine.scenario_executor)
+    los escenarios se reparten entre sus workers precalentados. Con
+    capturar_errores=True un escenario que falla devuelve {'error': ...} en su
+    posición en vez de abortar el batch completo.
+    """
+    reservados = {'path_parquet', 'anio', 'path_siglado', 'partidos_base', 'datos_preparados'}
+    for i, esc in enumerate(escenarios):
+        extra = reservados.intersection(esc)
+        if extra:
+            raise ValueError(f"Escenario {i}: parámetros no permitidos por escenario: {sorted(extra)}")
+
+    if executor is not None:
+        return executor.evaluar_diputados(path_parquet, anio, escenarios,
+                                          path_siglado=path_siglado, partidos_base=partidos_base,
+                                          capturar_errores=capturar_errores)
+
+    datos = preparar_datos_diputados(path_parquet, anio, path_siglado, print_debug)
+    if print_debug:
+        _maybe_log(f"Batch diputados {anio}: {len(escenarios)} escenarios sobre datos compartidos", 'info', print_debug)
+
+    return [
+        escenario_o_error(
+            capturar_errores,
+            path_parquet=path_parquet,
+            partidos_base=partidos_base,
+            anio=anio,
+            path_siglado=path_siglado,
+            datos_preparados=datos,
+            print_debug=print_debug,
+            **esc
+        )
+        for esc in escenarios
+    ]
+
+
+def escenario_o_error(capturar_errores: bool, **kwargs) -> Dict:
+    """procesar_diputados_v2(**kwargs); si falla y capturar_errores, {'error': 'Tipo: mensaje'}."""
+    try:
+        return procesar_diputados_v2(**kwargs)
+    except Exception as e:
+        if not capturar_errores:
+            raise
+        return {'error': f"{type(e).__name__}: {e}"}
+
+
 def export_scenarios(path_parquet: str, siglado_path: str, scenarios: list, out_path: str = None, anio: int = 2024, print_debug: bool = False):
     """Ejecuta una serie de escenarios y exporta un Excel con pestañas por escenario.
 
@@ -2996,28 +2854,31 @@ def export_scenarios(path_parquet: str, siglado_path: str, scenarios: list, out_
         from datetime import datetime
         out_path = f"outputs/escenarios_diputados_custom.{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 
+    # Todos los escenarios se evalúan sobre los mismos datos preparados
+    resultados = procesar_diputados_batch(
+        path_parquet=path_parquet,
+        anio=anio,
+        path_siglado=siglado_path,
+        escenarios=[{
+            'max_seats': params.get('max_seats', 500),
+            'sistema': params.get('sistema', 'mixto'),
+            'mr_seats': params.get('mr_seats', None),
+            'rp_seats': params.get('rp_seats', None),
+            'usar_coaliciones': True,
+            'sobrerrepresentacion': 8.0,
+            'umbral': 0.03,
+        } for _, params in scenarios],
+        print_debug=print_debug,
+    )
+
     with pd.ExcelWriter(out_path) as writer:
-        for name, params in scenarios:
+        for (name, params), res in zip(scenarios, resultados):
             if print_debug:
                 _maybe_log(f"ejecutando {name} {params}", 'info', print_debug)
             # copy params to avoid mutation
             p = dict(params)
             usar_pm = p.pop('usar_pm', False)
 
-            res = procesar_diputados_v2(
-                path_parquet=path_parquet,
-                anio=anio,
-                path_siglado=siglado_path,
-                max_seats=p.get('max_seats', 500),
-                sistema=p.get('sistema', 'mixto'),
-                mr_seats=p.get('mr_seats', None),
-                rp_seats=p.get('rp_seats', None),
-                usar_coaliciones=True,
-                sobrerrepresentacion=8.0,
-                umbral=0.03,
-                print_debug=print_debug,
-            )
-
             mr = res.get('mr', {})
             rp = res.get('rp', {})
             tot = res.get('tot', {})
@@ -3034,8 +2895,9 @@ def export_scenarios(path_parquet: str, siglado_path: str, scenarios: list, out_
                 try:
                     # read parquet and recompute recomposed with siglado rule
                     df_parq = pd.read_parquet(path_parquet)
-                    recomposed = recompose_coalitions(df_parq, anio, 'diputados', rule='equal_residue_siglado', siglado_path=siglado_path)
-                    pm_assigned = _simulate_pm_by_runnerup(recomposed, p.get('pm_seats', 100), partidos)
+                    recomposed = recompose_coalitions(df_parq, anio, 'diputados', rule='equal_residue_siglado_vec', siglado_path=siglado_path)
+                    tensor = ElectionTensor.desde_dataframe(recomposed, anio, 'diputados')
+                    pm_assigned = _simulate_pm_by_runnerup(tensor, p.get('pm_seats', 100), partidos)
                     df['pm'] = df['partido'].map(lambda x: pm_assigned.get(x, 0))
                 except Exception as e:
                     if print_debug:
@@ -12,6 +12,12 @@ import json
 from .core import assign_senadores, SenParams
 from typing import Dict, List, Tuple, Optional
 from .recomposicion import recompose_coalitions, parties_for
+from . import dataset_store
+from .dataset_store import obtener_boletas
+from .registro import obtener_registro
+from .partidos import canonizar_siglado, coalicion_de_tokens, partidos_de_col, registro_partidos, tokens_de_coalicion
+
+log = obtener_registro(__name__)
 
 # Mapeo global de nombres completos de estados a abreviaciones
 NOMBRE_ESTADO_A_ABREV = {
@@ -69,7 +75,7 @@ def extraer_coaliciones_de_siglado(siglado_path):
         return coaliciones
         
     except Exception as e:
-        print(f"[ERROR] Error leyendo siglado {siglado_path}: {e}")
+        log.error("Error leyendo siglado %s: %s", siglado_path, e)
         return {}
 
 def agregar_columnas_coalicion(df, coaliciones):
@@ -88,7 +94,7 @@ def agregar_columnas_coalicion(df, coaliciones):
         if len(partidos_disponibles) >= 2:  # Solo crear coalición si hay al menos 2 partidos
             # Sumar votos de los partidos de la coalición
             df_modificado[col_name] = df_modificado[partidos_disponibles].sum(axis=1)
-            print(f"[DEBUG] Coalición creada: {col_name} = {partidos_disponibles} ({df_modificado[col_name].sum():,} votos)")
+            log.debug(lambda: f"Coalición creada: {col_name} = {partidos_disponibles} ({df_modificado[col_name].sum():,} votos)")
     
     return df_modificado
 
@@ -114,73 +120,6 @@ def normalize_entidad_ascii(x: str) -> str:
     x = x.replace("COAHUILA DE ZARAGOZA", "COAHUILA")
     return x
 
-def canonizar_siglado(x: str) -> str:
-    """Canonización de siglado - idéntica al R"""
-    y = norm_ascii_up(x)
-    y = re.sub(r"\bGRUPO PARLAMENTARIO\b|\bGP\b|\bPARTIDO\b", "", y)
-    y = re.sub(r"\s+", " ", y).strip()
-    y = re.sub(r"\bMOVIMIENTO CIUDADANO\b|\bMC\b", "MC", y)
-    y = re.sub(r"\bVERDE\b|PARTIDO VERDE|\bPVEM\b|\bP V E M\b", "PVEM", y)
-    y = re.sub(r"ENCUENTRO SOCIAL|ENCUENTRO SOLIDARIO|\bPES\b", "PES", y)
-    y = re.sub(r"FUERZA POR MEXICO|\bFXM\b", "FXM", y)
-    y = re.sub(r"\bMORENA\b", "MORENA", y)
-    y = re.sub(r"PARTIDO DEL TRABAJO|\bPT\b", "PT", y)
-    y = re.sub(r"PARTIDO ACCION NACIONAL|\bPAN\b", "PAN", y)
-    y = re.sub(r"PARTIDO REVOLUCIONARIO INSTITUCIONAL|\bPRI\b", "PRI", y)
-    y = re.sub(r"PARTIDO DE LA REVOLUCION DEMOCRATICA|\bPRD\b", "PRD", y)
-    y = re.sub(r"NUEVA ALIANZA|\bNA\b|\bPANAL\b", "NA", y)
-    return y
-
-def coalicion_de_tokens(tokens: List[str], anio: int) -> Optional[str]:
-    """Determina coalición a partir de tokens - idéntica al R"""
-    S = sorted(set(tokens))
-    if anio == 2018:
-        if set(S) == {"MORENA","PT","PES"}: 
-            return "JUNTOS HAREMOS HISTORIA"
-        if set(S) == {"PAN","PRD","MC"}:    
-            return "POR MEXICO AL FRENTE"
-        if set(S) == {"PRI","PVEM","NA"}:   
-            return "TODOS POR MEXICO"
-    elif anio == 2024:
-        if set(S) == {"MORENA","PT","PVEM"}: 
-            return "SIGAMOS HACIENDO HISTORIA"
-        if set(S) == {"PAN","PRI","PRD"}:    
-            return "FUERZA Y CORAZON POR MEXICO"
-    
-    if len(S) == 1 and S[0] in {"PAN","PRI","PRD","PVEM","PT","MC","MORENA","PES","NA","CI"}:
-        return S[0]
-    return None
-
-def tokens_de_coalicion(coalicion: str, anio: int) -> List[str]:
-    """Descompone coalición en partidos - basada en R"""
-    if anio == 2018:
-        if coalicion == "JUNTOS HAREMOS HISTORIA":
-            return ["MORENA", "PT", "PES"]
-        elif coalicion == "POR MEXICO AL FRENTE":
-            return ["PAN", "PRD", "MC"]
-        elif coalicion == "TODOS POR MEXICO":
-            return ["PRI", "PVEM", "NA"]
-    elif anio == 2024:
-        if coalicion == "SIGAMOS HACIENDO HISTORIA":
-            return ["MORENA", "PT", "PVEM"]
-        elif coalicion == "FUERZA Y CORAZON POR MEXICO":
-            return ["PAN", "PRI", "PRD"]
-    
-    if coalicion in ["MC","PAN","PRI","PRD","MORENA","PVEM","PT","PES","NA","CI"]:
-        return [coalicion]
-    return []
-
-def partidos_de_col(col: str) -> List[str]:
-    """Extrae partidos de nombre de columna - incluyendo coaliciones"""
-    # Caso especial: coaliciones conocidas
-    if col == "POR_MEXICO_AL_FRENTE":
-        return ["PAN", "PRD", "MC"]
-    elif col == "JUNTOS_HAREMOS_HISTORIA":
-        return ["MORENA", "PT"]
-    # Casos regulares: partidos separados por _
-    else:
-        return col.split("_")
-
 def cols_candidaturas_anio_con_coaliciones(columnas: List[str], anio: int) -> List[str]:
     """Identifica columnas de candidaturas válidas incluyendo coaliciones"""
     if anio == 2018:
@@ -199,7 +138,7 @@ def cols_candidaturas_anio_con_coaliciones(columnas: List[str], anio: int) -> Li
         # Caso 2: Columnas de coaliciones (nombres que contienen FRENTE, HISTORIA, etc.)
         elif any(palabra in col.upper() for palabra in ['FRENTE', 'HISTORIA', 'MEXICO', 'HAREMOS', 'JUNTOS']):
             validas.append(col)
-            print(f"[DEBUG] Coalición detectada: {col}")
+            log.debug("Coalición detectada: %s", col)
     
     return validas
 
@@ -237,6 +176,37 @@ def read_siglado_sen_long(csv_path: str) -> pd.DataFrame:
     
     return gp[['ENTIDAD_ASCII', 'COALICION', 'FORMULA', 'GRUPO_PARLAMENTARIO', 'PARTIDO_ORIGEN']]
 
+def _construir_siglado_map_sen(csv_path: str) -> Dict[Tuple[str, str, int], Dict]:
+    """Mapa (ENTIDAD_ASCII, COALICION, FORMULA) -> {nominadores_set, ppn_gp} del siglado de senado"""
+    gp_long = read_siglado_sen_long(csv_path)
+    siglado_map = {}
+    grouped = gp_long.groupby(['ENTIDAD_ASCII', 'COALICION', 'FORMULA'])
+    for key, dfg in grouped:
+        entk, coalN, formula = key
+        nominadores = set()
+        gps = set()
+        # PARTIDO_ORIGEN puede contener el partido nominador
+        if 'PARTIDO_ORIGEN' in dfg.columns:
+            for v in dfg['PARTIDO_ORIGEN'].unique():
+                if pd.notna(v) and str(v).strip() != '':
+                    nominadores.add(canonizar_siglado(v))
+        # GRUPO_PARLAMENTARIO puede indicar el grupo parlamentario a acreditar
+        for g in dfg['GRUPO_PARLAMENTARIO'].unique():
+            if pd.notna(g) and str(g).strip() != '':
+                gps.add(canonizar_siglado(g))
+
+        ppn_gp = ''
+        if len(gps) == 1:
+            ppn_gp = list(gps)[0]
+        elif len(gps) > 1:
+            log.warning("Múltiples GRUPO_PARLAMENTARIO para %s: %s; ignorando ppn_gp", key, gps)
+
+        siglado_map[(normalize_entidad_ascii(entk), norm_ascii_up(coalN), int(formula))] = {
+            'nominadores_set': nominadores,
+            'ppn_gp': ppn_gp
+        }
+    return siglado_map
+
 def gp_lookup(entidad: str, coalicion: str, formula: int, acred_row: pd.Series, 
               gp_long: pd.DataFrame, partidos_base: List[str], anio: int) -> Optional[str]:
     """Busca grupo parlamentario - traducida del R"""
@@ -272,6 +242,67 @@ def gp_lookup(entidad: str, coalicion: str, formula: int, acred_row: pd.Series,
     
     return None
 
+def _indice_siglado_sen(gp_long: pd.DataFrame) -> Dict[Tuple[str, str, int], Tuple]:
+    """(ENTIDAD_ASCII, COALICION, FORMULA) -> (GRUPO_PARLAMENTARIO, PARTIDO_ORIGEN) de la primera fila"""
+    indice = {}
+    if gp_long is None or len(gp_long) == 0:
+        return indice
+    origen = gp_long['PARTIDO_ORIGEN'] if 'PARTIDO_ORIGEN' in gp_long.columns else [None] * len(gp_long)
+    for ent, coal, formula, grupo, orig in zip(gp_long['ENTIDAD_ASCII'], gp_long['COALICION'],
+                                               gp_long['FORMULA'], gp_long['GRUPO_PARLAMENTARIO'], origen):
+        indice.setdefault((ent, coal, int(formula)), (grupo, orig))
+    return indice
+
+def _gp_formula(entidad: str, coalicion: str, formula: int, acred: Dict, indice_gp: Dict,
+                partidos_base: List[str], anio: int, siglado_map: Optional[Dict]) -> Optional[str]:
+    """
+    Grupo parlamentario que acredita la fórmula: reglas jurídicas con siglado_map
+    y, si no resuelven, la misma cascada que gp_lookup (con índice en lugar de filtro).
+    """
+    entk = normalize_entidad_ascii(entidad)
+    coalN = norm_ascii_up(str(coalicion)) if coalicion is not None else ''
+    gp = None
+
+    entry = siglado_map.get((entk, coalN, int(formula))) if siglado_map else None
+    if entry:
+        nominadores_set = set([canonizar_siglado(x) for x in entry.get('nominadores_set', set())])
+        ppn_gp = entry.get('ppn_gp', '')
+
+        SHH = {"MORENA", "PT", "PVEM"}
+        FCM = {"PAN", "PRI", "PRD"}
+
+        # tokens de la coalición (si aplica)
+        tokens_set = set(tokens_de_coalicion(coalN, anio)) if coalN else set()
+
+        # 1) nominadores == SHH y ganó SHH / 2) nominadores == FCM y ganó FCM -> acreditar ppn_gp
+        if ppn_gp and nominadores_set == tokens_set and nominadores_set in (SHH, FCM):
+            gp = ppn_gp if ppn_gp in partidos_base or ppn_gp == 'CI' else None
+
+        # 3) único nominador y coincide con la coalición -> acreditar
+        if gp is None and len(nominadores_set) == 1:
+            solo = list(nominadores_set)[0]
+            if solo in partidos_base and (not tokens_set or solo in tokens_set or solo == coalN):
+                gp = solo
+    if gp is not None:
+        return gp
+
+    # Cascada de gp_lookup: siglado -> partido de origen -> mayor votación en la coalición
+    hit = indice_gp.get((entk, coalN, int(formula)))
+    if hit is not None:
+        for valor in hit:
+            if pd.notna(valor) and len(str(valor).strip()) > 0:
+                return valor
+
+    toks_disponibles = [t for t in tokens_de_coalicion(coalN, anio) if t in acred]
+    if toks_disponibles:
+        votos = [acred[t] if pd.notna(acred[t]) else -np.inf for t in toks_disponibles]
+        if any(np.isfinite(v) for v in votos):
+            return toks_disponibles[int(np.argmax(votos))]
+
+    if coalN in partidos_base + ["CI"]:
+        return coalN
+    return None
+
 def conteo_senado_MR_PM_sigladoF(df_boleta_est: pd.DataFrame, df_acred_est: pd.DataFrame, 
                                  partidos_base: List[str], gp_long: pd.DataFrame, anio: int,
                                  escanos_mr_efectivos: int = 64, escanos_pm: int = 32,
@@ -280,9 +311,14 @@ def conteo_senado_MR_PM_sigladoF(df_boleta_est: pd.DataFrame, df_acred_est: pd.D
     Conteo MR+PM con siglado por fórmula - traducción directa del R
     MR: senadores por entidad distribuidos proporcionalmente según escanos_mr_efectivos
     PM: senadores de primera minoría distribuidos según escanos_pm
+
+    Vectorizado: matriz entidad × coalición -> ganador y segundo lugar con un
+    solo argsort estable (empates por nombre de coalición, como el orden
+    (-votos, nombre) original) y tabla (entidad, coalición, fórmula) -> partido
+    resuelta una vez; los conteos salen de un bincount.
     """
-    print(f"[DEBUG] conteo_senado_MR_PM_sigladoF iniciando para año {anio}")
-    print(f"[DEBUG] Parámetros: MR efectivos={escanos_mr_efectivos}, PM={escanos_pm}")
+    log.debug("conteo_senado_MR_PM_sigladoF iniciando para año %s", anio)
+    log.debug("Parámetros: MR efectivos=%s, PM=%s", escanos_mr_efectivos, escanos_pm)
     
     # Validaciones
     assert 'ENTIDAD' in df_boleta_est.columns, "df_boleta_est debe tener ENTIDAD"
@@ -291,15 +327,10 @@ def conteo_senado_MR_PM_sigladoF(df_boleta_est: pd.DataFrame, df_acred_est: pd.D
     # Columnas de candidaturas válidas (excluyendo CI)
     cand_cols = cols_candidaturas_anio(df_boleta_est.columns.tolist(), anio)
     cand_cols = [c for c in cand_cols if c != "CI"]
-    print(f"[DEBUG] Columnas candidaturas: {cand_cols}")
     
     # Mapeo columna -> coalición
-    col2coal = {}
-    for col in cand_cols:
-        tokens = partidos_de_col(col)
-        coal = coalicion_de_tokens(tokens, anio)
-        col2coal[col] = coal
-    print(f"[DEBUG] Mapeo col->coalición: {col2coal}")
+    col2coal = {col: coalicion_de_tokens(partidos_de_col(col), anio) for col in cand_cols}
+    log.debug("Mapeo col->coalición: %s", col2coal)
     
     # Ordenar y validar que entidades coincidan
     df_boleta_est = df_boleta_est.sort_values('ENTIDAD').reset_index(drop=True)
@@ -308,168 +339,76 @@ def conteo_senado_MR_PM_sigladoF(df_boleta_est: pd.DataFrame, df_acred_est: pd.D
     if not df_boleta_est['ENTIDAD'].equals(df_acred_est['ENTIDAD']):
         raise ValueError("Las entidades en df_boleta_est y df_acred_est no coinciden")
     
-    # Inicializar contadores
     ssd = {p: 0 for p in partidos_base}
     indep = 0
     
-    print(f"[DEBUG] Procesando {len(df_boleta_est)} entidades")
+    # Coaliciones válidas en orden alfabético: con argsort estable los empates
+    # de votos quedan por nombre
+    coaliciones = sorted({c for c in col2coal.values() if c is not None and len(str(c).strip()) > 0})
+    n_ent = len(df_boleta_est)
+    if not coaliciones or n_ent == 0:
+        log.debug("No hay votos válidos para ninguna entidad")
+        return {'ssd_partidos': ssd, 'indep_mr_pm': indep}
     
-    # Procesar cada entidad
-    for i in range(len(df_boleta_est)):
-        entidad = df_boleta_est.iloc[i]['ENTIDAD']
-        print(f"[DEBUG] Procesando entidad {i+1}/{len(df_boleta_est)}: {entidad}")
-        
-        # Votos por columna en esta entidad
-        votos_cols = []
-        for col in cand_cols:
-            if col in df_boleta_est.columns:
-                voto = df_boleta_est.iloc[i][col]
-                votos_cols.append({'coalicion': col2coal[col], 'votos': voto if pd.notna(voto) else 0})
-        
-        # Filtrar coaliciones válidas
-        votos_validos = [v for v in votos_cols if v['coalicion'] is not None and len(str(v['coalicion']).strip()) > 0]
-        if not votos_validos:
-            print(f"[DEBUG] No hay votos válidos para {entidad}")
-            continue
-        
-        # Agregar por coalición
-        coal_votos = {}
-        for v in votos_validos:
-            coal = v['coalicion']
-            if coal not in coal_votos:
-                coal_votos[coal] = 0
-            coal_votos[coal] += v['votos']
-        
-        # Ordenar coaliciones por votos (descendente)
-        coaliciones_ordenadas = sorted(coal_votos.items(), key=lambda x: (-x[1], x[0]))
-        print(f"[DEBUG] {entidad} - Coaliciones ordenadas: {coaliciones_ordenadas}")
-        
-        if not coaliciones_ordenadas:
-            continue
-            
-        # Primera coalición (ganadora)
-        top1 = coaliciones_ordenadas[0][0]
-        top2 = coaliciones_ordenadas[1][0] if len(coaliciones_ordenadas) >= 2 else None
-        
-        print(f"[DEBUG] {entidad} - Ganador: {top1}, Segundo: {top2}")
-        
-        # MR efectivos: distribuir proporcionalmente entre 32 entidades
-        escanos_mr_por_entidad = escanos_mr_efectivos // 32
-        escanos_mr_extra = escanos_mr_efectivos % 32
-        
-        # PM: distribuir proporcionalmente entre 32 entidades
-        escanos_pm_por_entidad = escanos_pm // 32
-        escanos_pm_extra = escanos_pm % 32
-        
-        # Para esta entidad, calcular cuántos MR efectivos y PM le tocan
-        # Simplificación: distribuir uniformemente (después se puede sofisticar)
-        mr_esta_entidad = escanos_mr_por_entidad + (1 if i < escanos_mr_extra else 0)
-        pm_esta_entidad = escanos_pm_por_entidad + (1 if i < escanos_pm_extra else 0)
-        
-        print(f"[DEBUG] {entidad} - Asignación: {mr_esta_entidad} MR efectivos, {pm_esta_entidad} PM")
-        
-        # MR efectivos: asignar al ganador (aplicar reglas jurídicas usando siglado_map cuando exista)
-        for formula in range(1, mr_esta_entidad + 1):
-            gp = None
-            # intentar usar siglado_map si está disponible
-            try:
-                entk = normalize_entidad_ascii(entidad)
-                coalN = norm_ascii_up(str(top1)) if top1 is not None else ''
-                key = (entk, coalN, int(formula))
-                entry = siglado_map.get(key) if siglado_map else None
-            except Exception:
-                entry = None
-
-            if entry:
-                nominadores_set = set([canonizar_siglado(x) for x in entry.get('nominadores_set', set())])
-                ppn_gp = entry.get('ppn_gp', '')
-
-                SHH = {"MORENA", "PT", "PVEM"}
-                FCM = {"PAN", "PRI", "PRD"}
-
-                # tokens de la coalición ganadora (si aplica)
-                tokens = tokens_de_coalicion(coalN, anio) if coalN else []
-                tokens_set = set(tokens) if tokens else set()
-
-                # 1) nominadores == SHH y ganó SHH -> acreditar ppn_gp
-                if nominadores_set == SHH and tokens_set == SHH and ppn_gp:
-                    gp = ppn_gp
-                    if gp not in partidos_base and gp != 'CI':
-                        gp = None
-
-                # 2) nominadores == FCM y ganó FCM -> acreditar ppn_gp
-                if gp is None and nominadores_set == FCM and tokens_set == FCM and ppn_gp:
-                    gp = ppn_gp
-                    if gp not in partidos_base and gp != 'CI':
-                        gp = None
-
-                # 3) único nominador y coincide con ganador -> acreditar
-                if gp is None and len(nominadores_set) == 1:
-                    solo = list(nominadores_set)[0]
-                    if solo in partidos_base and (not tokens_set or solo in tokens_set or solo == norm_ascii_up(str(top1))):
-                        gp = solo
-
-            # fallback: usar gp_lookup como antes
-            if gp is None:
-                gp = gp_lookup(entidad, top1, formula, df_acred_est.iloc[i], gp_long, partidos_base, anio)
-
-            print(f"[DEBUG] {entidad} - MR F{formula}: {top1} -> {gp}")
-            if gp is not None:
-                if gp == "CI":
-                    indep += 1
-                elif gp in partidos_base:
-                    ssd[gp] += 1
-        
-        # PM: asignar al segundo lugar si hay PM para esta entidad
-        if pm_esta_entidad > 0 and top2 is not None:
-            for formula in range(1, pm_esta_entidad + 1):
-                gp2 = None
-                try:
-                    entk = normalize_entidad_ascii(entidad)
-                    coalN2 = norm_ascii_up(str(top2)) if top2 is not None else ''
-                    key2 = (entk, coalN2, int(formula))
-                    entry2 = siglado_map.get(key2) if siglado_map else None
-                except Exception:
-                    entry2 = None
-
-                if entry2:
-                    nominadores_set2 = set([canonizar_siglado(x) for x in entry2.get('nominadores_set', set())])
-                    ppn_gp2 = entry2.get('ppn_gp', '')
-
-                    SHH = {"MORENA", "PT", "PVEM"}
-                    FCM = {"PAN", "PRI", "PRD"}
-
-                    tokens2 = tokens_de_coalicion(coalN2, anio) if coalN2 else []
-                    tokens2_set = set(tokens2) if tokens2 else set()
-
-                    if nominadores_set2 == SHH and tokens2_set == SHH and ppn_gp2:
-                        gp2 = ppn_gp2 if ppn_gp2 in partidos_base or ppn_gp2 == 'CI' else None
-                    if gp2 is None and nominadores_set2 == FCM and tokens2_set == FCM and ppn_gp2:
-                        gp2 = ppn_gp2 if ppn_gp2 in partidos_base or ppn_gp2 == 'CI' else None
-                    if gp2 is None and len(nominadores_set2) == 1:
-                        solo2 = list(nominadores_set2)[0]
-                        if solo2 in partidos_base and (not tokens2_set or solo2 in tokens2_set or solo2 == norm_ascii_up(str(top2))):
-                            gp2 = solo2
-
-                if gp2 is None:
-                    gp2 = gp_lookup(entidad, top2, formula, df_acred_est.iloc[i], gp_long, partidos_base, anio)
-
-                print(f"[DEBUG] {entidad} - PM F{formula}: {top2} -> {gp2}")
-                if gp2 is not None:
-                    if gp2 == "CI":
-                        indep += 1
-                    elif gp2 in partidos_base:
-                        ssd[gp2] += 1
+    # Matriz entidad × coalición (suma de columnas en el orden de cand_cols)
+    votos = np.zeros((n_ent, len(coaliciones)))
+    pos_coal = {c: j for j, c in enumerate(coaliciones)}
+    for col in cand_cols:
+        coal = col2coal[col]
+        if col in df_boleta_est.columns and coal in pos_coal:
+            votos[:, pos_coal[coal]] += np.nan_to_num(df_boleta_est[col].to_numpy(dtype=float))
+    orden = np.argsort(-votos, axis=1, kind='stable')
+    top1 = orden[:, 0]
+    top2 = orden[:, 1] if len(coaliciones) >= 2 else None
+    
+    # MR efectivos y PM por entidad: reparto uniforme, el sobrante a las primeras
+    idx_ent = np.arange(n_ent)
+    mr_ent = escanos_mr_efectivos // 32 + (idx_ent < escanos_mr_efectivos % 32)
+    pm_ent = escanos_pm // 32 + (idx_ent < escanos_pm % 32)
+    if top2 is None:
+        pm_ent = np.zeros_like(pm_ent)
+    n_formulas = int(max(mr_ent.max(), pm_ent.max(), 0))
+    
+    # Tabla (entidad, coalición, fórmula) -> índice de partido (k_ci = CI, -1 = sin acreditar)
+    partidos_unicos = list(dict.fromkeys(partidos_base))
+    idx_partido = {p: k for k, p in enumerate(partidos_unicos)}
+    k_ci = len(partidos_unicos)
+    tabla = np.full((n_ent, len(coaliciones), max(n_formulas, 1)), -1, dtype=np.int64)
+    if n_formulas > 0:
+        indice_gp = _indice_siglado_sen(gp_long)
+        entidades = df_boleta_est['ENTIDAD'].tolist()
+        acred_rows = df_acred_est.to_dict('records')
+        for i in range(n_ent):
+            for j in {int(top1[i])} | ({int(top2[i])} if top2 is not None else set()):
+                for f in range(n_formulas):
+                    gp = _gp_formula(entidades[i], coaliciones[j], f + 1, acred_rows[i],
+                                     indice_gp, partidos_base, anio, siglado_map)
+                    if gp == "CI":
+                        tabla[i, j, f] = k_ci
+                    elif gp in idx_partido:
+                        tabla[i, j, f] = idx_partido[gp]
+    
+    # Fórmulas MR del ganador y PM del segundo lugar
+    formulas = np.arange(tabla.shape[2])
+    asignados = [tabla[idx_ent[:, None], top1[:, None], formulas[None, :]][formulas[None, :] < mr_ent[:, None]]]
+    if top2 is not None:
+        asignados.append(tabla[idx_ent[:, None], top2[:, None], formulas[None, :]][formulas[None, :] < pm_ent[:, None]])
+    asignados = np.concatenate(asignados)
+    conteo = np.bincount(asignados[asignados >= 0], minlength=k_ci + 1)
+    
+    for p in partidos_unicos:
+        ssd[p] = int(conteo[idx_partido[p]])
+    indep = int(conteo[k_ci])
     
     total_asignados = sum(ssd.values()) + indep
     total_esperado = escanos_mr_efectivos + escanos_pm
-    print(f"[DEBUG] Total MR+PM asignados: {total_asignados} (esperado: {total_esperado})")
-    print(f"[DEBUG] Detalle por partido: {ssd}")
-    print(f"[DEBUG] Independientes: {indep}")
+    log.debug("Total MR+PM asignados: %s (esperado: %s)", total_asignados, total_esperado)
+    log.debug("Detalle por partido: %s", ssd)
+    log.debug("Independientes: %s", indep)
     
     # Validar que se asignaron exactamente los escaños esperados
     if total_asignados != total_esperado:
-        print(f"[WARNING] Se asignaron {total_asignados} escaños MR+PM, esperado: {total_esperado}")
+        log.warning("Se asignaron %s escaños MR+PM, esperado: %s", total_asignados, total_esperado)
     
     return {'ssd_partidos': ssd, 'indep_mr_pm': indep}
 
@@ -477,8 +416,8 @@ def asigna_senado_RP(votos: Dict[str, int], threshold: float = 0.03, escanos_rp:
     """
     Asignación RP nacional para senado - traducción directa del R con validaciones
     """
-    print(f"[DEBUG] asigna_senado_RP con threshold={threshold}, escanos_rp={escanos_rp}")
-    print(f"[DEBUG] Votos entrada: {votos}")
+    log.debug("asigna_senado_RP con threshold=%s, escanos_rp=%s", threshold, escanos_rp)
+    log.debug("Votos entrada: %s", votos)
     
     # Convertir a arrays
     partidos = list(votos.keys())
@@ -500,22 +439,22 @@ def asigna_senado_RP(votos: Dict[str, int], threshold: float = 0.03, escanos_rp:
     if v_nacional.sum() > 0:
         v_nacional = v_nacional / v_nacional.sum()
     
-    print(f"[DEBUG] Porcentajes antes umbral: {dict(zip(partidos, v_valida))}")
-    print(f"[DEBUG] Porcentajes después umbral: {dict(zip(partidos, v_nacional))}")
+    log.debug(lambda: f"Porcentajes antes umbral: {dict(zip(partidos, v_valida))}")
+    log.debug(lambda: f"Porcentajes después umbral: {dict(zip(partidos, v_nacional))}")
     
     # VALIDACIÓN: Si no hay partidos que superen el umbral
     partidos_validos = np.sum(v_nacional > 0)
     if partidos_validos == 0:
-        print(f"[WARNING] Ningún partido supera umbral {threshold}. Retornando escaños vacíos.")
+        log.warning("Ningún partido supera umbral %s. Retornando escaños vacíos.", threshold)
         return {p: 0 for p in partidos}
     
     # Fórmula de resto mayor
     t = np.floor(v_nacional * escanos_rp + 1e-12).astype(int)
     u = escanos_rp - t.sum()
     
-    print(f"[DEBUG] Escaños base: {dict(zip(partidos, t))}")
-    print(f"[DEBUG] Escaños restantes a asignar: {u}")
-    print(f"[DEBUG] Partidos válidos: {partidos_validos}")
+    log.debug(lambda: f"Escaños base: {dict(zip(partidos, t))}")
+    log.debug("Escaños restantes a asignar: %s", u)
+    log.debug("Partidos válidos: %s", partidos_validos)
     
     if u > 0:
         # Calcular residuos solo para partidos con votos > 0
@@ -524,7 +463,7 @@ def asigna_senado_RP(votos: Dict[str, int], threshold: float = 0.03, escanos_rp:
         
         # VALIDACIÓN: Limitar u al número de partidos válidos
         u_safe = min(u, partidos_validos)
-        print(f"[DEBUG] u limitado de {u} a {u_safe}")
+        log.debug("u limitado de %s a %s", u, u_safe)
         
         # Ordenar por residuo descendente, con índice como desempate
         orden = np.lexsort((np.arange(len(rema)), -rema))
@@ -539,11 +478,11 @@ def asigna_senado_RP(votos: Dict[str, int], threshold: float = 0.03, escanos_rp:
                 t[idx] += 1
                 asignados += 1
         
-        print(f"[DEBUG] Escaños adicionales asignados: {asignados}")
+        log.debug("Escaños adicionales asignados: %s", asignados)
     
     resultado = {partidos[i]: int(t[i]) for i in range(len(partidos))}
-    print(f"[DEBUG] Resultado RP: {resultado}")
-    print(f"[DEBUG] Total RP asignados: {sum(resultado.values())}")
+    log.debug("Resultado RP: %s", resultado)
+    log.debug(lambda: f"Total RP asignados: {sum(resultado.values())}")
     
     return resultado
 
@@ -564,8 +503,8 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
         rp_seats: número de escaños RP
         pm_seats: número de escaños de primera minoría (sale de mr_seats)
     """
-    print(f"[DEBUG] procesar_senadores_v2 iniciando para año {anio}")
-    print(f"[DEBUG] Sistema: {sistema}, max_seats: {max_seats}, mr_seats: {mr_seats}, rp_seats: {rp_seats}, pm_seats: {pm_seats}")
+    log.debug("procesar_senadores_v2 iniciando para año %s", anio)
+    log.debug("Sistema: %s, max_seats: %s, mr_seats: %s, rp_seats: %s, pm_seats: %s", sistema, max_seats, mr_seats, rp_seats, pm_seats)
     
     # Configurar número de escaños según sistema
     if sistema == "mixto":
@@ -576,7 +515,7 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
         escanos_mr_efectivos = escanos_mr_total - escanos_pm  # MR puro
         escanos_rp = rp_seats if rp_seats is not None else 32
         
-        print(f"[DEBUG] Configuración mixta - MR total: {escanos_mr_total}, PM: {escanos_pm}, MR efectivo: {escanos_mr_efectivos}, RP: {escanos_rp}")
+        log.debug("Configuración mixta - MR total: %s, PM: %s, MR efectivo: %s, RP: %s", escanos_mr_total, escanos_pm, escanos_mr_efectivos, escanos_rp)
         
         # Validar que PM no sea mayor que MR disponible
         if escanos_pm > escanos_mr_total:
@@ -600,7 +539,7 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
     else:
         raise ValueError(f"Sistema no reconocido: {sistema}")
     
-    print(f"[DEBUG] Configuración final: {escanos_mr_total} MR total ({escanos_mr_efectivos} efectivo + {escanos_pm} PM) + {escanos_rp} RP = {escanos_mr_total + escanos_rp} total")
+    log.debug(lambda: f"Configuración final: {escanos_mr_total} MR total ({escanos_mr_efectivos} efectivo + {escanos_pm} PM) + {escanos_rp} RP = {escanos_mr_total + escanos_rp} total")
     
     if partidos_base is None:
         if anio == 2018:
@@ -675,121 +614,88 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                     manual_ssd.setdefault(p, 0)
                 manual_override = True
     except Exception as e:
-        print(f"[WARN] Error procesando overrides manuales en senado: {e}")
+        log.warning("Error procesando overrides manuales en senado: %s", e)
     
     try:
         # 1) Leer datos de boletas
-        print(f"[DEBUG] Leyendo parquet: {path_parquet}")
+        log.debug("Leyendo parquet: %s", path_parquet)
         if not os.path.exists(path_parquet):
             raise FileNotFoundError(f"No existe: {path_parquet}")
         
-        df_boletas = pd.read_parquet(path_parquet)
-        print(f"[DEBUG] Boletas shape: {df_boletas.shape}")
-        print(f"[DEBUG] Boletas columnas: {df_boletas.columns.tolist()}")
-        
-        # Normalizar columnas
-        df_boletas.columns = [norm_ascii_up(c) for c in df_boletas.columns]
-        
-        # Normalizar entidades
-        if 'ENTIDAD' in df_boletas.columns:
-            df_boletas['ENTIDAD'] = df_boletas['ENTIDAD'].apply(
-                lambda x: x.decode('utf-8', errors='replace') if isinstance(x, bytes) else str(x)
-            )
-            df_boletas['ENTIDAD'] = df_boletas['ENTIDAD'].apply(normalize_entidad_ascii)
+        # Boletas normalizadas (columnas y ENTIDAD), servidas desde el store del proceso
+        df_boletas = obtener_boletas(path_parquet)
+        log.debug("Boletas shape: %s", df_boletas.shape)
+        log.debug(lambda: f"Boletas columnas: {df_boletas.columns.tolist()}")
         
         # 1.5) NUEVO: Agregar coaliciones automáticamente basadas en el siglado
         coaliciones_agregadas = False
         coaliciones_en_siglado = None  # Variable para detectar si existen coaliciones
         
         if path_siglado:
-            print(f"[DEBUG] Extrayendo coaliciones del siglado: {path_siglado}")
-            coaliciones_en_siglado = extraer_coaliciones_de_siglado(path_siglado)
+            log.debug("Extrayendo coaliciones del siglado: %s", path_siglado)
+            coaliciones_en_siglado = dataset_store.obtener(path_siglado, 'coaliciones_sen', extraer_coaliciones_de_siglado)
             
             if coaliciones_en_siglado:
-                print(f"[DEBUG] Coaliciones encontradas en siglado: {coaliciones_en_siglado}")
+                log.debug("Coaliciones encontradas en siglado: %s", coaliciones_en_siglado)
                 
                 if usar_coaliciones:
-                    print(f"[DEBUG] Agregando columnas de coalición al dataset")
+                    log.debug("Agregando columnas de coalición al dataset")
                     df_boletas = agregar_columnas_coalicion(df_boletas, coaliciones_en_siglado)
                     coaliciones_agregadas = True
-                    print(f"[DEBUG] Dataset con coaliciones shape: {df_boletas.shape}")
+                    log.debug("Dataset con coaliciones shape: %s", df_boletas.shape)
                 else:
-                    print(f"[DEBUG] Coaliciones DESACTIVADAS por parámetro usar_coaliciones=False")
-                    print(f"[DEBUG] Se aplicará desagregación de votos para contrafactual")
+                    log.debug("Coaliciones DESACTIVADAS por parámetro usar_coaliciones=False")
+                    log.debug("Se aplicará desagregación de votos para contrafactual")
             else:
-                print(f"[DEBUG] No se detectaron coaliciones en el siglado")
+                log.debug("No se detectaron coaliciones en el siglado")
         
         # 2) Recomposición usando el sistema existente (solo si no agregamos coaliciones)
         if coaliciones_agregadas:
-            print(f"[DEBUG] Saltando recomposición: ya tenemos coaliciones del siglado")
+            log.debug("Saltando recomposición: ya tenemos coaliciones del siglado")
             recomposed = df_boletas
         else:
             # Si se proporcionó siglado, usar la regla con siglado; si no, usar la regla por defecto sin siglado
             if path_siglado:
-                print(f"[DEBUG] Realizando recomposición con siglado: {path_siglado}")
+                log.debug("Realizando recomposición con siglado: %s", path_siglado)
                 recomposed = recompose_coalitions(
                     df=df_boletas,
                     year=anio,
                     chamber="senado", 
-                    rule="equal_residue_siglado",
+                    rule="equal_residue_siglado_vec",
                     siglado_path=path_siglado
                 )
             else:
-                print(f"[DEBUG] Realizando recomposición SIN siglado (equal_residue_solo)")
+                log.debug("Realizando recomposición SIN siglado (equal_residue_solo)")
                 recomposed = recompose_coalitions(
                     df=df_boletas,
                     year=anio,
                     chamber="senado", 
-                    rule="equal_residue_solo",
+                    rule="equal_residue_solo_vec",
                     siglado_path=None
                 )
-        print(f"[DEBUG] Recomposición completada, shape: {recomposed.shape}")
+        log.debug("Recomposición completada, shape: %s", recomposed.shape)
         
         # 3) Crear df_acred_est (votos por entidad y partido)
         # Sumar votos por entidad para cada partido
         df_acred_est = recomposed.groupby('ENTIDAD')[partidos_base].sum().reset_index()
-        print(f"[DEBUG] Acreditación por entidad shape: {df_acred_est.shape}")
+        log.debug("Acreditación por entidad shape: %s", df_acred_est.shape)
         
         # 4) Leer siglado (si fue provisto)
         if path_siglado:
-            print(f"[DEBUG] Leyendo siglado: {path_siglado}")
-            gp_long = read_siglado_sen_long(path_siglado)
-            print(f"[DEBUG] Siglado shape: {gp_long.shape}")
+            log.debug("Leyendo siglado: %s", path_siglado)
+            gp_long = dataset_store.obtener(path_siglado, 'siglado_sen_long', read_siglado_sen_long)
+            log.debug("Siglado shape: %s", gp_long.shape)
 
-            # 4.5) Construir siglado_map: llave (ENTIDAD_ASCII, COALICION, FORMULA) -> {nominadores_set, ppn_gp}
-            siglado_map = {}
+            # 4.5) siglado_map: llave (ENTIDAD_ASCII, COALICION, FORMULA) -> {nominadores_set, ppn_gp}
+            # Compartido (solo lectura) desde el store del proceso
             try:
-                grouped = gp_long.groupby(['ENTIDAD_ASCII', 'COALICION', 'FORMULA'])
-                for key, dfg in grouped:
-                    entk, coalN, formula = key
-                    nominadores = set()
-                    gps = set()
-                    # PARTIDO_ORIGEN puede contener el partido nominador
-                    if 'PARTIDO_ORIGEN' in dfg.columns:
-                        for v in dfg['PARTIDO_ORIGEN'].unique():
-                            if pd.notna(v) and str(v).strip() != '':
-                                nominadores.add(canonizar_siglado(v))
-                    # GRUPO_PARLAMENTARIO puede indicar el grupo parlamentario a acreditar
-                    for g in dfg['GRUPO_PARLAMENTARIO'].unique():
-                        if pd.notna(g) and str(g).strip() != '':
-                            gps.add(canonizar_siglado(g))
-
-                    ppn_gp = ''
-                    if len(gps) == 1:
-                        ppn_gp = list(gps)[0]
-                    elif len(gps) > 1:
-                        print(f"[WARN] Múltiples GRUPO_PARLAMENTARIO para {key}: {gps}; ignorando ppn_gp")
-
-                    siglado_map[(normalize_entidad_ascii(entk), norm_ascii_up(coalN), int(formula))] = {
-                        'nominadores_set': nominadores,
-                        'ppn_gp': ppn_gp
-                    }
-                print(f"[DEBUG] siglado_map construido con {len(siglado_map)} entradas")
+                siglado_map = dataset_store.obtener(path_siglado, 'siglado_map_sen', _construir_siglado_map_sen, copiar=False)
+                log.debug(lambda: f"siglado_map construido con {len(siglado_map)} entradas")
             except Exception as e:
-                print(f"[WARN] No se pudo construir siglado_map: {e}")
+                log.warning("No se pudo construir siglado_map: %s", e)
                 siglado_map = None
         else:
-            print(f"[DEBUG] No se proporcionó path_siglado; gp_long vacío y sin siglado_map")
+            log.debug("No se proporcionó path_siglado; gp_long vacío y sin siglado_map")
             gp_long = pd.DataFrame(columns=['ENTIDAD_ASCII','COALICION','FORMULA','GRUPO_PARLAMENTARIO','PARTIDO_ORIGEN'])
             siglado_map = None
         
@@ -809,12 +715,12 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
             ssd = mrpm_result['ssd_partidos']
             indep_mr_pm = mrpm_result['indep_mr_pm']
             
-            print(f"[DEBUG] MR+PM por partido: {ssd}")
-            print(f"[DEBUG] Independientes MR+PM: {indep_mr_pm}")
+            log.debug("MR+PM por partido: %s", ssd)
+            log.debug("Independientes MR+PM: %s", indep_mr_pm)
             
             # Ajustar proporcionalmente si el total no coincide con el esperado
             total_mr_pm_original = sum(ssd.values()) + indep_mr_pm
-            print(f"[DEBUG] Total MR+PM original: {total_mr_pm_original}, esperado: {escanos_mr_total}")
+            log.debug("Total MR+PM original: %s, esperado: %s", total_mr_pm_original, escanos_mr_total)
             
             if total_mr_pm_original != escanos_mr_total and total_mr_pm_original > 0:
                 # Ajustar proporcionalmente
@@ -838,21 +744,21 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                             ssd_ajustado[p] += 1 if diferencia > 0 else -1
                 
                 ssd = ssd_ajustado
-                print(f"[DEBUG] MR+PM ajustado: {ssd}")
+                log.debug("MR+PM ajustado: %s", ssd)
         else:
             ssd = {p: 0 for p in partidos_base}
             indep_mr_pm = 0
         
         # 6) Calcular RP nacional (solo si aplica)
         votos_nacionales = {p: int(recomposed[p].sum()) for p in partidos_base}
-        print(f"[DEBUG] Votos nacionales: {votos_nacionales}")
+        log.debug("Votos nacionales: %s", votos_nacionales)
         
         # 6.5) CRÍTICO: Si usar_coaliciones=False, desagregar votos de coalición
         # Esto implementa el contrafactual: "como si nunca hubieran competido juntos"
         coaliciones_detectadas = coaliciones_en_siglado is not None and len(coaliciones_en_siglado) > 0
         
         if not usar_coaliciones and coaliciones_detectadas:
-            print(f"[INFO] DESAGREGANDO votos de coalición (contrafactual: competencia separada)")
+            log.info("DESAGREGANDO votos de coalición (contrafactual: competencia separada)")
             
             # Identificar coaliciones por año (senado)
             coaliciones_por_anio = {
@@ -865,7 +771,7 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
             if partidos_coalicion and all(p in votos_nacionales for p in partidos_coalicion):
                 # Calcular total de votos de la coalición
                 total_coalicion = sum(votos_nacionales[p] for p in partidos_coalicion)
-                print(f"[DEBUG] Total votos coalición {partidos_coalicion}: {total_coalicion:,}")
+                log.debug(lambda: f"Total votos coalición {partidos_coalicion}: {total_coalicion:,}")
                 
                 # Intentar cargar proporciones del año de referencia (año-3 o año-6)
                 proporciones = {}
@@ -874,8 +780,8 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                 path_ref = f"data/computos_senado_{anio_ref}.parquet"
                 if os.path.exists(path_ref):
                     try:
-                        df_ref = pd.read_parquet(path_ref)
-                        print(f"[DEBUG] Cargando proporciones históricas desde {anio_ref}")
+                        df_ref = obtener_boletas(path_ref)
+                        log.debug("Cargando proporciones históricas desde %s", anio_ref)
                         
                         # Calcular totales nacionales del año de referencia
                         totales_ref = {}
@@ -890,15 +796,15 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                             for p in partidos_coalicion:
                                 prop = totales_ref.get(p, 0) / total_ref
                                 proporciones[p] = prop
-                                print(f"[DEBUG]   {p}: {totales_ref.get(p, 0):,} votos ({prop*100:.2f}%)")
+                                log.debug(lambda: f"{p}: {totales_ref.get(p, 0):,} votos ({prop*100:.2f}%)")
                         else:
-                            print(f"[WARN] Total de referencia es 0, usando proporciones por defecto")
+                            log.warning("Total de referencia es 0, usando proporciones por defecto")
                     except Exception as e:
-                        print(f"[WARN] Error cargando año de referencia {anio_ref}: {e}")
+                        log.warning("Error cargando año de referencia %s: %s", anio_ref, e)
                 
                 # Proporciones por defecto si no hay datos históricos
                 if not proporciones:
-                    print(f"[DEBUG] Usando proporciones por defecto para {anio}")
+                    log.debug("Usando proporciones por defecto para %s", anio)
                     if anio == 2024:
                         proporciones = {'MORENA': 0.75, 'PT': 0.10, 'PVEM': 0.15}
                     elif anio == 2018:
@@ -909,16 +815,16 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                         proporciones = {p: 1.0/n_partidos for p in partidos_coalicion}
                 
                 # Redistribuir votos según proporciones
-                print(f"[DEBUG] Redistribuyendo {total_coalicion:,} votos según proporciones:")
+                log.debug(lambda: f"Redistribuyendo {total_coalicion:,} votos según proporciones:")
                 for p in partidos_coalicion:
                     votos_desagregados = int(total_coalicion * proporciones.get(p, 0))
                     votos_originales = votos_nacionales[p]
                     votos_nacionales[p] = votos_desagregados
-                    print(f"[DEBUG]   {p}: {votos_originales:,} -> {votos_desagregados:,} ({proporciones.get(p, 0)*100:.1f}%)")
+                    log.debug(lambda: f"{p}: {votos_originales:,} -> {votos_desagregados:,} ({proporciones.get(p, 0)*100:.1f}%)")
                 
-                print(f"[DEBUG] Votos nacionales después de desagregación: {votos_nacionales}")
+                log.debug("Votos nacionales después de desagregación: %s", votos_nacionales)
             else:
-                print(f"[DEBUG] No se pudo identificar coalición para desagregar en {anio}")
+                log.debug("No se pudo identificar coalición para desagregar en %s", anio)
         
         if escanos_mr_total > 0:
             # Si el usuario proporcionó un override manual de MR nacional, usarlo
@@ -931,15 +837,15 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                     suma_manual = None
 
                 if suma_manual is None:
-                    print(f"[WARN] Override manual proporcionado pero no se pudo interpretar los totales: {manual_ssd}")
+                    log.warning("Override manual proporcionado pero no se pudo interpretar los totales: %s", manual_ssd)
                 elif suma_manual == escanos_mr_total:
-                    print(f"[INFO] Aplicando override manual MR nacional: {manual_ssd}")
+                    log.info("Aplicando override manual MR nacional: %s", manual_ssd)
                     ssd = {p: int(manual_ssd.get(p, 0)) for p in partidos_base}
                     indep_mr_pm = 0
                     use_manual_override_now = True
                 else:
                     # No aplicar override nacional si es parcial (por ejemplo solo 2/32 estados)
-                    print(f"[WARN] mr_distritos_por_estado provisto pero la suma nacional ({suma_manual}) != MR_total esperado ({escanos_mr_total}). Ignorando override nacional. Se preservará el desglose por estado en meta.")
+                    log.warning("mr_distritos_por_estado provisto pero la suma nacional (%s) != MR_total esperado (%s). Ignorando override nacional. Se preservará el desglose por estado en meta.", suma_manual, escanos_mr_total)
             else:
                 # mrpm_result debería existir si se calculó antes; si no, calcular aquí
                 if 'mrpm_result' not in locals() or mrpm_result is None:
@@ -995,10 +901,10 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
             if not manual_override and 'mrpm_result' in locals() and mrpm_result is not None:
                 ssd = mrpm_result.get('ssd_partidos', ssd)
                 indep_mr_pm = mrpm_result.get('indep_mr_pm', indep_mr_pm if 'indep_mr_pm' in locals() else 0)
-                print(f"[DEBUG] MR+PM por partido: {ssd}")
-                print(f"[DEBUG] Independientes MR+PM: {indep_mr_pm}")
+                log.debug("MR+PM por partido: %s", ssd)
+                log.debug("Independientes MR+PM: %s", indep_mr_pm)
             else:
-                print(f"[DEBUG] MR+PM establecidos por override manual: {ssd}")
+                log.debug("MR+PM establecidos por override manual: %s", ssd)
 
             mr_pm = int(ssd.get(p, 0))
             rp_p = int(rp_result.get(p, 0)) if 'rp_result' in locals() else 0
@@ -1060,7 +966,7 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
             # PRIORIDAD: Si el cliente envió mr_distritos_por_estado (manual_mr_por_estado_input),
             # usar ESE desglose geográfico directamente en lugar de recalcularlo
             if manual_mr_por_estado_input and isinstance(manual_mr_por_estado_input, dict):
-                print(f"[INFO] ✅ Usando mr_por_estado manual del cliente (micro-ediciones por estado)")
+                log.info("✅ Usando mr_por_estado manual del cliente (micro-ediciones por estado)")
                 
                 # Mapeo de IDs a nombres de estado
                 estado_nombres = {
@@ -1104,13 +1010,13 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                         mr_por_estado[abrev_estado] = partidos_estado
                         senadores_por_estado[abrev_estado] = 3  # Cada estado tiene 3 senadores
                 
-                print(f"[DEBUG] mr_por_estado manual cargado: {len(mr_por_estado)} estados")
+                log.debug(lambda: f"mr_por_estado manual cargado: {len(mr_por_estado)} estados")
                 for estado, partidos_dict in list(mr_por_estado.items())[:3]:
-                    print(f"  {estado}: {partidos_dict}")
+                    log.debug("%s: %s", estado, partidos_dict)
             
             # Si NO hay override manual, calcular mr_por_estado usando eficiencias geográficas
             elif 'recomposed' in locals() and recomposed is not None and 'ENTIDAD' in recomposed.columns and ssd:
-                print(f"[DEBUG] Distribuyendo senadores FINALES geográficamente: {ssd}")
+                log.debug("Distribuyendo senadores FINALES geográficamente: %s", ssd)
                 
                 estados_unicos = recomposed['ENTIDAD'].unique()
                 
@@ -1193,7 +1099,7 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                     elif senadores_final > 0 and base_partido == 0:
                         # Caso especial: partido tiene senadores finales pero no ganó estados
                         # Distribuir uniformemente
-                        print(f"[DEBUG] ADVERTENCIA: {partido} tiene {senadores_final} senadores pero 0 base - distribuyendo uniformemente")
+                        log.debug("ADVERTENCIA: %s tiene %s senadores pero 0 base - distribuyendo uniformemente", partido, senadores_final)
                         
                         asignados_total = 0
                         residuos = []
@@ -1219,12 +1125,12 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                 
                 total_senadores = sum(sum(partidos.values()) for partidos in mr_por_estado.values())
                 total_ssd = sum(ssd.values())
-                print(f"[DEBUG] Desglosados {total_senadores}/{total_ssd} senadores en {len(mr_por_estado)} estados")
+                log.debug(lambda: f"Desglosados {total_senadores}/{total_ssd} senadores en {len(mr_por_estado)} estados")
             
             # FALLBACK: Distribución proporcional si no hay datos de votos
             else:
                 import math
-                print(f"[DEBUG] FALLBACK: Distribución proporcional (sin datos de votos)")
+                log.debug("FALLBACK: Distribución proporcional (sin datos de votos)")
                 
                 # Nombres de estados
                 estado_nombres = {
@@ -1285,7 +1191,7 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                         diferencia_partido = objetivo - total_asignado
                         
                         if diferencia_partido != 0:
-                            print(f"[DEBUG] Ajustando {partido}: {total_asignado} → {objetivo} (dif: {diferencia_partido:+d})")
+                            log.debug(lambda: f"Ajustando {partido}: {total_asignado} → {objetivo} (dif: {diferencia_partido:+d})")
                         
                         # Ajustar estado por estado
                         while diferencia_partido != 0:
@@ -1306,12 +1212,12 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
                                 mr_por_estado[estado_a_ajustar][partido] -= 1
                                 diferencia_partido += 1
                     
-                    print(f"[DEBUG] Distribución geográfica (fallback) calculada para {len(mr_por_estado)} estados")
+                    log.debug(lambda: f"Distribución geográfica (fallback) calculada para {len(mr_por_estado)} estados")
         
         except Exception as e:
             # Use repr(e) to avoid printing raw Unicode characters (e.g., emojis)
             # which on some Windows terminals (charmap) raise a codec error.
-            print(f"[ERROR] Error calculando mr_por_estado: {repr(e)}")
+            log.error(lambda: f"Error calculando mr_por_estado: {repr(e)}")
             # Crear estructura vacía para evitar errores
             mr_por_estado = {}
             senadores_por_estado = {}
@@ -1338,32 +1244,32 @@ def procesar_senadores_v2(path_parquet: str, anio: int, path_siglado: str,
             }
         }
         
-        print(f"[DEBUG] Resultado final:")
-        print(f"[DEBUG] - MR+PM: {resultado['mr']}")
-        print(f"[DEBUG] - RP: {resultado['rp']}")
-        print(f"[DEBUG] - Totales: {resultado['tot']}")
-        print(f"[DEBUG] - Seat chart: {len(seat_chart)} partidos")
-        print(f"[DEBUG] - Distribución geográfica: {len(mr_por_estado)} estados")
+        log.debug("Resultado final:")
+        log.debug("- MR+PM: %s", resultado['mr'])
+        log.debug("- RP: %s", resultado['rp'])
+        log.debug("- Totales: %s", resultado['tot'])
+        log.debug(lambda: f"- Seat chart: {len(seat_chart)} partidos")
+        log.debug(lambda: f"- Distribución geográfica: {len(mr_por_estado)} estados")
         
         # Validación final
         total_escanos = sum(resultado['tot'].values())
         escanos_esperados = escanos_mr_total + escanos_rp
         if total_escanos != escanos_esperados:
-            print(f"[WARNING] Total escaños = {total_escanos}, esperado {escanos_esperados}")
+            log.warning("Total escaños = %s, esperado %s", total_escanos, escanos_esperados)
         else:
-            print(f"[SUCCESS] Total escaños correcto: {total_escanos}")
+            log.debug("Total escaños correcto: %s", total_escanos)
         
         # Validar coherencia geográfica
         for partido in partidos_base:
             total_geo = sum(mr_por_estado[estado].get(partido, 0) for estado in mr_por_estado)
             mr_nacional = ssd.get(partido, 0)
             if total_geo != mr_nacional:
-                print(f"[WARNING] Coherencia geográfica - {partido}: geo={total_geo}, nacional={mr_nacional}")
+                log.warning("Coherencia geográfica - %s: geo=%s, nacional=%s", partido, total_geo, mr_nacional)
         
         return resultado
         
     except Exception as e:
-        print(f"[ERROR] procesar_senadores_v2: {e}")
+        log.error("procesar_senadores_v2: %s", e)
         import traceback
         traceback.print_exc()
         
@@ -1,64 +1,38 @@
 # recomposicion.py
 from __future__ import annotations
 from typing import Dict, List, Tuple, Optional
+from collections import OrderedDict
+import hashlib
+import os
 import re
 import math
+import threading
+import numpy as np
 import pandas as pd
 
-# ======================== Config por año/cámara ========================
-
-PARTIDOS_2018 = ["PAN","PRI","PRD","PVEM","PT","MC","MORENA","PES","NA"]
-PARTIDOS_2021 = ["PAN","PRI","PRD","PVEM","PT","MC","MORENA","PES","RSP","FXM"]
-PARTIDOS_2024 = ["PAN","PRI","PRD","PVEM","PT","MC","MORENA"]
-ALL_PARTIES = sorted(set(PARTIDOS_2018 + PARTIDOS_2021 + PARTIDOS_2024 + ["NA","PES","RSP","FXM","CI"]))
+from . import dataset_store
 
-import re
-import unicodedata
+# ======================== Config por año/cámara ========================
 
+from .partidos import (  # noqa: F401  (re-exportados: otros módulos los importan de aquí)
+    ALL_PARTIES, PARTIDOS_2018, PARTIDOS_2021, PARTIDOS_2024,
+    canonizar_siglado, norm_ascii_up, parties_for, registro_partidos, split_tokens,
+)
 
-def parties_for(year: int) -> List[str]:
-    if year == 2018:
-        return PARTIDOS_2018
-    if year == 2021:
-        return PARTIDOS_2021
-    if year == 2024:
-        return PARTIDOS_2024
-    # fallback: universo completo sin duplicados
-    return [p for p in ALL_PARTIES if p != "CI"]
 
 def _normalize_text(s: str) -> str:
     # alias que usan los loaders de siglado
     return norm_ascii_up(s)
 
 def _tokens_from_col(col: str) -> List[str]:
-    if not col:
-        return []
-    return [t for t in re.split(r"[-_]", col.upper()) if t]
-
-def split_tokens(col: str) -> List[str]:
-    # corregida: NO recursiva
-    return _tokens_from_col(col)
+    return list(split_tokens(col))
 
 def _is_candidate_col(col: str, year: int) -> bool:
-    toks = _tokens_from_col(col)
-    if not toks:
-        return False
-    valid = set(parties_for(year) + ["CI"])
-    return all(t in valid for t in toks)
+    return registro_partidos(year).mascara_columna(col) != 0
 
 def _is_coalition_col(col: str, year: int) -> bool:
-    toks = _tokens_from_col(col)
-    if not toks:
-        return False
-    valid = set(parties_for(year))
-    return (len(toks) >= 2) and all(t in valid for t in toks)
-
-def norm_ascii_up(s: str) -> str:
-    if s is None: return ""
-    s = str(s).strip().upper()
-    s = unicodedata.normalize("NFKD", s).encode("ASCII", "ignore").decode("ASCII")
-    s = re.sub(r"\s+", " ", s)
-    return s
+    reg = registro_partidos(year)
+    return reg.es_coalicion(reg.mascara_columna(col))
 
 def normalize_entidad_ascii(x: str) -> str:
     x = norm_ascii_up(x)
@@ -72,76 +46,10 @@ def normalize_entidad_ascii(x: str) -> str:
     x = x.replace("COAHUILA DE ZARAGOZA", "COAHUILA")
     return x
 
-def canonizar_siglado(x: str) -> str:
-    y = norm_ascii_up(x)
-    y = re.sub(r"\bGRUPO PARLAMENTARIO\b|\bGP\b|\bPARTIDO\b", "", y)
-    y = re.sub(r"\s+", " ", y).strip()
-    # siglas partidos:
-    y = re.sub(r"\bMOVIMIENTO CIUDADANO\b|\bMC\b", "MC", y)
-    y = re.sub(r"\bVERDE\b|PARTIDO VERDE|\bPVEM\b|\bP V E M\b", "PVEM", y)
-    y = re.sub(r"ENCUENTRO SOCIAL|ENCUENTRO SOLIDARIO|\bPES\b", "PES", y)
-    y = re.sub(r"FUERZA POR MEXICO|\bFXM\b", "FXM", y)
-    y = re.sub(r"\bMORENA\b", "MORENA", y)
-    y = re.sub(r"PARTIDO DEL TRABAJO|\bPT\b", "PT", y)
-    y = re.sub(r"PARTIDO ACCION NACIONAL|\bPAN\b", "PAN", y)
-    y = re.sub(r"PARTIDO REVOLUCIONARIO INSTITUCIONAL|\bPRI\b", "PRI", y)
-    y = re.sub(r"PARTIDO DE LA REVOLUCION DEMOCRATICA|\bPRD\b", "PRD", y)
-    y = re.sub(r"NUEVA ALIANZA|\bNA\b|\bPANAL\b", "NA", y)
-    # coaliciones 2018 (texto canónico sin acentos):
-    y = y.replace("JUNTOS HAREMOS HISTORIA", "JUNTOS HAREMOS HISTORIA")
-    y = y.replace("POR MEXICO AL FRENTE", "POR MEXICO AL FRENTE")
-    y = y.replace("TODOS POR MEXICO", "TODOS POR MEXICO")
-    # 2024
-    y = y.replace("SIGAMOS HACIENDO HISTORIA", "SIGAMOS HACIENDO HISTORIA")
-    y = y.replace("FUERZA Y CORAZON POR MEXICO", "FUERZA Y CORAZON POR MEXICO")
-    return y
-
-
 def canonizar_coalicion(tokens, anio):
-    S = sorted(set(t.upper().strip() for t in tokens if t))
-    if anio == 2018:
-        if set(S) == {"MORENA", "PT", "PES"}:
-            return "JUNTOS HAREMOS HISTORIA"
-        if set(S) == {"PAN", "PRD", "MC"}:
-            return "POR MEXICO AL FRENTE"
-        if set(S) == {"PRI", "PVEM", "NA"}:
-            return "TODOS POR MEXICO"
-        if len(S) == 1 and S[0] in {"PAN", "PRI", "PRD", "PVEM", "PT", "MC", "MORENA", "PES", "NA", "CI"}:
-            return S[0]
-        return None
-    if anio == 2021:
-        if set(S) == {"PAN", "PRI", "PRD"}:
-            return "VA POR MEXICO"
-        if len(S) == 1 and S[0] in {"PAN", "PRI", "PRD", "PVEM", "PT", "MC", "MORENA", "PES", "RSP", "FXM", "CI"}:
-            return S[0]
-        return None
-    if anio == 2024:
-        if set(S) == {"MORENA", "PT", "PVEM"}:
-            return "SIGAMOS HACIENDO HISTORIA"
-        if set(S) == {"PAN", "PRI", "PRD"}:
-            return "FUERZA Y CORAZON POR MEXICO"
-        if len(S) == 1 and S[0] in {"PAN", "PRI", "PRD", "PVEM", "PT", "MC", "MORENA", "CI"}:
-            return S[0]
-        return None
-    return None
-
-
-def split_tokens(col: str):
-    if not col:
-        return []
-    return [t for t in re.split(r"[-_]", col.upper()) if t]
-
-def _is_candidate_col(col: str, year: int) -> bool:
-    toks = _tokens_from_col(col)
-    if not toks: return False
-    valid = set(parties_for(year) + ["CI"])
-    return all(t in valid for t in toks)
-
-def _is_coalition_col(col: str, year: int) -> bool:
-    toks = _tokens_from_col(col)
-    if not toks: return False
-    valid = set(parties_for(year))
-    return len(toks) >= 2 and all(t in valid for t in toks)
+    """Coalición oficial (o partido solo) del año para esos tokens; None si no aplica."""
+    reg = registro_partidos(anio)
+    return reg.coalicion(reg.mascara(t.upper().strip() for t in tokens if t))
 
 def _solo_party_cols(df: pd.DataFrame, party: str) -> List[str]:
     patt = re.compile(rf"(^|[-_]){re.escape(party)}($|[-_])")
@@ -150,30 +58,9 @@ def _solo_party_cols(df: pd.DataFrame, party: str) -> List[str]:
 # ==================== Siglado (mapas por fila) ====================
 
 def _load_siglado_dip(path_csv: str) -> pd.DataFrame:
-    """Esperado: columnas (entidad|entidad_ascii), (distrito), coalicion, grupo_parlamentario|partido_origen"""
-    gp = pd.read_csv(path_csv, dtype=str, encoding="utf-8", keep_default_na=False)
-    gp.columns = [c.strip().lower() for c in gp.columns]
-    # normaliza llaves
-    if "entidad_ascii" in gp.columns:
-        gp["entidad_key"] = gp["entidad_ascii"].map(_normalize_text)
-    elif "entidad" in gp.columns:
-        gp["entidad_key"] = gp["entidad"].map(_normalize_text)
-    else:
-        raise ValueError("Siglado DIP: falta columna ENTIDAD/entidad_ascii.")
-    if "distrito" not in gp.columns:
-        raise ValueError("Siglado DIP: falta columna DISTRITO.")
-    gp["distrito"] = gp["distrito"].astype(str).str.extract(r"(\d+)").fillna("0").astype(int)
-    # toma GP o partido_origen
-    gp["dominante"] = gp.get("grupo_parlamentario", "").fillna("") \
-        .where(gp.get("grupo_parlamentario", "").astype(str).str.len()>0,
-               gp.get("partido_origen", ""))
-    gp["dominante"] = gp["dominante"].map(_normalize_text)
-    # clave de coalición 
-    if "coalicion" in gp.columns:
-        gp["coalicion_key"] = gp["coalicion"].map(_normalize_text)
-    else:
-        gp["coalicion_key"] = ""
-    return gp[["entidad_key","distrito","coalicion_key","dominante"]]
+    """Columnas entidad_key, distrito, coalicion_key, dominante desde el índice compilado del siglado."""
+    from .siglado_indice import obtener_indice
+    return obtener_indice(path_csv).como_dataframe()
 
 def _load_siglado_sen(path_csv: str) -> pd.DataFrame:
     """Esperado: columnas ENTIDAD, COALICION, FORMULA, GRUPO_PARLAMENTARIO|PARTIDO_ORIGEN"""
@@ -235,17 +122,172 @@ def parties_for_guess(tokens: List[str]) -> List[str]:
 
 # ================== Recomposición principal ==================
 
+# ================== Residuos vectorizados ==================
+
+VECTORIZED_SUFFIX = "_vec"
+
+def _dominant_index(df: pd.DataFrame, sig_map: pd.DataFrame, chamber: str) -> np.ndarray:
+    """
+    Dominante del siglado por fila de df (o "" si no hay entrada), resuelto con un
+    solo join sobre (entidad, distrito) en diputados o entidad en senado.
+    Replica el "primer renglón" que usan _pick_residue_siglado_dip/_sen.
+    """
+    ent = df["ENTIDAD"].astype(str).map(_normalize_text) if "ENTIDAD" in df.columns \
+        else pd.Series([""] * len(df), index=df.index)
+    if chamber == "diputados":
+        if "DISTRITO" in df.columns:
+            dist = df["DISTRITO"].astype(str).str.extract(r"(\d+)", expand=False).fillna("0").astype(int)
+        else:
+            dist = pd.Series(0, index=df.index)
+        keys = pd.DataFrame({"entidad_key": ent.to_numpy(), "distrito": dist.to_numpy()})
+        idx = sig_map.drop_duplicates(["entidad_key", "distrito"], keep="first")[["entidad_key", "distrito", "dominante"]]
+        joined = keys.merge(idx, on=["entidad_key", "distrito"], how="left")
+        dom = joined["dominante"]
+    else:
+        keys = pd.DataFrame({"ENTIDAD_KEY": ent.to_numpy()})
+        idx = sig_map.drop_duplicates(["ENTIDAD_KEY"], keep="first")[["ENTIDAD_KEY", "DOMINANTE"]]
+        dom = keys.merge(idx, on="ENTIDAD_KEY", how="left")["DOMINANTE"]
+    return dom.fillna("").astype(str).to_numpy()
+
+def _assign_coalitions_vectorized(out: pd.DataFrame, df: pd.DataFrame, coal_cols: List[str],
+                                  parties: List[str], chamber: str, rule: str,
+                                  sig_map: Optional[pd.DataFrame], year: int) -> None:
+    """
+    Versión NumPy del reparto por coalición: V // k a cada miembro y el residuo
+    V % k completo a un solo partido (dominante del siglado si es miembro; si no,
+    el miembro con más voto "solo", primer token en empates). Modifica out.
+
+    Los partidos son columnas de una matriz (índices del registro del año) y cada
+    coalición una máscara: la pertenencia del dominante es un AND de bits por fila.
+    """
+    if not coal_cols:
+        return
+    n = len(df)
+    reg = registro_partidos(year)
+    filas = np.arange(n)
+    idx_parties = [reg.indice(p) for p in parties]
+
+    acc = np.zeros((n, len(reg.partidos)))
+    solo = np.zeros((n, len(reg.partidos)))
+    for p, i in zip(parties, idx_parties):
+        acc[:, i] = out[p].to_numpy(dtype=float)
+        if p in df.columns:
+            solo[:, i] = pd.to_numeric(df[p], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+
+    dom_idx = None
+    if rule == "equal_residue_siglado" and sig_map is not None:
+        dom = _dominant_index(df, sig_map, chamber)
+        dom_idx = np.array([reg.indice(d) for d in dom], dtype=np.int64)
+    dom_bit = np.where(dom_idx >= 0, np.left_shift(1, np.maximum(dom_idx, 0)), 0) if dom_idx is not None else None
+
+    for c in coal_cols:
+        cols = np.array([reg.indice(t) for t in _tokens_from_col(c)])
+        mascara = reg.mascara_columna(c)
+        V = pd.to_numeric(df[c], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+        q = np.floor_divide(V, len(cols))
+        r = np.mod(V, len(cols)).astype(int)
+        acc[:, cols] += q[:, None]
+
+        # elegido por "solo": argmax devuelve el primer máximo, igual que max() sobre tokens
+        pick = cols[np.argmax(solo[:, cols], axis=1)]
+        if dom_bit is not None:
+            pick = np.where(dom_bit & mascara, dom_idx, pick)
+        acc[filas, pick] += r
+
+    for p, i in zip(parties, idx_parties):
+        out[p] = acc[:, i]
+
+# ================== Caché de recomposición ==================
+
+# (año, cámara, regla, hash siglado, huella df) -> DataFrame recompuesto, en orden LRU
+_RECOMP_CACHE: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+_RECOMP_MAX = int(os.environ.get("RECOMP_CACHE_MAX", "32"))
+_RECOMP_LOCK = threading.Lock()
+_RECOMP_STATS = {"hits": 0, "misses": 0}
+
+def _sha1_archivo(path: str) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.sha1(fh.read()).hexdigest()
+
+def _hash_siglado(path: Optional[str]) -> Optional[str]:
+    """Hash del contenido del siglado (memoizado por mtime en el store)."""
+    if not path:
+        return None
+    return dataset_store.obtener(path, "sha1", _sha1_archivo, copiar=False)
+
+def _huella_df(df: pd.DataFrame) -> str:
+    """Huella barata del contenido de la boleta (columnas + valores)."""
+    h = hashlib.sha1()
+    h.update("|".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return h.hexdigest()
+
+def recomposition_cache_stats() -> Dict[str, int]:
+    with _RECOMP_LOCK:
+        return {"hits": _RECOMP_STATS["hits"], "misses": _RECOMP_STATS["misses"],
+                "size": len(_RECOMP_CACHE), "max_size": _RECOMP_MAX}
+
+def clear_recomposition_cache() -> None:
+    with _RECOMP_LOCK:
+        _RECOMP_CACHE.clear()
+
+def entradas_recomposicion() -> List[Tuple[Tuple, pd.DataFrame]]:
+    """(clave, DataFrame compartido) de la caché, para el snapshot de arranque."""
+    with _RECOMP_LOCK:
+        return list(_RECOMP_CACHE.items())
+
+def sembrar_recomposicion(key: Tuple, out: pd.DataFrame) -> None:
+    """Registra una recomposición ya calculada; la clave es por contenido, así que no caduca."""
+    with _RECOMP_LOCK:
+        _RECOMP_CACHE[key] = out
+        _RECOMP_CACHE.move_to_end(key)
+        while len(_RECOMP_CACHE) > _RECOMP_MAX:
+            _RECOMP_CACHE.popitem(last=False)
+
 def recompose_coalitions(
     df: pd.DataFrame,
     year: int,
     chamber: str,  # "diputados" | "senado"
-    rule: str = "equal_residue_solo",  # o "equal_residue_siglado"
-    siglado_path: Optional[str] = None
+    rule: str = "equal_residue_solo",  # o "equal_residue_siglado"; sufijo "_vec" = versión NumPy
+    siglado_path: Optional[str] = None,
+    use_cache: bool = True
 ) -> pd.DataFrame:
     """
     Devuelve un DataFrame con columnas: ENTIDAD, (DISTRITO si aplica), PARTIDOS..., CI, TOTAL_BOLETAS
     donde cada fila trae los votos recombinados por partido.
+
+    El resultado se memoiza por (año, cámara, regla, hash del siglado, huella de df)
+    en una caché LRU acotada (RECOMP_CACHE_MAX); se devuelve siempre una copia.
     """
+    if not use_cache:
+        return _recompose_coalitions(df, year, chamber, rule, siglado_path)
+
+    sig_hash = _hash_siglado(siglado_path) if rule.startswith("equal_residue_siglado") and siglado_path else None
+    key = (int(year), chamber.lower().strip(), rule, sig_hash, _huella_df(df))
+    with _RECOMP_LOCK:
+        hit = _RECOMP_CACHE.get(key)
+        if hit is not None:
+            _RECOMP_CACHE.move_to_end(key)
+            _RECOMP_STATS["hits"] += 1
+            return hit.copy()
+        _RECOMP_STATS["misses"] += 1
+
+    out = _recompose_coalitions(df, year, chamber, rule, siglado_path)
+    with _RECOMP_LOCK:
+        _RECOMP_CACHE[key] = out
+        _RECOMP_CACHE.move_to_end(key)
+        while len(_RECOMP_CACHE) > _RECOMP_MAX:
+            _RECOMP_CACHE.popitem(last=False)
+    return out.copy()
+
+def _recompose_coalitions(
+    df: pd.DataFrame,
+    year: int,
+    chamber: str,
+    rule: str = "equal_residue_solo",
+    siglado_path: Optional[str] = None
+) -> pd.DataFrame:
+    """Implementación sin caché de recompose_coalitions."""
     chamber = chamber.lower().strip()
     parties = parties_for(year)
 
@@ -260,12 +302,20 @@ def recompose_coalitions(
             raise ValueError("Diputados requiere columna 'DISTRITO'.")
         out["DISTRITO"] = pd.to_numeric(df["DISTRITO"], errors="coerce").fillna(0).astype(int)
 
+    # Sufijo "_vec": misma regla, residuos asignados en bloque con NumPy
+    vectorized = rule.endswith(VECTORIZED_SUFFIX)
+    base_rule = rule[:-len(VECTORIZED_SUFFIX)] if vectorized else rule
+
     # Prepara mapa de siglado si la regla lo pide
     sig_map = None
-    if rule == "equal_residue_siglado":
+    if base_rule == "equal_residue_siglado":
         if not siglado_path:
             raise ValueError("Para 'equal_residue_siglado' debes pasar siglado_path.")
-        sig_map = _load_siglado_dip(siglado_path) if chamber=="diputados" else _load_siglado_sen(siglado_path)
+        # el mapa se lee una vez por archivo (store del proceso); solo lectura aquí
+        if chamber == "diputados":
+            sig_map = dataset_store.obtener(siglado_path, "residuo_dip", _load_siglado_dip, copiar=False)
+        else:
+            sig_map = dataset_store.obtener(siglado_path, "residuo_sen", _load_siglado_sen, copiar=False)
 
     # Inicializa columnas por partido y CI
     for p in parties:
@@ -287,6 +337,9 @@ def recompose_coalitions(
 
     # ahora procesa coaliciones
     coal_cols = [c for c in cand_cols if _is_coalition_col(c, year)]
+    if vectorized:
+        _assign_coalitions_vectorized(out, df, coal_cols, parties, chamber, base_rule, sig_map, year)
+        coal_cols = []
     for c in coal_cols:
         tokens = _tokens_from_col(c)
         k = len(tokens)
@@ -304,7 +357,7 @@ def recompose_coalitions(
             if r.iat[i] <= 0: 
                 continue
             row = df.iloc[i]
-            if rule == "equal_residue_siglado" and sig_map is not None:
+            if base_rule == "equal_residue_siglado" and sig_map is not None:
                 pick = _pick_residue_siglado_dip(row, sig_map, tokens) if chamber=="diputados" else _pick_residue_siglado_sen(row, sig_map, tokens)
             else:
                 pick = _pick_residue_solo(row, parties, tokens)
@@ -7,7 +7,10 @@ Permite simular escenarios electorales alternativos manteniendo la estructura ge
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-import logging
+
+from .registro import obtener_registro
+
+log = obtener_registro(__name__)
 
 def redistribuir_votos_mixto(votos_originales: Dict[str, float], 
                            nuevos_porcentajes: Dict[str, float],
@@ -116,9 +119,8 @@ def aplicar_redistribucion_geografica(df_votos: pd.DataFrame,
     # Calcular porcentajes actuales
     porcentajes_actuales = (totales_actuales / total_general * 100).to_dict()
     
-    print(f"[DEBUG] Redistribución geográfica:")
-    print(f"[DEBUG] Porcentajes actuales: {porcentajes_actuales}")
-    print(f"[DEBUG] Porcentajes objetivo: {porcentajes_objetivo}")
+    log.debug("Redistribución geográfica: actuales=%s objetivo=%s",
+              porcentajes_actuales, porcentajes_objetivo)
     
     # Calcular factores de ajuste por partido
     factores_ajuste = {}
@@ -130,7 +132,7 @@ def aplicar_redistribucion_geografica(df_votos: pd.DataFrame,
         else:
             factores_ajuste[partido] = 1.0  # Mantener sin cambios
     
-    print(f"[DEBUG] Factores de ajuste: {factores_ajuste}")
+    log.debug("Factores de ajuste: %s", factores_ajuste)
     
     # Aplicar factores de ajuste
     if mantener_estructura:
@@ -152,7 +154,7 @@ def aplicar_redistribucion_geografica(df_votos: pd.DataFrame,
     totales_finales = df_resultado.groupby(columna_partido)[columna_votos].sum()
     porcentajes_finales = (totales_finales / totales_finales.sum() * 100).to_dict()
     
-    print(f"[DEBUG] Porcentajes finales: {porcentajes_finales}")
+    log.debug("Porcentajes finales: %s", porcentajes_finales)
     
     return df_resultado
 
@@ -212,16 +214,15 @@ def simular_escenario_electoral(path_parquet: str,
                 df = df.melt(id_vars=id_cols, value_vars=party_cols, var_name='PARTIDO', value_name='VOTOS_CALCULADOS')
                 # Convertir tipos y rellenar nulos en votos
                 df['VOTOS_CALCULADOS'] = df['VOTOS_CALCULADOS'].fillna(0)
-                print(f"[DEBUG] Converted wide-format parquet to long-format: id_cols={id_cols}, parties={len(party_cols)}")
+                log.debug("Parquet ancho convertido a largo: id_cols=%s, partidos=%d", id_cols, len(party_cols))
     except Exception as _e:
-        print(f"[WARN] No se pudo normalizar formato de parquet a largo: {_e}")
+        log.warning("No se pudo normalizar formato de parquet a largo: %s", _e)
     
     # Extraer porcentajes actuales
     porcentajes_actuales = extraer_porcentajes_actuales(df)
     
-    print(f"[DEBUG] Iniciando simulación electoral:")
-    print(f"[DEBUG] Partidos encontrados: {list(porcentajes_actuales.keys())}")
-    print(f"[DEBUG] Porcentajes actuales: {porcentajes_actuales}")
+    log.debug("Iniciando simulación electoral: partidos=%s actuales=%s",
+              list(porcentajes_actuales), porcentajes_actuales)
     
     # Si no se proporcionan porcentajes objetivo, usar redistribución mixta
     if not porcentajes_objetivo:
@@ -234,7 +235,7 @@ def simular_escenario_electoral(path_parquet: str,
         else:
             porcentajes_objetivo = porcentajes_actuales
     
-    print(f"[DEBUG] Porcentajes objetivo calculados: {porcentajes_objetivo}")
+    log.debug("Porcentajes objetivo calculados: %s", porcentajes_objetivo)
     
     # Aplicar redistribución geográfica
     df_redistribuido = aplicar_redistribucion_geografica(
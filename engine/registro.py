@@ -0,0 +1,143 @@
+# engine/registro.py
+"""
+Logging del motor y de main.py: niveles, formato perezoso y traza por request.
+
+    log = obtener_registro(__name__)
+    log.debug("Procesando %s entidades", n)          # no formatea si DEBUG está apagado
+    log.debug(lambda: f"detalle: {df.describe()}")   # callable: ni siquiera se evalúa
+    if log.activo():                                  # bloques de debug completos
+        ...
+
+El nivel global sale de LOG_LEVEL (default INFO) y LOG_FORMAT=json emite una
+línea JSON por registro. trazar() activa todos los niveles solo en el contexto
+actual: main.py lo enciende por request con ?trace=<token> o el header
+X-Trace: <token>, solo si el token coincide con TRACE_TOKEN (sin TRACE_TOKEN
+la traza por request está apagada), y la ContextVar llega a los hilos del
+motor porque motor_executor corre cada llamada con copy_context().
+"""
+from __future__ import annotations
+
+import contextvars
+import hmac
+import json
+import logging
+import os
+import sys
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Union
+
+DEBUG, INFO, WARNING, ERROR = logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR
+
+_TRAZA: "contextvars.ContextVar[bool]" = contextvars.ContextVar('traza_request', default=False)
+_ID_REQUEST: "contextvars.ContextVar[Optional[str]]" = contextvars.ContextVar('id_request', default=None)
+
+_NIVELES = {'debug': DEBUG, 'info': INFO, 'warn': WARNING, 'warning': WARNING, 'error': ERROR}
+
+
+@contextmanager
+def trazar(activo: bool = True, id_request: Optional[str] = None) -> Iterator[None]:
+    """Dentro del bloque se emiten todos los niveles (si activo) y los registros llevan id_request."""
+    token_traza = _TRAZA.set(bool(activo))
+    token_id = _ID_REQUEST.set(id_request)
+    try:
+        yield
+    finally:
+        _TRAZA.reset(token_traza)
+        _ID_REQUEST.reset(token_id)
+
+
+def trazando() -> bool:
+    """True si el contexto actual pidió traza completa."""
+    return _TRAZA.get()
+
+
+def traza_autorizada(token: str) -> bool:
+    """¿`token` coincide con TRACE_TOKEN? Siempre False si TRACE_TOKEN no está configurado."""
+    esperado = os.environ.get('TRACE_TOKEN', '')
+    return bool(esperado and token) and hmac.compare_digest(token.encode(), esperado.encode())
+
+
+class _Formato(logging.Formatter):
+    """'[NIVEL] mensaje' (con id de request si hay) o una línea JSON."""
+
+    def __init__(self, como_json: bool):
+        super().__init__()
+        self.como_json = como_json
+
+    def format(self, record: logging.LogRecord) -> str:
+        id_request = getattr(record, 'id_request', None)
+        if self.como_json:
+            return json.dumps({
+                'ts': round(record.created, 3),
+                'nivel': record.levelname,
+                'modulo': record.name,
+                'id_request': id_request,
+                'msg': record.getMessage(),
+            }, ensure_ascii=False, default=str)
+        prefijo = f"[{record.levelname}]" + (f"[{id_request}]" if id_request else "")
+        return f"{prefijo} {record.getMessage()}"
+
+
+def _configurar(nombre_raiz: str) -> logging.Logger:
+    """Handler único por raíz ('engine', 'main'); respeta configuración previa del consumidor."""
+    raiz = logging.getLogger(nombre_raiz)
+    if not raiz.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(_Formato(os.environ.get('LOG_FORMAT', '').lower() == 'json'))
+        raiz.addHandler(handler)
+        raiz.setLevel(_NIVELES.get(os.environ.get('LOG_LEVEL', 'info').lower(), INFO))
+        raiz.propagate = False
+    return raiz
+
+
+class Registro:
+    """Envoltura delgada de logging.Logger con formato perezoso y traza por contexto."""
+
+    __slots__ = ('logger',)
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+
+    def activo(self, nivel: int = DEBUG) -> bool:
+        """¿Se emitiría un registro de este nivel? (barato: ContextVar + caché de logging)."""
+        return _TRAZA.get() or self.logger.isEnabledFor(nivel)
+
+    def _emitir(self, nivel: int, msg: Union[str, Callable[[], Any]], args: tuple) -> None:
+        if callable(msg):
+            msg, args = msg(), ()
+        registro = self.logger.makeRecord(
+            self.logger.name, nivel, '(registro)', 0, msg, args or None, None,
+            extra={'id_request': _ID_REQUEST.get()}
+        )
+        self.logger.handle(registro)
+
+    def log(self, nivel: int, msg: Union[str, Callable[[], Any]], *args: Any) -> None:
+        if _TRAZA.get() or self.logger.isEnabledFor(nivel):
+            self._emitir(nivel, msg, args)
+
+    def debug(self, msg: Union[str, Callable[[], Any]], *args: Any) -> None:
+        if _TRAZA.get() or self.logger.isEnabledFor(DEBUG):
+            self._emitir(DEBUG, msg, args)
+
+    def info(self, msg: Union[str, Callable[[], Any]], *args: Any) -> None:
+        if _TRAZA.get() or self.logger.isEnabledFor(INFO):
+            self._emitir(INFO, msg, args)
+
+    def warning(self, msg: Union[str, Callable[[], Any]], *args: Any) -> None:
+        if _TRAZA.get() or self.logger.isEnabledFor(WARNING):
+            self._emitir(WARNING, msg, args)
+
+    def error(self, msg: Union[str, Callable[[], Any]], *args: Any) -> None:
+        if _TRAZA.get() or self.logger.isEnabledFor(ERROR):
+            self._emitir(ERROR, msg, args)
+
+
+def nivel(nombre: str) -> int:
+    """'debug'/'info'/'warn'/'error' -> nivel de logging (DEBUG si no se reconoce)."""
+    return _NIVELES.get(str(nombre).lower(), DEBUG)
+
+
+def obtener_registro(nombre: str) -> Registro:
+    """Registro para el módulo `nombre`; la raíz ('engine' o 'main') se configura una vez."""
+    _configurar(nombre.split('.', 1)[0])
+    return Registro(logging.getLogger(nombre))
@@ -0,0 +1,286 @@
+# engine/respuestas.py
+"""
+Serialización JSON rápida y compresión de las respuestas de la API.
+
+`RespuestaJSON` codifica con orjson (escalares y arreglos numpy directo, sin
+pasar por tipos Python) y conserva el objeto original en `.contenido`: los
+endpoints que envuelven a otro (/data/initial, /kpis, /scaled-siglado...)
+lo leen con `contenido_de` en vez de re-parsear el body. Sin orjson se usa
+el json de la stdlib con un `default` para numpy. NaN/Inf salen como null
+con ambos encoders: orjson lo hace de forma nativa y la stdlib pasa antes
+por `finitos`, igual que `contenido_de` (solo al reutilizar una respuesta,
+no en cada una).
+
+`CompresionMiddleware` comprime con br (si el módulo brotli está instalado)
+o gzip según Accept-Encoding, solo bodies completos de tipo texto/JSON por
+encima del umbral; todas esas respuestas llevan Vary: Accept-Encoding, se
+compriman o no. Los bodies comprimidos se memorizan por hash, así los HIT
+de la caché de resultados no se recomprimen.
+
+Configuración: COMPRESS=0 desactiva la compresión; COMPRESS_MIN_BYTES
+(default 1024) es el umbral; COMPRESS_CACHE (default 64) el número de
+bodies comprimidos memorizados.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+from .registro import obtener_registro
+
+log = obtener_registro(__name__)
+
+
+# ====================== JSON ======================
+
+def _por_defecto(valor: Any) -> Any:
+    """Tipos que ninguno de los dos encoders conoce de forma nativa."""
+    # numpy sin importar: no puede haber valores numpy (main.py lo carga perezosamente)
+    np = sys.modules.get('numpy')
+    if np is not None:
+        if isinstance(valor, np.generic):
+            return valor.item()
+        if isinstance(valor, np.ndarray):
+            return valor.tolist()
+    if isinstance(valor, (set, frozenset)):
+        return list(valor)
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    raise TypeError(f"Tipo no serializable a JSON: {type(valor).__name__}")
+
+
+def finitos(valor: Any) -> Any:
+    """NaN/Inf -> None en todo el valor (como hace orjson); el mismo objeto si no hay ninguno."""
+    if isinstance(valor, float):  # incluye np.float64
+        return valor if math.isfinite(valor) else None
+    if isinstance(valor, dict):
+        nuevo = None
+        for k, v in valor.items():
+            f = finitos(v)
+            if f is not v:
+                if nuevo is None:
+                    nuevo = dict(valor)
+                nuevo[k] = f
+        return valor if nuevo is None else nuevo
+    if isinstance(valor, (list, tuple)):
+        nuevos = [finitos(v) for v in valor]
+        return nuevos if any(a is not b for a, b in zip(nuevos, valor)) else valor
+    np = sys.modules.get('numpy')
+    if np is not None:
+        if isinstance(valor, np.floating):
+            return valor if np.isfinite(valor) else None
+        if isinstance(valor, np.ndarray) and valor.dtype.kind == 'f':
+            malos = ~np.isfinite(valor)
+            if not malos.any():
+                return valor
+            out = valor.astype(object)
+            out[malos] = None
+            return out.tolist()
+    return valor
+
+
+def _dumps_stdlib(contenido: Any) -> bytes:
+    return json.dumps(finitos(contenido), ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+                      default=_por_defecto).encode("utf-8")
+
+
+def dumps(contenido: Any) -> bytes:
+    """Serializa a JSON UTF-8 compacto; NaN/Inf como null."""
+    if orjson is not None:
+        try:
+            # orjson ya escribe NaN/Inf como null, igual que finitos()
+            return orjson.dumps(contenido, default=_por_defecto,
+                                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # p. ej. enteros de más de 64 bits o llaves tupla: la stdlib decide
+            pass
+    return _dumps_stdlib(contenido)
+
+
+def loads(cuerpo: bytes) -> Any:
+    return orjson.loads(cuerpo) if orjson is not None else json.loads(cuerpo)
+
+
+class RespuestaJSON(JSONResponse):
+    """JSONResponse con encoder rápido que recuerda el objeto que serializó."""
+
+    def __init__(self, content: Any, *args, **kwargs):
+        self.contenido = content
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def contenido_de(resultado: Any) -> Any:
+    """
+    Contenido de lo que devolvió otro handler: el objeto original si es una
+    RespuestaJSON (con NaN/Inf como None, igual que en su body), el body
+    parseado si es una respuesta ya serializada (HIT de caché) o el valor
+    mismo si no es una respuesta.
+    """
+    if isinstance(resultado, RespuestaJSON):
+        return finitos(resultado.contenido)
+    cuerpo = getattr(resultado, 'body', None)
+    if cuerpo is None:
+        return resultado
+    return loads(cuerpo)
+
+
+# ====================== Compresión ======================
+
+_COMPRIMIBLES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def _activado() -> bool:
+    return os.environ.get("COMPRESS", "1").strip().lower() not in ("0", "false", "no")
+
+
+def umbral_bytes() -> int:
+    try:
+        return int(os.environ.get("COMPRESS_MIN_BYTES", "1024"))
+    except ValueError:
+        return 1024
+
+
+def codificaciones_disponibles() -> Tuple[str, ...]:
+    """En orden de preferencia."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def elegir_codificacion(accept_encoding: str) -> Optional[str]:
+    """Mejor codificación disponible aceptada por el cliente (respeta q=0 y '*')."""
+    calidades: Dict[str, float] = {}
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, params = parte.strip().partition(";")
+        if not nombre:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        calidades[nombre.strip()] = q
+    comodin = calidades.get("*", 0.0)
+    opciones = [(calidades.get(c, comodin), -i, c) for i, c in enumerate(codificaciones_disponibles())]
+    q, _, mejor = max(opciones)
+    return mejor if q > 0 else None
+
+
+def _comprimir_crudo(cuerpo: bytes, codificacion: str) -> bytes:
+    if codificacion == "br":
+        return brotli.compress(cuerpo, quality=5)
+    return gzip.compress(cuerpo, compresslevel=6, mtime=0)
+
+
+class _Memo:
+    """LRU de bodies comprimidos por (codificación, sha1 del body)."""
+
+    def __init__(self, maximo: int):
+        self.maximo = maximo
+        self._datos: "OrderedDict[Tuple[str, bytes], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def comprimir(self, cuerpo: bytes, codificacion: str) -> bytes:
+        if self.maximo <= 0:
+            return _comprimir_crudo(cuerpo, codificacion)
+        clave = (codificacion, hashlib.sha1(cuerpo).digest())
+        with self._lock:
+            hecho = self._datos.get(clave)
+            if hecho is not None:
+                self._datos.move_to_end(clave)
+                self.hits += 1
+                return hecho
+            self.misses += 1
+        hecho = _comprimir_crudo(cuerpo, codificacion)
+        with self._lock:
+            self._datos[clave] = hecho
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+        return hecho
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entradas": len(self._datos), "max_entradas": self.maximo,
+                    "hits": self.hits, "misses": self.misses}
+
+
+_MEMO = _Memo(int(os.environ.get("COMPRESS_CACHE", "64")))
+
+
+def comprimir(cuerpo: bytes, codificacion: str) -> bytes:
+    return _MEMO.comprimir(cuerpo, codificacion)
+
+
+def stats_compresion() -> Dict[str, Any]:
+    return {"activada": _activado(), "umbral_bytes": umbral_bytes(),
+            "codificaciones": list(codificaciones_disponibles()),
+            "json": "orjson" if orjson is not None else "stdlib", **_MEMO.stats()}
+
+
+class CompresionMiddleware:
+    """
+    Middleware ASGI: comprime bodies completos (una sola parte) de tipo
+    texto/JSON ≥ umbral y les pone Vary: Accept-Encoding aunque no se
+    compriman (por tamaño o porque el cliente no acepta). Las respuestas en
+    streaming pasan sin tocar.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _activado():
+            return await self.app(scope, receive, send)
+        codificacion = elegir_codificacion(Headers(scope=scope).get("accept-encoding", ""))
+
+        inicio = None
+        directo = False
+
+        async def enviar(mensaje):
+            nonlocal inicio, directo
+            if mensaje["type"] == "http.response.start":
+                inicio = mensaje
+                return
+            if directo or mensaje["type"] != "http.response.body" or inicio is None:
+                return await send(mensaje)
+            directo = True
+            cuerpo = mensaje.get("body", b"")
+            headers = MutableHeaders(raw=inicio["headers"])
+            if (not mensaje.get("more_body", False)
+                    and "content-encoding" not in headers
+                    and headers.get("content-type", "").startswith(_COMPRIMIBLES)):
+                headers.add_vary_header("Accept-Encoding")
+                if codificacion is not None and len(cuerpo) >= umbral_bytes():
+                    cuerpo = comprimir(cuerpo, codificacion)
+                    headers["Content-Encoding"] = codificacion
+                    headers["Content-Length"] = str(len(cuerpo))
+                    mensaje = {**mensaje, "body": cuerpo}
+            await send(inicio)
+            await send(mensaje)
+
+        await self.app(scope, receive, enviar)
@@ -0,0 +1,160 @@
+# engine/result_cache.py
+"""
+Caché de respuestas completas para los endpoints de procesamiento.
+
+La clave es un hash de los parámetros canonicalizados: los JSON (dicts o
+strings JSON) se normalizan en orden de llaves y los flotantes se formatean
+igual (45 == 45.0 == "45.0" dentro de un payload JSON). Cada caché tiene su
+propio presupuesto de memoria (bytes del body), TTL y contadores.
+
+Dentro de `sin_lectura()` las lecturas fallan (cuentan como miss) y la
+evaluación se repite; la entrada se refresca con el put() normal.
+"""
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+# ====================== Canonicalización ======================
+
+def canonicalizar(valor: Any) -> Any:
+    """Convierte un valor de parámetro a una forma estable para hashing."""
+    if valor is None or isinstance(valor, bool):
+        return valor
+    # numpy sin importar: no puede haber escalares numpy (main.py lo carga perezosamente)
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, float):
+        if math.isnan(valor) or math.isinf(valor):
+            return str(valor)
+        if valor.is_integer():
+            return int(valor)
+        return float(f"{valor:.12g}")
+    if isinstance(valor, str):
+        s = valor.strip()
+        if s[:1] in ('{', '['):
+            try:
+                return canonicalizar(json.loads(s))
+            except Exception:
+                pass
+        return s
+    if isinstance(valor, dict):
+        return {str(k): canonicalizar(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [canonicalizar(v) for v in valor]
+    return str(valor)
+
+
+def clave_canonica(namespace: str, params: Dict[str, Any]) -> str:
+    """sha256 de los parámetros canonicalizados; los None se omiten."""
+    canon = {k: canonicalizar(v) for k, v in params.items() if v is not None}
+    payload = json.dumps([namespace, canon], sort_keys=True, separators=(',', ':'), ensure_ascii=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+# ====================== Caché con presupuesto ======================
+
+_SIN_LECTURA: "contextvars.ContextVar[bool]" = contextvars.ContextVar('cache_sin_lectura', default=False)
+
+
+@contextmanager
+def sin_lectura() -> Iterator[None]:
+    """Dentro del bloque (y de lo que se ejecute en su contexto) get() siempre es miss."""
+    token = _SIN_LECTURA.set(True)
+    try:
+        yield
+    finally:
+        _SIN_LECTURA.reset(token)
+
+
+class ResultCache:
+    """
+    LRU acotada por bytes con expiración por TTL. Guarda el body ya
+    serializado y los headers de la respuesta.
+    """
+
+    def __init__(self, nombre: str, max_bytes: int, ttl_s: float):
+        self.nombre = nombre
+        self.max_bytes = int(max_bytes)
+        self.ttl_s = float(ttl_s)
+        self._data: "OrderedDict[str, Tuple[float, bytes, Dict[str, str]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'expirations': 0}
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        ahora = time.monotonic()
+        with self._lock:
+            hit = None if _SIN_LECTURA.get() else self._data.get(key)
+            if hit is None:
+                self._stats['misses'] += 1
+                return None
+            expira, body, headers = hit
+            if expira <= ahora:
+                self._drop(key)
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats['hits'] += 1
+            return body, dict(headers)
+
+    def put(self, key: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> bool:
+        size = len(body)
+        if self.max_bytes <= 0 or size > self.max_bytes:
+            return False
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (time.monotonic() + self.ttl_s, body, dict(headers or {}))
+            self._bytes += size
+            self._stats['stores'] += 1
+            while self._bytes > self.max_bytes and self._data:
+                viejo = next(iter(self._data))
+                self._drop(viejo)
+                self._stats['evictions'] += 1
+        return True
+
+    def _drop(self, key: str) -> None:
+        _, body, _ = self._data.pop(key)
+        self._bytes -= len(body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._stats['hits'] + self._stats['misses']
+            return {
+                **self._stats,
+                'hit_ratio': round(self._stats['hits'] / total, 4) if total else 0.0,
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_s': self.ttl_s,
+            }
+
+
+def _env_cache(prefijo: str, mb_default: float, ttl_default: float) -> Tuple[int, float]:
+    mb = float(os.environ.get(f'{prefijo}_CACHE_MAX_MB', mb_default))
+    ttl = float(os.environ.get(f'{prefijo}_CACHE_TTL_S', ttl_default))
+    return int(mb * 1024 * 1024), ttl
+
+
+CACHE_DIPUTADOS = ResultCache('diputados', *_env_cache('DIP', 64, 3600))
+CACHE_SENADO = ResultCache('senado', *_env_cache('SEN', 32, 3600))
@@ -0,0 +1,206 @@
+# engine/scenario_executor.py
+"""
+Ejecución en paralelo de barridos de escenarios sobre un pool de procesos.
+
+Los workers se calientan una sola vez (initializer) con los datos preparados
+de cada año, así que por tarea solo viajan los parámetros del escenario y el
+resultado. Los resultados se devuelven siempre en el orden de entrada.
+
+Número de workers: argumento `workers` o env SCENARIO_WORKERS (default: 2, o
+1 con una sola CPU). Cada worker precarga todos los años, así que el default
+es bajo para caber en instancias chicas. Los workers se crean con spawn:
+el proceso de la API tiene hilos (MOTOR, calentamiento) y un fork podría
+heredar sus locks tomados. Con 1 worker no se crea pool y las tareas corren
+en el proceso actual; en `mapear_async` pasan por MOTOR, con su mismo límite
+de concurrencia y su MotorSaturado.
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .registro import obtener_registro
+
+log = obtener_registro(__name__)
+
+# Datos preparados dentro de cada proceso worker:
+# (path_parquet, anio, path_siglado) -> (firma del parquet, salida de preparar_datos_diputados)
+_DATOS_WORKER: Dict[Tuple[str, int, Optional[str]], Tuple[Tuple[int, int], Dict]] = {}
+
+DatosSpec = Tuple[str, int, Optional[str]]
+
+
+def workers_default() -> int:
+    """Workers configurados por entorno (SCENARIO_WORKERS) o hasta 2 según las CPUs."""
+    try:
+        return max(1, int(os.environ.get('SCENARIO_WORKERS', min(2, os.cpu_count() or 1))))
+    except ValueError:
+        return 1
+
+
+def _datos_diputados(path_parquet: str, anio: int, path_siglado: Optional[str]) -> Dict:
+    """Datos preparados del año, cargados una vez por proceso (o si cambia el parquet)."""
+    key = (path_parquet, int(anio), path_siglado)
+    st = os.stat(path_parquet)
+    firma = (st.st_mtime_ns, st.st_size)
+    hit = _DATOS_WORKER.get(key)
+    if hit is None or hit[0] != firma:
+        from .procesar_diputados_v2 import preparar_datos_diputados
+        hit = (firma, preparar_datos_diputados(path_parquet, int(anio), path_siglado))
+        _DATOS_WORKER[key] = hit
+    return hit[1]
+
+
+def _init_worker(precargar: Sequence[DatosSpec],
+                 inicializador: Optional[Callable[..., Any]],
+                 init_args: Tuple) -> None:
+    """Initializer del pool: precarga los años pedidos y corre el inicializador extra."""
+    from .snapshot import cargar_snapshot
+
+    # con fork el store ya viene sembrado del padre; con spawn se siembra aquí
+    cargar_snapshot()
+    for spec in precargar:
+        try:
+            _datos_diputados(*spec)
+        except Exception as e:
+            log.warning("No se pudo precargar %s: %s", spec, e)
+    if inicializador is not None:
+        inicializador(*init_args)
+
+
+def _evaluar_diputados(tarea: Tuple[DatosSpec, Optional[List[str]], Dict, bool]) -> Dict:
+    """Tarea del pool: un escenario de diputados sobre los datos del worker."""
+    from .procesar_diputados_v2 import escenario_o_error
+
+    (path_parquet, anio, path_siglado), partidos_base, kwargs, capturar_errores = tarea
+    return escenario_o_error(
+        capturar_errores,
+        path_parquet=path_parquet,
+        partidos_base=partidos_base,
+        anio=anio,
+        path_siglado=path_siglado,
+        datos_preparados=_datos_diputados(path_parquet, anio, path_siglado),
+        **kwargs
+    )
+
+
+class ScenarioExecutor:
+    """
+    Pool de procesos con workers precalentados.
+
+    precargar: años de diputados a preparar en cada worker, como tuplas
+    (path_parquet, anio, path_siglado). inicializador/init_args: función
+    adicional (a nivel de módulo, para poder serializarla) que corre una vez
+    por worker, p.ej. para cargar datos de un script de barrido.
+    """
+
+    def __init__(self, workers: Optional[int] = None,
+                 precargar: Iterable[DatosSpec] = (),
+                 inicializador: Optional[Callable[..., Any]] = None,
+                 init_args: Tuple = ()):
+        self.workers = workers_default() if workers is None else max(1, int(workers))
+        self.precargar = list(precargar)
+        self.inicializador = inicializador
+        self.init_args = tuple(init_args)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._init_local = False
+        self._lock = threading.Lock()
+
+    def _obtener_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 1:
+            with self._lock:
+                if not self._init_local:
+                    _init_worker(self.precargar, self.inicializador, self.init_args)
+                    self._init_local = True
+            return None
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.precargar, self.inicializador, self.init_args),
+                )
+            return self._pool
+
+    def mapear(self, fn: Callable[[Any], Any], items: Iterable[Any], chunksize: int = 1) -> List[Any]:
+        """fn(item) para cada item, en paralelo; resultados en orden de entrada."""
+        items = list(items)
+        pool = self._obtener_pool()
+        if pool is None:
+            return [fn(it) for it in items]
+        return list(pool.map(fn, items, chunksize=max(1, chunksize)))
+
+    async def mapear_async(self, fn: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """Como mapear, sin bloquear el event loop (sin pool, en MOTOR: puede lanzar MotorSaturado)."""
+        items = list(items)
+        if self.workers <= 1:
+            from .motor_executor import MOTOR
+            return await MOTOR.ejecutar(self.mapear, fn, items)
+        loop = asyncio.get_running_loop()
+        pool = await loop.run_in_executor(None, self._obtener_pool)
+        return list(await asyncio.gather(*(loop.run_in_executor(pool, fn, it) for it in items)))
+
+    @staticmethod
+    def _tareas_diputados(path_parquet: str, anio: int, escenarios: Sequence[Dict],
+                          path_siglado: Optional[str], partidos_base: Optional[List[str]],
+                          capturar_errores: bool = False) -> List[Tuple]:
+        spec = (path_parquet, int(anio), path_siglado)
+        return [(spec, partidos_base, dict(esc), capturar_errores) for esc in escenarios]
+
+    def evaluar_diputados(self, path_parquet: str, anio: int, escenarios: Sequence[Dict],
+                          path_siglado: Optional[str] = None,
+                          partidos_base: Optional[List[str]] = None,
+                          capturar_errores: bool = False) -> List[Dict]:
+        """Escenarios de procesar_diputados_v2 (kwargs) repartidos en el pool."""
+        tareas = self._tareas_diputados(path_parquet, anio, escenarios, path_siglado, partidos_base,
+                                        capturar_errores)
+        return self.mapear(_evaluar_diputados, tareas)
+
+    async def evaluar_diputados_async(self, path_parquet: str, anio: int, escenarios: Sequence[Dict],
+                                      path_siglado: Optional[str] = None,
+                                      partidos_base: Optional[List[str]] = None) -> List[Dict]:
+        tareas = self._tareas_diputados(path_parquet, anio, escenarios, path_siglado, partidos_base)
+        return await self.mapear_async(_evaluar_diputados, tareas)
+
+    def cerrar(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    def __enter__(self) -> "ScenarioExecutor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+
+_EXECUTOR: Optional[ScenarioExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def obtener_executor() -> ScenarioExecutor:
+    """Executor compartido del proceso (API); precarga los años de diputados."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            precargar = [
+                (f"data/computos_diputados_{anio}.parquet", anio, f"data/siglado-diputados-{anio}.csv")
+                for anio in (2018, 2021, 2024)
+            ]
+            _EXECUTOR = ScenarioExecutor(precargar=[p for p in precargar if os.path.exists(p[0])])
+        return _EXECUTOR
+
+
+def cerrar_executor() -> None:
+    """Apaga el pool compartido si se llegó a crear (al cerrar la API)."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        executor, _EXECUTOR = _EXECUTOR, None
+    if executor is not None:
+        executor.cerrar()
@@ -0,0 +1,270 @@
+# engine/siglado_indice.py
+"""
+Índice compilado del siglado de diputados.
+
+El CSV (data/siglado-diputados-{anio}.csv) se compila una vez a arreglos
+compactos por renglón: id de entidad, distrito, id de coalición, grupo
+parlamentario y máscara de bits de partidos nominadores. El índice se guarda
+junto al CSV (<nombre>.indice.npz) con el sha1 del CSV y solo se recompila si
+ese checksum cambia; dentro del proceso vive en dataset_store.
+
+    idx = obtener_indice("data/siglado-diputados-2024.csv")
+    idx.dominante("AGUASCALIENTES", 1, "SIGAMOS HACIENDO HISTORIA")  # 'PVEM'
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import dataset_store
+from .recomposicion import norm_ascii_up, normalize_entidad_ascii
+from .registro import obtener_registro
+
+log = obtener_registro(__name__)
+
+FORMATO = 1
+SUFIJO = ".indice.npz"
+_NULOS = {"", "\\N", "NAN", "NONE", "NULL"}  # \N es el NULL de los dumps de MySQL
+
+
+def _limpio(x: str) -> str:
+    """Sigla/nombre normalizado; '' para vacíos y marcadores de nulo."""
+    y = norm_ascii_up(x)
+    return "" if y in _NULOS else y
+
+
+@dataclass(frozen=True, eq=False)
+class IndiceSiglado:
+    """Siglado por renglón (orden del CSV) con tablas de nombres por id."""
+    sha1: str
+    entidades: Tuple[str, ...]
+    coaliciones: Tuple[str, ...]
+    partidos: Tuple[str, ...]
+    ent: np.ndarray          # int16, id en entidades
+    distrito: np.ndarray     # int16
+    coal: np.ndarray         # int16, id en coaliciones o -1
+    gp: np.ndarray           # int16, id en partidos (grupo parlamentario) o -1
+    nominadores: np.ndarray  # uint32, bit i = partidos[i] postuló
+    _ent_id: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    _coal_id: Dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+    _renglones: Dict[Tuple[int, int], np.ndarray] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._ent_id.update({e: i for i, e in enumerate(self.entidades)})
+        self._coal_id.update({c: i for i, c in enumerate(self.coaliciones)})
+        pares = self.ent.astype(np.int64) * 10_000 + self.distrito
+        orden = np.argsort(pares, kind="stable")
+        claves, inicio = np.unique(pares[orden], return_index=True)
+        for clave, filas in zip(claves, np.split(orden, inicio[1:])):
+            self._renglones[(int(clave // 10_000), int(clave % 10_000))] = filas
+
+    def __len__(self) -> int:
+        return len(self.ent)
+
+    def renglones(self, entidad: str, distrito: int) -> np.ndarray:
+        """Renglones (en orden del CSV) de (entidad normalizada, distrito)."""
+        e = self._ent_id.get(entidad)
+        if e is None:
+            return np.empty(0, dtype=np.int64)
+        return self._renglones.get((e, int(distrito)), np.empty(0, dtype=np.int64))
+
+    def dominante_de(self, fila: int) -> str:
+        """Grupo parlamentario del renglón o, si falta, su único nominador."""
+        g = int(self.gp[fila])
+        if g >= 0:
+            return self.partidos[g]
+        bits = self.partidos_de_mascara(int(self.nominadores[fila]))
+        return bits[0] if len(bits) == 1 else ""
+
+    def dominante(self, entidad: str, distrito: int, coalicion: Optional[str] = None) -> str:
+        """Dominante del primer renglón del distrito (y de la coalición, si se da); '' si no hay."""
+        filas = self.renglones(entidad, distrito)
+        if coalicion is not None:
+            c = self._coal_id.get(coalicion, -2)
+            filas = filas[self.coal[filas] == c]
+        return self.dominante_de(int(filas[0])) if len(filas) else ""
+
+    def partidos_de_mascara(self, mascara: int) -> List[str]:
+        return [p for i, p in enumerate(self.partidos) if mascara >> i & 1]
+
+    def como_dataframe(self) -> pd.DataFrame:
+        """Vista entidad_key/distrito/coalicion_key/dominante (la de _load_siglado_dip)."""
+        ent = np.array(self.entidades, dtype=object)
+        coal = np.array(self.coaliciones + ("",), dtype=object)
+        return pd.DataFrame({
+            "entidad_key": ent[self.ent] if len(self) else np.array([], dtype=object),
+            "distrito": self.distrito.astype(int),
+            "coalicion_key": coal[self.coal] if len(self) else np.array([], dtype=object),
+            "dominante": [self.dominante_de(i) for i in range(len(self))],
+        })
+
+    def por_distrito(self) -> Dict[Tuple[str, int], Dict]:
+        """
+        (entidad, distrito) -> {'nominadores_set', 'ppn_gp'}, indexado tanto por la
+        entidad ASCII como por la normalizada. ppn_gp queda '' si el distrito tiene
+        más de un grupo parlamentario.
+        """
+        acum: Dict[Tuple[str, int], Tuple[int, Set[str]]] = {}
+        for (e, d), filas in self._renglones.items():
+            mascara = int(np.bitwise_or.reduce(self.nominadores[filas]))
+            gps = {self.partidos[g] for g in self.gp[filas] if g >= 0}
+            ent = self.entidades[e]
+            for key in ((ent, d), (normalize_entidad_ascii(ent), d)):
+                m, g = acum.get(key, (0, set()))
+                acum[key] = (m | mascara, g | gps)
+        mapa = {}
+        for key, (mascara, gps) in acum.items():
+            if len(gps) > 1:
+                log.warning("Múltiples GRUPO_PARLAMENTARIO para %s: %s; ignorando ppn_gp", key, gps)
+            mapa[key] = {'nominadores_set': set(self.partidos_de_mascara(mascara)),
+                         'ppn_gp': next(iter(gps)) if len(gps) == 1 else ''}
+        return mapa
+
+    def coaliciones_con_partidos(self) -> Dict[str, List[str]]:
+        """NOMBRE_CON_GUIONES -> grupos parlamentarios de la coalición (solo si son 2 o más)."""
+        out = {}
+        for c, nombre in enumerate(self.coaliciones):
+            gps = sorted({self.partidos[g] for g in self.gp[self.coal == c] if g >= 0})
+            if len(gps) > 1:
+                out[nombre.replace(' ', '_')] = gps
+        return out
+
+    def distritos_por_grupo(self) -> Dict[str, int]:
+        """Renglones por grupo parlamentario (dominante), para eficiencias."""
+        conteo: Dict[str, int] = {}
+        for i in range(len(self)):
+            dom = self.dominante_de(i)
+            if dom:
+                conteo[dom] = conteo.get(dom, 0) + 1
+        return conteo
+
+
+def _sha1(path: str) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.sha1(fh.read()).hexdigest()
+
+
+def _columna(df: pd.DataFrame, *opciones: str) -> Optional[pd.Series]:
+    for c in opciones:
+        if c in df.columns:
+            return df[c]
+    return None
+
+
+def _ids(valores: pd.Series) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """Tabla de nombres (orden de aparición, sin '') e ids por renglón (-1 para '')."""
+    codigos, tabla = pd.factorize(valores.where(valores != "", None), use_na_sentinel=True)
+    return tuple(str(t) for t in tabla), codigos.astype(np.int16)
+
+
+def compilar(path_csv: str, sha1: Optional[str] = None) -> IndiceSiglado:
+    """Lee y normaliza el CSV de siglado de diputados (una sola pasada vectorizada)."""
+    gp = pd.read_csv(path_csv, dtype=str, encoding="utf-8", keep_default_na=False)
+    gp.columns = [norm_ascii_up(c).replace(" ", "_").lower() for c in gp.columns]
+
+    entidad = _columna(gp, "entidad_ascii", "entidad")
+    if entidad is None:
+        raise ValueError("Siglado DIP: falta columna ENTIDAD/entidad_ascii.")
+    if "distrito" not in gp.columns:
+        raise ValueError("Siglado DIP: falta columna DISTRITO.")
+
+    entidades, ent = _ids(entidad.map(norm_ascii_up))
+    distrito = gp["distrito"].astype(str).str.extract(r"(\d+)", expand=False).fillna("0").astype(int)
+    coalicion = _columna(gp, "coalicion")
+    coaliciones, coal = _ids(coalicion.map(norm_ascii_up)) if coalicion is not None \
+        else ((), np.full(len(gp), -1, dtype=np.int16))
+
+    vacio = pd.Series([""] * len(gp), index=gp.index, dtype=object)
+    grupo = _columna(gp, "grupo_parlamentario", "grupo")
+    grupo = vacio if grupo is None else grupo.map(_limpio)
+    nominador = _columna(gp, "partido_origen", "partido", "postulador")
+    nominador = vacio if nominador is None else nominador.map(_limpio)
+
+    partidos = tuple(dict.fromkeys([*grupo[grupo != ""], *nominador[nominador != ""]]))
+    if len(partidos) > 32:
+        raise ValueError(f"Siglado DIP: demasiados partidos para la máscara ({len(partidos)})")
+    pid = {p: i for i, p in enumerate(partidos)}
+    mascara = np.array([1 << pid[p] if p else 0 for p in nominador], dtype=np.uint32)
+
+    return IndiceSiglado(
+        sha1=sha1 or _sha1(path_csv),
+        entidades=entidades,
+        coaliciones=coaliciones,
+        partidos=partidos,
+        ent=ent,
+        distrito=distrito.to_numpy(dtype=np.int16),
+        coal=coal,
+        gp=np.array([pid[g] if g else -1 for g in grupo], dtype=np.int16),
+        nominadores=mascara,
+    )
+
+
+def ruta_artefacto(path_csv: str) -> str:
+    return os.path.splitext(path_csv)[0] + SUFIJO
+
+
+def _guardar(indice: IndiceSiglado, destino: str) -> None:
+    """Escritura atómica (tmp + replace) para no dejar artefactos a medias."""
+    tmp = f"{destino}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "wb") as fh:
+        np.savez(
+            fh,
+            formato=np.array(FORMATO), sha1=np.array(indice.sha1),
+            entidades=np.array(indice.entidades, dtype=str), coaliciones=np.array(indice.coaliciones, dtype=str),
+            partidos=np.array(indice.partidos, dtype=str),
+            ent=indice.ent, distrito=indice.distrito, coal=indice.coal, gp=indice.gp,
+            nominadores=indice.nominadores,
+        )
+    os.replace(tmp, destino)
+
+
+def _leer(origen: str, sha1: str) -> Optional[IndiceSiglado]:
+    """Índice persistido si existe, es de este FORMATO y corresponde al sha1 dado."""
+    try:
+        with np.load(origen, allow_pickle=False) as z:
+            if int(z["formato"]) != FORMATO or str(z["sha1"]) != sha1:
+                return None
+            return IndiceSiglado(
+                sha1=sha1,
+                entidades=tuple(z["entidades"].tolist()), coaliciones=tuple(z["coaliciones"].tolist()),
+                partidos=tuple(z["partidos"].tolist()),
+                ent=z["ent"], distrito=z["distrito"], coal=z["coal"], gp=z["gp"], nominadores=z["nominadores"],
+            )
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning("Índice de siglado ilegible (%s): %s; se recompila", origen, e)
+        return None
+
+
+def cargar_indice(path_csv: str, persistir: Optional[bool] = None) -> IndiceSiglado:
+    """
+    Índice del CSV: lee el artefacto si su sha1 coincide; si no, compila y lo
+    guarda. Los siglados temporales (tmp_*) no se persisten por defecto.
+    """
+    if persistir is None:
+        persistir = not os.path.basename(path_csv).startswith("tmp_")
+    sha1 = _sha1(path_csv)
+    destino = ruta_artefacto(path_csv)
+    indice = _leer(destino, sha1) if persistir else None
+    if indice is not None:
+        return indice
+    indice = compilar(path_csv, sha1)
+    if persistir:
+        try:
+            _guardar(indice, destino)
+            log.debug("Índice de siglado compilado: %s (%s renglones)", destino, len(indice))
+        except OSError as e:
+            log.warning("No se pudo guardar el índice de siglado %s: %s", destino, e)
+    return indice
+
+
+def obtener_indice(path_csv: str) -> IndiceSiglado:
+    """Índice compartido del proceso (solo lectura), recargado si cambia el CSV."""
+    return dataset_store.obtener(path_csv, "siglado_indice", cargar_indice, copiar=False)
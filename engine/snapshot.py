@@ -0,0 +1,348 @@
+# engine/snapshot.py
+"""
+Snapshot de arranque del estado preparado de los motores.
+
+En build (render.yaml) se calientan los loaders de siempre -boletas
+normalizadas, índices de siglado, coaliciones, recomposiciones, secciones INE,
+eficiencias- y su contenido se vuelca a un solo .npz sin compresión. Al
+arrancar, el archivo se mapea en memoria (mmap) y sus arreglos se siembran en
+dataset_store y en la caché de recomposición: un arranque en frío no lee
+parquet ni CSV. Las columnas numéricas y los códigos de categóricas quedan
+como vistas (de solo lectura) sobre el mmap; las columnas de texto sí se
+materializan como object, porque los str de Python no pueden vivir en él.
+
+Cada entrada guarda tamaño, mtime y sha1 de su archivo de origen. Si tamaño y
+mtime coinciden la entrada se usa sin leer el archivo; si solo cambió el
+mtime se compara el sha1. Si el archivo cambió, esa entrada se descarta y su
+loader corre como siempre al primer uso.
+
+    python -m engine.snapshot             # genera data/engine_snapshot.npz
+    ENGINE_SNAPSHOT=0                     # desactiva la carga al arrancar
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import uuid
+import zipfile
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import dataset_store
+from .registro import obtener_registro
+
+log = obtener_registro(__name__)
+
+FORMATO = 1
+RUTA_SNAPSHOT = "data/engine_snapshot.npz"
+
+# Insumos que se calientan en build: años de diputados y siglados de senado (como en main.py)
+ANIOS_DIPUTADOS = (2018, 2021, 2024)
+SIGLADOS_SENADO = {2018: "data/siglado_senado_2018_corregido.csv", 2024: "data/siglado-senado-2024.csv"}
+
+_CARGADO: Dict[str, int] = {}
+
+
+def ruta_snapshot() -> Optional[str]:
+    """Ruta configurada (env ENGINE_SNAPSHOT) o None si está desactivado."""
+    ruta = os.environ.get("ENGINE_SNAPSHOT", RUTA_SNAPSHOT)
+    return None if ruta.strip().lower() in ("", "0", "false", "no") else ruta
+
+
+def _sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for bloque in iter(lambda: fh.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _origen_sin_cambios(meta: Dict, cache_sha1: Dict[str, Optional[str]]) -> bool:
+    """¿El archivo de origen sigue igual? stat primero; sha1 solo si el mtime cambió con el mismo tamaño."""
+    ruta = meta["ruta"]
+    try:
+        st = os.stat(ruta)
+    except OSError:
+        return False
+    if "tam" in meta:
+        if st.st_size != meta["tam"]:
+            return False
+        if st.st_mtime_ns == meta["mtime_ns"]:
+            return True
+    if ruta not in cache_sha1:
+        cache_sha1[ruta] = _sha1(ruta)
+    return cache_sha1[ruta] == meta["sha1"]
+
+
+# ---------------------------------------------------------------- serialización
+
+def _frame_a_arreglos(df: pd.DataFrame, pref: str, arreglos: Dict[str, np.ndarray]) -> Dict:
+    """Columnas del DataFrame como arreglos planos; ValueError si alguna no es representable."""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        raise ValueError("índice no estándar")
+    columnas = []
+    for j, col in enumerate(df.columns):
+        if not isinstance(col, str):
+            raise ValueError(f"columna no textual: {col!r}")
+        serie = df[col]
+        clave = f"{pref}/{j}"
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            cats = serie.cat.categories
+            if not all(isinstance(c, str) for c in cats):
+                raise ValueError(f"categorías no textuales en {col}")
+            arreglos[clave] = serie.cat.codes.to_numpy()
+            arreglos[clave + "c"] = np.array(list(cats), dtype=str)
+            columnas.append([col, "c", bool(serie.cat.ordered)])
+        elif serie.dtype == object:
+            valores = serie.tolist()
+            if not all(isinstance(v, str) for v in valores):
+                raise ValueError(f"columna {col} con valores no textuales")
+            arreglos[clave] = np.array(valores, dtype=str) if valores else np.array([], dtype="U1")
+            columnas.append([col, "s"])
+        elif serie.dtype.kind in "biuf":
+            arreglos[clave] = serie.to_numpy()
+            columnas.append([col, "n"])
+        else:
+            raise ValueError(f"dtype no soportado en {col}: {serie.dtype}")
+    return {"columnas": columnas, "filas": len(df)}
+
+
+def _frame_de_arreglos(meta: Dict, pref: str, arreglos: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """DataFrame cuyas columnas numéricas/categóricas son vistas de `arreglos` (copy=False, sin consolidar)."""
+    datos = {}
+    for j, (col, tipo, *extra) in enumerate(meta["columnas"]):
+        arr = arreglos[f"{pref}/{j}"]
+        if tipo == "c":
+            datos[col] = pd.Categorical.from_codes(arr, categories=arreglos[f"{pref}/{j}c"].tolist(), ordered=extra[0])
+        elif tipo == "s":
+            datos[col] = arr.astype(object)
+        else:
+            datos[col] = arr
+    return pd.DataFrame(datos, index=pd.RangeIndex(meta["filas"]), columns=[c[0] for c in meta["columnas"]],
+                        copy=False)
+
+
+def _json_exacto(valor: Any) -> Any:
+    """Valor JSON que reproduce exactamente al original; ValueError si no es así."""
+    crudo = json.loads(json.dumps(valor))
+    if crudo != valor or type(crudo) is not type(valor):
+        raise ValueError("no representable en JSON")
+    return crudo
+
+
+def _serializar(valor: Any, pref: str, arreglos: Dict[str, np.ndarray]) -> Dict:
+    """Descripción de la entrada (va al manifiesto) y sus arreglos; ValueError si no se soporta."""
+    from .siglado_indice import IndiceSiglado
+    from redistritacion.modulos.distritacion import SeccionesINE
+
+    if isinstance(valor, pd.DataFrame):
+        return {"clase": "frame", **_frame_a_arreglos(valor, pref, arreglos)}
+    if isinstance(valor, SeccionesINE):
+        return {"clase": "secciones", **_frame_a_arreglos(valor.secciones, pref, arreglos)}
+    if isinstance(valor, IndiceSiglado):
+        for campo in ("ent", "distrito", "coal", "gp", "nominadores"):
+            arreglos[f"{pref}/{campo}"] = getattr(valor, campo)
+        return {"clase": "indice", "sha1": valor.sha1, "entidades": list(valor.entidades),
+                "coaliciones": list(valor.coaliciones), "partidos": list(valor.partidos)}
+    if isinstance(valor, dict) and all(isinstance(v, float) for v in valor.values()):
+        # eficiencias: np.float64 -> float
+        return {"clase": "json", "valor": _json_exacto({k: float(v) for k, v in valor.items()})}
+    return {"clase": "json", "valor": _json_exacto(valor)}
+
+
+def _deserializar(meta: Dict, pref: str, arreglos: Dict[str, np.ndarray]) -> Any:
+    clase = meta["clase"]
+    if clase == "frame":
+        return _frame_de_arreglos(meta, pref, arreglos)
+    if clase == "secciones":
+        from redistritacion.modulos.distritacion import secciones_desde_df
+        return secciones_desde_df(_frame_de_arreglos(meta, pref, arreglos))
+    if clase == "indice":
+        from .siglado_indice import IndiceSiglado
+        return IndiceSiglado(
+            sha1=meta["sha1"], entidades=tuple(meta["entidades"]), coaliciones=tuple(meta["coaliciones"]),
+            partidos=tuple(meta["partidos"]),
+            **{campo: arreglos[f"{pref}/{campo}"] for campo in ("ent", "distrito", "coal", "gp", "nominadores")},
+        )
+    return meta["valor"]
+
+
+# ---------------------------------------------------------------- generación
+
+def calentar() -> None:
+    """Corre los loaders de arranque para que dataset_store y la caché de recomposición queden llenos."""
+    from .procesar_diputados_v2 import preparar_datos_diputados
+    from .procesar_senadores_v2 import extraer_coaliciones_de_siglado, read_siglado_sen_long
+    from .recomposicion import recompose_coalitions
+    from .calcular_eficiencia_real import calcular_eficiencia_partidos
+    from .siglado_indice import obtener_indice
+
+    for anio in ANIOS_DIPUTADOS:
+        path_parquet = dataset_store.ruta_boletas("diputados", anio)
+        path_siglado = f"data/siglado-diputados-{anio}.csv"
+        if not os.path.exists(path_parquet):
+            continue
+        if os.path.exists(path_siglado):
+            obtener_indice(path_siglado)
+            preparar_datos_diputados(path_parquet, anio, path_siglado)
+            for usar_coaliciones in (False, True):
+                calcular_eficiencia_partidos(anio, usar_coaliciones=usar_coaliciones)
+        preparar_datos_diputados(path_parquet, anio, None)
+
+    for anio, path_siglado in SIGLADOS_SENADO.items():
+        path_parquet = dataset_store.ruta_boletas("senado", anio)
+        if not os.path.exists(path_parquet):
+            continue
+        df = dataset_store.obtener_boletas(path_parquet)
+        recompose_coalitions(df=df, year=anio, chamber="senado", rule="equal_residue_solo_vec")
+        if os.path.exists(path_siglado):
+            dataset_store.obtener(path_siglado, "coaliciones_sen", extraer_coaliciones_de_siglado)
+            dataset_store.obtener(path_siglado, "siglado_sen_long", read_siglado_sen_long)
+            recompose_coalitions(df=df, year=anio, chamber="senado",
+                                 rule="equal_residue_siglado_vec", siglado_path=path_siglado)
+
+    try:
+        from redistritacion.modulos.distritacion import PATH_SECCIONES_INE, obtener_secciones_ine
+        if os.path.exists(PATH_SECCIONES_INE) or os.path.exists(PATH_SECCIONES_INE.replace(".parquet", ".csv")):
+            obtener_secciones_ine()
+    except Exception as e:
+        log.warning("Secciones INE fuera del snapshot: %s", e)
+
+
+def generar(destino: str = RUTA_SNAPSHOT) -> Dict[str, int]:
+    """Calienta los loaders y vuelca su estado a destino (escritura atómica). Devuelve conteos."""
+    from .recomposicion import entradas_recomposicion
+
+    calentar()
+    arreglos: Dict[str, np.ndarray] = {}
+    entradas: List[Dict] = []
+    recomposiciones: List[Dict] = []
+    omitidas = 0
+
+    for tipo, ruta, valor in dataset_store.entradas():
+        pref = f"e{len(entradas)}"
+        propios: Dict[str, np.ndarray] = {}
+        try:
+            meta = _serializar(valor, pref, propios)
+        except (ValueError, TypeError) as e:
+            log.debug("Snapshot omite %s:%s (%s)", tipo, ruta, e)
+            omitidas += 1
+            continue
+        arreglos.update(propios)
+        st = os.stat(ruta)
+        entradas.append({"tipo": tipo, "ruta": os.path.relpath(ruta), "tam": st.st_size,
+                         "mtime_ns": st.st_mtime_ns, "sha1": _sha1(ruta), **meta})
+
+    for key, df in entradas_recomposicion():
+        pref = f"r{len(recomposiciones)}"
+        propios = {}
+        try:
+            meta = _frame_a_arreglos(df, pref, propios)
+        except ValueError as e:
+            log.debug("Snapshot omite recomposición %s (%s)", key[:3], e)
+            omitidas += 1
+            continue
+        arreglos.update(propios)
+        recomposiciones.append({"clave": list(key), **meta})
+
+    manifiesto = {"formato": FORMATO, "entradas": entradas, "recomposiciones": recomposiciones}
+    os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+    tmp = f"{destino}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "wb") as fh:
+        np.savez(fh, manifiesto=np.array(json.dumps(manifiesto)), **arreglos)
+    os.replace(tmp, destino)
+    conteo = {"entradas": len(entradas), "recomposiciones": len(recomposiciones), "omitidas": omitidas}
+    log.info("Snapshot generado en %s: %s", destino, conteo)
+    return conteo
+
+
+# ---------------------------------------------------------------- carga
+
+def _mapear_npz(path: str) -> Dict[str, np.ndarray]:
+    """
+    Arreglos de un .npz sin compresión como vistas sobre un mmap del archivo
+    (np.load ignora mmap_mode para .npz).
+    """
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    arreglos = {}
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} está comprimido")
+            # encabezado local: 30 bytes fijos + nombre + extra
+            n_nombre, n_extra = struct.unpack("<HH", mm[info.header_offset + 26:info.header_offset + 30])
+            inicio = info.header_offset + 30 + n_nombre + n_extra
+            cab = io.BytesIO(mm[inicio:inicio + min(info.file_size, 1 << 16)])
+            version = np.lib.format.read_magic(cab)
+            if version == (1, 0):
+                forma, fortran, dtype = np.lib.format.read_array_header_1_0(cab)
+            else:
+                forma, fortran, dtype = np.lib.format.read_array_header_2_0(cab)
+            if dtype.hasobject:
+                raise ValueError(f"{info.filename} tiene dtype object")
+            nombre = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            arreglos[nombre] = np.ndarray(forma, dtype=dtype, buffer=mm, offset=inicio + cab.tell(),
+                                          order="F" if fortran else "C")
+    return arreglos
+
+
+def cargar_snapshot(origen: Optional[str] = None) -> Dict[str, int]:
+    """
+    Siembra dataset_store y la caché de recomposición desde el snapshot. Nunca
+    falla: sin archivo, o si es de otro formato, devuelve ceros y los loaders
+    siguen como siempre. Idempotente por ruta.
+    """
+    origen = origen or ruta_snapshot()
+    vacio = {"entradas": 0, "recomposiciones": 0, "descartadas": 0}
+    if not origen or not os.path.exists(origen):
+        return vacio
+    clave_archivo = f"{os.path.abspath(origen)}:{dataset_store._firma(origen)}"
+    if clave_archivo in _CARGADO:
+        return dict(vacio, entradas=_CARGADO[clave_archivo])
+    try:
+        arreglos = _mapear_npz(origen)
+        manifiesto = json.loads(arreglos["manifiesto"].item())
+        if manifiesto.get("formato") != FORMATO:
+            log.warning("Snapshot %s de otro formato; se ignora", origen)
+            return vacio
+    except Exception as e:
+        log.warning("Snapshot ilegible (%s): %s; se ignora", origen, e)
+        return vacio
+
+    from .recomposicion import sembrar_recomposicion
+
+    sembradas, descartadas = 0, 0
+    sha1_actual: Dict[str, Optional[str]] = {}
+    for i, meta in enumerate(manifiesto["entradas"]):
+        ruta = meta["ruta"]
+        if not _origen_sin_cambios(meta, sha1_actual):
+            descartadas += 1
+            continue
+        try:
+            dataset_store.sembrar(ruta, meta["tipo"], _deserializar(meta, f"e{i}", arreglos))
+            sembradas += 1
+        except Exception as e:
+            log.warning("Snapshot: no se pudo sembrar %s:%s: %s", meta["tipo"], ruta, e)
+            descartadas += 1
+
+    for i, meta in enumerate(manifiesto["recomposiciones"]):
+        sembrar_recomposicion(tuple(meta["clave"]), _frame_de_arreglos(meta, f"r{i}", arreglos))
+
+    _CARGADO[clave_archivo] = sembradas
+    conteo = {"entradas": sembradas, "recomposiciones": len(manifiesto["recomposiciones"]),
+              "descartadas": descartadas}
+    log.info("Snapshot %s cargado: %s", origen, conteo)
+    return conteo
+
+
+if __name__ == "__main__":
+    import sys
+
+    print(generar(sys.argv[1] if len(sys.argv) > 1 else RUTA_SNAPSHOT))
@@ -0,0 +1,119 @@
+# engine/tensor_electoral.py
+"""
+Tensor de votos distrito x partido.
+
+Formato canónico en memoria de una elección (cámara, año): una matriz densa
+de votos (renglón = distrito, columna = partido del registro del año), más
+los vectores de entidad y distrito. Ganadores MR, segundos lugares, totales
+nacionales y agregados por entidad son reducciones sobre la matriz.
+
+    t = ElectionTensor.desde_dataframe(recomposed, 2024, 'diputados')
+    t.totales(['MORENA', 'PAN'])          # {'MORENA': ..., 'PAN': ...}
+    t.ganadores(['MORENA', 'PAN'])        # índice del ganador por distrito
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .partidos import RegistroPartidos, registro_partidos
+
+
+@dataclass(frozen=True, eq=False)
+class ElectionTensor:
+    """Votos de una elección: matriz distritos x partidos (partidos del registro, CI al final)."""
+    camara: str
+    anio: int
+    registro: RegistroPartidos
+    votos: np.ndarray                 # (D, P) int64 (float64 si hay votos no enteros)
+    entidad_id: np.ndarray            # (D,) índice en entidades
+    distrito: np.ndarray              # (D,) número de distrito
+    entidades: Tuple[str, ...]        # en orden de aparición
+    presentes: frozenset              # partidos con columna en el origen
+
+    @classmethod
+    def desde_dataframe(cls, df: pd.DataFrame, anio: int, camara: str = 'diputados') -> 'ElectionTensor':
+        """Construye el tensor; las columnas de partido ausentes quedan en cero."""
+        reg = registro_partidos(anio)
+        presentes = [p for p in reg.partidos if p in df.columns]
+        votos = np.zeros((len(df), len(reg.partidos)), dtype=np.float64)
+        for p in presentes:
+            votos[:, reg.indice(p)] = pd.to_numeric(df[p], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        if np.array_equal(votos, np.floor(votos)):
+            votos = votos.astype(np.int64)
+        votos.setflags(write=False)
+
+        if 'ENTIDAD' in df.columns:
+            entidad_id, entidades = pd.factorize(df['ENTIDAD'], sort=False)
+            entidades = tuple(entidades)
+        else:
+            entidad_id, entidades = np.zeros(len(df), dtype=np.int64), ('',)
+        if 'DISTRITO' in df.columns:
+            distrito = pd.to_numeric(df['DISTRITO'], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+        else:
+            distrito = np.arange(1, len(df) + 1, dtype=np.int64)
+        return cls(camara=camara, anio=anio, registro=reg, votos=votos,
+                   entidad_id=np.asarray(entidad_id, dtype=np.int64), distrito=distrito,
+                   entidades=entidades, presentes=frozenset(presentes))
+
+    @property
+    def n_distritos(self) -> int:
+        return self.votos.shape[0]
+
+    def columnas(self, partidos: Sequence[str]) -> np.ndarray:
+        """Submatriz (D, len(partidos)) en ese orden; ceros para partidos fuera del registro."""
+        idx = [self.registro.indice(p) for p in partidos]
+        out = np.zeros((self.n_distritos, len(idx)), dtype=self.votos.dtype)
+        for j, i in enumerate(idx):
+            if i >= 0:
+                out[:, j] = self.votos[:, i]
+        return out
+
+    def sumas(self, grupos: Sequence[Sequence[str]]) -> np.ndarray:
+        """(D, len(grupos)): votos de cada grupo de partidos (p. ej. coaliciones) por distrito."""
+        return np.stack([self.columnas(list(g)).sum(axis=1) for g in grupos], axis=1) if grupos \
+            else np.zeros((self.n_distritos, 0), dtype=self.votos.dtype)
+
+    def totales(self, partidos: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """Votos nacionales por partido."""
+        partidos = list(partidos) if partidos is not None else list(self.registro.partidos)
+        return dict(zip(partidos, (int(v) for v in self.columnas(partidos).sum(axis=0))))
+
+    def ganadores(self, partidos: Optional[Sequence[str]] = None, matriz: Optional[np.ndarray] = None) -> np.ndarray:
+        """Índice (en partidos / columnas de matriz) del más votado por distrito; empate -> el primero."""
+        m = self.columnas(list(partidos)) if matriz is None else matriz
+        return np.argmax(m, axis=1)
+
+    def segundos(self, partidos: Sequence[str]) -> np.ndarray:
+        """Índice del segundo lugar por distrito (-1 si hay menos de dos partidos)."""
+        m = self.columnas(list(partidos))
+        if m.shape[1] < 2:
+            return np.full(self.n_distritos, -1, dtype=np.int64)
+        orden = np.argsort(-m, axis=1, kind='stable')
+        return orden[:, 1]
+
+    def conteo(self, indices: np.ndarray, etiquetas: Sequence[str]) -> Dict[str, int]:
+        """Distritos por etiqueta a partir de un vector de índices (p. ej. ganadores)."""
+        cuenta = np.bincount(indices, minlength=len(etiquetas))
+        return {e: int(c) for e, c in zip(etiquetas, cuenta)}
+
+    def conteo_por_entidad(self, indices: np.ndarray, etiquetas: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        """{entidad: {etiqueta: distritos}} para entidades con al menos un distrito."""
+        k = len(etiquetas)
+        cuenta = np.bincount(self.entidad_id * k + indices, minlength=len(self.entidades) * k)
+        cuenta = cuenta.reshape(len(self.entidades), k)
+        return {ent: {e: int(c) for e, c in zip(etiquetas, fila)}
+                for ent, fila in zip(self.entidades, cuenta)}
+
+    def distritos_por_entidad(self) -> Dict[str, int]:
+        """Número de distritos por entidad, en orden de aparición."""
+        cuenta = np.bincount(self.entidad_id, minlength=len(self.entidades))
+        return {ent: int(c) for ent, c in zip(self.entidades, cuenta)}
+
+    def fila(self, i: int, partidos: Sequence[str]) -> Dict[str, float]:
+        """Votos del distrito i para partidos con columna en el origen (como dict)."""
+        return {p: float(self.votos[i, self.registro.indice(p)]) for p in partidos if p in self.presentes}
+
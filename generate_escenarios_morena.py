@@ -21,13 +21,61 @@ import numpy as np
 # Agregar el directorio actual al path
 sys.path.append('.')
 
-from engine.procesar_diputados_v2 import procesar_diputados_v2
+from engine.procesar_diputados_v2 import procesar_diputados_batch
+from engine.scenario_executor import ScenarioExecutor
 from usar_swing import SwingElectoral
 
-def calcular_escenarios_morena():
+
+def evaluar_grid(path_parquet, año, path_siglado, magnitudes, configuraciones, executor=None):
+    """
+    Evalúa todas las combinaciones magnitud × configuración × coalición del año
+    de una sola vez (en paralelo si hay executor). Devuelve
+    {(magnitud, nombre_config, usar_coaliciones): resultado}; las combinaciones
+    que fallan se reportan y se omiten, sin afectar a las demás.
+    """
+    combinaciones = [
+        (magnitud, config, usar_coal)
+        for magnitud in magnitudes
+        for config in configuraciones
+        for usar_coal in (True, False)
+    ]
+    escenarios = [{
+        "max_seats": magnitud,
+        "sistema": "mixto",
+        "mr_seats": int(magnitud * config["mr_pct"]),
+        "rp_seats": magnitud - int(magnitud * config["mr_pct"]),
+        "umbral": 0.03,
+        "quota_method": "hare",
+        "usar_coaliciones": usar_coal,
+    } for magnitud, config, usar_coal in combinaciones]
+    try:
+        resultados = procesar_diputados_batch(
+            path_parquet=path_parquet,
+            anio=año,
+            path_siglado=path_siglado,
+            escenarios=escenarios,
+            executor=executor,
+            capturar_errores=True,
+        )
+    except Exception as e:
+        # solo errores del año completo (p. ej. parquet ilegible)
+        print(f"  [ERROR] Evaluando escenarios de {path_parquet}: {e}")
+        return {}
+    grid = {}
+    for (magnitud, config, usar_coal), res in zip(combinaciones, resultados):
+        if "error" in res:
+            print(f"  [ERROR] {año} magnitud={magnitud} {config['nombre']} coalición={usar_coal}: {res['error']}")
+            continue
+        grid[(magnitud, config["nombre"], usar_coal)] = res
+    return grid
+
+
+def calcular_escenarios_morena(executor=None):
     """
     Genera todos los escenarios para MORENA y exporta a CSV
     Incluye escenarios con swing electoral para 2021
+
+    executor: ScenarioExecutor opcional para evaluar los escenarios en paralelo
     """
     
     # Configuración de escenarios
@@ -75,6 +123,8 @@ def calcular_escenarios_morena():
             print(f"[WARN] No se encontró {path_siglado}, saltando año {año}")
             continue
         
+        resultados_grid = evaluar_grid(path_parquet, año, path_siglado, magnitudes, configuraciones, executor)
+        
         for magnitud in magnitudes:
             print(f"  [INFO] Magnitud: {magnitud} escaños")
             
@@ -86,19 +136,7 @@ def calcular_escenarios_morena():
                 
                 # Procesar CON coalición
                 try:
-                    resultado_con_coal = procesar_diputados_v2(
-                        path_parquet=path_parquet,
-                        anio=año,
-                        path_siglado=path_siglado,
-                        max_seats=magnitud,
-                        sistema="mixto",
-                        mr_seats=mr_seats,
-                        rp_seats=rp_seats,
-                        umbral=0.03,
-                        quota_method="hare",
-                        usar_coaliciones=True,
-                        print_debug=False
-                    )
+                    resultado_con_coal = resultados_grid[(magnitud, config['nombre'], True)]
                     
                     # Sumar escaños de MORENA y coalición
                     partidos_coalicion = coaliciones_morena.get(año, ["MORENA"])
@@ -141,19 +179,7 @@ def calcular_escenarios_morena():
                 
                 # Procesar SIN coalición
                 try:
-                    resultado_sin_coal = procesar_diputados_v2(
-                        path_parquet=path_parquet,
-                        anio=año,
-                        path_siglado=path_siglado,
-                        max_seats=magnitud,
-                        sistema="mixto",
-                        mr_seats=mr_seats,
-                        rp_seats=rp_seats,
-                        umbral=0.03,
-                        quota_method="hare",
-                        usar_coaliciones=False,
-                        print_debug=False
-                    )
+                    resultado_sin_coal = resultados_grid[(magnitud, config['nombre'], False)]
                     
                     escaños_morena = resultado_sin_coal['tot'].get('MORENA', 0)
                     pct_morena = (escaños_morena / magnitud) * 100
@@ -263,6 +289,7 @@ def calcular_escenarios_morena():
                 print(f"    [INFO] Distritos sin swing (mantienen votos originales): {distritos_sin_swing}")
                 
                 # Procesar escenarios con votos ajustados
+                resultados_swing = evaluar_grid(temp_parquet_path, 2021, path_siglado, magnitudes, configuraciones, executor)
                 for magnitud in magnitudes:
                     print(f"    [INFO] Magnitud: {magnitud} escaños (CON SWING)")
                     
@@ -274,19 +301,7 @@ def calcular_escenarios_morena():
                         
                         # CON coalición y CON swing
                         try:
-                            resultado_swing_coal = procesar_diputados_v2(
-                                path_parquet=temp_parquet_path,
-                                anio=2021,
-                                path_siglado=path_siglado,
-                                max_seats=magnitud,
-                                sistema="mixto",
-                                mr_seats=mr_seats,
-                                rp_seats=rp_seats,
-                                umbral=0.03,
-                                quota_method="hare",
-                                usar_coaliciones=True,
-                                print_debug=False
-                            )
+                            resultado_swing_coal = resultados_swing[(magnitud, config['nombre'], True)]
                             
                             partidos_coalicion = coaliciones_morena.get(2021, ["MORENA"])
                             escaños_morena_solo = resultado_swing_coal['tot'].get('MORENA', 0)
@@ -328,19 +343,7 @@ def calcular_escenarios_morena():
                         
                         # SIN coalición pero CON swing
                         try:
-                            resultado_swing_sin_coal = procesar_diputados_v2(
-                                path_parquet=temp_parquet_path,
-                                anio=2021,
-                                path_siglado=path_siglado,
-                                max_seats=magnitud,
-                                sistema="mixto",
-                                mr_seats=mr_seats,
-                                rp_seats=rp_seats,
-                                umbral=0.03,
-                                quota_method="hare",
-                                usar_coaliciones=False,
-                                print_debug=False
-                            )
+                            resultado_swing_sin_coal = resultados_swing[(magnitud, config['nombre'], False)]
                             
                             escaños_morena = resultado_swing_sin_coal['tot'].get('MORENA', 0)
                             pct_morena = (escaños_morena / magnitud) * 100
@@ -481,7 +484,9 @@ Para más detalles, ver: INVESTIGACION_OUTLIERS_SWING.md
 
 if __name__ == "__main__":
     try:
-        output_path, df = calcular_escenarios_morena()
+        # Workers: env SCENARIO_WORKERS (default: número de CPUs)
+        with ScenarioExecutor() as executor:
+            output_path, df = calcular_escenarios_morena(executor)
         print(f"\n[OK] Proceso completado. Archivo generado: {output_path}")
         
         # Mostrar preview del CSV
@@ -1,22 +1,39 @@
+import time
+_INICIO_IMPORT = time.perf_counter()
+
+import asyncio
 from fastapi import FastAPI, HTTPException, Query, Body, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import pandas as pd
+from engine.respuestas import RespuestaJSON, CompresionMiddleware, contenido_de, stats_compresion
 import sys
 import os
 import json
+import uuid
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 from datetime import datetime
+from contextlib import asynccontextmanager
 
 # Agregar el directorio actual al path para importaciones
 sys.path.append('.')
 
-from engine.procesar_senadores_v2 import procesar_senadores_v2  
-from engine.procesar_diputados_v2 import procesar_diputados_v2
-from engine.redistribucion_votos import simular_escenario_electoral, redistribuir_votos_mixto
+# pandas y los motores se importan al primer uso (o en el calentamiento de
+# arranque) para que /health y /data/escenarios respondan sin esperarlos;
+# ver engine/arranque.py
+from engine.arranque import ModuloDiferido, funcion_diferida
+pd = ModuloDiferido('pandas')
+procesar_senadores_v2 = funcion_diferida('engine.procesar_senadores_v2', 'procesar_senadores_v2')
+procesar_diputados_v2 = funcion_diferida('engine.procesar_diputados_v2', 'procesar_diputados_v2')
+simular_escenario_electoral = funcion_diferida('engine.redistribucion_votos', 'simular_escenario_electoral')
+redistribuir_votos_mixto = funcion_diferida('engine.redistribucion_votos', 'redistribuir_votos_mixto')
 # kpi_utils se encuentra en el paquete engine (no en outputs)
-from engine.kpi_utils import calcular_kpis_electorales, formato_seat_chart
+calcular_kpis_electorales = funcion_diferida('engine.kpi_utils', 'calcular_kpis_electorales')
+formato_seat_chart = funcion_diferida('engine.kpi_utils', 'formato_seat_chart')
+from engine.result_cache import CACHE_DIPUTADOS, CACHE_SENADO, clave_canonica
+from engine.motor_executor import MOTOR, MotorSaturado
+from engine.registro import obtener_registro, trazar, traza_autorizada
+
+log = obtener_registro('main')
 
 # Mapea colores por partido
 PARTY_COLORS = {
@@ -95,11 +112,11 @@ def transformar_resultado_a_formato_frontend(resultado_dict: Dict, plan: str) ->
     Transforma el resultado de las funciones de procesamiento al formato esperado por el frontend
     """
     try:
-        print(f"[DEBUG] Transformando resultado para plan: {plan}")
-        print(f"[DEBUG] Keys en resultado_dict: {list(resultado_dict.keys()) if resultado_dict else 'None'}")
+        log.debug("Transformando resultado para plan: %s", plan)
+        log.debug(lambda: f"Keys en resultado_dict: {list(resultado_dict.keys()) if resultado_dict else 'None'}")
         
         if not resultado_dict or 'tot' not in resultado_dict:
-            print(f"[DEBUG] Resultado vacío o sin 'tot', devolviendo vacío")
+            log.debug("Resultado vacío o sin 'tot', devolviendo vacío")
             return {"plan": plan, "resultados": [], "kpis": {}, "seat_chart": []}
         
         # Obtener datos base
@@ -148,23 +165,23 @@ def transformar_resultado_a_formato_frontend(resultado_dict: Dict, plan: str) ->
             # Validación: MR + PM + RP debe ser igual a TOTAL
             suma_verificacion = mr_escanos + pm_escanos + rp_escanos
             if suma_verificacion != escanos:
-                print(f"[WARNING] {partido}: MR({mr_escanos}) + PM({pm_escanos}) + RP({rp_escanos}) = {suma_verificacion} != seats({escanos})")
+                log.warning("%s: MR(%s) + PM(%s) + RP(%s) = %s != seats(%s)", partido, mr_escanos, pm_escanos, rp_escanos, suma_verificacion, escanos)
             
             seat_chart.append(seat_chart_item)
         
-        print(f"[DEBUG] Seat chart construido: {len(seat_chart)} partidos")
+        log.debug(lambda: f"Seat chart construido: {len(seat_chart)} partidos")
         for item in seat_chart:
-            print(f"[DEBUG] {item['party']}: {item['seats']} escaños")
+            log.debug("%s: %s escaños", item['party'], item['seats'])
         
         # Calcular KPIs
         votos_list = [r["votos"] for r in resultados]
         escanos_list = [r["total"] for r in resultados]
         
-        print(f"[DEBUG] Calculando KPIs con:")
-        print(f"[DEBUG] Total votos: {total_votos}")
-        print(f"[DEBUG] Total escaños: {total_escanos}")
-        print(f"[DEBUG] Votos por partido: {votos_list}")
-        print(f"[DEBUG] Escaños por partido: {escanos_list}")
+        log.debug("Calculando KPIs con:")
+        log.debug("Total votos: %s", total_votos)
+        log.debug("Total escaños: %s", total_escanos)
+        log.debug("Votos por partido: %s", votos_list)
+        log.debug("Escaños por partido: %s", escanos_list)
         
         # Calcular métricas de proporcionalidad mejoradas
         metricas_proporcionalidad = calcular_ratios_proporcionalidad(resultados, total_votos, total_escanos)
@@ -179,7 +196,7 @@ def transformar_resultado_a_formato_frontend(resultado_dict: Dict, plan: str) ->
             "partidos_con_escanos": len([r for r in resultados if r["total"] > 0])
         }
         
-        print(f"[DEBUG] KPIs calculados: {kpis}")
+        log.debug("KPIs calculados: %s", kpis)
 
         # Campos adicionales de diagnóstico para ayudar al frontend a reproducir/visualizar
         try:
@@ -198,7 +215,7 @@ def transformar_resultado_a_formato_frontend(resultado_dict: Dict, plan: str) ->
                 # una representación en 'porcentaje' alternativa por si el frontend espera otra escala
                 "gallagher_pct": round(kpis.get("gallagher", 0) * 100, 6)
             }
-            print(f"[DEBUG] KPIs debug fields: {kpis['_debug']}")
+            log.debug("KPIs debug fields: %s", kpis['_debug'])
         except Exception:
             pass
         
@@ -224,18 +241,40 @@ def transformar_resultado_a_formato_frontend(resultado_dict: Dict, plan: str) ->
                 if 'distritos_por_estado' in meta:
                     out['meta']['distritos_por_estado'] = meta.get('distritos_por_estado')
         except Exception as e:
-            print(f"[WARN] Error incluyendo meta en respuesta: {e}")
+            log.warning("Error incluyendo meta en respuesta: %s", e)
 
         return out
         
     except Exception as e:
-        print(f"[ERROR] Error transformando resultado: {e}")
+        log.error("Error transformando resultado: %s", e)
         return {"plan": plan, "resultados": [], "kpis": {"error": str(e)}, "seat_chart": []}
 
+@asynccontextmanager
+async def ciclo_de_vida(app):
+    """Al arrancar: importa los motores y siembra el snapshot de build (engine/snapshot.py) en un hilo de fondo.
+    Al cerrar: cancela el precalentamiento y apaga el pool de escenarios."""
+    from engine import arranque
+
+    def sembrar_snapshot():
+        from engine.snapshot import cargar_snapshot
+        cargar_snapshot()
+
+    hilo = arranque.calentar_en_segundo_plano(arranque.MODULOS_MOTOR, despues=sembrar_snapshot)
+    # Escenarios predefinidos a la caché de resultados en cuanto terminan los imports
+    precalentado = asyncio.create_task(arranque.precalentar_escenarios(escenarios_precalentados(), esperar=hilo)) \
+        if hilo is not None else None
+    yield
+    if precalentado is not None and not precalentado.done():
+        precalentado.cancel()
+    from engine.scenario_executor import cerrar_executor
+    await asyncio.to_thread(cerrar_executor)
+
 app = FastAPI(
     title="Backend Electoral API",
     description="API para procesamiento de datos electorales con soporte de coaliciones",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=ciclo_de_vida,
+    default_response_class=RespuestaJSON,
 )
 
 # Configurar CORS con opciones más específicas
@@ -259,6 +298,23 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# gzip/br según Accept-Encoding para bodies grandes (ver engine/respuestas.py)
+app.add_middleware(CompresionMiddleware)
+
+@app.middleware("http")
+async def traza_por_request(request: Request, call_next):
+    """
+    X-Request-ID en todos los registros y respuestas. ?trace=<token> o el header
+    X-Trace: <token> (igual a TRACE_TOKEN) activa todos los niveles de log solo
+    para este request.
+    """
+    id_request = (request.headers.get("x-request-id") or uuid.uuid4().hex[:8])[:64]
+    token = request.query_params.get("trace") or request.headers.get("x-trace") or ""
+    with trazar(traza_autorizada(token), id_request):
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = id_request
+    return response
+
 @app.get("/")
 async def root():
     return {
@@ -308,7 +364,7 @@ async def get_initial_data(
         config_msg = f"{camara_lower.capitalize()} 2024 {plan_final}"
         if mr_seats or rp_seats or escanos_totales:
             config_msg += f" (custom: mr={mr_seats}, rp={rp_seats}, total={escanos_totales}, sistema={sistema})"
-        print(f"[INFO] Cargando datos iniciales: {config_msg}")
+        log.info("Cargando datos iniciales: %s", config_msg)
         
         if camara_lower == "diputados":
             # Procesar datos vigentes de diputados 2024
@@ -322,11 +378,7 @@ async def get_initial_data(
             )
             
             # Agregar metadatos de configuración inicial
-            if hasattr(resultado, 'body'):
-                import json
-                data = json.loads(resultado.body.decode())
-            else:
-                data = resultado
+            data = contenido_de(resultado)
                 
             # Agregar información de configuración inicial
             mr_final = mr_seats if mr_seats else 300
@@ -353,11 +405,7 @@ async def get_initial_data(
             )
             
             # Agregar metadatos de configuración inicial
-            if hasattr(resultado, 'body'):
-                import json
-                data = json.loads(resultado.body.decode())
-            else:
-                data = resultado
+            data = contenido_de(resultado)
                 
             # Agregar información de configuración inicial
             data["config_inicial"] = {
@@ -399,56 +447,155 @@ async def get_initial_data(
         if "meta" in data:
             if camara_lower == "diputados":
                 if "mr_por_estado" not in data["meta"]:
-                    print(f"[WARN] mr_por_estado NO presente en respuesta de diputados")
+                    log.warning("mr_por_estado NO presente en respuesta de diputados")
                 else:
-                    print(f"[INFO] ✅ mr_por_estado presente con {len(data['meta']['mr_por_estado'])} estados")
+                    log.info(lambda: f"✅ mr_por_estado presente con {len(data['meta']['mr_por_estado'])} estados")
                     
                 if "distritos_por_estado" not in data["meta"]:
-                    print(f"[WARN] distritos_por_estado NO presente en respuesta de diputados")
+                    log.warning("distritos_por_estado NO presente en respuesta de diputados")
                 else:
                     total_distritos = sum(data['meta']['distritos_por_estado'].values())
-                    print(f"[INFO] ✅ distritos_por_estado presente: {total_distritos} distritos totales")
+                    log.info("✅ distritos_por_estado presente: %s distritos totales", total_distritos)
             elif camara_lower in ["senadores", "senado"]:
                 if "mr_por_estado" not in data["meta"]:
-                    print(f"[WARN] mr_por_estado NO presente en respuesta de senadores")
+                    log.warning("mr_por_estado NO presente en respuesta de senadores")
                 else:
-                    print(f"[INFO] ✅ mr_por_estado presente con {len(data['meta']['mr_por_estado'])} estados")
+                    log.info(lambda: f"✅ mr_por_estado presente con {len(data['meta']['mr_por_estado'])} estados")
                     
                 if "senadores_por_estado" not in data["meta"]:
-                    print(f"[WARN] senadores_por_estado NO presente en respuesta de senadores")
+                    log.warning("senadores_por_estado NO presente en respuesta de senadores")
                 else:
                     total_senadores = sum(data['meta']['senadores_por_estado'].values())
-                    print(f"[INFO] ✅ senadores_por_estado presente: {total_senadores} senadores totales")
+                    log.info("✅ senadores_por_estado presente: %s senadores totales", total_senadores)
         else:
-            print(f"[WARN] 'meta' NO presente en respuesta")
+            log.warning("'meta' NO presente en respuesta")
         
-        print(f"[INFO] Datos iniciales de {camara_lower} cargados exitosamente")
+        log.info("Datos iniciales de %s cargados exitosamente", camara_lower)
         return data
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[ERROR] Error cargando datos iniciales: {str(e)}")
+        log.error(lambda: f"Error cargando datos iniciales: {str(e)}")
         import traceback
-        print(traceback.format_exc())
+        log.error(traceback.format_exc())
         raise HTTPException(
             status_code=500, 
             detail=f"Error cargando datos iniciales: {str(e)}"
         )
 
+# ==========================================
+# CACHÉ DE RESULTADOS
+# ==========================================
+
+# Planes predefinidos: en ellos los parámetros de magnitud/reparto se ignoran
+# (el plan los fija), así que no deben fragmentar la clave de caché.
+# total_distritos NO va aquí: la redistritación geográfica lo usa en todos los planes.
+PLANES_PREDEFINIDOS_DIP = {"vigente", "plan_a", "plan_c", "300_100_con_topes", "300_100_sin_topes", "200_200_sin_topes"}
+PARAMS_IGNORADOS_EN_PRESET_DIP = (
+    "escanos_totales", "sistema", "umbral", "mr_seats", "pm_seats", "rp_seats",
+    "max_seats_per_party", "reparto_mode", "reparto_method",
+)
+
+def clave_cache_diputados(params: Dict[str, Any]) -> str:
+    """Clave canónica de /procesar/diputados (compartida por /kpis, /seat-chart, etc.)"""
+    params = dict(params)
+    plan_key = str(params.get("plan") or "").lower().strip()
+    plan_key = {"a": "plan_a", "b": "vigente", "c": "plan_c"}.get(plan_key, plan_key)
+    if plan_key in PLANES_PREDEFINIDOS_DIP:
+        for k in PARAMS_IGNORADOS_EN_PRESET_DIP:
+            params.pop(k, None)
+    return clave_canonica("diputados", params)
+
+# En Senado el modo/método de reparto sí aplica a todos los planes; solo las
+# magnitudes quedan fijas en los planes predefinidos.
+PLANES_PREDEFINIDOS_SEN = {"vigente", "plan_a", "plan_c"}
+PARAMS_IGNORADOS_EN_PRESET_SEN = ("escanos_totales", "sistema", "umbral", "mr_seats", "pm_seats", "rp_seats")
+
+def clave_cache_senado(params: Dict[str, Any]) -> str:
+    """Clave canónica de /procesar/senado (compartida por /kpis y /seat-chart)"""
+    params = dict(params)
+    if normalizar_plan(str(params.get("plan") or "")) in PLANES_PREDEFINIDOS_SEN:
+        for k in PARAMS_IGNORADOS_EN_PRESET_SEN:
+            params.pop(k, None)
+    return clave_canonica("senado", params)
+
+def escenarios_precalentados():
+    """
+    (etiqueta, fábrica de corutina) de los planes predefinidos de /data/escenarios
+    por año y cámara, llamando a los mismos handlers (mismas claves de caché).
+    Primero lo que pide /data/initial: 2024 vigente.
+    """
+    def orden(planes):
+        return sorted(planes, key=lambda p: (p != "vigente", p))
+
+    tareas = []
+    for anio in (2024, 2021, 2018):
+        if os.path.exists(f"data/computos_diputados_{anio}.parquet"):
+            tareas += [(f"diputados {anio} {plan}", lambda a=anio, p=plan: procesar_diputados(anio=a, plan=p))
+                       for plan in orden(PLANES_PREDEFINIDOS_DIP)]
+    for anio in (2024, 2018):
+        if os.path.exists(f"data/computos_senado_{anio}.parquet"):
+            tareas += [(f"senado {anio} {plan}", lambda a=anio, p=plan: procesar_senado(request=None, anio=a, plan=p))
+                       for plan in orden(PLANES_PREDEFINIDOS_SEN)]
+    # /data/initial primero en ambas cámaras
+    return sorted(tareas, key=lambda t: t[0] not in ("diputados 2024 vigente", "senado 2024 vigente"))
+
+def respuesta_desde_cache(entry) -> Response:
+    """Reconstruye la respuesta a partir del body ya serializado"""
+    body, headers = entry
+    headers["X-Cache"] = "HIT"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Contadores de las cachés de resultados y de datos"""
+    from engine import dataset_store
+    from engine.recomposicion import recomposition_cache_stats
+    return {
+        "diputados": CACHE_DIPUTADOS.stats(),
+        "senado": CACHE_SENADO.stats(),
+        "dataset_store": dataset_store.estadisticas(),
+        "recomposicion": recomposition_cache_stats(),
+        "compresion": stats_compresion(),
+    }
+
+# ==========================================
+# EJECUCIÓN DEL MOTOR
+# ==========================================
+
+async def ejecutar_motor(fn, *args, **kwargs):
+    """Corre una llamada CPU-bound del motor fuera del event loop (503 si la cola está llena)"""
+    try:
+        return await MOTOR.ejecutar(fn, *args, **kwargs)
+    except MotorSaturado as e:
+        log.warning("%s", e)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+@app.get("/motor/stats")
+async def motor_stats():
+    """Concurrencia, profundidad de cola y rechazos del executor del motor"""
+    return MOTOR.stats()
+
+@app.get("/arranque/stats")
+async def arranque_stats():
+    """Tiempo de import de main.py, imports diferidos por módulo y estado del calentamiento"""
+    from engine import arranque
+    return arranque.estado()
+
 @app.get("/health")
 async def health_check():
-    """Endpoint de salud del servidor"""
+    """Endpoint de salud del servidor (no requiere pandas ni los motores)"""
     try:
         return {
             "status": "healthy", 
-            "timestamp": pd.Timestamp.now().isoformat(),
+            "timestamp": datetime.now().isoformat(),
             "version": "2.0.0",
             "cors_enabled": True,
             "endpoints": ["procesar/senado", "procesar/diputados"]
         }
     except Exception as e:
-        return JSONResponse(
+        return RespuestaJSON(
             status_code=500,
             content={"status": "unhealthy", "error": str(e)}
         )
@@ -509,7 +656,7 @@ async def obtener_partidos_por_anio(
     Devuelve partidos disponibles para un año específico con sus porcentajes vigentes
     """
     try:
-        print(f"[DEBUG] Obteniendo partidos para año {anio}, cámara {camara}")
+        log.debug("Obteniendo partidos para año %s, cámara %s", anio, camara)
         
         # Cargar datos según cámara
         if camara == "diputados":
@@ -525,7 +672,7 @@ async def obtener_partidos_por_anio(
         
         # Cargar datos
         df = pd.read_parquet(path_datos)
-        print(f"[DEBUG] Datos cargados: {len(df)} filas")
+        log.debug(lambda: f"Datos cargados: {len(df)} filas")
         
         # Los datos están en formato ancho (cada partido es una columna)
         # Excluir columnas no partidarias
@@ -539,12 +686,12 @@ async def obtener_partidos_por_anio(
         
         # Filtrar partidos con votos > 0 (solo partidos que participaron)
         votos_por_partido = {k: v for k, v in votos_por_partido.items() if v > 0}
-        print(f"[DEBUG] Partidos que participaron en {anio}: {list(votos_por_partido.keys())}")
+        log.debug(lambda: f"Partidos que participaron en {anio}: {list(votos_por_partido.keys())}")
         
         total_votos = sum(votos_por_partido.values())
         
-        print(f"[DEBUG] Total votos: {total_votos}")
-        print(f"[DEBUG] Partidos encontrados: {list(votos_por_partido.keys())}")
+        log.debug("Total votos: %s", total_votos)
+        log.debug(lambda: f"Partidos encontrados: {list(votos_por_partido.keys())}")
         
         # Crear lista de partidos con porcentajes
         partidos_data = []
@@ -559,7 +706,7 @@ async def obtener_partidos_por_anio(
         # Ordenar por porcentaje descendente
         partidos_data.sort(key=lambda x: x['porcentaje_vigente'], reverse=True)
         
-        print(f"[DEBUG] Partidos procesados correctamente: {len(partidos_data)}")
+        log.debug(lambda: f"Partidos procesados correctamente: {len(partidos_data)}")
         
         return {
             "anio": anio,
@@ -570,7 +717,7 @@ async def obtener_partidos_por_anio(
         }
         
     except Exception as e:
-        print(f"[ERROR] Error obteniendo partidos: {e}")
+        log.error("Error obteniendo partidos: %s", e)
         raise HTTPException(
             status_code=400, 
             detail=f"Error obteniendo partidos para {camara} {anio}: {str(e)}"
@@ -579,7 +726,7 @@ async def obtener_partidos_por_anio(
 @app.options("/procesar/senado")
 async def options_procesar_senado():
     """Manejo de CORS preflight para senado"""
-    return JSONResponse(
+    return RespuestaJSON(
         status_code=200,
         content={"message": "CORS preflight OK"},
         headers={
@@ -824,7 +971,7 @@ async def procesar_senado(
     try:
         # Normalizar el nombre del plan para compatibilidad con frontend
         plan_normalizado = normalizar_plan(plan)
-        print(f"[DEBUG] Senado - Plan original: '{plan}' -> Plan normalizado: '{plan_normalizado}'")
+        log.debug("Senado - Plan original: '%s' -> Plan normalizado: '%s'", plan, plan_normalizado)
 
         # Parsear body JSON para detectar overrides manuales (mr_distritos_manuales / mr_distritos_por_estado)
         raw_body_parsed = False
@@ -836,13 +983,29 @@ async def procesar_senado(
             mr_distritos_manuales = raw_body.get('mr_distritos_manuales')
             mr_distritos_por_estado = raw_body.get('mr_distritos_por_estado')
             if mr_distritos_manuales:
-                print(f"[DEBUG] Se detectó mr_distritos_manuales en el body: keys={list(mr_distritos_manuales.keys()) if isinstance(mr_distritos_manuales, dict) else 'str'}")
+                log.debug(lambda: f"Se detectó mr_distritos_manuales en el body: keys={list(mr_distritos_manuales.keys()) if isinstance(mr_distritos_manuales, dict) else 'str'}")
             if mr_distritos_por_estado:
-                print(f"[DEBUG] Se detectó mr_distritos_por_estado en el body: sample={list(mr_distritos_por_estado.keys())[:5] if isinstance(mr_distritos_por_estado, dict) else 'str'}")
+                log.debug(lambda: f"Se detectó mr_distritos_por_estado en el body: sample={list(mr_distritos_por_estado.keys())[:5] if isinstance(mr_distritos_por_estado, dict) else 'str'}")
         except Exception:
             # No body JSON o parseo falló; continuar sin overrides
             raw_body_parsed = False
 
+        # Caché de resultados: el body completo entra en la clave porque sus
+        # overrides (y el alias mr_por_estado) se reflejan en la respuesta
+        cache_key = clave_cache_senado({
+            "anio": anio, "plan": plan, "escanos_totales": escanos_totales,
+            "sistema": sistema, "umbral": umbral, "mr_seats": mr_seats,
+            "pm_seats": pm_seats, "rp_seats": rp_seats,
+            "reparto_mode": reparto_mode, "reparto_method": reparto_method,
+            "usar_coaliciones": usar_coaliciones,
+            "raw_body": raw_body if raw_body_parsed else None,
+            "raw_body_parsed": raw_body_parsed,
+        })
+        cached = CACHE_SENADO.get(cache_key)
+        if cached is not None:
+            log.debug("Senado - respuesta servida desde caché (%s)", cache_key[:12])
+            return respuesta_desde_cache(cached)
+
         # Alias: aceptar también 'mr_por_estado' (frontend). Si se envía, convertirlo
         # a 'mr_distritos_por_estado' para pasarlo al motor y además preservar su desglose
         # para devolverlo en meta.
@@ -894,7 +1057,7 @@ async def procesar_senado(
                 if primera_clave is not None and (str(primera_clave).isdigit() or isinstance(primera_clave, int)):
                     # Ya vienen como IDs (usar tal cual)
                     mr_distritos_por_estado = mr_por_estado_raw if isinstance(mr_por_estado_raw, str) else json.dumps(mr_por_estado_raw)
-                    print(f"[DEBUG] ✅ mr_por_estado ya viene con IDs numéricos; usando directamente para mr_distritos_por_estado")
+                    log.debug("✅ mr_por_estado ya viene con IDs numéricos; usando directamente para mr_distritos_por_estado")
                 else:
                     # Convertir nombres → IDs
                     mr_por_estado_con_ids = {}
@@ -906,13 +1069,13 @@ async def procesar_senado(
                             if nid:
                                 mr_por_estado_con_ids[str(nid)] = partidos
                             else:
-                                print(f"[WARN] Estado '{nombre_estado}' no reconocido en mapeo (intentadas: '{_norm(nombre_estado)}')")
+                                log.warning(lambda: f"Estado '{nombre_estado}' no reconocido en mapeo (intentadas: '{_norm(nombre_estado)}')")
 
                     mr_distritos_por_estado = json.dumps(mr_por_estado_con_ids)
-                    print(f"[DEBUG] ✅ Convertido mr_por_estado de nombres → IDs: {len(mr_por_estado_con_ids)} estados")
+                    log.debug(lambda: f"✅ Convertido mr_por_estado de nombres → IDs: {len(mr_por_estado_con_ids)} estados")
 
         except Exception as _e:
-            print(f"[WARN] Error procesando alias mr_por_estado en senado: {_e}")
+            log.warning("Error procesando alias mr_por_estado en senado: %s", _e)
 
         # Si el frontend envió mr_distritos_por_estado (sliders micro), preservar su desglose
         try:
@@ -943,14 +1106,14 @@ async def procesar_senado(
                         except Exception:
                             nombre_estado = str(estado_id_str).upper()
                         mr_por_estado_manual[nombre_estado] = partidos_dict.copy() if isinstance(partidos_dict, dict) else {}
-                    print(f"[DEBUG] Senado: mr_por_estado_manual preservado con {len(mr_por_estado_manual)} estados")
+                    log.debug(lambda: f"Senado: mr_por_estado_manual preservado con {len(mr_por_estado_manual)} estados")
             # 🔥 IMPORTANTE: Si se enviaron sliders nacionales (mr_distritos_manuales) pero NO flechitas,
             # resetear mr_por_estado_manual para evitar usar valores antiguos
             elif mr_distritos_manuales:
-                print(f"[DEBUG] Senado: Sliders nacionales detectados sin flechitas → reseteando mr_por_estado_manual")
+                log.debug("Senado: Sliders nacionales detectados sin flechitas → reseteando mr_por_estado_manual")
                 mr_por_estado_manual = None
         except Exception as _e:
-            print(f"[WARN] No se pudo parsear mr_distritos_por_estado en senado: {_e}")
+            log.warning("No se pudo parsear mr_distritos_por_estado en senado: %s", _e)
         
         if anio not in [2018, 2024]:
             raise HTTPException(status_code=400, detail="Año no soportado. Use 2018 o 2024")
@@ -1017,9 +1180,9 @@ async def procesar_senado(
             umbral_final = umbral if umbral is not None else 0.03
             max_seats = mr_puro + rp_escanos  # Total fijo, PM no suma
             
-            print(f"[DEBUG] Plan personalizado - MR original: {mr_puro}, PM: {pm_escanos}, RP: {rp_escanos}")
-            print(f"[DEBUG] MR efectivo: {mr_final_efectivo}, PM: {pm_escanos}, Total: {max_seats}")
-            print(f"[DEBUG] Total para backend - mr_seats: {mr_seats_final}, rp_seats: {rp_seats_final}")
+            log.debug("Plan personalizado - MR original: %s, PM: %s, RP: %s", mr_puro, pm_escanos, rp_escanos)
+            log.debug("MR efectivo: %s, PM: %s, Total: %s", mr_final_efectivo, pm_escanos, max_seats)
+            log.debug("Total para backend - mr_seats: %s, rp_seats: %s", mr_seats_final, rp_seats_final)
         else:
             raise HTTPException(status_code=400, detail="Plan no válido. Use 'vigente', 'plan_a', 'plan_c' o 'personalizado'")
             
@@ -1027,11 +1190,11 @@ async def procesar_senado(
         if reparto_mode == "cuota":
             quota_method_final = reparto_method
             divisor_method_final = None
-            print(f"[DEBUG] Senado - Modo cuota seleccionado: {quota_method_final}")
+            log.debug("Senado - Modo cuota seleccionado: %s", quota_method_final)
         elif reparto_mode == "divisor":
             quota_method_final = None
             divisor_method_final = reparto_method
-            print(f"[DEBUG] Senado - Modo divisor seleccionado: {divisor_method_final}")
+            log.debug("Senado - Modo divisor seleccionado: %s", divisor_method_final)
         else:
             raise HTTPException(status_code=400, detail="reparto_mode debe ser 'cuota' o 'divisor'")
             
@@ -1048,7 +1211,8 @@ async def procesar_senado(
         if not os.path.exists(path_siglado):
             raise HTTPException(status_code=404, detail=f"Archivo siglado no encontrado: {path_siglado}")
             
-        resultado = procesar_senadores_v2(
+        resultado = await ejecutar_motor(
+            procesar_senadores_v2,
             path_parquet=path_parquet,
             anio=anio,
             path_siglado=path_siglado,
@@ -1082,9 +1246,9 @@ async def procesar_senado(
                         candidate = json.loads(candidate)
                     if isinstance(candidate, dict):
                         mr_por_estado_manual = {str(k).upper(): (v.copy() if isinstance(v, dict) else {}) for k, v in candidate.items()}
-                        print(f"[DEBUG] Senado: Construido mr_por_estado_manual directamente desde raw_body (claves: {len(mr_por_estado_manual)})")
+                        log.debug(lambda: f"Senado: Construido mr_por_estado_manual directamente desde raw_body (claves: {len(mr_por_estado_manual)})")
                 except Exception as _e:
-                    print(f"[WARN] No se pudo construir mr_por_estado_manual desde raw_body: {_e}")
+                    log.warning("No se pudo construir mr_por_estado_manual desde raw_body: %s", _e)
 
             if 'mr_por_estado_manual' in locals() and mr_por_estado_manual:
                 # Calcular ssd (MR nacional por partido) desde el desglose por estado
@@ -1102,7 +1266,7 @@ async def procesar_senado(
                                 manual_ssd[key_norm] = manual_ssd.get(key_norm, 0) + 0
 
                 suma_manual = sum(manual_ssd.values())
-                print(f"[DEBUG] manual_ssd calculado (por partido, MAYUS): {manual_ssd}")
+                log.debug("manual_ssd calculado (por partido, MAYUS): %s", manual_ssd)
                 # Determinar MR total esperado según configuración usada arriba
                 try:
                     expected_mr_total = mr_seats_final
@@ -1117,12 +1281,12 @@ async def procesar_senado(
                         expected_mr_total = None
 
                 if suma_manual and expected_mr_total and suma_manual == expected_mr_total:
-                    print(f"[INFO] Aplicando mr_por_estado_manual enviado por cliente (suma={suma_manual})")
-                    print(f"[DEBUG] expected_mr_total={expected_mr_total}")
+                    log.info("Aplicando mr_por_estado_manual enviado por cliente (suma=%s)", suma_manual)
+                    log.debug("expected_mr_total=%s", expected_mr_total)
                     # Mostrar partidos actuales en resultado_formateado para depuración
                     try:
                         existentes = [r.get('partido') for r in resultado_formateado.get('resultados', [])]
-                        print(f"[DEBUG] Partidos en resultado_formateado (orden): {existentes}")
+                        log.debug("Partidos en resultado_formateado (orden): %s", existentes)
                     except Exception:
                         pass
                     # Actualizar MR nacionales en resultados y en seat_chart
@@ -1161,7 +1325,7 @@ async def procesar_senado(
                     resultado_formateado['meta']['override_aplicado'] = False
                     resultado_formateado['meta']['override_reason'] = 'suma_manual_no_coincide' if suma_manual else 'no_manual'
         except Exception as _e:
-            print(f"[WARN] No se pudo aplicar mr_por_estado_manual: {_e}")
+            log.warning("No se pudo aplicar mr_por_estado_manual: %s", _e)
         
         # ============================================================================
         # DETECCIÓN AUTOMÁTICA DE MAYORÍAS (SENADO)
@@ -1249,13 +1413,13 @@ async def procesar_senado(
                     }
                 }
                 
-                print(f"[INFO] Senado - Mayorías detectadas:")
-                print(f"  Total escaños: {total_escanos}")
-                print(f"  Mayoría simple (>{int(mayoria_simple_umbral)}): {mayorias_info['mayoria_simple']['partido']} ({mayorias_info['mayoria_simple']['escanos']} escaños)")
-                print(f"  Mayoría calificada (≥{int(mayoria_calificada_umbral)+1}): {mayorias_info['mayoria_calificada']['partido']} ({mayorias_info['mayoria_calificada']['escanos']} escaños)")
+                log.info("Senado - Mayorías detectadas:")
+                log.debug("Total escaños: %s", total_escanos)
+                log.debug(lambda: f"Mayoría simple (>{int(mayoria_simple_umbral)}): {mayorias_info['mayoria_simple']['partido']} ({mayorias_info['mayoria_simple']['escanos']} escaños)")
+                log.debug(lambda: f"Mayoría calificada (≥{int(mayoria_calificada_umbral)+1}): {mayorias_info['mayoria_calificada']['partido']} ({mayorias_info['mayoria_calificada']['escanos']} escaños)")
                 
         except Exception as e_mayorias:
-            print(f"[WARN] Error detectando mayorías en Senado: {e_mayorias}")
+            log.warning("Error detectando mayorías en Senado: %s", e_mayorias)
             # No fallar la petición si hay error en detección de mayorías
             pass
         # ============================================================================
@@ -1293,7 +1457,7 @@ async def procesar_senado(
                 resultado_formateado.setdefault('meta', {})
                 resultado_formateado['meta']['trace'] = trace
         except Exception as _e:
-            print(f"[WARN] No se pudo añadir trace meta: {_e}")
+            log.warning("No se pudo añadir trace meta: %s", _e)
 
         # Retornar con headers anti-caché para evitar problemas de actualización
         # Si el frontend envió distribución manual por estado para Senado, devolverla tal cual
@@ -1346,13 +1510,13 @@ async def procesar_senado(
                                     manual_ssd[key_norm] = manual_ssd.get(key_norm, 0) + 0
 
                     suma_manual = sum(manual_ssd.values())
-                    print(f"[DEBUG] client_mr -> manual_ssd (MAYUS): {manual_ssd}")
+                    log.debug("client_mr -> manual_ssd (MAYUS): %s", manual_ssd)
                     expected_mr_total = mr_seats_final if 'mr_seats_final' in locals() else None
                     if expected_mr_total is None:
                         expected_mr_total = sum(r.get('mr', 0) for r in resultado_formateado.get('resultados', []))
 
                     if suma_manual and expected_mr_total and suma_manual == expected_mr_total:
-                        print(f"[INFO] Aplicando client_mr override (suma_manual={suma_manual}, expected={expected_mr_total})")
+                        log.info("Aplicando client_mr override (suma_manual=%s, expected=%s)", suma_manual, expected_mr_total)
                         # Aplicar: actualizar resultados y seat_chart
                         rp_map = {it.get('party'): it.get('rp', 0) for it in resultado_formateado.get('seat_chart', [])}
                         for row in resultado_formateado.get('resultados', []):
@@ -1373,9 +1537,9 @@ async def procesar_senado(
                         resultado_formateado['meta']['override_aplicado'] = False
                         resultado_formateado['meta']['override_reason'] = 'suma_manual_no_coincide' if suma_manual else 'no_manual'
                 except Exception as _e:
-                    print(f"[WARN] Error procesando mr_por_estado cliente para devolver/aplicar override: {_e}")
+                    log.warning("Error procesando mr_por_estado cliente para devolver/aplicar override: %s", _e)
         except Exception as _e:
-            print(f"[WARN] No se pudo incluir mr_por_estado_manual en respuesta (senado): {_e}")
+            log.warning("No se pudo incluir mr_por_estado_manual en respuesta (senado): %s", _e)
 
         # Incluir meta retornada por el motor (para diagnóstico) sin sobreescribir
         try:
@@ -1383,22 +1547,24 @@ async def procesar_senado(
             resultado_formateado.setdefault('meta', {})
             resultado_formateado['meta']['engine_result_meta'] = engine_meta
         except Exception as _e:
-            print(f"[WARN] No se pudo anexar engine_result_meta en la respuesta: {_e}")
+            log.warning("No se pudo anexar engine_result_meta en la respuesta: %s", _e)
 
-        return JSONResponse(
-            content=resultado_formateado,
-            headers={
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0"
-            }
-        )
+        headers = {
+            "Cache-Control": "no-cache, no-store, must-revalidate",
+            "Pragma": "no-cache",
+            "Expires": "0"
+        }
+        response = RespuestaJSON(content=resultado_formateado, headers=headers)
+        CACHE_SENADO.put(cache_key, response.body, headers)
+        return response
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"[ERROR] Error en /procesar/senado: {str(e)}")
-        print(f"[ERROR] Tipo de error: {type(e).__name__}")
+        log.error(lambda: f"Error en /procesar/senado: {str(e)}")
+        log.error(lambda: f"Tipo de error: {type(e).__name__}")
         import traceback
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error procesando senado: {str(e)}")
 
 @app.get("/calcular-limites-pm")
@@ -1491,7 +1657,7 @@ async def calcular_distribucion_estados(
     """
     try:
         from redistritacion.modulos.reparto_distritos import repartir_distritos_hare
-        from redistritacion.modulos.distritacion import cargar_secciones_ine
+        from redistritacion.modulos.distritacion import poblacion_por_estado
         from engine.calcular_eficiencia_real import calcular_eficiencia_partidos
         import json
         
@@ -1512,8 +1678,7 @@ async def calcular_distribucion_estados(
             n_distritos = 300
         
         # 2. Calcular distribución de distritos por estado (método Hare)
-        secciones_df = cargar_secciones_ine()
-        poblacion_estados = secciones_df.groupby("ENTIDAD")["POBTOT"].sum().to_dict()
+        poblacion_estados = poblacion_por_estado()
         distribucion_hare = repartir_distritos_hare(poblacion_estados, n_distritos, piso_constitucional=2)
         
         # 3. Calcular eficiencias históricas
@@ -1693,7 +1858,7 @@ async def calcular_mayoria_forzada_endpoint(
             # Configuración personalizada del usuario
             mr_total = mr_seats
             rp_total = rp_seats
-            print(f"[DEBUG] Usando configuración personalizada: mr={mr_total}, rp={rp_total}, total={mr_total+rp_total}")
+            log.debug(lambda: f"Usando configuración personalizada: mr={mr_total}, rp={rp_total}, total={mr_total+rp_total}")
         elif plan == "vigente" or plan == "plan_a" or plan == "plan_c":
             mr_total = 300
             rp_total = 100
@@ -1731,7 +1896,8 @@ async def calcular_mayoria_forzada_endpoint(
                 )
         
         # PASO 1: Calcular configuración de mayoría forzada
-        config = calcular_mayoria_forzada(
+        config = await ejecutar_motor(
+            calcular_mayoria_forzada,
             partido=partido,
             tipo_mayoria=tipo_mayoria,
             mr_total=mr_total,
@@ -1771,12 +1937,8 @@ async def calcular_mayoria_forzada_endpoint(
             sistema=sistema
         )
         
-        # Extraer el contenido del JSONResponse
-        if hasattr(resultado_completo, 'body'):
-            import json
-            resultado_data = json.loads(resultado_completo.body.decode())
-        else:
-            resultado_data = resultado_completo
+        # Contenido de la respuesta (sin re-parsear el body)
+        resultado_data = contenido_de(resultado_completo)
         
         # PASO 3: Extraer datos del partido objetivo
         # El seat_chart está en la raíz, NO en mayorias
@@ -1801,7 +1963,7 @@ async def calcular_mayoria_forzada_endpoint(
         es_coalicion_explicita = '+' in partido
         if es_coalicion_explicita:
             solo_partido = False
-            print(f"[DEBUG] Partido '{partido}' contiene '+', forzando solo_partido=False (coalición)")
+            log.debug("Partido '%s' contiene '+', forzando solo_partido=False (coalición)", partido)
         
         # Calcular escaños totales según solo_partido
         if solo_partido:
@@ -1809,7 +1971,7 @@ async def calcular_mayoria_forzada_endpoint(
             diputados_obtenidos = partido_data.get('seats', 0)
             mr_asignados = partido_data.get('mr_seats', partido_data.get('mr', 0))
             rp_asignados = partido_data.get('rp_seats', partido_data.get('rp', 0))
-            print(f"[DEBUG] solo_partido=True: Contando SOLO {partido}: {diputados_obtenidos} escaños")
+            log.debug("solo_partido=True: Contando SOLO %s: %s escaños", partido, diputados_obtenidos)
         else:
             # Contar toda la coalición (MORENA + PT + PVEM si partido=MORENA)
             # Detectar miembros de la coalición
@@ -1843,7 +2005,7 @@ async def calcular_mayoria_forzada_endpoint(
                     mr_asignados += p_data.get('mr_seats', p_data.get('mr', 0))
                     rp_asignados += p_data.get('rp_seats', p_data.get('rp', 0))
             
-            print(f"[DEBUG] solo_partido=False: Contando coalición {nombre_coalicion}: {diputados_obtenidos} escaños totales")
+            log.debug("solo_partido=False: Contando coalición %s: %s escaños totales", nombre_coalicion, diputados_obtenidos)
         
         # PASO 4: Construir respuesta completa
         # Calcular umbral dinámicamente basado en escaños totales
@@ -1855,7 +2017,8 @@ async def calcular_mayoria_forzada_endpoint(
         from engine.procesar_diputados_v2 import procesar_diputados_v2
         
         # Re-ejecutar pero ahora capturando resultado directo sin transformar
-        resultado_dict_raw = procesar_diputados_v2(
+        resultado_dict_raw = await ejecutar_motor(
+            procesar_diputados_v2,
             path_parquet=f"data/computos_diputados_{anio}.parquet",
             anio=anio,
             max_seats=escanos_totales if escanos_totales else (mr_total + rp_total),
@@ -2029,7 +2192,8 @@ async def calcular_mayoria_forzada_senado_endpoint(
         from engine.procesar_senadores_v2 import procesar_senadores_v2
         
         # PASO 1: Calcular configuración de mayoría forzada para Senado
-        config = calcular_mayoria_forzada_senado(
+        config = await ejecutar_motor(
+            calcular_mayoria_forzada_senado,
             partido=partido,
             tipo_mayoria=tipo_mayoria,
             plan=plan,
@@ -2049,7 +2213,8 @@ async def calcular_mayoria_forzada_senado_endpoint(
             }
         
         # PASO 2: EJECUTAR sistema electoral completo con votos ajustados
-        resultado_completo = procesar_senadores_v2(
+        resultado_completo = await ejecutar_motor(
+            procesar_senadores_v2,
             anio=anio,
             plan=plan,
             aplicar_topes=aplicar_topes,
@@ -2073,7 +2238,7 @@ async def calcular_mayoria_forzada_senado_endpoint(
         es_coalicion_explicita = '+' in partido
         if es_coalicion_explicita:
             solo_partido = False
-            print(f"[DEBUG] Partido '{partido}' contiene '+', forzando solo_partido=False (coalición)")
+            log.debug("Partido '%s' contiene '+', forzando solo_partido=False (coalición)", partido)
         
         # Calcular senadores totales según solo_partido
         if solo_partido:
@@ -2082,7 +2247,7 @@ async def calcular_mayoria_forzada_senado_endpoint(
             mr_senadores = partido_data.get('mr_seats', 0)
             pm_senadores = partido_data.get('pm_seats', 0)
             rp_senadores = partido_data.get('rp_seats', 0)
-            print(f"[DEBUG] solo_partido=True: Contando SOLO {partido}: {senadores_obtenidos} senadores")
+            log.debug("solo_partido=True: Contando SOLO %s: %s senadores", partido, senadores_obtenidos)
         else:
             # Contar toda la coalición (MORENA + PT + PVEM si partido=MORENA)
             # Detectar miembros de la coalición
@@ -2118,7 +2283,7 @@ async def calcular_mayoria_forzada_senado_endpoint(
                     pm_senadores += p_data.get('pm_seats', 0)
                     rp_senadores += p_data.get('rp_seats', 0)
             
-            print(f"[DEBUG] solo_partido=False: Contando coalición {nombre_coalicion}: {senadores_obtenidos} senadores totales")
+            log.debug("solo_partido=False: Contando coalición %s: %s senadores totales", nombre_coalicion, senadores_obtenidos)
         
         # PASO 4: Construir respuesta completa
         umbral = 65 if tipo_mayoria == "simple" else 86
@@ -2152,8 +2317,8 @@ async def calcular_mayoria_forzada_senado_endpoint(
         raise
     except Exception as e:
         import traceback
-        print(f"[ERROR] Error calculando mayoría forzada Senado: {str(e)}")
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        log.error(lambda: f"Error calculando mayoría forzada Senado: {str(e)}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error calculando mayoría forzada Senado: {str(e)}")
 
 
@@ -2264,8 +2429,8 @@ async def generar_tabla_estados_senado_endpoint(
         raise
     except Exception as e:
         import traceback
-        print(f"[ERROR] Error generando tabla estados Senado: {str(e)}")
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        log.error(lambda: f"Error generando tabla estados Senado: {str(e)}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error generando tabla: {str(e)}")
 
 @app.post("/editar/estados_senado")
@@ -2311,6 +2476,15 @@ async def editar_estados_senado_endpoint(
         if anio not in [2018, 2024]:
             raise HTTPException(status_code=400, detail="Año no soportado")
         
+        # Mismo body (canonicalizado) -> misma respuesta
+        cache_key = clave_canonica("senado_estados", {
+            "anio": anio, "plan": plan, "estados_manuales": estados_manuales,
+            "aplicar_topes": aplicar_topes, "usar_coaliciones": usar_coaliciones,
+        })
+        cached = CACHE_SENADO.get(cache_key)
+        if cached is not None:
+            return respuesta_desde_cache(cached)
+        
         # Normalizar nombre del plan
         plan_normalizado = normalizar_plan(plan)
         
@@ -2355,7 +2529,8 @@ async def editar_estados_senado_endpoint(
         # Procesar con estados manuales
         # TODO: Implementar modificación del siglado basado en estados_manuales
         # Por ahora, procesar normalmente
-        resultado = procesar_senadores_v2(
+        resultado = await ejecutar_motor(
+            procesar_senadores_v2,
             path_parquet=path_parquet,
             anio=anio,
             path_siglado=path_siglado,
@@ -2440,28 +2615,28 @@ async def editar_estados_senado_endpoint(
                     }
                 }
         except Exception as e_mayorias:
-            print(f"[WARN] Error detectando mayorías: {e_mayorias}")
+            log.warning("Error detectando mayorías: %s", e_mayorias)
         
         # Agregar info de estados editados
         resultado_formateado['estados_editados'] = {
             partido: len(estados) for partido, estados in estados_manuales.items()
         }
         
-        return JSONResponse(
-            content=resultado_formateado,
-            headers={
-                "Cache-Control": "no-cache, no-store, must-revalidate",
-                "Pragma": "no-cache",
-                "Expires": "0"
-            }
-        )
+        headers = {
+            "Cache-Control": "no-cache, no-store, must-revalidate",
+            "Pragma": "no-cache",
+            "Expires": "0"
+        }
+        response = RespuestaJSON(content=resultado_formateado, headers=headers)
+        CACHE_SENADO.put(cache_key, response.body, headers)
+        return response
         
     except HTTPException:
         raise
     except Exception as e:
         import traceback
-        print(f"[ERROR] Error en /editar/estados_senado: {str(e)}")
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        log.error(lambda: f"Error en /editar/estados_senado: {str(e)}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error procesando: {str(e)}")
 
 @app.post("/exportar/escenario_senado")
@@ -2536,8 +2711,8 @@ async def exportar_escenario_senado_endpoint(
         raise
     except Exception as e:
         import traceback
-        print(f"[ERROR] Error exportando escenario: {str(e)}")
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        log.error(lambda: f"Error exportando escenario: {str(e)}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error exportando: {str(e)}")
 
 @app.post("/importar/escenario_senado")
@@ -2616,8 +2791,8 @@ async def importar_escenario_senado_endpoint(
         raise
     except Exception as e:
         import traceback
-        print(f"[ERROR] Error importando escenario: {str(e)}")
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        log.error(lambda: f"Error importando escenario: {str(e)}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error importando: {str(e)}")
 
 @app.get("/generar/tabla_distritos_diputados")
@@ -2714,8 +2889,8 @@ async def generar_tabla_distritos_diputados_endpoint(
         raise
     except Exception as e:
         import traceback
-        print(f"[ERROR] Error generando tabla distritos Diputados: {str(e)}")
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        log.error(lambda: f"Error generando tabla distritos Diputados: {str(e)}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error generando tabla: {str(e)}")
 
 @app.post("/exportar/escenario_diputados")
@@ -2795,8 +2970,8 @@ async def exportar_escenario_diputados_endpoint(
         raise
     except Exception as e:
         import traceback
-        print(f"[ERROR] Error exportando escenario diputados: {str(e)}")
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        log.error(lambda: f"Error exportando escenario diputados: {str(e)}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error exportando: {str(e)}")
 
 @app.post("/importar/escenario_diputados")
@@ -2878,14 +3053,14 @@ async def importar_escenario_diputados_endpoint(
         raise
     except Exception as e:
         import traceback
-        print(f"[ERROR] Error importando escenario diputados: {str(e)}")
-        print(f"[ERROR] Traceback: {traceback.format_exc()}")
+        log.error(lambda: f"Error importando escenario diputados: {str(e)}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Error importando: {str(e)}")
 
 @app.options("/procesar/diputados")
 async def options_procesar_diputados():
     """Manejo de CORS preflight para diputados"""
-    return JSONResponse(
+    return RespuestaJSON(
         status_code=200,
         content={"message": "CORS preflight OK"},
         headers={
@@ -2919,7 +3094,8 @@ async def procesar_diputados(
     votos_custom: Optional[str] = None,  # JSON string con redistribución
     partidos_fijos: Optional[str] = None,  # JSON string con partidos fijos
     overrides_pool: Optional[str] = None,   # JSON string con overrides del pool
-    porcentajes_partidos: Optional[str] = None  # JSON string con porcentajes por partido
+    porcentajes_partidos: Optional[str] = None,  # JSON string con porcentajes por partido
+    ajustar_votos_por_mr: bool = True  # False: con MR manuales se conservan los votos del escenario
 ):
     """
     Procesa los datos de diputados para un año específico con soporte de coaliciones
@@ -2945,6 +3121,7 @@ async def procesar_diputados(
     - **partidos_fijos**: JSON con partidos fijos {"MORENA":2, "PAN":40}
     - **overrides_pool**: JSON con overrides del pool {"PAN":20, "MC":10}
     - **porcentajes_partidos**: JSON con % de votos por partido {"MORENA":42.5, "PAN":20.7, ...}
+    - **ajustar_votos_por_mr**: Con MR manuales, ajustar los votos por regla de tres para que sean consistentes con esos MR (default: True). Con False se conservan los votos del escenario (flechitas de /ajustar/distrito-individual).
     
     NOTA: La redistritación geográfica está SIEMPRE ACTIVA. El sistema usa el método Hare 
     para distribuir distritos por estado según población y aplica eficiencias históricas 
@@ -2969,7 +3146,7 @@ async def procesar_diputados(
                     content_type_tmp = ''
                 if isinstance(body_obj, dict) and 'application/json' not in content_type_tmp.lower():
                     raw_body_parsed = True
-                    print(f"[WARN] Parsed JSON from body despite Content-Type={content_type_tmp}; marking raw_body_parsed=True")
+                    log.warning("Parsed JSON from body despite Content-Type=%s; marking raw_body_parsed=True", content_type_tmp)
             except Exception:
                 body_obj = None
             # Si no obtuvimos un dict, intentar un parsing tolerante desde el body raw
@@ -2989,7 +3166,7 @@ async def procesar_diputados(
                                 parsed = json.loads(raw_text_stripped)
                                 body_obj = parsed
                                 raw_body_parsed = True
-                                print(f"[WARN] Parsed raw body as JSON despite Content-Type: {request.headers.get('content-type')}")
+                                log.warning(lambda: f"Parsed raw body as JSON despite Content-Type: {request.headers.get('content-type')}")
                             except Exception:
                                 # No es JSON válido, mantener None y caer a heurísticas
                                 body_obj = body_obj or None
@@ -3031,7 +3208,7 @@ async def procesar_diputados(
                                         porcentajes_partidos = {k: float(v) for k, v in potential_parties_qs.items()}
                                         body_obj = porcentajes_partidos
                                         raw_body_parsed = True
-                                        print(f"[WARN] Parsed URL-encoded form as porcentajes_partidos (Content-Type={request.headers.get('content-type')})")
+                                        log.warning(lambda: f"Parsed URL-encoded form as porcentajes_partidos (Content-Type={request.headers.get('content-type')})")
                                     elif potential_json_found and not isinstance(body_obj, dict):
                                         # si encontramos JSON percent-encoded dentro de alguno de los campos, priorizamos
                                         # seleccionar el primer valor parseable
@@ -3039,7 +3216,7 @@ async def procesar_diputados(
                                             if isinstance(val, (dict, list)):
                                                 body_obj = val
                                                 raw_body_parsed = True
-                                                print(f"[WARN] Extracted JSON from percent-encoded form field (Content-Type={request.headers.get('content-type')})")
+                                                log.warning(lambda: f"Extracted JSON from percent-encoded form field (Content-Type={request.headers.get('content-type')})")
                                                 break
                                     else:
                                         # heurística clásica: buscar primer bloque JSON en el texto
@@ -3051,7 +3228,7 @@ async def procesar_diputados(
                                                 parsed = json.loads(fragment)
                                                 body_obj = parsed
                                                 raw_body_parsed = True
-                                                print(f"[WARN] Heuristically parsed JSON fragment from raw body (Content-Type={request.headers.get('content-type')})")
+                                                log.warning(lambda: f"Heuristically parsed JSON fragment from raw body (Content-Type={request.headers.get('content-type')})")
                                         except Exception:
                                             body_obj = body_obj or None
                             except Exception:
@@ -3064,7 +3241,7 @@ async def procesar_diputados(
                                         parsed = json.loads(fragment)
                                         body_obj = parsed
                                         raw_body_parsed = True
-                                        print(f"[WARN] Heuristically parsed JSON fragment from raw body (Content-Type={request.headers.get('content-type')})")
+                                        log.warning(lambda: f"Heuristically parsed JSON fragment from raw body (Content-Type={request.headers.get('content-type')})")
                                 except Exception:
                                     body_obj = body_obj or None
                 except Exception:
@@ -3142,7 +3319,7 @@ async def procesar_diputados(
                     if str(primera_clave).isdigit() or isinstance(primera_clave, int):
                         # Ya vienen como IDs, usar directamente
                         mr_distritos_por_estado = mr_por_estado_raw if isinstance(mr_por_estado_raw, str) else json.dumps(mr_por_estado_raw)
-                        print(f"[DEBUG] ✅ mr_por_estado ya tiene IDs numéricos")
+                        log.debug("✅ mr_por_estado ya tiene IDs numéricos")
                     else:
                         # Convertir nombres → IDs con normalización robusta
                         mr_por_estado_con_ids = {}
@@ -3154,13 +3331,13 @@ async def procesar_diputados(
                             if nid:
                                 mr_por_estado_con_ids[str(nid)] = partidos
                             else:
-                                print(f"[WARN] Estado '{nombre_estado}' no reconocido en mapeo (intentadas: '{_norm(nombre_estado)}')")
+                                log.warning(lambda: f"Estado '{nombre_estado}' no reconocido en mapeo (intentadas: '{_norm(nombre_estado)}')")
 
                         mr_distritos_por_estado = json.dumps(mr_por_estado_con_ids)
-                        print(f"[DEBUG] ✅ Convertido mr_por_estado de nombres → IDs: {len(mr_por_estado_con_ids)} estados")
+                        log.debug(lambda: f"✅ Convertido mr_por_estado de nombres → IDs: {len(mr_por_estado_con_ids)} estados")
                 
                 except Exception as e:
-                    print(f"[WARN] Error procesando mr_por_estado: {e}")
+                    log.warning("Error procesando mr_por_estado: %s", e)
                     mr_distritos_por_estado = mr_por_estado_raw if isinstance(mr_por_estado_raw, str) else json.dumps(mr_por_estado_raw)
             
             # Soporte para payloads 'desnudos' como {"PRD":90, "PAN":5, ...}
@@ -3169,7 +3346,7 @@ async def procesar_diputados(
                 potential_parties = {k:v for k,v in body_obj.items() if isinstance(k, str) and k.isupper() and isinstance(v, (int,float))}
                 # Si hay al menos 2 claves que lucen como partidos y no vienen ya en porcentajes_partidos
                 if potential_parties and not porcentajes_partidos:
-                    print(f"[DEBUG] Detectado payload desnudo de partidos, mapeando a porcentajes_partidos: {list(potential_parties.keys())}")
+                    log.debug(lambda: f"Detectado payload desnudo de partidos, mapeando a porcentajes_partidos: {list(potential_parties.keys())}")
                     porcentajes_partidos = potential_parties
             except Exception:
                 pass
@@ -3188,24 +3365,42 @@ async def procesar_diputados(
                     if potential_qp:
                         porcentajes_partidos = potential_qp
                         raw_body_parsed = True
-                        print(f"[WARN] Detected party percentages in query params, mapping to porcentajes_partidos: {list(potential_qp.keys())}")
+                        log.warning(lambda: f"Detected party percentages in query params, mapping to porcentajes_partidos: {list(potential_qp.keys())}")
             except Exception:
                 pass
-        print(f"[DEBUG] Iniciando /procesar/diputados con:")
-        print(f"[DEBUG] - anio: {anio}")
-        print(f"[DEBUG] - plan: {plan}")
-        print(f"[DEBUG] - escanos_totales: {escanos_totales}")
-        print(f"[DEBUG] - sistema: {sistema}")
-        print(f"[DEBUG] - mr_seats: {mr_seats}")
-        print(f"[DEBUG] - rp_seats: {rp_seats}")
-        print(f"[DEBUG] - total_distritos: {total_distritos}")  # ← NUEVO
-        print(f"[DEBUG] [MR MANUAL] mr_distritos_manuales (inicial): {mr_distritos_manuales[:100] if isinstance(mr_distritos_manuales, str) and mr_distritos_manuales else mr_distritos_manuales}")
-        print(f"[DEBUG] [MR ESTADO] mr_distritos_por_estado (inicial): {mr_distritos_por_estado[:100] if isinstance(mr_distritos_por_estado, str) and mr_distritos_por_estado else mr_distritos_por_estado}")
+        # Caché de resultados: misma configuración canónica -> misma respuesta
+        cache_key = clave_cache_diputados({
+            "anio": anio, "plan": plan, "escanos_totales": escanos_totales, "sistema": sistema,
+            "umbral": umbral, "mr_seats": mr_seats, "pm_seats": pm_seats, "rp_seats": rp_seats,
+            "total_distritos": total_distritos, "max_seats_per_party": max_seats_per_party,
+            "sobrerrepresentacion": sobrerrepresentacion, "aplicar_topes": aplicar_topes,
+            "reparto_mode": reparto_mode, "reparto_method": reparto_method,
+            "usar_coaliciones": usar_coaliciones, "mr_distritos_manuales": mr_distritos_manuales,
+            "mr_distritos_por_estado": mr_distritos_por_estado, "votos_custom": votos_custom,
+            "partidos_fijos": partidos_fijos, "overrides_pool": overrides_pool,
+            "porcentajes_partidos": porcentajes_partidos, "raw_body_parsed": raw_body_parsed,
+            "ajustar_votos_por_mr": ajustar_votos_por_mr,
+        })
+        cached = CACHE_DIPUTADOS.get(cache_key)
+        if cached is not None:
+            log.debug("/procesar/diputados HIT %s", cache_key[:12])
+            return respuesta_desde_cache(cached)
+
+        log.debug("Iniciando /procesar/diputados con:")
+        log.debug("- anio: %s", anio)
+        log.debug("- plan: %s", plan)
+        log.debug("- escanos_totales: %s", escanos_totales)
+        log.debug("- sistema: %s", sistema)
+        log.debug("- mr_seats: %s", mr_seats)
+        log.debug("- rp_seats: %s", rp_seats)
+        log.debug("- total_distritos: %s", total_distritos)  # ← NUEVO
+        log.debug(lambda: f"[MR MANUAL] mr_distritos_manuales (inicial): {mr_distritos_manuales[:100] if isinstance(mr_distritos_manuales, str) and mr_distritos_manuales else mr_distritos_manuales}")
+        log.debug(lambda: f"[MR ESTADO] mr_distritos_por_estado (inicial): {mr_distritos_por_estado[:100] if isinstance(mr_distritos_por_estado, str) and mr_distritos_por_estado else mr_distritos_por_estado}")
 
         # FORZAR redistritación geográfica SIEMPRE activa
         # Esto garantiza que los MR se calculen correctamente en todos los casos
         redistritacion_geografica = True
-        print(f"[DEBUG] - redistritacion_geografica: FORZADO a True (SIEMPRE activo)")
+        log.debug("- redistritacion_geografica: FORZADO a True (SIEMPRE activo)")
 
         # NUEVO: Procesar parámetros de redistribución de votos
         votos_redistribuidos = None
@@ -3220,7 +3415,7 @@ async def procesar_diputados(
             'overrides_pool': bool(overrides_pool),
             'porcentajes_partidos': bool(porcentajes_partidos)
         }
-        print(f"[DEBUG-REDISTRIB] keys_present: {keys_present}")
+        log.debug("[DEBUG-REDISTRIB] keys_present: %s", keys_present)
         # Si ninguna key relevante llegó, imprimimos un diagnóstico ligero
         if not any(keys_present.values()):
             try:
@@ -3238,16 +3433,16 @@ async def procesar_diputados(
                 except Exception:
                     content_type = '<unknown>'
 
-                print(f"[DEBUG-REDISTRIB] No redistrib keys present. body_summary={body_summary}, Content-Type={content_type}")
+                log.debug("[DEBUG-REDISTRIB] No redistrib keys present. body_summary=%s, Content-Type=%s", body_summary, content_type)
             except Exception as e:
-                print(f"[DEBUG-REDISTRIB] Error inspeccionando body para diagnóstico: {e}")
+                log.debug("[DEBUG-REDISTRIB] Error inspeccionando body para diagnóstico: %s", e)
         if votos_custom or partidos_fijos or overrides_pool or porcentajes_partidos:
-            print(f"[DEBUG] Redistribución de votos solicitada:")
-            print(f"[DEBUG] - votos_custom: {votos_custom}")
-            print(f"[DEBUG] - partidos_fijos: {partidos_fijos}")
-            print(f"[DEBUG] - overrides_pool: {overrides_pool}")
-            print(f"[DEBUG] - porcentajes_partidos: {porcentajes_partidos}")
-            print(f"[DEBUG] NOTA: redistritacion_geografica se activará automáticamente para recalcular MR")
+            log.debug("Redistribución de votos solicitada:")
+            log.debug("- votos_custom: %s", votos_custom)
+            log.debug("- partidos_fijos: %s", partidos_fijos)
+            log.debug("- overrides_pool: %s", overrides_pool)
+            log.debug("- porcentajes_partidos: %s", porcentajes_partidos)
+            log.debug("NOTA: redistritacion_geografica se activará automáticamente para recalcular MR")
             
             try:
                 # Parsear JSON strings o aceptar dicts ya parseados (frontend puede enviar objeto JSON)
@@ -3276,7 +3471,7 @@ async def procesar_diputados(
                 # - Si por alguna razón no se puede leer el archivo de votos, hacemos la normalización clásica (escala total).
                 if porcentajes_dict:
                     total_porcentajes = sum(porcentajes_dict.values())
-                    print(f"[DEBUG] Suma de porcentajes recibidos: {total_porcentajes}")
+                    log.debug("Suma de porcentajes recibidos: %s", total_porcentajes)
 
                     if total_porcentajes > 0 and abs(total_porcentajes - 100) > 0.01:
                         try:
@@ -3292,13 +3487,13 @@ async def procesar_diputados(
                                 unspecified = [p for p in partidos_en_archivo if p not in specified]
 
                                 fixed_sum = sum(specified.values())
-                                print(f"[DEBUG] Porcentajes especificados (fijos): {specified}, suma={fixed_sum}")
+                                log.debug("Porcentajes especificados (fijos): %s, suma=%s", specified, fixed_sum)
 
                                 if fixed_sum >= 100.0:
                                     # Escalar los especificados para sumar 100 (no hay remanente)
                                     factor = 100.0 / (fixed_sum or 1.0)
                                     porcentajes_dict = {p: v * factor for p, v in specified.items()}
-                                    print(f"[DEBUG] Se escaló especificados a 100% con factor {factor}")
+                                    log.debug("Se escaló especificados a 100%% con factor %s", factor)
                                 else:
                                     # Distribuir el remanente entre los no especificados
                                     remaining = 100.0 - fixed_sum
@@ -3313,26 +3508,26 @@ async def procesar_diputados(
 
                                         # Combinar especificados + distribuidos
                                         porcentajes_dict = {**specified, **distributed}
-                                        print(f"[DEBUG] Remanente {remaining} distribuido proporcionalmente entre no-especificados")
+                                        log.debug("Remanente %s distribuido proporcionalmente entre no-especificados", remaining)
                                     else:
                                         # No hay no-especificados: escalar especificados para sumar 100
                                         factor = 100.0 / (fixed_sum or 1.0)
                                         porcentajes_dict = {p: v * factor for p, v in specified.items()}
-                                        print(f"[DEBUG] No hubo partidos para distribuir remanente; se escaló especificados con factor {factor}")
+                                        log.debug("No hubo partidos para distribuir remanente; se escaló especificados con factor %s", factor)
                             else:
                                 # Fallback: archivo no existe, aplicar la normalización clásica
                                 factor_normalizacion = 100.0 / total_porcentajes
                                 porcentajes_dict = {partido: porcentaje * factor_normalizacion for partido, porcentaje in porcentajes_dict.items()}
-                                print(f"[WARN] No se pudo leer {path_datos_tmp}; aplicada normalización clásica con factor {factor_normalizacion}")
+                                log.warning("No se pudo leer %s; aplicada normalización clásica con factor %s", path_datos_tmp, factor_normalizacion)
 
                         except Exception as e:
                             # En caso de cualquier error, usar la normalización simple (comportamiento antiguo)
-                            print(f"[WARN] Error normalizando porcentajes parcialmente: {e}; aplicando escala simple")
+                            log.warning("Error normalizando porcentajes parcialmente: %s; aplicando escala simple", e)
                             factor_normalizacion = 100.0 / total_porcentajes
                             porcentajes_dict = {partido: porcentaje * factor_normalizacion for partido, porcentaje in porcentajes_dict.items()}
 
                         nueva_suma = sum(porcentajes_dict.values())
-                        print(f"[DEBUG] Porcentajes tras normalización/parcial: {nueva_suma}")
+                        log.debug("Porcentajes tras normalización/parcial: %s", nueva_suma)
                 
                 # Determinar archivo de datos
                 path_datos = f"data/computos_diputados_{anio}.parquet"
@@ -3350,8 +3545,8 @@ async def procesar_diputados(
                         if partido in partidos_validos
                     }
 
-                    print(f"[DEBUG] Partidos válidos para {anio}: {partidos_validos}")
-                    print(f"[DEBUG] Porcentajes filtrados: {porcentajes_filtrados}")
+                    log.debug("Partidos válidos para %s: %s", anio, partidos_validos)
+                    log.debug("Porcentajes filtrados: %s", porcentajes_filtrados)
 
                     # Re-normalizar después del filtrado
                     if porcentajes_filtrados:
@@ -3362,7 +3557,7 @@ async def procesar_diputados(
                                 partido: porcentaje * factor 
                                 for partido, porcentaje in porcentajes_filtrados.items()
                             }
-                            print(f"[DEBUG] Porcentajes re-normalizados: {porcentajes_filtrados}")
+                            log.debug("Porcentajes re-normalizados: %s", porcentajes_filtrados)
 
                     # Para asegurar un recálculo completo (incluyendo MR por distrito),
                     # generamos un parquet temporal con votos redistribuidos por distrito
@@ -3393,13 +3588,13 @@ async def procesar_diputados(
                                 # quitar nombre del eje de columnas que crea pivot_table
                                 df_wide.columns.name = None
                                 tmp_to_save = df_wide
-                                print(f"[DEBUG] Converted df_redistribuido to wide-format for parquet (id_cols={id_cols})")
+                                log.debug("Converted df_redistribuido to wide-format for parquet (id_cols=%s)", id_cols)
 
                         except Exception as e:
-                            print(f"[WARN] No se pudo pivotar df_redistribuido a formato ancho: {e}; se guardará tal cual")
+                            log.warning("No se pudo pivotar df_redistribuido a formato ancho: %s; se guardará tal cual", e)
 
                         tmp_to_save.to_parquet(tmp_name, index=False)
-                        print(f"[DEBUG] Parquet temporal con votos redistribuidos creado: {tmp_name}")
+                        log.debug("Parquet temporal con votos redistribuidos creado: %s", tmp_name)
 
                         votos_redistribuidos = porcentajes_finales
                         
@@ -3408,23 +3603,23 @@ async def procesar_diputados(
                         try:
                             from redistritacion.modulos.tabla_puente import generar_siglado_new
                             
-                            print(f"[DEBUG] Generando siglado temporal con ganadores redistribuidos...")
+                            log.debug("Generando siglado temporal con ganadores redistribuidos...")
                             siglado_temporal = generar_siglado_new(tmp_to_save, print_debug=False)
                             
                             # Guardar siglado temporal
                             siglado_tmp_name = f'outputs/tmp_siglado_{uuid.uuid4().hex}.csv'
                             siglado_temporal.to_csv(siglado_tmp_name, index=False, encoding='utf-8-sig')
-                            print(f"[DEBUG] Siglado temporal creado: {siglado_tmp_name}")
-                            print(f"[DEBUG] Ganadores por distrito actualizados según redistribución")
+                            log.debug("Siglado temporal creado: %s", siglado_tmp_name)
+                            log.debug("Ganadores por distrito actualizados según redistribución")
                             
                             # Actualizar path_siglado para usar el temporal
                             path_siglado = siglado_tmp_name
                             
                         except Exception as e_siglado:
-                            print(f"[WARN] No se pudo generar siglado temporal: {e_siglado}")
+                            log.warning("No se pudo generar siglado temporal: %s", e_siglado)
                             # Continuar sin siglado temporal (usará el histórico)
                             import traceback
-                            print(traceback.format_exc())
+                            log.error(traceback.format_exc())
                         
                         # Reemplazar el path_datos por el parquet temporal para forzar
                         # a `procesar_diputados_v2` a recalcular MR a partir de estos votos
@@ -3439,16 +3634,16 @@ async def procesar_diputados(
                             # simplemente ignoramos y confiamos en path_datos
                             pass
                     except Exception as e:
-                        print(f"[WARN] No se pudo generar parquet temporal redistribuido: {e}")
+                        log.warning("No se pudo generar parquet temporal redistribuido: %s", e)
                         # Caer hacia atrás a usar solo porcentajes_filtrados para redistribución
                         votos_redistribuidos = porcentajes_filtrados
                 elif votos_custom_dict:
                     # Usar porcentajes directos proporcionados (funcionalidad anterior)
-                    print(f"[DEBUG] Usando porcentajes directos: {votos_custom_dict}")
+                    log.debug("Usando porcentajes directos: %s", votos_custom_dict)
                     votos_redistribuidos = votos_custom_dict
                 else:
                     # Usar redistribución mixta basada en datos reales
-                    print(f"[DEBUG] Aplicando redistribución mixta")
+                    log.debug("Aplicando redistribución mixta")
                     df_datos, porcentajes_finales = simular_escenario_electoral(
                         path_datos,
                         porcentajes_objetivo={},
@@ -3457,15 +3652,15 @@ async def procesar_diputados(
                         mantener_geografia=True
                     )
                     votos_redistribuidos = porcentajes_finales
-                    print(f"[DEBUG] Votos redistribuidos: {votos_redistribuidos}")
+                    log.debug("Votos redistribuidos: %s", votos_redistribuidos)
                 
             except Exception as e:
-                print(f"[ERROR] Error en redistribución de votos: {e}")
+                log.error("Error en redistribución de votos: %s", e)
                 raise HTTPException(status_code=400, detail=f"Error en redistribución de votos: {str(e)}")
         
         # Normalizar el nombre del plan para compatibilidad con frontend
         plan_normalizado = normalizar_plan(plan)
-        print(f"[DEBUG] Diputados - Plan original: '{plan}' -> Plan normalizado: '{plan_normalizado}'")
+        log.debug("Diputados - Plan original: '%s' -> Plan normalizado: '%s'", plan, plan_normalizado)
         
         if anio not in [2018, 2021, 2024]:
             raise HTTPException(status_code=400, detail="Año no soportado. Use 2018, 2021 o 2024")
@@ -3487,13 +3682,13 @@ async def procesar_diputados(
             # para que se procese correctamente
             if mr_distritos_por_estado:
                 mr_seats_final = 300
-                print(f"[DEBUG] 🎯 Sliders MICRO detectados en plan vigente → mr_seats_final=300")
+                log.debug("🎯 Sliders MICRO detectados en plan vigente → mr_seats_final=300")
             
         elif plan_normalizado == "plan_a":
             # PLAN A: 300 total (0 MR + 300 RP), umbral 3%, sin tope, SIN PM
             # Ignorar cualquier escanos_totales enviado desde el frontend: plan_a es RP puro 300
             if escanos_totales is not None:
-                print(f"[DEBUG] plan_a recibido escanos_totales={escanos_totales} pero será IGNORADO (plan_a fuerza 300)")
+                log.debug("plan_a recibido escanos_totales=%s pero será IGNORADO (plan_a fuerza 300)", escanos_totales)
             max_seats = 300
             mr_seats_final = 0
             pm_seats_final = 0  # SIN PM en plan A (es RP puro)
@@ -3508,7 +3703,7 @@ async def procesar_diputados(
             # PLAN C: 300 total (300 MR + 0 RP), sin umbral, sin tope, SIN PM
             # Ignorar cualquier escanos_totales enviado desde el frontend: plan_c es MR puro 300
             if escanos_totales is not None:
-                print(f"[DEBUG] plan_c recibido escanos_totales={escanos_totales} pero será IGNORADO (plan_c fuerza 300)")
+                log.debug("plan_c recibido escanos_totales=%s pero será IGNORADO (plan_c fuerza 300)", escanos_totales)
             max_seats = 300
             mr_seats_final = 300
             pm_seats_final = 0  # SIN PM en plan C (solo MR)
@@ -3531,7 +3726,7 @@ async def procesar_diputados(
             divisor_method_final = None
             sistema_final = "mixto"
             aplicar_topes = True
-            print(f"[DEBUG] Escenario 300-100 CON TOPES activado (redistritación geográfica por defecto)")
+            log.debug("Escenario 300-100 CON TOPES activado (redistritación geográfica por defecto)")
             
         elif plan_normalizado == "300_100_sin_topes":
             # 300 MR + 100 RP = 400 total, SIN TOPES, CON REDISTRITACIÓN GEOGRÁFICA (por defecto)
@@ -3545,7 +3740,7 @@ async def procesar_diputados(
             divisor_method_final = None
             sistema_final = "mixto"
             aplicar_topes = False
-            print(f"[DEBUG] Escenario 300-100 SIN TOPES activado (redistritación geográfica por defecto)")
+            log.debug("Escenario 300-100 SIN TOPES activado (redistritación geográfica por defecto)")
             
         elif plan_normalizado == "200_200_sin_topes":
             # 200 MR + 200 RP = 400 total, SIN TOPES, CON REDISTRITACIÓN GEOGRÁFICA (por defecto)
@@ -3559,7 +3754,7 @@ async def procesar_diputados(
             divisor_method_final = None
             sistema_final = "mixto"
             aplicar_topes = False
-            print(f"[DEBUG] Escenario 200-200 SIN TOPES activado (redistritación geográfica por defecto)")
+            log.debug("Escenario 200-200 SIN TOPES activado (redistritación geográfica por defecto)")
             
         elif plan_normalizado == "personalizado":
             # Plan personalizado con parámetros del usuario
@@ -3571,31 +3766,31 @@ async def procesar_diputados(
             # SIEMPRE usar escanos_totales como base si está definido
             if escanos_totales is not None:
                 max_seats = escanos_totales
-                print(f"[DEBUG] Usando magnitud base: {max_seats} escaños")
+                log.debug("Usando magnitud base: %s escaños", max_seats)
                 
                 # Distribuir según el sistema elegido
                 if sistema_final == "mr":
                     # MR PURO: TODOS los escaños van a MR (puede incluir PM si se especifica)
                     mr_seats_final = max_seats
                     rp_seats_final = 0
-                    print(f"[DEBUG] Sistema MR puro: {mr_seats_final} MR + {rp_seats_final} RP = {max_seats}")
+                    log.debug("Sistema MR puro: %s MR + %s RP = %s", mr_seats_final, rp_seats_final, max_seats)
                 elif sistema_final == "rp":
                     # RP PURO: TODOS los escaños van a RP (sin PM)
                     mr_seats_final = 0
                     rp_seats_final = max_seats
-                    print(f"[DEBUG] Sistema RP puro: {mr_seats_final} MR + {rp_seats_final} RP = {max_seats}")
+                    log.debug("Sistema RP puro: %s MR + %s RP = %s", mr_seats_final, rp_seats_final, max_seats)
                 else:  # mixto
                     # MIXTO: Usuario debe especificar MR/RP o usar proporción default
                     if mr_seats is not None and rp_seats is not None:
                         # Usuario especificó ambos
                         mr_seats_final = mr_seats
                         rp_seats_final = rp_seats
-                        print(f"[DEBUG] Sistema mixto especificado: {mr_seats_final} MR + {rp_seats_final} RP")
+                        log.debug("Sistema mixto especificado: %s MR + %s RP", mr_seats_final, rp_seats_final)
                     else:
                         # Usar proporción default 60% MR, 40% RP
                         mr_seats_final = int(max_seats * 0.6)
                         rp_seats_final = max_seats - mr_seats_final
-                        print(f"[DEBUG] Sistema mixto automático (60/40): {mr_seats_final} MR + {rp_seats_final} RP = {max_seats}")
+                        log.debug("Sistema mixto automático (60/40): %s MR + %s RP = %s", mr_seats_final, rp_seats_final, max_seats)
                 
                 # CONFIGURAR PRIMERA MINORÍA (PM)
                 # PM "sale" de MR, no suma al total
@@ -3608,14 +3803,14 @@ async def procesar_diputados(
                             detail=f"PM ({pm_escanos}) no puede ser mayor que MR ({mr_seats_final})"
                         )
                     pm_seats_final = pm_escanos
-                    print(f"[DEBUG] PM activado: {pm_seats_final} escaños de primera minoría (salen de MR)")
+                    log.debug("PM activado: %s escaños de primera minoría (salen de MR)", pm_seats_final)
                 else:
                     pm_seats_final = 0
-                    print(f"[DEBUG] PM desactivado (pm_seats=0 o None)")
+                    log.debug("PM desactivado (pm_seats=0 o None)")
                     
             else:
                 # FALLBACK: Usuario no especificó magnitud total
-                print(f"[DEBUG] No se especificó magnitud, usando parámetros individuales o defaults")
+                log.debug("No se especificó magnitud, usando parámetros individuales o defaults")
                 # Respetar explícitamente los valores individuales si están presentes.
                 if sistema_final == "mr":
                     # Para MR puro, usar mr_seats como magnitud total si se proporcionó,
@@ -3654,32 +3849,32 @@ async def procesar_diputados(
                             detail=f"PM ({pm_escanos}) no puede ser mayor que MR ({mr_seats_final})"
                         )
                     pm_seats_final = pm_escanos
-                    print(f"[DEBUG] PM activado (fallback): {pm_seats_final} escaños")
+                    log.debug("PM activado (fallback): %s escaños", pm_seats_final)
                 else:
                     pm_seats_final = 0
             
             umbral_final = umbral if umbral is not None else 0.03
             max_seats_per_party_final = max_seats_per_party
-            print(f"[DEBUG] max_seats_per_party recibido: {max_seats_per_party}")
-            print(f"[DEBUG] max_seats_per_party_final: {max_seats_per_party_final}")
+            log.debug("max_seats_per_party recibido: %s", max_seats_per_party)
+            log.debug("max_seats_per_party_final: %s", max_seats_per_party_final)
             
             # Configurar métodos de reparto según el modo seleccionado
             if reparto_mode == "cuota":
                 quota_method_final = reparto_method
                 divisor_method_final = None
-                print(f"[DEBUG] Modo cuota seleccionado: {quota_method_final}")
+                log.debug("Modo cuota seleccionado: %s", quota_method_final)
             elif reparto_mode == "divisor":
                 quota_method_final = None
                 divisor_method_final = reparto_method
-                print(f"[DEBUG] Modo divisor seleccionado: {divisor_method_final}")
+                log.debug("Modo divisor seleccionado: %s", divisor_method_final)
             else:
                 raise HTTPException(status_code=400, detail="reparto_mode debe ser 'cuota' o 'divisor'")
         else:
             raise HTTPException(status_code=400, detail="Plan no válido. Use 'vigente', 'plan_a', 'plan_c' o 'personalizado'")
         
-        print(f"[DEBUG] Plan {plan_normalizado}: max_seats={max_seats}, mr={mr_seats_final}, rp={rp_seats_final}, umbral={umbral_final}")
-        print(f"[DEBUG] LÍMITES: aplicar_topes={aplicar_topes}, sobrerrepresentacion={sobrerrepresentacion}, max_seats_per_party={max_seats_per_party}")
-        print(f"[DEBUG] TYPE: sobrerrepresentacion type={type(sobrerrepresentacion)}, value={repr(sobrerrepresentacion)}")
+        log.debug("Plan %s: max_seats=%s, mr=%s, rp=%s, umbral=%s", plan_normalizado, max_seats, mr_seats_final, rp_seats_final, umbral_final)
+        log.debug("LÍMITES: aplicar_topes=%s, sobrerrepresentacion=%s, max_seats_per_party=%s", aplicar_topes, sobrerrepresentacion, max_seats_per_party)
+        log.debug(lambda: f"TYPE: sobrerrepresentacion type={type(sobrerrepresentacion)}, value={repr(sobrerrepresentacion)}")
 
         # Construir paths (si hay un parquet temporal generado por redistribución, usarlo)
         path_parquet = parquet_replacement if parquet_replacement else f"data/computos_diputados_{anio}.parquet"
@@ -3689,8 +3884,8 @@ async def procesar_diputados(
         if 'path_siglado' not in locals() or path_siglado is None:
             path_siglado = f"data/siglado-diputados-{anio}.csv"
         
-        print(f"[DEBUG] path_parquet: {path_parquet}")
-        print(f"[DEBUG] path_siglado: {path_siglado}")
+        log.debug("path_parquet: %s", path_parquet)
+        log.debug("path_siglado: %s", path_siglado)
         
         # Verificar que existen los archivos
         if not os.path.exists(path_parquet):
@@ -3703,25 +3898,25 @@ async def procesar_diputados(
         seed_value = 42 if not aplicar_topes else None
         
         # DEBUG: Log completo de parámetros antes de llamar al motor
-        print(f"[DEBUG] ========== PARÁMETROS PARA MOTOR ==========")
-        print(f"[DEBUG] path_parquet: {path_parquet}")
-        print(f"[DEBUG] anio: {anio}")
-        print(f"[DEBUG] max_seats: {max_seats}")
-        print(f"[DEBUG] sistema: {sistema_final}")
-        print(f"[DEBUG] mr_seats: {mr_seats_final}")
-        print(f"[DEBUG] rp_seats: {rp_seats_final}")
-        print(f"[DEBUG] pm_seats: {pm_seats_final}")
-        print(f"[DEBUG] umbral: {umbral_final}")
-        print(f"[DEBUG] max_seats_per_party: {max_seats_per_party_final}")
-        print(f"[DEBUG] sobrerrepresentacion: {sobrerrepresentacion}")
-        print(f"[DEBUG] aplicar_topes: {aplicar_topes}")
-        print(f"[DEBUG] quota_method: {quota_method_final}")
-        print(f"[DEBUG] divisor_method: {divisor_method_final}")
-        print(f"[DEBUG] usar_coaliciones: {usar_coaliciones}")
-        print(f"[DEBUG] votos_redistribuidos: {votos_redistribuidos}")
-        print(f"[DEBUG] seed: {seed_value}")
-        print(f"[DEBUG] redistritacion_geografica: {redistritacion_geografica} (SIEMPRE True)")
-        print(f"[DEBUG] =============================================")
+        log.debug("========== PARÁMETROS PARA MOTOR ==========")
+        log.debug("path_parquet: %s", path_parquet)
+        log.debug("anio: %s", anio)
+        log.debug("max_seats: %s", max_seats)
+        log.debug("sistema: %s", sistema_final)
+        log.debug("mr_seats: %s", mr_seats_final)
+        log.debug("rp_seats: %s", rp_seats_final)
+        log.debug("pm_seats: %s", pm_seats_final)
+        log.debug("umbral: %s", umbral_final)
+        log.debug("max_seats_per_party: %s", max_seats_per_party_final)
+        log.debug("sobrerrepresentacion: %s", sobrerrepresentacion)
+        log.debug("aplicar_topes: %s", aplicar_topes)
+        log.debug("quota_method: %s", quota_method_final)
+        log.debug("divisor_method: %s", divisor_method_final)
+        log.debug("usar_coaliciones: %s", usar_coaliciones)
+        log.debug("votos_redistribuidos: %s", votos_redistribuidos)
+        log.debug("seed: %s", seed_value)
+        log.debug("redistritacion_geografica: %s (SIEMPRE True)", redistritacion_geografica)
+        log.debug("=============================================")
         
         # 🔥 FIX CRÍTICO: Si hay mr_distritos_manuales y mr_seats_final es None, calcularlo
         # Esto es necesario porque plan="vigente" pone mr_seats_final=None por defecto
@@ -3730,9 +3925,9 @@ async def procesar_diputados(
                 mr_temp = json.loads(mr_distritos_manuales) if isinstance(mr_distritos_manuales, str) else mr_distritos_manuales
                 total_mr_temp = sum(mr_temp.values())
                 mr_seats_final = total_mr_temp
-                print(f"[DEBUG] 🔧 mr_seats_final calculado desde mr_distritos_manuales: {mr_seats_final}")
+                log.debug("🔧 mr_seats_final calculado desde mr_distritos_manuales: %s", mr_seats_final)
             except Exception as e:
-                print(f"[DEBUG] ⚠️  No se pudo calcular mr_seats_final desde mr_distritos_manuales: {e}")
+                log.debug("⚠️  No se pudo calcular mr_seats_final desde mr_distritos_manuales: %s", e)
         
         # APLICAR REDISTRITACIÓN GEOGRÁFICA (siempre activa)
         # La redistritación geográfica está SIEMPRE activada para garantizar
@@ -3744,13 +3939,13 @@ async def procesar_diputados(
         if redistritacion_geografica and mr_seats_final and mr_seats_final > 0:
             
             # DEBUG: Verificar parámetros recibidos
-            print(f"[DEBUG] 🔍 Verificando parámetros de distribución:")
-            print(f"[DEBUG]   mr_distritos_manuales: {mr_distritos_manuales[:100] if mr_distritos_manuales else None}")
-            print(f"[DEBUG]   mr_distritos_por_estado: {mr_distritos_por_estado[:100] if mr_distritos_por_estado else None}")
+            log.debug("🔍 Verificando parámetros de distribución:")
+            log.debug(lambda: f"mr_distritos_manuales: {mr_distritos_manuales[:100] if mr_distritos_manuales else None}")
+            log.debug(lambda: f"mr_distritos_por_estado: {mr_distritos_por_estado[:100] if mr_distritos_por_estado else None}")
             
             # PRIORIDAD 1: Si hay distribución por estado, convertirla a MR manuales totales
             if mr_distritos_por_estado:
-                print(f"[DEBUG] 🎯 Procesando distribución MICRO por estado: {mr_distritos_por_estado[:200]}")
+                log.debug("🎯 Procesando distribución MICRO por estado: %s", mr_distritos_por_estado[:200])
                 try:
                     from redistritacion.modulos.reparto_distritos import repartir_distritos_hare
                     from redistritacion.modulos.distritacion import cargar_secciones_ine
@@ -3766,12 +3961,12 @@ async def procesar_diputados(
                     # 🔥 VALIDACIÓN CRÍTICA: El frontend DEBE mandar TODOS los estados (32)
                     # No solo los que modificaron con flechitas
                     num_estados_recibidos = len(distribucion_estados)
-                    print(f"[DEBUG] Recibidos {num_estados_recibidos} estados en mr_por_estado")
+                    log.debug("Recibidos %s estados en mr_por_estado", num_estados_recibidos)
                     
                     if num_estados_recibidos < 32:
-                        print(f"[WARN] ⚠️  Solo se recibieron {num_estados_recibidos}/32 estados")
-                        print(f"[WARN] ⚠️  El frontend debería enviar TODOS los estados, no solo los modificados")
-                        print(f"[WARN] Estados recibidos: {list(distribucion_estados.keys())}")
+                        log.warning("⚠️  Solo se recibieron %s/32 estados", num_estados_recibidos)
+                        log.warning("⚠️  El frontend debería enviar TODOS los estados, no solo los modificados")
+                        log.warning(lambda: f"Estados recibidos: {list(distribucion_estados.keys())}")
                     
                     # 🔥 CRÍTICO: GUARDAR desglose por estado EXACTAMENTE como lo envió el frontend
                     # NO recalcular nada, NO redistribuir, solo preservar
@@ -3796,7 +3991,7 @@ async def procesar_diputados(
                         nombre_estado = ID_A_NOMBRE_ESTADO.get(estado_id, f"ESTADO_{estado_id}")
                         mr_por_estado_manual[nombre_estado] = partidos_dict.copy()
                     
-                    print(f"[DEBUG] 🎯 mr_por_estado_manual preservado con {len(mr_por_estado_manual)} estados")
+                    log.debug(lambda: f"🎯 mr_por_estado_manual preservado con {len(mr_por_estado_manual)} estados")
                     
                     # Sumar totales para mr_distritos_manuales
                     totales_por_partido = {}
@@ -3807,13 +4002,13 @@ async def procesar_diputados(
                     # Convertir a mr_distritos_manuales
                     mr_distritos_manuales = json.dumps(totales_por_partido)
                     total_mr_estados = sum(totales_por_partido.values())
-                    print(f"[DEBUG] ✅ Totales por partido: {mr_distritos_manuales}")
-                    print(f"[DEBUG] Total MR: {total_mr_estados}")
+                    log.debug("✅ Totales por partido: %s", mr_distritos_manuales)
+                    log.debug("Total MR: %s", total_mr_estados)
                     
                     # 🔥 VALIDACIÓN: Si todos los estados tienen 0, es un error del frontend
                     if total_mr_estados == 0 and len(mr_por_estado_manual) > 0:
-                        print(f"[ERROR] ❌ TODOS LOS ESTADOS TIENEN 0 DISTRITOS")
-                        print(f"[ERROR] ❌ El frontend está enviando mr_por_estado con todos los valores en 0")
+                        log.error("❌ TODOS LOS ESTADOS TIENEN 0 DISTRITOS")
+                        log.error("❌ El frontend está enviando mr_por_estado con todos los valores en 0")
                         raise HTTPException(
                             status_code=400,
                             detail="Error en mr_por_estado: todos los estados tienen 0 distritos. "
@@ -3827,7 +4022,7 @@ async def procesar_diputados(
             
             # PRIORIDAD 2: Si hay MR manuales (o fueron convertidos desde mr_distritos_por_estado), usarlos
             if mr_distritos_manuales:
-                print(f"[DEBUG] 🎯 mr_distritos_manuales RECIBIDO (tipo: {type(mr_distritos_manuales)}): {mr_distritos_manuales[:200] if isinstance(mr_distritos_manuales, str) else mr_distritos_manuales}")
+                log.debug(lambda: f"🎯 mr_distritos_manuales RECIBIDO (tipo: {type(mr_distritos_manuales)}): {mr_distritos_manuales[:200] if isinstance(mr_distritos_manuales, str) else mr_distritos_manuales}")
                 try:
                     mr_ganados_geograficos = json.loads(mr_distritos_manuales)
                     
@@ -3839,12 +4034,12 @@ async def procesar_diputados(
                             detail=f"La suma de MR manuales ({total_mr_manuales}) excede el total de escaños MR ({mr_seats_final})"
                         )
                     
-                    print(f"[DEBUG] ✅ MR manuales validados: {mr_ganados_geograficos} (total={total_mr_manuales}/{mr_seats_final})")
+                    log.debug("✅ MR manuales validados: %s (total=%s/%s)", mr_ganados_geograficos, total_mr_manuales, mr_seats_final)
                     
                     # 🔥 IMPORTANTE: Si mr_distritos_manuales NO vino de mr_distritos_por_estado,
                     # resetear mr_por_estado_manual para evitar usar valores antiguos de flechitas
                     if not mr_distritos_por_estado:
-                        print(f"[DEBUG] 🔄 Reseteando mr_por_estado_manual (sliders nacionales detectados, NO flechitas)")
+                        log.debug("🔄 Reseteando mr_por_estado_manual (sliders nacionales detectados, NO flechitas)")
                         mr_por_estado_manual = None
                     
                     # ========================================================================
@@ -3860,120 +4055,124 @@ async def procesar_diputados(
                     # 4. Generar parquet ajustado con simular_escenario_electoral
                     # 5. Usar ese parquet para el resto del cálculo
                     #
-                    print(f"[DEBUG] 🔄 Iniciando ajuste de votos para MR manuales...")
+                    if not ajustar_votos_por_mr:
+                        log.debug("MR manuales sin ajuste de votos (se conservan los votos del escenario)")
+                    else:
+                        log.debug("🔄 Iniciando ajuste de votos para MR manuales...")
                     
-                    try:
-                        import pandas as pd
-                        import uuid
+                        try:
+                            import pandas as pd
+                            import uuid
                         
-                        # 🔥 CRÍTICO: Para calcular el MR base, SIEMPRE usar datos históricos originales,
-                        # NO usar path_parquet que podría ser un temporal de una request anterior
-                        path_parquet_original = f"data/computos_diputados_{anio}.parquet"
+                            # 🔥 CRÍTICO: Para calcular el MR base, SIEMPRE usar datos históricos originales,
+                            # NO usar path_parquet que podría ser un temporal de una request anterior
+                            path_parquet_original = f"data/computos_diputados_{anio}.parquet"
                         
-                        # PASO 1: Calcular MR BASE (históricos) usando el motor SIN sliders
-                        print(f"[DEBUG] 📊 Calculando MR base históricos desde {path_parquet_original}...")
+                            # PASO 1: Calcular MR BASE (históricos) usando el motor SIN sliders
+                            log.debug("📊 Calculando MR base históricos desde %s...", path_parquet_original)
                         
-                        resultado_base = procesar_diputados_v2(
-                            path_parquet=path_parquet_original,
-                            anio=anio,
-                            max_seats=max_seats,
-                            sistema=sistema_final,
-                            mr_seats=mr_seats_final,
-                            rp_seats=rp_seats_final,
-                            pm_seats=pm_seats_final,
-                            umbral=umbral_final,
-                            max_seats_per_party=None,  # Sin topes para obtener valores reales
-                            sobrerrepresentacion=None,
-                            aplicar_topes=False,  # Sin topes para cálculo base
-                            quota_method=quota_method_final,
-                            divisor_method=divisor_method_final,
-                            usar_coaliciones=usar_coaliciones,
-                            votos_redistribuidos=None,  # Sin redistribución
-                            seed=seed_value,
-                            print_debug=False,  # Sin debug para no contaminar logs
-                            mr_ganados_geograficos=None  # ← SIN sliders (calcular base real)
-                        )
+                            resultado_base = await ejecutar_motor(
+                                procesar_diputados_v2,
+                                path_parquet=path_parquet_original,
+                                anio=anio,
+                                max_seats=max_seats,
+                                sistema=sistema_final,
+                                mr_seats=mr_seats_final,
+                                rp_seats=rp_seats_final,
+                                pm_seats=pm_seats_final,
+                                umbral=umbral_final,
+                                max_seats_per_party=None,  # Sin topes para obtener valores reales
+                                sobrerrepresentacion=None,
+                                aplicar_topes=False,  # Sin topes para cálculo base
+                                quota_method=quota_method_final,
+                                divisor_method=divisor_method_final,
+                                usar_coaliciones=usar_coaliciones,
+                                votos_redistribuidos=None,  # Sin redistribución
+                                seed=seed_value,
+                                print_debug=False,  # Sin debug para no contaminar logs
+                                mr_ganados_geograficos=None  # ← SIN sliders (calcular base real)
+                            )
                         
-                        mr_base = resultado_base.get('mr', {})
-                        votos_base = resultado_base.get('votos', {})
-                        total_votos_base = sum(votos_base.values())
+                            mr_base = resultado_base.get('mr', {})
+                            votos_base = resultado_base.get('votos', {})
+                            total_votos_base = sum(votos_base.values())
                         
-                        print(f"[DEBUG] MR base calculados: {mr_base}")
-                        print(f"[DEBUG] Votos base: {votos_base}")
+                            log.debug("MR base calculados: %s", mr_base)
+                            log.debug("Votos base: %s", votos_base)
                         
-                        # PASO 2: Calcular porcentajes ajustados usando regla de tres
-                        porcentajes_ajustados = {}
+                            # PASO 2: Calcular porcentajes ajustados usando regla de tres
+                            porcentajes_ajustados = {}
                         
-                        for partido, mr_manual in mr_ganados_geograficos.items():
-                            mr_historico = mr_base.get(partido, 0)
-                            votos_historicos = votos_base.get(partido, 0)
-                            pct_historico = (votos_historicos / total_votos_base * 100) if total_votos_base > 0 else 0
+                            for partido, mr_manual in mr_ganados_geograficos.items():
+                                mr_historico = mr_base.get(partido, 0)
+                                votos_historicos = votos_base.get(partido, 0)
+                                pct_historico = (votos_historicos / total_votos_base * 100) if total_votos_base > 0 else 0
                             
-                            if mr_historico > 0:
-                                # Regla de tres: si con X% sacaba Y distritos, con Z distritos necesita...
-                                # nuevo_% = (mr_manual / mr_historico) * pct_historico
-                                pct_ajustado = (mr_manual / mr_historico) * pct_historico
-                            else:
-                                # Si el partido no tenía MR históricos pero ahora tiene manuales,
-                                # asignar un porcentaje proporcional mínimo
-                                pct_ajustado = (mr_manual / total_mr_manuales) * 3.0 if total_mr_manuales > 0 else 0
+                                if mr_historico > 0:
+                                    # Regla de tres: si con X% sacaba Y distritos, con Z distritos necesita...
+                                    # nuevo_% = (mr_manual / mr_historico) * pct_historico
+                                    pct_ajustado = (mr_manual / mr_historico) * pct_historico
+                                else:
+                                    # Si el partido no tenía MR históricos pero ahora tiene manuales,
+                                    # asignar un porcentaje proporcional mínimo
+                                    pct_ajustado = (mr_manual / total_mr_manuales) * 3.0 if total_mr_manuales > 0 else 0
                             
-                            porcentajes_ajustados[partido] = pct_ajustado
-                            print(f"[DEBUG] {partido}: {pct_historico:.2f}% ({mr_historico} MR) → {pct_ajustado:.2f}% ({mr_manual} MR)")
+                                porcentajes_ajustados[partido] = pct_ajustado
+                                log.debug("%s: %.2f%% (%s MR) → %.2f%% (%s MR)", partido, pct_historico, mr_historico, pct_ajustado, mr_manual)
                         
-                        # PASO 3: Renormalizar para que sumen 100%
-                        total_ajustado = sum(porcentajes_ajustados.values())
-                        if total_ajustado > 0:
-                            factor = 100.0 / total_ajustado
-                            porcentajes_ajustados = {
-                                partido: pct * factor 
-                                for partido, pct in porcentajes_ajustados.items()
-                            }
-                            print(f"[DEBUG] Porcentajes renormalizados (total=100%): {porcentajes_ajustados}")
+                            # PASO 3: Renormalizar para que sumen 100%
+                            total_ajustado = sum(porcentajes_ajustados.values())
+                            if total_ajustado > 0:
+                                factor = 100.0 / total_ajustado
+                                porcentajes_ajustados = {
+                                    partido: pct * factor 
+                                    for partido, pct in porcentajes_ajustados.items()
+                                }
+                                log.debug("Porcentajes renormalizados (total=100%%): %s", porcentajes_ajustados)
                         
-                        # PASO 4: Generar parquet ajustado con simular_escenario_electoral
-                        # 🔥 CRÍTICO: Usar datos originales, no temporales de requests anteriores
-                        print(f"[DEBUG] 📝 Generando parquet con votos ajustados desde {path_parquet_original}...")
+                            # PASO 4: Generar parquet ajustado con simular_escenario_electoral
+                            # 🔥 CRÍTICO: Usar datos originales, no temporales de requests anteriores
+                            log.debug("📝 Generando parquet con votos ajustados desde %s...", path_parquet_original)
                         
-                        df_redistribuido, porcentajes_finales = simular_escenario_electoral(
-                            path_parquet_original,
-                            porcentajes_objetivo=porcentajes_ajustados,
-                            partidos_fijos={},
-                            overrides_pool={},
-                            mantener_geografia=True
-                        )
+                            df_redistribuido, porcentajes_finales = simular_escenario_electoral(
+                                path_parquet_original,
+                                porcentajes_objetivo=porcentajes_ajustados,
+                                partidos_fijos={},
+                                overrides_pool={},
+                                mantener_geografia=True
+                            )
                         
-                        # PASO 5: Guardar parquet temporal
-                        tmp_name = f"outputs/tmp_mr_ajustado_{uuid.uuid4().hex}.parquet"
-                        os.makedirs(os.path.dirname(tmp_name), exist_ok=True)
+                            # PASO 5: Guardar parquet temporal
+                            tmp_name = f"outputs/tmp_mr_ajustado_{uuid.uuid4().hex}.parquet"
+                            os.makedirs(os.path.dirname(tmp_name), exist_ok=True)
                         
-                        # Convertir a formato ancho si es necesario
-                        tmp_to_save = df_redistribuido
-                        if 'PARTIDO' in df_redistribuido.columns and 'VOTOS_CALCULADOS' in df_redistribuido.columns:
-                            id_cols = [c for c in ['ENTIDAD', 'DISTRITO', 'TOTAL_BOLETAS', 'CI'] if c in df_redistribuido.columns]
-                            df_wide = df_redistribuido.pivot_table(
-                                index=id_cols, 
-                                columns='PARTIDO', 
-                                values='VOTOS_CALCULADOS', 
-                                aggfunc='sum'
-                            ).reset_index()
-                            df_wide.columns.name = None
-                            tmp_to_save = df_wide
-                            print(f"[DEBUG] Parquet convertido a formato ancho")
+                            # Convertir a formato ancho si es necesario
+                            tmp_to_save = df_redistribuido
+                            if 'PARTIDO' in df_redistribuido.columns and 'VOTOS_CALCULADOS' in df_redistribuido.columns:
+                                id_cols = [c for c in ['ENTIDAD', 'DISTRITO', 'TOTAL_BOLETAS', 'CI'] if c in df_redistribuido.columns]
+                                df_wide = df_redistribuido.pivot_table(
+                                    index=id_cols, 
+                                    columns='PARTIDO', 
+                                    values='VOTOS_CALCULADOS', 
+                                    aggfunc='sum'
+                                ).reset_index()
+                                df_wide.columns.name = None
+                                tmp_to_save = df_wide
+                                log.debug("Parquet convertido a formato ancho")
                         
-                        tmp_to_save.to_parquet(tmp_name, index=False)
-                        print(f"[DEBUG] ✅ Parquet ajustado guardado en: {tmp_name}")
+                            tmp_to_save.to_parquet(tmp_name, index=False)
+                            log.debug("✅ Parquet ajustado guardado en: %s", tmp_name)
                         
-                        # PASO 6: Usar el parquet ajustado para el resto del procesamiento
-                        path_parquet = tmp_name
-                        print(f"[INFO] 🎯 MR manuales + votos ajustados: sistema recalculará RP con porcentajes consistentes")
+                            # PASO 6: Usar el parquet ajustado para el resto del procesamiento
+                            path_parquet = tmp_name
+                            log.info("🎯 MR manuales + votos ajustados: sistema recalculará RP con porcentajes consistentes")
                         
-                    except Exception as e_ajuste:
-                        print(f"[ERROR] ❌ Error ajustando votos para MR manuales: {e_ajuste}")
-                        import traceback
-                        traceback.print_exc()
-                        # Continuar sin ajuste (usar datos originales)
-                        print(f"[WARN] Continuando sin ajuste de votos (puede haber inconsistencias)")
+                        except Exception as e_ajuste:
+                            log.error("❌ Error ajustando votos para MR manuales: %s", e_ajuste)
+                            import traceback
+                            traceback.print_exc()
+                            # Continuar sin ajuste (usar datos originales)
+                            log.warning("Continuando sin ajuste de votos (puede haber inconsistencias)")
                     
                     # ========================================================================
                     # FIN AJUSTE DE VOTOS
@@ -3984,24 +4183,23 @@ async def procesar_diputados(
             
             # Si NO hay MR manuales, calcularlos automáticamente
             else:
-                print(f"[DEBUG] ❌ NO se recibieron MR manuales, calculando automáticamente...")
+                log.debug("❌ NO se recibieron MR manuales, calculando automáticamente...")
                 try:
                     from redistritacion.modulos.reparto_distritos import repartir_distritos_hare
-                    from redistritacion.modulos.distritacion import cargar_secciones_ine
+                    from redistritacion.modulos.distritacion import poblacion_por_estado as _poblacion_por_estado
                     from engine.calcular_eficiencia_real import calcular_eficiencia_partidos
                     
                     # PASO 1: Calcular eficiencias reales de los partidos en el año seleccionado
-                    print(f"[DEBUG] Calculando eficiencias históricas para {anio}...")
+                    log.debug("Calculando eficiencias históricas para %s...", anio)
                     eficiencias_por_partido = calcular_eficiencia_partidos(anio, usar_coaliciones=usar_coaliciones)
-                    print(f"[DEBUG] Eficiencias calculadas: {eficiencias_por_partido}")
+                    log.debug("Eficiencias calculadas: %s", eficiencias_por_partido)
                     
-                    # PASO 2: Cargar secciones para población
-                    secciones = cargar_secciones_ine()
-                    poblacion_por_estado = secciones.groupby('ENTIDAD')['POBTOT'].sum().to_dict()
+                    # PASO 2: Población por estado (precalculada en el almacén de secciones)
+                    poblacion_por_estado = _poblacion_por_estado()
                     
                     # Usar total_distritos si fue especificado, sino usar mr_seats_final
                     n_distritos_param = total_distritos if total_distritos is not None else mr_seats_final
-                    print(f"[DEBUG] Redistritación geográfica con {n_distritos_param} distritos (total_distritos={total_distritos}, mr_seats={mr_seats_final})")
+                    log.debug("Redistritación geográfica con %s distritos (total_distritos=%s, mr_seats=%s)", n_distritos_param, total_distritos, mr_seats_final)
                     
                     # Repartir distritos usando método Hare
                     asignacion_distritos = repartir_distritos_hare(
@@ -4010,7 +4208,7 @@ async def procesar_diputados(
                         piso_constitucional=2
                     )
                     
-                    print(f"[DEBUG] Asignación de distritos por estado: {asignacion_distritos}")
+                    log.debug("Asignación de distritos por estado: %s", asignacion_distritos)
                     
                     # Cargar votos reales
                     df_votos = pd.read_parquet(path_parquet)
@@ -4040,7 +4238,7 @@ async def procesar_diputados(
                     
                     # Calcular % nacional de cada partido (usar votos_redistribuidos si existe)
                     if votos_redistribuidos:
-                        print(f"[DEBUG] Usando votos redistribuidos para geografía: {votos_redistribuidos}")
+                        log.debug("Usando votos redistribuidos para geografía: %s", votos_redistribuidos)
                         porcentajes_partidos_dict = votos_redistribuidos
                     else:
                         # Calcular de los datos reales
@@ -4050,7 +4248,7 @@ async def procesar_diputados(
                             total_nacional = df_votos['TOTAL_BOLETAS'].sum()
                             porcentajes_partidos_dict[partido] = (total_partido / total_nacional * 100) if total_nacional > 0 else 0
                     
-                    print(f"[DEBUG] Porcentajes para redistritación geográfica: {porcentajes_partidos_dict}")
+                    log.debug("Porcentajes para redistritación geográfica: %s", porcentajes_partidos_dict)
                     
                     # Por cada partido, calcular MR ganados por estado
                     for partido in partidos_disponibles:
@@ -4062,7 +4260,7 @@ async def procesar_diputados(
                         
                         # Obtener eficiencia real del partido (histórica)
                         eficiencia_partido = eficiencias_por_partido.get(partido, 1.0)
-                        print(f"[DEBUG] {partido}: usando eficiencia {eficiencia_partido:.3f}")
+                        log.debug("%s: usando eficiencia %.3f", partido, eficiencia_partido)
                         
                         total_mr_ganados = 0
                         
@@ -4104,31 +4302,32 @@ async def procesar_diputados(
                             total_mr_ganados += distritos_ganados
                         
                         mr_ganados_por_partido[partido] = total_mr_ganados
-                        print(f"[DEBUG] {partido}: {total_mr_ganados} MR (de {mr_seats_final} total)")
+                        log.debug("%s: %s MR (de %s total)", partido, total_mr_ganados, mr_seats_final)
                     
                     mr_ganados_geograficos = mr_ganados_por_partido
-                    print(f"[DEBUG] MR ganados con redistritación geográfica: {mr_ganados_geograficos}")
-                    print(f"[DEBUG] Total MR asignados: {sum(mr_ganados_geograficos.values())} de {mr_seats_final}")
+                    log.debug("MR ganados con redistritación geográfica: %s", mr_ganados_geograficos)
+                    log.debug(lambda: f"Total MR asignados: {sum(mr_ganados_geograficos.values())} de {mr_seats_final}")
                     
                 except Exception as e:
-                    print(f"[ERROR] Error en redistritación geográfica automática: {e}")
+                    log.error("Error en redistritación geográfica automática: %s", e)
                     import traceback
-                    print(traceback.format_exc())
+                    log.error(traceback.format_exc())
                     # Continuar sin redistritación geográfica
                     mr_ganados_geograficos = None
         
         # Logging explicativo sobre cómo se determinarán los MR
         if mr_ganados_geograficos is not None:
-            print(f"[INFO] ✅ MR se calcularán con REDISTRITACIÓN GEOGRÁFICA (eficiencias reales + nuevos porcentajes)")
-            print(f"[INFO] Total MR pre-calculados: {sum(mr_ganados_geograficos.values())}")
+            log.info("✅ MR se calcularán con REDISTRITACIÓN GEOGRÁFICA (eficiencias reales + nuevos porcentajes)")
+            log.info(lambda: f"Total MR pre-calculados: {sum(mr_ganados_geograficos.values())}")
         else:
-            print(f"[INFO] ⚠️  MR se calcularán DISTRITO POR DISTRITO desde siglado histórico")
-            print(f"[INFO] Esto es correcto SOLO si NO hay redistribución de votos")
+            log.info("⚠️  MR se calcularán DISTRITO POR DISTRITO desde siglado histórico")
+            log.info("Esto es correcto SOLO si NO hay redistribución de votos")
             if votos_redistribuidos:
-                print(f"[WARN] ⚠️⚠️⚠️  HAY VOTOS REDISTRIBUIDOS pero mr_ganados_geograficos es None!")
-                print(f"[WARN] Los resultados pueden NO reflejar los cambios de porcentajes solicitados")
+                log.warning("⚠️⚠️⚠️  HAY VOTOS REDISTRIBUIDOS pero mr_ganados_geograficos es None!")
+                log.warning("Los resultados pueden NO reflejar los cambios de porcentajes solicitados")
         
-        resultado = procesar_diputados_v2(
+        resultado = await ejecutar_motor(
+            procesar_diputados_v2,
             path_parquet=path_parquet,
             anio=anio,
             path_siglado=path_siglado,
@@ -4151,10 +4350,10 @@ async def procesar_diputados(
         )
         
         # Debug: Verificar qué devuelve procesar_diputados_v2
-        print(f"[DEBUG] Resultado de procesar_diputados_v2: {resultado}")
+        log.debug("Resultado de procesar_diputados_v2: %s", resultado)
         if 'tot' in resultado:
-            print(f"[DEBUG] Escaños totales por partido: {resultado['tot']}")
-            print(f"[DEBUG] Suma total escaños: {sum(resultado['tot'].values())}")
+            log.debug("Escaños totales por partido: %s", resultado['tot'])
+            log.debug(lambda: f"Suma total escaños: {sum(resultado['tot'].values())}")
         
         # Transformar al formato esperado por el frontend con colores
         resultado_formateado = transformar_resultado_a_formato_frontend(resultado, plan)
@@ -4262,7 +4461,7 @@ async def procesar_diputados(
             }
             
         except Exception as e_mayorias:
-            print(f"[WARN] No se pudo calcular mayorías: {e_mayorias}")
+            log.warning("No se pudo calcular mayorías: %s", e_mayorias)
             # Si falla, agregar info básica
             resultado_formateado["mayorias"] = {
                 "error": str(e_mayorias),
@@ -4301,7 +4500,7 @@ async def procesar_diputados(
                 resultado_formateado.setdefault('meta', {})
                 resultado_formateado['meta']['trace'] = trace
         except Exception as _e:
-            print(f"[WARN] No se pudo añadir trace meta en diputados: {_e}")
+            log.warning("No se pudo añadir trace meta en diputados: %s", _e)
 
         # 🔥 IMPORTANTE: Preservar distribución geográfica en la respuesta
         try:
@@ -4323,30 +4522,30 @@ async def procesar_diputados(
             # PRIORIDAD 1: Si el frontend envió mr_distritos_por_estado (flechitas micro),
             # devolver EXACTAMENTE eso (no recalcular nada)
             if 'mr_por_estado_manual' in locals() and mr_por_estado_manual:
-                print(f"[DEBUG] 🎯 Devolviendo mr_por_estado_manual (flechitas) con {len(mr_por_estado_manual)} estados")
+                log.debug(lambda: f"🎯 Devolviendo mr_por_estado_manual (flechitas) con {len(mr_por_estado_manual)} estados")
                 
                 # Ya vienen con abreviaciones (AGS, BC, CDMX, etc.), usar directamente
                 resultado_formateado['meta']['mr_por_estado'] = mr_por_estado_manual
                 
                 if len(mr_por_estado_manual) < 32:
-                    print(f"[WARN] ⚠️  Solo {len(mr_por_estado_manual)}/32 estados en respuesta")
+                    log.warning(lambda: f"⚠️  Solo {len(mr_por_estado_manual)}/32 estados en respuesta")
             
             # PRIORIDAD 2: Si NO hay manual, usar el calculado por el motor
             elif 'resultado' in locals() and isinstance(resultado, dict):
                 meta_motor = resultado.get('meta', {})
                 if isinstance(meta_motor, dict) and 'mr_por_estado' in meta_motor:
                     mr_por_estado_calculado = meta_motor['mr_por_estado']
-                    print(f"[DEBUG] 🔄 Devolviendo mr_por_estado calculado por motor con {len(mr_por_estado_calculado)} estados")
+                    log.debug(lambda: f"🔄 Devolviendo mr_por_estado calculado por motor con {len(mr_por_estado_calculado)} estados")
                     
                     # Ya vienen con abreviaciones (AGS, BC, CDMX, etc.), usar directamente
                     resultado_formateado['meta']['mr_por_estado'] = mr_por_estado_calculado
                 else:
-                    print(f"[WARN] ⚠️  Motor no devolvió mr_por_estado en meta")
+                    log.warning("⚠️  Motor no devolvió mr_por_estado en meta")
             else:
-                print(f"[WARN] ⚠️  No hay mr_por_estado disponible (ni manual ni calculado)")
+                log.warning("⚠️  No hay mr_por_estado disponible (ni manual ni calculado)")
                     
         except Exception as _e:
-            print(f"[WARN] No se pudo incluir mr_por_estado en respuesta: {_e}")
+            log.warning("No se pudo incluir mr_por_estado en respuesta: %s", _e)
             import traceback
             traceback.print_exc()
 
@@ -4362,11 +4561,11 @@ async def procesar_diputados(
                     resultado_formateado['meta']['distritos_por_estado'] = distritos_por_estado_dict
                     
                     total_distritos = sum(distritos_por_estado_dict.values())
-                    print(f"[DEBUG] ✅ distritos_por_estado agregado a respuesta: {total_distritos} distritos totales")
+                    log.debug("✅ distritos_por_estado agregado a respuesta: %s distritos totales", total_distritos)
                 else:
-                    print(f"[WARN] ⚠️  Motor no devolvió distritos_por_estado en meta")
+                    log.warning("⚠️  Motor no devolvió distritos_por_estado en meta")
         except Exception as _e:
-            print(f"[WARN] No se pudo incluir distritos_por_estado en respuesta: {_e}")
+            log.warning("No se pudo incluir distritos_por_estado en respuesta: %s", _e)
             import traceback
             traceback.print_exc()
 
@@ -4383,10 +4582,12 @@ async def procesar_diputados(
             pass
 
         # Retornar con headers anti-caché para evitar problemas de actualización
-        return JSONResponse(
+        response = RespuestaJSON(
             content=resultado_formateado,
             headers=headers
         )
+        CACHE_DIPUTADOS.put(cache_key, response.body, headers)
+        return response
         
     except Exception as e:
         # Mejor manejo de excepciones: anexar siempre un resumen del error a meta.trace
@@ -4394,6 +4595,11 @@ async def procesar_diputados(
         import traceback
         traceback_str = traceback.format_exc()
 
+        # Motor saturado: propagar el 503 (con Retry-After) tal cual, también a
+        # los endpoints que llaman a procesar_diputados internamente
+        if isinstance(e, _HTTPException) and e.status_code == 503:
+            raise
+
         # Si ya es un HTTPException, intentar anexar resumen de la excepción al resultado formateado
         if isinstance(e, _HTTPException):
             # Construir trace si es posible
@@ -4414,19 +4620,19 @@ async def procesar_diputados(
                 else:
                     content_payload = {'detail': str(msg), 'meta': {'trace': trace_block}}
             except Exception as _inner:
-                print(f"[WARN] No se pudo anexar HTTPException al trace: {_inner}")
+                log.warning("No se pudo anexar HTTPException al trace: %s", _inner)
                 content_payload = {'detail': str(getattr(e, 'detail', repr(e)))}
 
-            print(f"[ERROR] HTTPException interceptada desde /procesar/diputados: {getattr(e, 'detail', repr(e))}")
-            # Devolver JSONResponse con el mismo status code y payload enriquecido
-            return JSONResponse(status_code=getattr(e, 'status_code', 500), content=content_payload)
+            log.error(lambda: f"HTTPException interceptada desde /procesar/diputados: {getattr(e, 'detail', repr(e))}")
+            # Devolver RespuestaJSON con el mismo status code y payload enriquecido
+            return RespuestaJSON(status_code=getattr(e, 'status_code', 500), content=content_payload)
 
         # Para cualquier otra excepción, registrar y anexar resumen en meta.trace
         error_msg = str(e)
         error_type = type(e).__name__
-        print(f"[ERROR] Error en /procesar/diputados: {error_msg}")
-        print(f"[ERROR] Tipo de error: {error_type}")
-        print(f"[ERROR] Traceback completo: {traceback_str}")
+        log.error("Error en /procesar/diputados: %s", error_msg)
+        log.error("Tipo de error: %s", error_type)
+        log.error("Traceback completo: %s", traceback_str)
 
         # Intentar enriquecer meta.trace con información resumida del error para diagnóstico
         try:
@@ -4440,7 +4646,7 @@ async def procesar_diputados(
                     'trace_sample': tb_lines[-5:]
                 }
         except Exception as _inner:
-            print(f"[WARN] No se pudo anexar error al trace: {_inner}")
+            log.warning("No se pudo anexar error al trace: %s", _inner)
 
         # Crear mensaje de error más informativo para el cliente
         safe_msg = error_msg.strip() or '<no message>'
@@ -4449,6 +4655,149 @@ async def procesar_diputados(
         # Para facilitar debugging en frontend/ops devolvemos un mensaje consistente
         raise HTTPException(status_code=500, detail=detail_msg)
 
+# Configuración de motor de los planes predefinidos (igual que en /procesar/diputados)
+PRESETS_MOTOR_DIP = {
+    "vigente": {"max_seats": 500, "sistema": "mixto", "mr_seats": None, "rp_seats": 200, "pm_seats": 0,
+                "umbral": 0.03, "max_seats_per_party": 300, "quota_method": "hare", "divisor_method": None},
+    "plan_a": {"max_seats": 300, "sistema": "rp", "mr_seats": 0, "rp_seats": 300, "pm_seats": 0,
+               "umbral": 0.03, "max_seats_per_party": None, "quota_method": "hare", "divisor_method": None},
+    "plan_c": {"max_seats": 300, "sistema": "mr", "mr_seats": 300, "rp_seats": 0, "pm_seats": 0,
+               "umbral": 0.0, "max_seats_per_party": None, "quota_method": None, "divisor_method": None},
+    "300_100_con_topes": {"max_seats": 400, "sistema": "mixto", "mr_seats": 300, "rp_seats": 100, "pm_seats": 0,
+                          "umbral": 0.03, "max_seats_per_party": 300, "quota_method": "hare",
+                          "divisor_method": None, "aplicar_topes": True},
+    "300_100_sin_topes": {"max_seats": 400, "sistema": "mixto", "mr_seats": 300, "rp_seats": 100, "pm_seats": 0,
+                          "umbral": 0.03, "max_seats_per_party": None, "quota_method": "hare",
+                          "divisor_method": None, "aplicar_topes": False},
+    "200_200_sin_topes": {"max_seats": 400, "sistema": "mixto", "mr_seats": 200, "rp_seats": 200, "pm_seats": 0,
+                          "umbral": 0.03, "max_seats_per_party": None, "quota_method": "hare",
+                          "divisor_method": None, "aplicar_topes": False},
+}
+
+def escenario_batch_a_kwargs(esc: Dict[str, Any]) -> Dict[str, Any]:
+    """Traduce un escenario del body de /procesar/diputados/batch a kwargs del motor"""
+    plan = normalizar_plan(str(esc.get("plan") or "personalizado"))
+    if plan in PRESETS_MOTOR_DIP:
+        kwargs = dict(PRESETS_MOTOR_DIP[plan])
+    elif plan == "personalizado":
+        escanos = esc.get("escanos_totales", esc.get("max_seats"))
+        mr, rp = esc.get("mr_seats"), esc.get("rp_seats")
+        if escanos is None and mr is not None and rp is not None:
+            escanos = mr + rp
+        if escanos is None:
+            raise HTTPException(status_code=400, detail="Cada escenario personalizado requiere escanos_totales (o mr_seats + rp_seats)")
+        reparto_mode = esc.get("reparto_mode", "cuota")
+        reparto_method = esc.get("reparto_method", "hare")
+        if reparto_mode not in ("cuota", "divisor"):
+            raise HTTPException(status_code=400, detail="reparto_mode debe ser 'cuota' o 'divisor'")
+        kwargs = {
+            "max_seats": int(escanos),
+            "sistema": esc.get("sistema", "mixto"),
+            "mr_seats": mr,
+            "rp_seats": rp,
+            "pm_seats": esc.get("pm_seats") or 0,
+            "umbral": esc.get("umbral", 0.03),
+            "max_seats_per_party": esc.get("max_seats_per_party"),
+            "quota_method": reparto_method if reparto_mode == "cuota" else None,
+            "divisor_method": reparto_method if reparto_mode == "divisor" else None,
+        }
+    else:
+        raise HTTPException(status_code=400, detail=f"Plan '{plan}' no soportado en batch. Use "
+                            f"{', '.join(repr(p) for p in PRESETS_MOTOR_DIP)} o 'personalizado'")
+
+    # los planes 300_100/200_200 fijan aplicar_topes, igual que en /procesar/diputados
+    if "aplicar_topes" in kwargs:
+        aplicar_topes = kwargs.pop("aplicar_topes")
+    else:
+        aplicar_topes = bool(esc.get("aplicar_topes", True))
+    kwargs.update({
+        "sobrerrepresentacion": esc.get("sobrerrepresentacion"),
+        "aplicar_topes": aplicar_topes,
+        "usar_coaliciones": bool(esc.get("usar_coaliciones", True)),
+        # mismo seed que /procesar/diputados para que los resultados coincidan
+        "seed": esc.get("seed", 42 if not aplicar_topes else None),
+    })
+    return kwargs
+
+@app.post("/procesar/diputados/batch")
+async def procesar_diputados_batch_endpoint(request: Request):
+    """
+    Evalúa varios escenarios de diputados de un mismo año en una sola llamada.
+
+    Body (JSON):
+    {
+        "anio": 2024,
+        "escenarios": [
+            {"nombre": "vigente", "plan": "vigente"},
+            {"nombre": "300_100_con_topes", "escanos_totales": 400, "mr_seats": 300, "rp_seats": 100, "max_seats_per_party": 300},
+            {"nombre": "400_mr", "sistema": "mr", "escanos_totales": 400, "aplicar_topes": false}
+        ]
+    }
+
+    Los escenarios se evalúan en el pool de procesos (engine/scenario_executor.py),
+    cuyos workers ya tienen el año cargado y recompuesto; no aplican
+    redistribución de votos ni redistritación geográfica.
+    """
+    from engine.scenario_executor import obtener_executor
+
+    try:
+        body = await request.json()
+    except Exception:
+        raise HTTPException(status_code=400, detail="Body JSON requerido")
+
+    anio = body.get("anio", 2024)
+    escenarios = body.get("escenarios") or []
+    if anio not in [2018, 2021, 2024]:
+        raise HTTPException(status_code=400, detail="Año no soportado. Use 2018, 2021 o 2024")
+    if not isinstance(escenarios, list) or not escenarios:
+        raise HTTPException(status_code=400, detail="escenarios debe ser una lista no vacía")
+
+    path_parquet = f"data/computos_diputados_{anio}.parquet"
+    path_siglado = f"data/siglado-diputados-{anio}.csv"
+    if not os.path.exists(path_parquet):
+        raise HTTPException(status_code=404, detail=f"Archivo no encontrado: {path_parquet}")
+
+    nombres = [str(esc.get("nombre") or f"escenario_{i + 1}") for i, esc in enumerate(escenarios)]
+    kwargs = [escenario_batch_a_kwargs(esc) for esc in escenarios]
+
+    try:
+        # Pool de procesos con los años precargados; no bloquea el event loop
+        resultados = await obtener_executor().evaluar_diputados_async(
+            path_parquet,
+            anio,
+            kwargs,
+            path_siglado=path_siglado if os.path.exists(path_siglado) else None,
+        )
+    except MotorSaturado as e:
+        # con un solo worker el batch corre en MOTOR, igual que ejecutar_motor
+        log.warning("%s", e)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        import traceback
+        log.error(lambda: f"Error en /procesar/diputados/batch: {str(e)}")
+        log.error(lambda: f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"Error procesando batch: {str(e)}")
+
+    log.debug(lambda: f"Batch diputados {anio}: {len(resultados)} escenarios evaluados")
+    return RespuestaJSON(
+        content={
+            "anio": anio,
+            "escenarios": [
+                {
+                    "nombre": nombre,
+                    "plan": esc.get("plan", "personalizado"),
+                    "resultado": transformar_resultado_a_formato_frontend(res, esc.get("plan", "personalizado")),
+                }
+                for nombre, esc, res in zip(nombres, escenarios, resultados)
+            ],
+        },
+        headers={
+            "Cache-Control": "no-cache, no-store, must-revalidate",
+            "Pragma": "no-cache",
+            "Expires": "0"
+        }
+    )
+
 @app.get("/años-disponibles")
 async def años_disponibles():
     """Retorna los años disponibles para procesamiento"""
@@ -4527,6 +4876,7 @@ async def obtener_kpis(
         # Llamar al endpoint de procesamiento correspondiente y reenviar parámetros
         if camara == "senado":
             response = await procesar_senado(
+                request=None,
                 anio=anio,
                 plan=plan,
                 escanos_totales=escanos_totales,
@@ -4558,20 +4908,14 @@ async def obtener_kpis(
                 porcentajes_partidos=porcentajes_partidos,
             )
         
-        # Extraer el contenido del JSONResponse
-        if hasattr(response, 'body'):
-            # Es un JSONResponse, extraer el contenido
-            import json
-            resultado = json.loads(response.body.decode())
-        else:
-            # Es un diccionario directo
-            resultado = response
+        # Contenido de la respuesta (sin re-parsear el body)
+        resultado = contenido_de(response)
         
         # Calcular KPIs usando los resultados actualizados
         kpis = calcular_kpis_electorales(resultado, anio, camara)
         
         # Retornar con headers anti-caché
-        return JSONResponse(
+        return RespuestaJSON(
             content=kpis,
             headers={
                 "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -4580,6 +4924,8 @@ async def obtener_kpis(
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error obteniendo KPIs: {str(e)}")
 
@@ -4614,6 +4960,7 @@ async def obtener_seat_chart(
         # Llamar al endpoint de procesamiento correspondiente y reenviar parámetros
         if camara == "senado":
             response = await procesar_senado(
+                request=None,
                 anio=anio,
                 plan=plan,
                 escanos_totales=escanos_totales,
@@ -4645,14 +4992,8 @@ async def obtener_seat_chart(
                 porcentajes_partidos=porcentajes_partidos,
             )
         
-        # Extraer el contenido del JSONResponse
-        if hasattr(response, 'body'):
-            # Es un JSONResponse, extraer el contenido
-            import json
-            resultado = json.loads(response.body.decode())
-        else:
-            # Es un diccionario directo
-            resultado = response
+        # Contenido de la respuesta (sin re-parsear el body)
+        resultado = contenido_de(response)
         
         # Formatear para seat-chart usando los resultados actualizados
         seat_chart_data = formato_seat_chart(resultado)
@@ -4665,7 +5006,7 @@ async def obtener_seat_chart(
             pass
         
         # Retornar con headers anti-caché
-        return JSONResponse(
+        return RespuestaJSON(
             content=seat_chart_data,
             headers={
                 "Cache-Control": "no-cache, no-store, must-revalidate",
@@ -4674,6 +5015,8 @@ async def obtener_seat_chart(
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error obteniendo seat-chart: {str(e)}")
 
@@ -4703,7 +5046,7 @@ def normalizar_plan(plan: str) -> str:
     }
     
     resultado = mapeo_planes.get(plan_lower, plan_lower)
-    print(f"[DEBUG] Normalizando plan: '{plan}' -> '{resultado}'")
+    log.debug("Normalizando plan: '%s' -> '%s'", plan, resultado)
     return resultado
 
 
@@ -4730,6 +5073,9 @@ class AjusteDistritoRequest(BaseModel):
     # Opcional: votos redistribuidos si aplica
     votos_redistribuidos: Optional[str] = None
     coaliciones_activas: Optional[str] = None
+    
+    # Opcional: token devuelto por el ajuste anterior (recálculo incremental)
+    token_escenario: Optional[str] = None
 
 
 @app.post("/ajustar/distrito-individual")
@@ -4743,6 +5089,17 @@ async def ajustar_distrito_individual(request: AjusteDistritoRequest):
     - Siempre mantiene el total de distritos del estado constante
     - Recalcula COMPLETO: RP, topes, KPIs, seat_chart
     
+    **Votos:** los clics conservan los votos del escenario (el recálculo
+    completo corre con ajustar_votos_por_mr=False); solo se mueve el MR.
+    
+    **Modo incremental:** la respuesta trae `token_escenario`. Si el siguiente
+    clic lo reenvía (con el mismo mr_nacional_actual que devolvió este y los
+    mismos anio/plan/aplicar_topes/votos/coaliciones), solo se recalculan RP
+    y topes sobre los votos nacionales del escenario ya preparado, sin
+    recorrer el pipeline completo; meta.mr_por_estado lleva el renglón del
+    estado ajustado. Token desconocido/expirado, de otro escenario o MR que
+    no coincide → recálculo completo (que emite un token nuevo).
+    
     **Ejemplo:**
     ```
     Estado: Jalisco (20 distritos)
@@ -4759,12 +5116,12 @@ async def ajustar_distrito_individual(request: AjusteDistritoRequest):
     - ajuste_realizado: Info del cambio ejecutado
     """
     try:
-        print(f"\n{'='*80}")
-        print(f"🎯 AJUSTE DISTRITO INDIVIDUAL - {request.estado}")
-        print(f"{'='*80}")
-        print(f"Partido: {request.partido} | Acción: {request.accion}")
-        print(f"Estado actual: {request.mr_estado_actual}")
-        print(f"Nacional actual: {request.mr_nacional_actual}")
+        log.debug(lambda: f"{'='*80}")
+        log.debug("🎯 AJUSTE DISTRITO INDIVIDUAL - %s", request.estado)
+        log.debug(lambda: f"{'='*80}")
+        log.debug("Partido: %s | Acción: %s", request.partido, request.accion)
+        log.debug("Estado actual: %s", request.mr_estado_actual)
+        log.debug("Nacional actual: %s", request.mr_nacional_actual)
         
         # ========================================
         # PASO 1: OBTENER TOTAL DE DISTRITOS DEL ESTADO
@@ -4819,7 +5176,7 @@ async def ajustar_distrito_individual(request: AjusteDistritoRequest):
                     estado: max(1, round(distritos * factor_escala))
                     for estado, distritos in DISTRITOS_POR_ESTADO.items()
                 }
-                print(f"⚠️  Plan personalizado con {mr_total} MR - Escalando distritos por estado (factor: {factor_escala:.3f})")
+                log.warning("⚠️  Plan personalizado con %s MR - Escalando distritos por estado (factor: %.3f)", mr_total, factor_escala)
         
         distritos_totales_estado = DISTRITOS_POR_ESTADO.get(request.estado)
         if not distritos_totales_estado:
@@ -4828,7 +5185,7 @@ async def ajustar_distrito_individual(request: AjusteDistritoRequest):
                 detail=f"Estado '{request.estado}' no reconocido. Verifica el nombre exacto."
             )
         
-        print(f"📊 Distritos totales en {request.estado}: {distritos_totales_estado}")
+        log.debug("📊 Distritos totales en %s: %s", request.estado, distritos_totales_estado)
         
         # ========================================
         # PASO 2: VALIDAR OPERACIÓN
@@ -4860,7 +5217,7 @@ async def ajustar_distrito_individual(request: AjusteDistritoRequest):
                 "partido_decrementado": partido_a_decrementar,
                 "cambio": +1
             }
-            print(f"✅ Incremento: {request.partido} +1, {partido_a_decrementar} -1")
+            log.debug("✅ Incremento: %s +1, %s -1", request.partido, partido_a_decrementar)
         
         elif request.accion == "decrementar":
             # Verificar que el partido tenga al menos 1 distrito en este estado
@@ -4886,7 +5243,7 @@ async def ajustar_distrito_individual(request: AjusteDistritoRequest):
                 "partido_decrementado": request.partido,
                 "cambio": -1
             }
-            print(f"✅ Decremento: {request.partido} -1, {partido_a_incrementar} +1")
+            log.debug("✅ Decremento: %s -1, %s +1", request.partido, partido_a_incrementar)
         
         else:
             raise HTTPException(
@@ -4897,34 +5254,69 @@ async def ajustar_distrito_individual(request: AjusteDistritoRequest):
         # Validar que totales sumen correctamente
         total_estado_nuevo = sum(mr_estado_nuevo.values())
         if total_estado_nuevo != distritos_totales_estado:
-            print(f"⚠️  WARNING: Total estado = {total_estado_nuevo}, esperado = {distritos_totales_estado}")
+            log.warning("⚠️  WARNING: Total estado = %s, esperado = %s", total_estado_nuevo, distritos_totales_estado)
         
-        print(f"Estado nuevo: {mr_estado_nuevo}")
-        print(f"Nacional nuevo: {mr_nacional_nuevo}")
+        log.debug("Estado nuevo: %s", mr_estado_nuevo)
+        log.debug("Nacional nuevo: %s", mr_nacional_nuevo)
         
         # ========================================
-        # PASO 3: RECALCULAR SISTEMA COMPLETO
+        # PASO 3: RECALCULAR (INCREMENTAL O COMPLETO)
         # ========================================
         
-        print(f"\n🔄 Recalculando sistema completo con nuevos MR...")
+        from engine.ajuste_incremental import aplicar_ajuste, capturar_asignacion, crear_estado, huella_escenario
+        from engine.procesar_diputados_v2 import NOMBRE_ESTADO_A_ABREV, normalize_entidad_ascii
+        from engine.result_cache import sin_lectura
         
-        # Convertir mr_nacional_nuevo a formato esperado por procesar_diputados
-        mr_distritos_manuales = json.dumps(mr_nacional_nuevo)
-        
-        # Llamar a procesar_diputados con MR manuales
-        resultado = await procesar_diputados(
-            anio=request.anio,
-            plan=request.plan,
-            aplicar_topes=request.aplicar_topes,
-            mr_distritos_manuales=mr_distritos_manuales,
-            votos_custom=request.votos_redistribuidos  # Usar votos_custom, no votos_redistribuidos
+        # Todo lo que define el escenario salvo el vector MR: un token solo vale para su huella
+        huella = huella_escenario(
+            camara=request.camara, anio=request.anio, plan=request.plan,
+            aplicar_topes=request.aplicar_topes, votos_redistribuidos=request.votos_redistribuidos,
+            coaliciones_activas=request.coaliciones_activas,
         )
+        entidad = NOMBRE_ESTADO_A_ABREV.get(normalize_entidad_ascii(request.estado))
+        
+        token_escenario = None
+        resultado_incremental = None
+        if request.token_escenario:
+            # Solo RP + topes (sub-milisegundo): corre inline, sin pasar por MOTOR
+            resultado_incremental = aplicar_ajuste(
+                request.token_escenario, huella, request.mr_nacional_actual, mr_nacional_nuevo,
+                entidad=entidad, mr_entidad=mr_estado_nuevo
+            )
         
-        # Parsear resultado
-        if hasattr(resultado, 'body'):
-            resultado_dict = json.loads(resultado.body.decode())
+        if resultado_incremental is not None:
+            log.debug("⚡ Recálculo incremental (token %s)", request.token_escenario[:8])
+            token_escenario = request.token_escenario
+            resultado_dict = transformar_resultado_a_formato_frontend(resultado_incremental, request.plan)
+            resultado_dict['meta'] = resultado_incremental['meta']
         else:
-            resultado_dict = resultado
+            log.debug("🔄 Recalculando sistema completo con nuevos MR...")
+            
+            async def evaluar_completo():
+                # MR manuales con los votos del escenario fijos (sin regla de tres); se
+                # capturan las entradas de RP + topes para que los siguientes clics sean incrementales
+                with capturar_asignacion() as captura:
+                    resultado = await procesar_diputados(
+                        anio=request.anio,
+                        plan=request.plan,
+                        aplicar_topes=request.aplicar_topes,
+                        mr_distritos_manuales=json.dumps(mr_nacional_nuevo),
+                        votos_custom=request.votos_redistribuidos,  # Usar votos_custom, no votos_redistribuidos
+                        ajustar_votos_por_mr=False
+                    )
+                # Contenido de la respuesta (sin re-parsear el body)
+                return captura, contenido_de(resultado)
+            
+            captura, resultado_dict = await evaluar_completo()
+            try:
+                token_escenario = crear_estado(captura, huella, mr_nacional_nuevo, resultado_dict)
+                if token_escenario is None and not captura:
+                    # HIT de la caché sin plantilla para esta huella: se evalúa otra vez para capturar
+                    with sin_lectura():
+                        captura, resultado_dict = await evaluar_completo()
+                    token_escenario = crear_estado(captura, huella, mr_nacional_nuevo, resultado_dict)
+            except Exception as e:
+                log.warning("No se pudo preparar el estado incremental: %s", e)
         
         # ========================================
         # PASO 4: CONSTRUIR RESPUESTA
@@ -4942,20 +5334,22 @@ async def ajustar_distrito_individual(request: AjusteDistritoRequest):
                 "estado": request.estado,
                 "distritos_totales": distritos_totales_estado,
                 **ajuste_info
-            }
+            },
+            "token_escenario": token_escenario,
+            "modo_recalculo": "incremental" if resultado_incremental is not None else "completo"
         }
         
-        print(f"\n✅ AJUSTE COMPLETADO")
-        print(f"{'='*80}\n")
+        log.debug("✅ AJUSTE COMPLETADO")
+        log.debug(lambda: f"{'='*80}")
         
-        return JSONResponse(content=respuesta)
+        return RespuestaJSON(content=respuesta)
         
     except HTTPException:
         raise
     except Exception as e:
         import traceback
-        print(f"\n❌ ERROR en ajuste distrito individual:")
-        print(traceback.format_exc())
+        log.error("❌ ERROR en ajuste distrito individual:")
+        log.error(traceback.format_exc())
         raise HTTPException(
             status_code=500,
             detail=f"Error procesando ajuste: {str(e)}"
@@ -4976,11 +5370,7 @@ async def obtener_scaled_siglado(anio: int, plan: str = "personalizado"):
     try:
         # Llamar al endpoint de procesamiento para generar metadata (si no está en cache)
         response = await procesar_diputados(anio=anio, plan=plan)
-        if hasattr(response, 'body'):
-            import json
-            resultado = json.loads(response.body.decode())
-        else:
-            resultado = response
+        resultado = contenido_de(response)
 
         meta = resultado.get('meta', {}) if isinstance(resultado, dict) else {}
         scaled_info = meta.get('scaled_info') if isinstance(meta, dict) else None
@@ -4995,15 +5385,15 @@ async def obtener_scaled_siglado(anio: int, plan: str = "personalizado"):
                 try:
                     with open(path, 'r', encoding='utf-8') as fh:
                         csv_text = fh.read()
-                    return JSONResponse(content={"scaled_csv": csv_text, 'path': path})
+                    return RespuestaJSON(content={"scaled_csv": csv_text, 'path': path})
                 except Exception as e:
                     # Fall back to inline CSV if lectura falla
-                    print(f"Error leyendo scaled CSV desde {path}: {e}")
+                    log.debug("Error leyendo scaled CSV desde %s: %s", path, e)
 
         # Fallback: buscar scaled_csv inline
         csv_text = scaled_info.get('scaled_csv')
         if csv_text:
-            return JSONResponse(content={"scaled_csv": csv_text})
+            return RespuestaJSON(content={"scaled_csv": csv_text})
 
         raise HTTPException(status_code=404, detail="No hay scaled_siglado disponible (ni archivo ni inline)")
 
@@ -5011,3 +5401,6 @@ async def obtener_scaled_siglado(anio: int, plan: str = "personalizado"):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error obteniendo scaled_siglado: {str(e)}")
+
+from engine.arranque import registrar_main
+registrar_main(_INICIO_IMPORT)
@@ -17,7 +17,47 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 import pandas as pd
 import numpy as np
 from redistritacion.modulos.reparto_distritos import repartir_distritos_hare
-from redistritacion.modulos.distritacion import cargar_secciones_ine
+from redistritacion.modulos.distritacion import poblacion_por_estado as cargar_poblacion_por_estado
+from engine.scenario_executor import ScenarioExecutor
+
+
+ESTADO_NOMBRES = {
+    1: 'AGUASCALIENTES', 2: 'BAJA CALIFORNIA', 3: 'BAJA CALIFORNIA SUR',
+    4: 'CAMPECHE', 5: 'CHIAPAS', 6: 'CHIHUAHUA', 7: 'COAHUILA',
+    8: 'COLIMA', 9: 'CIUDAD DE MEXICO', 10: 'DURANGO', 11: 'GUANAJUATO',
+    12: 'GUERRERO', 13: 'HIDALGO', 14: 'JALISCO', 15: 'MEXICO',
+    16: 'MICHOACAN', 17: 'MORELOS', 18: 'NAYARIT', 19: 'NUEVO LEON',
+    20: 'OAXACA', 21: 'PUEBLA', 22: 'QUERETARO', 23: 'QUINTANA ROO',
+    24: 'SAN LUIS POTOSI', 25: 'SINALOA', 26: 'SONORA', 27: 'TABASCO',
+    28: 'TAMAULIPAS', 29: 'TLAXCALA', 30: 'VERACRUZ', 31: 'YUCATAN',
+    32: 'ZACATECAS'
+}
+
+# Datos compartidos por proceso (población por estado y votos 2024). En el
+# pool de procesos se cargan una vez por worker con precargar_datos().
+_DATOS = None
+
+
+def precargar_datos():
+    """Carga (una vez por proceso) población por estado y votos 2024."""
+    global _DATOS
+    if _DATOS is None:
+        poblacion_por_estado = cargar_poblacion_por_estado()
+        df_votos = pd.read_parquet('data/computos_diputados_2024.parquet')
+        df_votos['ENTIDAD_NOMBRE'] = df_votos['ENTIDAD'].str.strip().str.upper()
+        _DATOS = {'poblacion_por_estado': poblacion_por_estado, 'df_votos': df_votos}
+    return _DATOS
+
+
+def _datos_barrido(mr_total):
+    """Asignación de distritos (depende de mr_total) + datos compartidos."""
+    datos = precargar_datos()
+    asignacion_distritos = repartir_distritos_hare(
+        poblacion_estados=datos['poblacion_por_estado'],
+        n_distritos=mr_total,
+        piso_constitucional=2
+    )
+    return asignacion_distritos, datos['df_votos']
 
 
 def calcular_mr_ganados_real(pct_votos, mr_total, eficiencia_mr=1.0, 
@@ -36,32 +76,14 @@ def calcular_mr_ganados_real(pct_votos, mr_total, eficiencia_mr=1.0,
     Returns:
         Número de MR ganados
     """
-    # Si no están pre-calculados, cargarlos
-    if asignacion_distritos is None:
-        secciones = cargar_secciones_ine()
-        poblacion_por_estado = secciones.groupby('ENTIDAD')['POBTOT'].sum().to_dict()
-        asignacion_distritos = repartir_distritos_hare(
-            poblacion_estados=poblacion_por_estado,
-            n_distritos=mr_total,
-            piso_constitucional=2
-        )
-    
-    if df_votos is None:
-        df_votos = pd.read_parquet('data/computos_diputados_2024.parquet')
-        df_votos['ENTIDAD_NOMBRE'] = df_votos['ENTIDAD'].str.strip().str.upper()
+    # Si no están pre-calculados, tomarlos de los datos compartidos del proceso
+    if asignacion_distritos is None or df_votos is None:
+        asignacion_base, df_base = _datos_barrido(mr_total)
+        asignacion_distritos = asignacion_distritos if asignacion_distritos is not None else asignacion_base
+        df_votos = df_votos if df_votos is not None else df_base
     
     if estado_nombres is None:
-        estado_nombres = {
-            1: 'AGUASCALIENTES', 2: 'BAJA CALIFORNIA', 3: 'BAJA CALIFORNIA SUR',
-            4: 'CAMPECHE', 5: 'CHIAPAS', 6: 'CHIHUAHUA', 7: 'COAHUILA',
-            8: 'COLIMA', 9: 'CIUDAD DE MEXICO', 10: 'DURANGO', 11: 'GUANAJUATO',
-            12: 'GUERRERO', 13: 'HIDALGO', 14: 'JALISCO', 15: 'MEXICO',
-            16: 'MICHOACAN', 17: 'MORELOS', 18: 'NAYARIT', 19: 'NUEVO LEON',
-            20: 'OAXACA', 21: 'PUEBLA', 22: 'QUERETARO', 23: 'QUINTANA ROO',
-            24: 'SAN LUIS POTOSI', 25: 'SINALOA', 26: 'SONORA', 27: 'TABASCO',
-            28: 'TAMAULIPAS', 29: 'TLAXCALA', 30: 'VERACRUZ', 31: 'YUCATAN',
-            32: 'ZACATECAS'
-        }
+        estado_nombres = ESTADO_NOMBRES
     
     # Calcular factor de escalamiento: de 42.49% real a pct_votos
     factor_escala = pct_votos / 42.49
@@ -153,11 +175,19 @@ def calcular_escanos_combinado(pct_votos, mr_total, rp_total, aplicar_topes,
     }
 
 
+def _evaluar_pct(args):
+    """Tarea del pool: escaños para un % de votos (datos precargados en el worker)."""
+    pct, mr_total, rp_total, aplicar_topes, eficiencia_mr = args
+    asignacion_distritos, df_votos = _datos_barrido(mr_total)
+    return calcular_escanos_combinado(pct, mr_total, rp_total, aplicar_topes, eficiencia_mr,
+                                      asignacion_distritos, df_votos, ESTADO_NOMBRES)
+
+
 def buscar_votos_minimos(mr_total, rp_total, aplicar_topes, objetivo_escanos,
-                         eficiencia_mr=1.1):
+                         eficiencia_mr=1.1, executor=None):
     """
     Busca el % de votos mínimo para alcanzar objetivo_escanos.
-    OPTIMIZADO: Pre-calcula datos compartidos.
+    OPTIMIZADO: Pre-calcula datos compartidos (una vez por proceso).
     
     Args:
         mr_total: Total de distritos MR
@@ -165,45 +195,34 @@ def buscar_votos_minimos(mr_total, rp_total, aplicar_topes, objetivo_escanos,
         aplicar_topes: Si True, aplica topes del 8%
         objetivo_escanos: Meta (201 para simple, 267 para calificada)
         eficiencia_mr: Factor de eficiencia en conversión votos→MR
+        executor: ScenarioExecutor opcional; si se da, la rejilla de % se
+                  evalúa completa en paralelo y se toma el primer % que cumple
     
     Returns:
         Dict con el % mínimo y detalle de escaños
     """
-    # PRE-CALCULAR datos compartidos (esto es clave para optimizar)
-    secciones = cargar_secciones_ine()
-    poblacion_por_estado = secciones.groupby('ENTIDAD')['POBTOT'].sum().to_dict()
-    asignacion_distritos = repartir_distritos_hare(
-        poblacion_estados=poblacion_por_estado,
-        n_distritos=mr_total,
-        piso_constitucional=2
-    )
-    
-    df_votos = pd.read_parquet('data/computos_diputados_2024.parquet')
-    df_votos['ENTIDAD_NOMBRE'] = df_votos['ENTIDAD'].str.strip().str.upper()
-    
-    estado_nombres = {
-        1: 'AGUASCALIENTES', 2: 'BAJA CALIFORNIA', 3: 'BAJA CALIFORNIA SUR',
-        4: 'CAMPECHE', 5: 'CHIAPAS', 6: 'CHIHUAHUA', 7: 'COAHUILA',
-        8: 'COLIMA', 9: 'CIUDAD DE MEXICO', 10: 'DURANGO', 11: 'GUANAJUATO',
-        12: 'GUERRERO', 13: 'HIDALGO', 14: 'JALISCO', 15: 'MEXICO',
-        16: 'MICHOACAN', 17: 'MORELOS', 18: 'NAYARIT', 19: 'NUEVO LEON',
-        20: 'OAXACA', 21: 'PUEBLA', 22: 'QUERETARO', 23: 'QUINTANA ROO',
-        24: 'SAN LUIS POTOSI', 25: 'SINALOA', 26: 'SONORA', 27: 'TABASCO',
-        28: 'TAMAULIPAS', 29: 'TLAXCALA', 30: 'VERACRUZ', 31: 'YUCATAN',
-        32: 'ZACATECAS'
-    }
-    
-    # Búsqueda binaria entre 30% y 80%
+    # Búsqueda entre 30% y 80%, en incrementos de 0.5%
     min_pct = 30.0
     max_pct = 80.0
+    rejilla = np.arange(min_pct, max_pct + 0.5, 0.5)
+    
+    if executor is not None:
+        resultados = executor.mapear(
+            _evaluar_pct,
+            [(float(pct), mr_total, rp_total, aplicar_topes, eficiencia_mr) for pct in rejilla],
+            chunksize=8
+        )
+        return next((r for r in resultados if r['total'] >= objetivo_escanos), None)
+    
+    asignacion_distritos, df_votos = _datos_barrido(mr_total)
     
     mejor_resultado = None
     
     # Prueba incrementos de 0.5%
-    for pct in np.arange(min_pct, max_pct + 0.5, 0.5):
+    for pct in rejilla:
         resultado = calcular_escanos_combinado(pct, mr_total, rp_total, 
                                                aplicar_topes, eficiencia_mr,
-                                               asignacion_distritos, df_votos, estado_nombres)
+                                               asignacion_distritos, df_votos, ESTADO_NOMBRES)
         
         if resultado['total'] >= objetivo_escanos:
             if mejor_resultado is None or pct < mejor_resultado['pct_votos']:
@@ -213,9 +232,17 @@ def buscar_votos_minimos(mr_total, rp_total, aplicar_topes, objetivo_escanos,
     return mejor_resultado
 
 
-def analizar_votos_minimos_morena():
+def _buscar_tarea(args):
+    """Tarea del pool: buscar_votos_minimos para una configuración."""
+    return buscar_votos_minimos(*args)
+
+
+def analizar_votos_minimos_morena(executor=None):
     """
     Calcula votos mínimos para MORENA en cada escenario.
+
+    executor: ScenarioExecutor opcional; cada búsqueda (escenario × eficiencia ×
+    objetivo) se evalúa en un worker y los resultados se imprimen en orden.
     """
     
     escenarios_config = [
@@ -243,6 +270,18 @@ def analizar_votos_minimos_morena():
     print("\n⚠️  NOTA: Este análisis usa redistritación REAL (método Hare por población)")
     print("   NO asume proporcionalidad directa. Los resultados son más precisos.\n")
     
+    # Todas las búsquedas (mayoría simple 201 y calificada 267) de una vez
+    tareas = [
+        (mr, rp, topes, objetivo, eficiencia_val)
+        for eficiencia_val, _ in eficiencias
+        for _, mr, rp, topes in escenarios_config
+        for objetivo in (201, 267)
+    ]
+    if executor is not None:
+        busquedas = iter(executor.mapear(_buscar_tarea, tareas))
+    else:
+        busquedas = (_buscar_tarea(t) for t in tareas)
+    
     todos_resultados = []
     
     for eficiencia_val, eficiencia_desc in eficiencias:
@@ -255,11 +294,9 @@ def analizar_votos_minimos_morena():
             print(f"{nombre} ({mr} MR + {rp} RP)")
             print(f"{'─'*120}")
             
-            # Mayoría simple (201)
-            simple = buscar_votos_minimos(mr, rp, topes, 201, eficiencia_val)
-            
-            # Mayoría calificada (267)
-            calificada = buscar_votos_minimos(mr, rp, topes, 267, eficiencia_val)
+            # Mayoría simple (201) y calificada (267), en el orden de `tareas`
+            simple = next(busquedas)
+            calificada = next(busquedas)
             
             print(f"\n📊 MAYORÍA SIMPLE (201 escaños):")
             if simple:
@@ -364,4 +401,6 @@ def analizar_votos_minimos_morena():
 
 
 if __name__ == '__main__':
-    analizar_votos_minimos_morena()
+    # Workers: env SCENARIO_WORKERS (default: número de CPUs), precalentados con los datos
+    with ScenarioExecutor(inicializador=precargar_datos) as executor:
+        analizar_votos_minimos_morena(executor)
@@ -19,7 +19,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from redistritacion.modulos.reparto_distritos import repartir_distritos_hare
-from redistritacion.modulos.distritacion import cargar_secciones_ine
+from redistritacion.modulos.distritacion import poblacion_por_estado as cargar_poblacion_por_estado
 
 def calcular_distritos_por_estado_con_votos_minimos(mr_total: int, pct_votos: float, eficiencia: float = 1.1):
     """
@@ -52,9 +52,8 @@ def calcular_distritos_por_estado_con_votos_minimos(mr_total: int, pct_votos: fl
     # Agregar estado (extraer de DISTRITO: "01 - AGUASCALIENTES")
     votos_por_distrito['ESTADO'] = votos_por_distrito['DISTRITO'].str.split(' - ').str[1]
     
-    # Cargar secciones para redistritación por población
-    secciones = cargar_secciones_ine()
-    poblacion_por_estado = secciones.groupby('ENTIDAD')['POBTOT'].sum().to_dict()
+    # Población por estado para redistritación (almacén de secciones)
+    poblacion_por_estado = cargar_poblacion_por_estado()
     
     # Repartir distritos según escenario usando método Hare
     asignacion_distritos = repartir_distritos_hare(
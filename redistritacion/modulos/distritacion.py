@@ -10,13 +10,96 @@ Redistrita secciones electorales en nuevos distritos respetando:
 Método: Greedy con semillas geográficas
 """
 
+import os
+from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
 
 
-def cargar_secciones_ine(path: str = 'redistritacion/data/INE_SECCION_2020.parquet') -> pd.DataFrame:
+# ==============================================================================
+# ALMACÉN DE SECCIONES INE (compartido por proceso)
+# ==============================================================================
+
+PATH_SECCIONES_INE = 'redistritacion/data/INE_SECCION_2020.parquet'
+COLUMNAS_SECCIONES = ['ID', 'ENTIDAD', 'DISTRITO', 'MUNICIPIO', 'SECCION', 'POBTOT']
+
+# dtype compacto por columna (ENTIDAD ≤ 32, DISTRITO/MUNICIPIO < 600)
+_DTYPES_SECCIONES = {
+    'ID': 'int32', 'ENTIDAD': 'int16', 'DISTRITO': 'int16',
+    'MUNICIPIO': 'int16', 'SECCION': 'int32', 'POBTOT': 'int32',
+}
+
+
+@dataclass(frozen=True)
+class SeccionesINE:
+    """
+    Secciones INE 2020 con columnas compactas y agregados precalculados.
+    Instancia compartida: tratar como solo lectura.
+    """
+    secciones: pd.DataFrame
+    poblacion_estado: Dict[int, int]
+    poblacion_municipio: Dict[Tuple[int, int], int]
+    secciones_estado: Dict[int, int]
+    secciones_municipio: Dict[Tuple[int, int], int]
+
+
+def _columna_compacta(serie: pd.Series, dtype: str) -> pd.Series:
+    """Entero del dtype pedido si cabe; si no, int64; si no es numérica, categórica."""
+    num = pd.to_numeric(serie, errors='coerce')
+    if num.isna().any() or not (num == np.floor(num)).all():
+        return serie.astype('category')
+    info = np.iinfo(dtype)
+    if len(num) and (num.min() < info.min or num.max() > info.max):
+        return num.astype('int64')
+    return num.astype(dtype)
+
+
+def _cargar_secciones(path: str) -> SeccionesINE:
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path, columns=COLUMNAS_SECCIONES)
+    else:
+        df = pd.read_csv(path, encoding='latin-1', usecols=COLUMNAS_SECCIONES)
+    df = df[COLUMNAS_SECCIONES].dropna(subset=['POBTOT']).reset_index(drop=True)
+    for col, dtype in _DTYPES_SECCIONES.items():
+        df[col] = _columna_compacta(df[col], dtype)
+    return secciones_desde_df(df)
+
+
+def secciones_desde_df(df: pd.DataFrame) -> SeccionesINE:
+    """Agregados por estado/municipio sobre secciones ya compactadas (también usado por el snapshot)."""
+    pob = df['POBTOT'].astype('int64')
+    por_estado = pob.groupby(df['ENTIDAD'], observed=True)
+    por_municipio = pob.groupby([df['ENTIDAD'], df['MUNICIPIO']], observed=True)
+    return SeccionesINE(
+        secciones=df,
+        poblacion_estado={int(k): int(v) for k, v in por_estado.sum().items()},
+        poblacion_municipio={(int(e), int(m)): int(v) for (e, m), v in por_municipio.sum().items()},
+        secciones_estado={int(k): int(v) for k, v in por_estado.size().items()},
+        secciones_municipio={(int(e), int(m)): int(v) for (e, m), v in por_municipio.size().items()},
+    )
+
+
+def obtener_secciones_ine(path: str = PATH_SECCIONES_INE) -> SeccionesINE:
+    """
+    Almacén de secciones del proceso: se lee una vez (parquet, o CSV si no
+    existe) y se recarga solo si el archivo cambia en disco.
+    """
+    from engine import dataset_store
+
+    if not os.path.exists(path):
+        path = path.replace('.parquet', '.csv')
+    return dataset_store.obtener(path, 'secciones_ine', _cargar_secciones, copiar=False)
+
+
+def poblacion_por_estado(path: str = PATH_SECCIONES_INE) -> Dict[int, int]:
+    """Población total (POBTOT) por ENTIDAD, precalculada en el almacén."""
+    return dict(obtener_secciones_ine(path).poblacion_estado)
+
+
+def cargar_secciones_ine(path: str = PATH_SECCIONES_INE) -> pd.DataFrame:
     """
     Carga archivo de secciones del INE Censo 2020.
     
@@ -24,26 +107,10 @@ def cargar_secciones_ine(path: str = 'redistritacion/data/INE_SECCION_2020.parqu
         path: Ruta al archivo Parquet (más eficiente que CSV)
     
     Returns:
-        DataFrame con columnas: ID, ENTIDAD, DISTRITO, MUNICIPIO, SECCION, POBTOT
+        DataFrame (copia del almacén compartido) con columnas:
+        ID, ENTIDAD, DISTRITO, MUNICIPIO, SECCION, POBTOT (int32)
     """
-    # Usar parquet si existe, sino fallback a CSV
-    import os
-    if os.path.exists(path):
-        df = pd.read_parquet(path)
-    else:
-        # Fallback a CSV si no existe parquet
-        csv_path = path.replace('.parquet', '.csv')
-        df = pd.read_csv(csv_path, encoding='latin-1')
-    
-    # Seleccionar columnas relevantes
-    columnas = ['ID', 'ENTIDAD', 'DISTRITO', 'MUNICIPIO', 'SECCION', 'POBTOT']
-    df_clean = df[columnas].copy()
-    
-    # Validar datos
-    df_clean = df_clean.dropna(subset=['POBTOT'])
-    df_clean['POBTOT'] = df_clean['POBTOT'].astype(int)
-    
-    return df_clean
+    return obtener_secciones_ine(path).secciones.copy()
 
 
 def calcular_poblacion_objetivo(
@@ -7,6 +7,9 @@ respetando el piso constitucional de 2 distritos por estado.
 Método: Hare con piso constitucional (igual que el INE)
 """
 
+import threading
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple
@@ -43,6 +46,87 @@ def aplicar_piso_constitucional(
     return {estado: piso for estado in estados}
 
 
+# Rango de tamaños de cámara precalculados en la tabla de reparto
+N_MIN_TABLA = 64
+N_MAX_TABLA = 600
+
+# (estados, poblaciones, piso) -> TablaRepartoHare; pocas combinaciones por proceso
+_TABLAS: "OrderedDict[Tuple, TablaRepartoHare]" = OrderedDict()
+_MAX_TABLAS = 8
+_LOCK_TABLAS = threading.Lock()
+
+
+def _reparto_hare_matriz(poblaciones: np.ndarray, ns: np.ndarray, piso: int) -> np.ndarray:
+    """
+    Reparto Hare con piso para varios tamaños a la vez.
+
+    Devuelve una matriz (estados × len(ns)) int16; la columna j es el reparto
+    de ns[j] distritos. Mismas operaciones de punto flotante y mismo desempate
+    (orden de entrada en residuos iguales) que el cálculo estado por estado.
+    """
+    n_estados = len(poblaciones)
+    restantes = ns - n_estados * piso
+    out = np.full((n_estados, len(ns)), piso, dtype=np.int16)
+    activos = restantes > 0
+    if not activos.any():
+        return out
+
+    cuota = float(poblaciones.sum()) / restantes[activos]
+    cociente = poblaciones[:, None] / cuota[None, :]
+    enteros = np.floor(cociente)
+    residuos = cociente - enteros
+
+    faltantes = restantes[activos] - enteros.sum(axis=0).astype(np.int64)
+    orden = np.argsort(-residuos, axis=0, kind='stable')
+    posicion = np.empty_like(orden)
+    np.put_along_axis(posicion, orden, np.arange(n_estados)[:, None], axis=0)
+
+    out[:, activos] += (enteros + (posicion < faltantes[None, :])).astype(np.int16)
+    return out
+
+
+class TablaRepartoHare:
+    """
+    Reparto precalculado para cada tamaño N_MIN_TABLA..N_MAX_TABLA de una
+    población fija: matriz densa estados × K en int16.
+    """
+
+    def __init__(self, poblacion_estados: Dict[str, int], piso_constitucional: int = 2):
+        self.estados = list(poblacion_estados.keys())
+        self.piso = int(piso_constitucional)
+        self.n_min = max(N_MIN_TABLA, len(self.estados) * self.piso)
+        self.n_max = N_MAX_TABLA
+        self._poblaciones = np.array(list(poblacion_estados.values()), dtype=float)
+        ns = np.arange(self.n_min, self.n_max + 1)
+        self.matriz = _reparto_hare_matriz(self._poblaciones, ns, self.piso) if len(ns) else \
+            np.empty((len(self.estados), 0), dtype=np.int16)
+
+    def columna(self, n_distritos: int) -> np.ndarray:
+        """Vector de distritos por estado (orden de self.estados)."""
+        if self.n_min <= n_distritos <= self.n_max:
+            return self.matriz[:, n_distritos - self.n_min]
+        return _reparto_hare_matriz(self._poblaciones, np.array([n_distritos]), self.piso)[:, 0]
+
+    def reparto(self, n_distritos: int) -> Dict[str, int]:
+        return dict(zip(self.estados, self.columna(n_distritos).tolist()))
+
+
+def tabla_reparto_hare(poblacion_estados: Dict[str, int], piso_constitucional: int = 2) -> TablaRepartoHare:
+    """Tabla de reparto compartida para esta población y piso (se construye una vez)."""
+    key = (tuple(poblacion_estados.items()), int(piso_constitucional))
+    with _LOCK_TABLAS:
+        tabla = _TABLAS.get(key)
+        if tabla is not None:
+            _TABLAS.move_to_end(key)
+            return tabla
+    tabla = TablaRepartoHare(poblacion_estados, piso_constitucional)
+    with _LOCK_TABLAS:
+        _TABLAS[key] = tabla
+        while len(_TABLAS) > _MAX_TABLAS:
+            _TABLAS.popitem(last=False)
+    return tabla
+
+
 def repartir_distritos_hare(
     poblacion_estados: Dict[str, int],
     n_distritos: int,
@@ -59,6 +143,9 @@ def repartir_distritos_hare(
     3. Asignar parte entera (cocientes)
     4. Distribuir residuos por restos mayores
     
+    El resultado sale de la tabla precalculada (tabla_reparto_hare) para
+    esta población, así que cada llamada es una lectura de columna.
+    
     Args:
         poblacion_estados: Dict {estado: poblacion}
         n_distritos: Número total de distritos a repartir
@@ -80,53 +167,7 @@ def repartir_distritos_hare(
             f"({n_estados} estados × {piso_constitucional} = {minimo_distritos})"
         )
     
-    # PASO 1: Asignar piso constitucional
-    distritos = {estado: piso_constitucional for estado in poblacion_estados.keys()}
-    distritos_asignados = n_estados * piso_constitucional
-    distritos_restantes = n_distritos - distritos_asignados
-    
-    if distritos_restantes == 0:
-        # Si ya se agotaron los distritos, retornar
-        return distritos
-    
-    # PASO 2: Calcular cuota Hare con población total
-    poblacion_total = sum(poblacion_estados.values())
-    cuota = poblacion_total / distritos_restantes
-    
-    # PASO 3: Calcular cocientes y residuos
-    cocientes = {}
-    residuos = {}
-    
-    for estado, poblacion in poblacion_estados.items():
-        cociente_exacto = poblacion / cuota
-        cociente_entero = int(np.floor(cociente_exacto))
-        residuo = cociente_exacto - cociente_entero
-        
-        cocientes[estado] = cociente_entero
-        residuos[estado] = residuo
-    
-    # PASO 4: Asignar parte entera (cocientes)
-    for estado, cociente in cocientes.items():
-        distritos[estado] += cociente
-        distritos_asignados += cociente
-    
-    # PASO 5: Distribuir residuos (restos mayores)
-    distritos_faltantes = n_distritos - distritos_asignados
-    
-    if distritos_faltantes > 0:
-        # Ordenar estados por residuo descendente
-        estados_ordenados = sorted(
-            residuos.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
-        # Asignar un distrito extra a los primeros N estados
-        for i in range(distritos_faltantes):
-            estado = estados_ordenados[i][0]
-            distritos[estado] += 1
-    
-    return distritos
+    return tabla_reparto_hare(poblacion_estados, piso_constitucional).reparto(int(n_distritos))
 
 
 def generar_reporte_reparto(
@@ -0,0 +1,63 @@
+import numpy as np
+
+from engine.ajuste_incremental import ESTADOS, aplicar_ajuste, capturar_asignacion, crear_estado, huella_escenario
+from engine.procesar_diputados_v2 import asignadip_v2
+
+PARTIDOS = ["MORENA", "PAN", "PRI", "MC", "PT"]
+VOTOS = np.array([24_000_000, 10_000_000, 5_500_000, 6_000_000, 3_200_000], dtype=float)
+PARAMS = dict(m=200, S=500, threshold=0.03, max_seats=300, max_pp=0.08,
+              apply_caps=True, partidos_base=PARTIDOS, mr_son_manuales=True)
+
+
+HUELLA = huella_escenario(camara="diputados", anio=2024, plan="vigente", aplicar_topes=True)
+
+
+def _respuesta(seats, meta=None):
+    return {"resultados": [
+        {"partido": p, "votos": int(v), "total": int(t)}
+        for p, v, t in zip(PARTIDOS, VOTOS, seats[2])
+    ], "meta": meta or {}}
+
+
+def _seats(mr):
+    return asignadip_v2(x=VOTOS, ssd=np.array([mr[p] for p in PARTIDOS]), **PARAMS)["seats"]
+
+
+def test_ajuste_incremental_igual_a_recalculo_completo():
+    mr = {"MORENA": 200, "PAN": 40, "PRI": 20, "MC": 25, "PT": 15}
+    with capturar_asignacion() as captura:
+        seats = asignadip_v2(x=VOTOS, ssd=np.array(list(mr.values())), **PARAMS)["seats"]
+    meta = {"VTE": 1, "mr_por_estado": {"JAL": {"MORENA": 12, "PAN": 8}, "AGS": {"MORENA": 3, "PAN": 0}}}
+    token = crear_estado(captura, HUELLA, mr, _respuesta(seats, meta))
+    assert token
+
+    nuevo = {**mr, "MORENA": 199, "PAN": 41}
+    # otro escenario (huella distinta) -> recálculo completo, el estado no avanza
+    otra = huella_escenario(camara="diputados", anio=2024, plan="vigente", aplicar_topes=False)
+    assert aplicar_ajuste(token, otra, mr, nuevo) is None
+
+    res = aplicar_ajuste(token, HUELLA, mr, nuevo, entidad="JAL", mr_entidad={"MORENA": 11, "PAN": 9})
+    esperado = _seats(nuevo)
+    assert [res["tot"][p] for p in PARTIDOS] == esperado[2].tolist()
+    assert [res["rp"][p] for p in PARTIDOS] == esperado[1].tolist()
+    assert res["meta"]["mr_por_estado"] == {"JAL": {"MORENA": 11, "PAN": 9}, "AGS": {"MORENA": 3, "PAN": 0}}
+    assert res["meta"]["VTE"] == 1 and meta["mr_por_estado"]["JAL"]["PAN"] == 8
+
+    # el estado avanzó: reenviar el MR viejo con el mismo token ya no aplica
+    assert aplicar_ajuste(token, HUELLA, mr, nuevo) is None
+    assert aplicar_ajuste("desconocido", HUELLA, nuevo, mr) is None
+
+
+def test_hit_de_cache_sin_captura_usa_la_plantilla_de_la_huella():
+    mr = {"MORENA": 180, "PAN": 50, "PRI": 25, "MC": 25, "PT": 20}
+    huella = huella_escenario(camara="diputados", anio=2021, plan="vigente", aplicar_topes=True)
+    assert crear_estado({}, huella, mr, _respuesta(_seats(mr))) is None  # sin plantilla todavía
+    with capturar_asignacion() as captura:
+        seats = _seats(mr)
+    assert crear_estado(captura, huella, mr, _respuesta(seats))
+
+    otro = {**mr, "MORENA": 170, "PT": 30}
+    token = crear_estado({}, huella, otro, _respuesta(_seats(otro)))
+    assert token and ESTADOS.obtener(token).ssd.tolist() == [otro[p] for p in PARTIDOS]
+    # la respuesta no corresponde al MR pedido -> sin token
+    assert crear_estado({}, huella, otro, _respuesta(seats)) is None
@@ -0,0 +1,71 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+
+from engine import arranque
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SONDA = """
+import json, sys
+import main
+from fastapi.testclient import TestClient
+pesados = ['pandas', 'numpy', 'engine.procesar_diputados_v2', 'engine.procesar_senadores_v2']
+c = TestClient(main.app)  # sin `with`: no corre el calentamiento
+codigos = [c.get('/health').status_code, c.get('/data/escenarios').status_code]
+print(json.dumps({'cargados': [m for m in pesados if m in sys.modules], 'codigos': codigos}))
+"""
+
+
+def test_main_responde_health_y_escenarios_sin_cargar_pandas_ni_motores():
+    env = dict(os.environ, STARTUP_WARMUP="0", LOG_LEVEL="WARNING")
+    out = subprocess.run([sys.executable, "-c", SONDA], cwd=RAIZ, env=env,
+                         capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    assert json.loads(out.stdout.strip().splitlines()[-1]) == {"cargados": [], "codigos": [200, 200]}
+
+
+def test_diferidos_importan_al_primer_uso_y_quedan_medidos(tmp_path, monkeypatch):
+    (tmp_path / "modulo_prueba_arranque.py").write_text("def doble(x):\n    return 2 * x\nVALOR = 7\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    doble = arranque.funcion_diferida("modulo_prueba_arranque", "doble")
+    mod = arranque.ModuloDiferido("modulo_prueba_arranque")
+    assert "modulo_prueba_arranque" not in sys.modules
+    assert doble(21) == 42 and mod.VALOR == 7
+    medido = arranque.estado()["modulos"]["modulo_prueba_arranque"]
+    assert medido["ms"] >= 0 and medido["modulos_nuevos"] == 1
+    sys.modules.pop("modulo_prueba_arranque", None)
+
+
+def test_precalentar_escenarios_sigue_tras_fallos_y_respeta_el_switch(monkeypatch):
+    monkeypatch.delenv("STARTUP_WARMUP", raising=False)
+    monkeypatch.delenv("STARTUP_PRESETS", raising=False)
+    corridas = []
+
+    async def ok(nombre):
+        corridas.append(nombre)
+
+    async def falla():
+        raise RuntimeError("motor saturado")
+
+    tareas = [("a", lambda: ok("a")), ("b", falla), ("c", lambda: ok("c"))]
+    progreso = asyncio.run(arranque.precalentar_escenarios(tareas))
+    assert corridas == ["a", "c"]
+    assert (progreso["total"], progreso["listos"], progreso["fallidos"]) == (3, 2, ["b"])
+    assert arranque.estado()["escenarios"]["listos"] == 2
+
+    monkeypatch.setenv("STARTUP_PRESETS", "0")
+    assert asyncio.run(arranque.precalentar_escenarios(tareas)) == {}
+    assert corridas == ["a", "c"]
+
+
+def test_escenarios_precalentados_empiezan_por_data_initial():
+    import main
+
+    etiquetas = [etiqueta for etiqueta, _ in main.escenarios_precalentados()]
+    assert etiquetas[:2] == ["diputados 2024 vigente", "senado 2024 vigente"]
+    assert "diputados 2018 300_100_con_topes" in etiquetas and "senado 2018 plan_c" in etiquetas
+    assert len(etiquetas) == len(set(etiquetas))
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from engine.procesar_senadores_v2 import conteo_senado_MR_PM_sigladoF
+
+PARTIDOS = ["PAN", "PRI", "PRD", "PVEM", "PT", "MC", "MORENA"]
+
+
+def test_conteo_senado_ganador_segundo_y_siglado():
+    boleta = pd.DataFrame({
+        "ENTIDAD": ["AGUASCALIENTES", "BAJA CALIFORNIA", "CAMPECHE"],
+        "PAN_PRI_PRD": [500, 300, 200],
+        "MORENA_PT_PVEM": [400, 300, 900],
+        "MC": [100, 300, 950],
+    })
+    acred = pd.DataFrame({
+        "ENTIDAD": boleta["ENTIDAD"],
+        "PAN": [300, 100, 100], "PRI": [150, 100, 50], "PRD": [50, 100, 50],
+        "MORENA": [300, 200, 600], "PT": [50, 50, 200], "PVEM": [50, 50, 100], "MC": [100, 300, 950],
+    })
+    gp_long = pd.DataFrame({
+        "ENTIDAD_ASCII": ["AGUASCALIENTES", "AGUASCALIENTES"],
+        "COALICION": ["FUERZA Y CORAZON POR MEXICO"] * 2,
+        "FORMULA": [1, 2],
+        "GRUPO_PARLAMENTARIO": ["PRI", ""],
+        "PARTIDO_ORIGEN": [None, "PRD"],
+    })
+    res = conteo_senado_MR_PM_sigladoF(boleta, acred, PARTIDOS, gp_long, 2024,
+                                       escanos_mr_efectivos=64, escanos_pm=32)
+    # AGS: FCM gana (F1 -> PRI por siglado, F2 -> PRD por partido de origen), SHH segundo -> MORENA
+    # BC: empate triple -> orden por nombre: FCM (PAN por votación) y MC segundo
+    # CAM: MC gana, SHH segundo
+    assert res == {
+        "ssd_partidos": {"PAN": 2, "PRI": 1, "PRD": 1, "PVEM": 0, "PT": 0, "MC": 3, "MORENA": 2},
+        "indep_mr_pm": 0,
+    }
@@ -0,0 +1,36 @@
+import threading
+import time
+
+from engine import dataset_store
+
+
+def test_loader_lento_no_bloquea_otras_claves_ni_carga_dos_veces(tmp_path):
+    lento, rapido = tmp_path / "lento.csv", tmp_path / "rapido.csv"
+    lento.write_text("a")
+    rapido.write_text("b")
+    entro, soltar = threading.Event(), threading.Event()
+    llamadas = []
+
+    def loader_lento(path):
+        llamadas.append(path)
+        entro.set()
+        assert soltar.wait(5)
+        return {"v": 1}
+
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(
+        dataset_store.obtener(str(lento), "prueba", loader_lento))) for _ in range(3)]
+    try:
+        for h in hilos:
+            h.start()
+        assert entro.wait(5)
+        t0 = time.monotonic()
+        assert dataset_store.obtener(str(rapido), "prueba", lambda p: "rapido") == "rapido"
+        assert time.monotonic() - t0 < 1
+    finally:
+        soltar.set()
+        for h in hilos:
+            h.join(5)
+    assert resultados == [{"v": 1}] * 3 and len(llamadas) == 1
+    assert dataset_store.invalidar(str(lento)) == 1 and not dataset_store._CARGANDO
+    dataset_store.invalidar(str(rapido))
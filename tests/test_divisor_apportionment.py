@@ -0,0 +1,63 @@
+import heapq
+import math
+
+import numpy as np
+import pytest
+
+from engine.core import _divisor_apportionment_tabla, divisor_apportionment
+
+DIVISORES = {
+    "dhondt": lambda k: k + 1.0,
+    "saintelague": lambda k: k + 0.5,
+    "adams": lambda k: float(k),
+    "huntington_hill": lambda k: math.sqrt(k * (k + 1.0)),
+}
+
+
+def _secuencial(votes, seats, method):
+    """Definición del método: escaño por escaño al mayor cociente."""
+    d = DIVISORES[method]
+    k = [0] * len(votes)
+    q = lambda i: -math.inf if votes[i] <= 0 else (votes[i] / d(k[i]) if d(k[i]) > 0 else math.inf)
+    heap = [(-q(i), -votes[i], i) for i in range(len(votes))]
+    heapq.heapify(heap)
+    for _ in range(seats):
+        _, _, i = heapq.heappop(heap)
+        k[i] += 1
+        heapq.heappush(heap, (-q(i), -votes[i], i))
+    return np.array(k)
+
+
+def _casos(n_casos, semilla):
+    rng = np.random.default_rng(semilla)
+    for _ in range(n_casos):
+        n = int(rng.integers(2, 12))
+        votes = rng.integers(0, 5_000_000, size=n).astype(float)
+        if rng.random() < 0.2:
+            votes[rng.integers(0, n)] = 0
+        yield votes, int(rng.integers(1, 600))
+
+
+@pytest.mark.parametrize("method", ["dhondt", "saintelague"])
+def test_kernel_igual_a_tabla_de_cocientes(method):
+    for votes, seats in _casos(500, 1):
+        np.testing.assert_array_equal(
+            divisor_apportionment(votes, seats, method),
+            _divisor_apportionment_tabla(votes, seats, method),
+        )
+
+
+@pytest.mark.parametrize("method", list(DIVISORES))
+def test_kernel_igual_a_reparto_secuencial(method):
+    for votes, seats in _casos(300, 2):
+        res = divisor_apportionment(votes, seats, method)
+        assert res.sum() == seats
+        np.testing.assert_array_equal(res, _secuencial(votes, seats, method))
+
+
+def test_webster_es_sainte_lague():
+    votes = np.array([340_000, 280_000, 160_000, 60_000, 15_000], dtype=float)
+    np.testing.assert_array_equal(
+        divisor_apportionment(votes, 400, "webster"),
+        divisor_apportionment(votes, 400, "saintelague"),
+    )
@@ -0,0 +1,83 @@
+import numpy as np
+
+from engine.procesar_diputados_v2 import LR_ties
+
+
+def _lr_ties_original(v_abs, n, q=None, seed=None):
+    """Versión anterior (bucle por bloques + np.random global), como referencia."""
+    v_abs = np.nan_to_num(v_abs.astype(float))
+    if q is None:
+        q = np.sum(v_abs) / n if n > 0 else 0.0
+    if q <= 0 or n <= 0:
+        return np.zeros_like(v_abs, dtype=int)
+    t = np.floor(v_abs / q).astype(int)
+    u = int(n - np.sum(t))
+    if u <= 0:
+        return t
+    rem = v_abs % q
+    base_ord = np.argsort(-rem)
+    if seed is not None:
+        np.random.seed(seed)
+    rank = np.zeros(len(v_abs), dtype=int)
+    i = 0
+    while i < len(base_ord):
+        j = i
+        while j < len(base_ord) and abs(rem[base_ord[j]] - rem[base_ord[i]]) < 1e-12:
+            j += 1
+        idx_bloque = base_ord[i:j]
+        if len(idx_bloque) > 1:
+            v_bloque = v_abs[idx_bloque]
+            ord_votos = np.argsort(-v_bloque)
+            empates = []
+            k = 0
+            while k < len(ord_votos):
+                l = k
+                while l < len(ord_votos) and abs(v_bloque[ord_votos[l]] - v_bloque[ord_votos[k]]) < 1e-12:
+                    l += 1
+                if l - k > 1:
+                    empates.extend(idx_bloque[ord_votos[k:l]])
+                k = l
+            if empates:
+                perm_empates = np.random.permutation(empates)
+                for orig, nuevo in zip(empates, perm_empates):
+                    pos_orig = np.where(idx_bloque[ord_votos] == orig)[0][0]
+                    idx_bloque[ord_votos[pos_orig]] = nuevo
+            idx_bloque = idx_bloque[ord_votos]
+        rank[i:j] = idx_bloque
+        i = j
+    add = np.zeros_like(v_abs, dtype=int)
+    for i in range(min(u, len(rank))):
+        add[rank[i]] += 1
+    return t + add
+
+
+def test_lr_ties_igual_a_version_original():
+    rng = np.random.default_rng(7)
+    for caso in range(400):
+        n_part = int(rng.integers(2, 12))
+        if caso % 2:
+            # votos repetidos para forzar empates exactos de residuo y votación
+            votos = rng.choice([0, 1000, 2500, 2500, 7000], size=n_part).astype(float)
+        else:
+            votos = rng.integers(0, 3_000_000, size=n_part).astype(float)
+        n = int(rng.integers(1, 60))
+        seed = int(rng.integers(0, 1000))
+        esperado = _lr_ties_original(votos.copy(), n, seed=seed)
+        assert np.array_equal(LR_ties(votos.copy(), n, seed=seed), esperado), (votos, n, seed)
+
+
+def test_lr_ties_no_toca_estado_global_de_numpy():
+    np.random.seed(123)
+    antes = np.random.get_state()[1].copy()
+    LR_ties(np.array([100.0, 100.0, 100.0]), 2, seed=5)
+    assert np.array_equal(np.random.get_state()[1], antes)
+
+
+def test_lr_ties_sin_semilla_es_reproducible_con_la_semilla_global():
+    votos = np.array([100.0, 100.0, 100.0, 100.0])
+    resultados = set()
+    for _ in range(5):
+        np.random.seed(0)
+        resultados.add(tuple(LR_ties(votos, 2)))
+    assert len(resultados) == 1
+
@@ -0,0 +1,26 @@
+import asyncio
+import threading
+
+import pytest
+
+from engine.motor_executor import MotorExecutor, MotorSaturado
+
+
+def test_motor_rechaza_cuando_la_cola_esta_llena():
+    ex = MotorExecutor(max_concurrencia=1, max_cola=1)
+    liberar = threading.Event()
+
+    async def escenario():
+        corriendo = asyncio.ensure_future(ex.ejecutar(liberar.wait, 5))
+        en_cola = asyncio.ensure_future(ex.ejecutar(lambda: "ok"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(MotorSaturado):
+            await ex.ejecutar(lambda: "rechazada")
+        st = ex.stats()
+        assert (st["corriendo"], st["en_cola"], st["rechazadas"]) == (1, 1, 1)
+        liberar.set()
+        return await corriendo, await en_cola
+
+    assert asyncio.run(escenario()) == (True, "ok")
+    st = ex.stats()
+    assert (st["corriendo"], st["en_cola"], st["completadas"]) == (0, 0, 2)
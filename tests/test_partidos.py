@@ -0,0 +1,40 @@
+import pandas as pd
+
+from engine.partidos import coalicion_de_tokens, registro_partidos, tokens_de_coalicion
+from engine.recomposicion import _assign_coalitions_vectorized, _is_candidate_col, _is_coalition_col
+
+
+def test_registro_mascaras_y_coaliciones_por_anio():
+    reg = registro_partidos(2024)
+    m = reg.mascara_columna("MORENA-PT_PVEM")
+    assert m == reg.mascara(["PVEM", "PT", "MORENA"])
+    assert reg.coalicion(m) == "SIGAMOS HACIENDO HISTORIA"
+    assert reg.pertenece(m, "PT") and not reg.pertenece(m, "PAN")
+    assert reg.mascara_columna("PAN_PES") == 0  # PES no compite en 2024
+    assert coalicion_de_tokens(["MC"], 2024) == "MC"
+    assert coalicion_de_tokens(["MC"], 2024, individuales=False) is None
+    assert tokens_de_coalicion("JUNTOS HAREMOS HISTORIA", 2018) == ["MORENA", "PT", "PES"]
+    assert tokens_de_coalicion("JUNTOS HAREMOS HISTORIA", 2024) == []
+    assert _is_candidate_col("CI", 2024) and not _is_coalition_col("PAN_CI", 2024)
+    assert _is_coalition_col("PAN_PRI", 2021) and not _is_coalition_col("PAN", 2021)
+
+
+def test_residuo_al_dominante_miembro_o_al_mas_votado():
+    df = pd.DataFrame({
+        "ENTIDAD": ["A", "A", "B"], "DISTRITO": [1, 2, 1],
+        "PAN": [5.0, 1.0, 9.0], "PRI": [1.0, 1.0, 2.0], "PRD": [0.0, 7.0, 0.0],
+        "PAN_PRI_PRD": [11.0, 8.0, 3.0],
+    })
+    sig = pd.DataFrame({"entidad_key": ["A", "A"], "distrito": [1, 2],
+                        "coalicion_key": ["", ""], "dominante": ["PRI", "MORENA"]})
+    partidos = registro_partidos(2024).partidos[:-1]
+    out = df[["ENTIDAD"]].copy()
+    for p in partidos:
+        out[p] = df[p] if p in df.columns else 0.0
+    _assign_coalitions_vectorized(out, df, ["PAN_PRI_PRD"], list(partidos), "diputados",
+                                  "equal_residue_siglado", sig, 2024)
+    # A-1: residuo 2 al dominante PRI; A-2: MORENA no es miembro -> PRD (más voto solo);
+    # B-1: sin residuo
+    assert out["PAN"].tolist() == [8.0, 3.0, 10.0]
+    assert out["PRI"].tolist() == [6.0, 3.0, 3.0]
+    assert out["PRD"].tolist() == [3.0, 11.0, 1.0]
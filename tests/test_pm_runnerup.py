@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from engine.procesar_diputados_v2 import _simulate_pm_by_runnerup
+from engine.tensor_electoral import ElectionTensor
+
+
+def _segundos_ordenando(df, partidos):
+    """Segundo lugar con sort estable por distrito (versión con iterrows)."""
+    return [sorted(((p, float(row.get(p, 0) or 0.0)) for p in partidos), key=lambda x: -x[1])[1][0]
+            for _, row in df.iterrows()]
+
+
+def test_segundos_del_tensor_respetan_empates_del_orden_estable():
+    rng = np.random.default_rng(4)
+    registro = ["PAN", "PRI", "PRD", "PVEM", "PT", "MC", "MORENA"]
+    for _ in range(200):
+        n = int(rng.integers(2, 7))
+        partidos = list(rng.permutation(registro)[:n])
+        df = pd.DataFrame(rng.integers(0, 4, size=(25, n)).astype(float), columns=partidos)
+        segundos = ElectionTensor.desde_dataframe(df, 2024).segundos(partidos)
+        assert [partidos[k] for k in segundos] == _segundos_ordenando(df, partidos)
+
+
+def test_pm_por_resto_mayor_y_vector_de_segundos():
+    # segundos: PAN x5, PRI x3, MC x2 -> cuotas 3.5, 2.1, 1.4 con 7 escaños
+    filas = [{"PAN": 1, "PRI": 9, "MC": 0}] * 5 + [{"PAN": 9, "PRI": 1, "MC": 0}] * 3 \
+        + [{"PAN": 9, "PRI": 0, "MC": 1}] * 2
+    tensor = ElectionTensor.desde_dataframe(pd.DataFrame(filas), 2024)
+    partidos = ["PAN", "PRI", "MC"]
+    pm, segundos = _simulate_pm_by_runnerup(tensor, 7, partidos, return_segundos=True)
+    assert pm == {"PAN": 4, "PRI": 2, "MC": 1}
+    assert segundos.tolist() == [0] * 5 + [1] * 3 + [2] * 2
+    assert _simulate_pm_by_runnerup(tensor, 0, partidos) == {"PAN": 0, "PRI": 0, "MC": 0}
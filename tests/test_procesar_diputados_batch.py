@@ -0,0 +1,45 @@
+from engine.procesar_diputados_v2 import procesar_diputados_batch, procesar_diputados_v2
+
+
+def test_batch_igual_a_llamadas_individuales():
+    base = dict(path_parquet="data/computos_diputados_2024.parquet", anio=2024,
+                path_siglado="data/siglado-diputados-2024.csv")
+    escenarios = [
+        {"max_seats": 500, "rp_seats": 200, "max_seats_per_party": 300},
+        {"max_seats": 400, "mr_seats": 300, "rp_seats": 100, "aplicar_topes": False, "seed": 42},
+        {"max_seats": 300, "sistema": "rp", "mr_seats": 0, "rp_seats": 300},
+    ]
+
+    batch = procesar_diputados_batch(escenarios=escenarios, **base)
+
+    assert len(batch) == len(escenarios)
+    for esc, res in zip(escenarios, batch):
+        individual = procesar_diputados_v2(**base, **esc)
+        for k in ("mr", "pm", "rp", "tot"):
+            assert res[k] == individual[k]
+
+
+def test_batch_acepta_los_planes_400_con_magnitudes_del_endpoint_individual():
+    from main import escenario_batch_a_kwargs
+
+    con = escenario_batch_a_kwargs({"plan": "300_100_con_topes", "aplicar_topes": False})
+    assert (con["max_seats"], con["mr_seats"], con["rp_seats"], con["max_seats_per_party"]) == (400, 300, 100, 300)
+    assert con["aplicar_topes"] is True and con["umbral"] == 0.03 and con["quota_method"] == "hare"
+    for plan, mr, rp in (("300_100_sin_topes", 300, 100), ("200_200_sin_topes", 200, 200)):
+        kw = escenario_batch_a_kwargs({"plan": plan})
+        assert (kw["max_seats"], kw["mr_seats"], kw["rp_seats"]) == (400, mr, rp)
+        assert kw["max_seats_per_party"] is None and kw["aplicar_topes"] is False and kw["seed"] == 42
+
+
+def test_batch_aisla_el_escenario_que_falla():
+    from engine.scenario_executor import ScenarioExecutor
+
+    base = dict(path_parquet="data/computos_diputados_2024.parquet", anio=2024,
+                path_siglado="data/siglado-diputados-2024.csv")
+    escenarios = [{"max_seats": 300, "sistema": "rp", "mr_seats": 0, "rp_seats": 300},
+                  {"max_seats": 300, "parametro_inexistente": 1}]
+    for executor in (None, ScenarioExecutor(workers=1)):
+        ok, malo = procesar_diputados_batch(escenarios=escenarios, executor=executor,
+                                            capturar_errores=True, **base)
+        assert sum(ok["tot"].values()) == 300
+        assert malo["error"].startswith("TypeError")
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine.dataset_store import obtener_boletas
+from engine.recomposicion import recompose_coalitions
+
+
+# Los parquet no traen columnas de coalición; agregamos algunas sintéticas con
+# residuos no nulos (V % k != 0) para ejercitar el reparto del residuo.
+COALICIONES = {
+    2018: ["MORENA_PT_PES", "PAN_PRD_MC", "PRI_PVEM_NA"],
+    2021: ["MORENA_PT_PVEM", "PAN_PRI_PRD"],
+    2024: ["MORENA_PT_PVEM", "PAN_PRI_PRD"],
+}
+
+
+def _con_coaliciones(df, coal_cols):
+    df = df.copy()
+    n = len(df)
+    base = np.arange(n, dtype=float)
+    for i, c in enumerate(coal_cols):
+        # mezcla de múltiplos y no múltiplos de k para tener filas con y sin residuo
+        df[c] = (df["PT"].fillna(0) // 7 + base * (i + 2)).astype(float)
+    return df
+
+
+@pytest.mark.parametrize("anio", [2018, 2021, 2024])
+@pytest.mark.parametrize("rule", ["equal_residue_solo", "equal_residue_siglado"])
+def test_recomposicion_vectorizada_igual_a_loop_diputados(anio, rule):
+    df = _con_coaliciones(obtener_boletas(f"data/computos_diputados_{anio}.parquet"), COALICIONES[anio])
+    sig = f"data/siglado-diputados-{anio}.csv" if rule == "equal_residue_siglado" else None
+
+    loop = recompose_coalitions(df, anio, "diputados", rule=rule, siglado_path=sig, use_cache=False)
+    vec = recompose_coalitions(df, anio, "diputados", rule=rule + "_vec", siglado_path=sig, use_cache=False)
+
+    pd.testing.assert_frame_equal(loop, vec)
+
+
+def test_recomposicion_vectorizada_igual_a_loop_senado():
+    df = _con_coaliciones(obtener_boletas("data/computos_senado_2024.parquet"), COALICIONES[2024])
+    sig = "data/siglado-senado-2024.csv"
+
+    loop = recompose_coalitions(df, 2024, "senado", rule="equal_residue_siglado", siglado_path=sig, use_cache=False)
+    vec = recompose_coalitions(df, 2024, "senado", rule="equal_residue_siglado_vec", siglado_path=sig, use_cache=False)
+
+    pd.testing.assert_frame_equal(loop, vec)
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+
+from engine.registro import obtener_registro, traza_autorizada, trazar, trazando
+
+
+class _Captura(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.registros = []
+
+    def emit(self, record):
+        self.registros.append((record.levelname, record.getMessage(), getattr(record, "id_request", None)))
+
+
+def _registro_con_captura(nivel=logging.INFO):
+    log = obtener_registro("engine.prueba_registro")
+    captura = _Captura()
+    log.logger.addHandler(captura)
+    log.logger.setLevel(nivel)
+    return log, captura
+
+
+def test_debug_apagado_no_formatea_ni_evalua():
+    log, captura = _registro_con_captura()
+    llamadas = []
+    log.debug(lambda: llamadas.append(1) or "caro")
+    log.debug("valor %s", 1)
+    log.warning("aviso %s", 2)
+    assert llamadas == []
+    assert not log.activo()
+    assert captura.registros == [("WARNING", "aviso 2", None)]
+
+
+def test_trazar_activa_debug_solo_en_su_contexto():
+    log, captura = _registro_con_captura()
+    with trazar(True, "abc123"):
+        assert trazando() and log.activo()
+        log.debug(lambda: f"detalle {40 + 2}")
+    log.debug("fuera")
+    assert captura.registros == [("DEBUG", "detalle 42", "abc123")]
+
+
+def test_traza_se_propaga_a_hilos_y_no_entre_tareas():
+    log, captura = _registro_con_captura()
+
+    async def request(id_request, traza):
+        with trazar(traza, id_request):
+            await asyncio.sleep(0)
+            # como motor_executor, to_thread corre la llamada con copy_context()
+            await asyncio.to_thread(log.debug, "motor %s", id_request)
+
+    async def varios():
+        await asyncio.gather(request("r1", True), request("r2", False))
+
+    asyncio.run(varios())
+    assert captura.registros == [("DEBUG", "motor r1", "r1")]
+
+
+def test_traza_por_request_requiere_token_configurado(monkeypatch):
+    monkeypatch.delenv("TRACE_TOKEN", raising=False)
+    assert not traza_autorizada("1") and not traza_autorizada("")
+    monkeypatch.setenv("TRACE_TOKEN", "s3creto")
+    assert traza_autorizada("s3creto")
+    assert not traza_autorizada("1") and not traza_autorizada("")
+
+
+def test_request_id_en_todas_las_respuestas(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    import main
+
+    monkeypatch.delenv("TRACE_TOKEN", raising=False)
+    c = TestClient(main.app)
+    assert c.get("/health").headers["X-Request-ID"]
+    assert c.get("/health?trace=1", headers={"X-Request-ID": "abc"}).headers["X-Request-ID"] == "abc"
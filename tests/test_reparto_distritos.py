@@ -0,0 +1,39 @@
+import math
+
+import numpy as np
+import pytest
+
+from redistritacion.modulos.reparto_distritos import repartir_distritos_hare, tabla_reparto_hare
+
+
+def _hare_secuencial(poblacion, n, piso):
+    """Reparto estado por estado (versión previa a la tabla)."""
+    distritos = {e: piso for e in poblacion}
+    restantes = n - piso * len(poblacion)
+    if restantes == 0:
+        return distritos
+    cuota = sum(poblacion.values()) / restantes
+    residuos = {}
+    for e, p in poblacion.items():
+        c = p / cuota
+        distritos[e] += math.floor(c)
+        residuos[e] = c - math.floor(c)
+    faltantes = n - sum(distritos.values())
+    for e, _ in sorted(residuos.items(), key=lambda x: x[1], reverse=True)[:faltantes]:
+        distritos[e] += 1
+    return distritos
+
+
+def test_tabla_hare_igual_al_reparto_secuencial():
+    rng = np.random.default_rng(1)
+    poblacion = {i + 1: int(p) for i, p in enumerate(rng.integers(700_000, 17_000_000, size=32))}
+    poblacion[5] = poblacion[6] = poblacion[7]  # residuos empatados
+
+    tabla = tabla_reparto_hare(poblacion, 2)
+    assert tabla.matriz.shape == (32, 600 - 64 + 1) and tabla.matriz.dtype == np.int16
+    for n in list(range(64, 601)) + [800]:
+        assert repartir_distritos_hare(poblacion, n, 2) == _hare_secuencial(poblacion, n, 2)
+    assert repartir_distritos_hare(poblacion, 300, 1) == _hare_secuencial(poblacion, 300, 1)
+
+    with pytest.raises(ValueError):
+        repartir_distritos_hare(poblacion, 63, 2)
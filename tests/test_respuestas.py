@@ -0,0 +1,92 @@
+import gzip
+import json
+
+import numpy as np
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from engine import respuestas
+from engine.respuestas import CompresionMiddleware, RespuestaJSON, contenido_de, elegir_codificacion
+
+
+def test_dumps_codifica_numpy_y_llaves_no_str_igual_que_la_stdlib(monkeypatch):
+    contenido = {"votos": np.array([3, 4], dtype=np.int64), "pct": np.float64(0.25),
+                 1: {"n": np.int64(7)}, "partidos": ("PAN", "ñandú")}
+    esperado = {"votos": [3, 4], "pct": 0.25, "1": {"n": 7}, "partidos": ["PAN", "ñandú"]}
+    assert json.loads(respuestas.dumps(contenido)) == esperado
+    monkeypatch.setattr(respuestas, "orjson", None)
+    assert json.loads(respuestas.dumps(contenido)) == esperado
+    assert respuestas.dumps({"x": 2 ** 70}) == b'{"x":1180591620717411303424}'
+
+
+def test_contenido_de_no_reparsea_respuestas_propias():
+    original = {"seat_chart": [{"party": "MORENA", "seats": np.int64(250)}]}
+    r = RespuestaJSON(original)
+    assert contenido_de(r) is original
+    assert contenido_de(Response(content=r.body, media_type="application/json")) == {
+        "seat_chart": [{"party": "MORENA", "seats": 250}]}
+    assert contenido_de(original) is original
+
+
+def test_elegir_codificacion_respeta_q_y_disponibilidad(monkeypatch):
+    monkeypatch.setattr(respuestas, "brotli", None)
+    assert elegir_codificacion("gzip, deflate, br") == "gzip"
+    assert elegir_codificacion("br") is None
+    assert elegir_codificacion("gzip;q=0, *") is None
+    assert elegir_codificacion("*") == "gzip"
+    assert elegir_codificacion("") is None
+    monkeypatch.setattr(respuestas, "brotli", object())
+    assert elegir_codificacion("gzip, br") == "br"
+    assert elegir_codificacion("gzip, br;q=0.5") == "gzip"
+
+
+def test_middleware_comprime_solo_bodies_grandes_completos(monkeypatch):
+    monkeypatch.setenv("COMPRESS_MIN_BYTES", "500")
+    monkeypatch.setattr(respuestas, "brotli", None)
+    app = FastAPI(default_response_class=RespuestaJSON)
+    app.add_middleware(CompresionMiddleware)
+    grande = {"mr_por_estado": {f"E{i}": {"MORENA": i} for i in range(100)}}
+
+    @app.get("/grande")
+    def ruta_grande():
+        return RespuestaJSON(grande)
+
+    @app.get("/chico")
+    def ruta_chica():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def ruta_stream():
+        return StreamingResponse(iter([b"a," * 400, b"b"]), media_type="text/csv")
+
+    c = TestClient(app)
+    r = c.get("/grande", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip" and r.headers["vary"] == "Accept-Encoding"
+    assert int(r.headers["content-length"]) < len(respuestas.dumps(grande))
+    assert r.json() == grande
+    antes = respuestas._MEMO.stats()["hits"]
+    c.get("/grande", headers={"Accept-Encoding": "gzip"})
+    assert respuestas._MEMO.stats()["hits"] == antes + 1  # mismo body: no se recomprime
+
+    # sin comprimir (cliente sin gzip o body chico) también llevan Vary
+    for r in (c.get("/grande", headers={"Accept-Encoding": "identity"}),
+              c.get("/chico", headers={"Accept-Encoding": "gzip"})):
+        assert "content-encoding" not in r.headers and r.headers["vary"] == "Accept-Encoding"
+    r = c.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in r.headers and r.text == "a," * 400 + "b"
+    assert gzip.decompress(respuestas.comprimir(b"x" * 600, "gzip")) == b"x" * 600
+
+
+def test_nan_e_inf_salen_como_null_con_ambos_encoders(monkeypatch):
+    contenido = {"pct": float("nan"), "ok": 1.5, "serie": [np.float64("inf"), 2.0],
+                 "arr": np.array([1.0, np.nan]), "f32": np.float32("nan"), 3: (float("-inf"),)}
+    esperado = {"pct": None, "ok": 1.5, "serie": [None, 2.0], "arr": [1.0, None], "f32": None, "3": [None]}
+    assert json.loads(respuestas.dumps(contenido)) == esperado
+    r = RespuestaJSON(contenido)
+    assert contenido_de(r)["pct"] is None and json.loads(r.body) == esperado
+    monkeypatch.setattr(respuestas, "orjson", None)
+    assert json.loads(respuestas.dumps(contenido)) == esperado
+    assert json.loads(RespuestaJSON(contenido).body) == esperado
+    limpio = {"a": [1.0, 2], "b": np.array([1.0])}
+    assert respuestas.finitos(limpio) is limpio
@@ -0,0 +1,66 @@
+import json
+
+from engine.result_cache import ResultCache, clave_canonica, sin_lectura
+
+
+def test_clave_canonica_ignora_orden_y_formato_de_flotantes():
+    a = clave_canonica("diputados", {
+        "anio": 2024,
+        "porcentajes_partidos": json.dumps({"MORENA": 45, "PAN": 20.0}),
+        "umbral": 0.03,
+    })
+    b = clave_canonica("diputados", {
+        "umbral": 0.030000000000000002,
+        "porcentajes_partidos": {"PAN": 20, "MORENA": 45.0},
+        "anio": 2024,
+        "votos_custom": None,
+    })
+    assert a == b
+    assert a != clave_canonica("senado", {"anio": 2024})
+
+
+def test_result_cache_respeta_presupuesto_y_ttl():
+    cache = ResultCache("t", max_bytes=10, ttl_s=60)
+    assert cache.put("a", b"12345")
+    assert cache.put("b", b"12345")
+    assert cache.get("a") is not None  # "a" pasa a ser el más reciente
+    assert cache.put("c", b"12345")     # desaloja "b" (LRU)
+    assert cache.get("b") is None
+    assert not cache.put("grande", b"x" * 11)
+
+    st = cache.stats()
+    assert st["bytes"] <= 10 and st["evictions"] == 1 and st["hits"] == 1
+
+    expirada = ResultCache("t", max_bytes=10, ttl_s=0)
+    expirada.put("a", b"1")
+    assert expirada.get("a") is None
+    assert expirada.stats()["expirations"] == 1
+
+
+def test_clave_senado_ignora_magnitudes_en_planes_predefinidos():
+    from main import clave_cache_senado
+
+    base = {"anio": 2024, "plan": "vigente", "reparto_mode": "divisor", "reparto_method": "dhondt"}
+    assert clave_cache_senado(base) == clave_cache_senado({**base, "umbral": 0.05, "mr_seats": 10})
+    # el método de reparto sí aplica a todos los planes del Senado
+    assert clave_cache_senado(base) != clave_cache_senado({**base, "reparto_method": "sainte_lague"})
+    pers = {**base, "plan": "personalizado", "sistema": "mixto"}
+    assert clave_cache_senado(pers) != clave_cache_senado({**pers, "umbral": 0.05})
+
+
+def test_clave_diputados_conserva_total_distritos_en_planes_predefinidos():
+    from main import clave_cache_diputados
+
+    base = {"anio": 2024, "plan": "plan_c", "total_distritos": None}
+    assert clave_cache_diputados(base) == clave_cache_diputados({**base, "mr_seats": 200, "umbral": 0.05})
+    # la redistritación geográfica sí usa total_distritos en los planes predefinidos
+    assert clave_cache_diputados(base) != clave_cache_diputados({**base, "total_distritos": 200})
+
+
+def test_sin_lectura_fuerza_miss_y_put_refresca():
+    cache = ResultCache("t", max_bytes=100, ttl_s=60)
+    cache.put("a", b"viejo")
+    with sin_lectura():
+        assert cache.get("a") is None
+        cache.put("a", b"nuevo")
+    assert cache.get("a")[0] == b"nuevo"
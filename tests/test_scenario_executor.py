@@ -0,0 +1,55 @@
+import asyncio
+
+from engine.procesar_diputados_v2 import procesar_diputados_batch
+from engine import scenario_executor
+from engine.scenario_executor import ScenarioExecutor
+
+
+def test_pool_devuelve_resultados_en_orden_e_iguales_al_batch_serial():
+    base = dict(path_parquet="data/computos_diputados_2024.parquet", anio=2024,
+                path_siglado="data/siglado-diputados-2024.csv")
+    escenarios = [
+        {"max_seats": 400, "mr_seats": 200, "rp_seats": 200, "aplicar_topes": False, "seed": 42},
+        {"max_seats": 500, "rp_seats": 200, "max_seats_per_party": 300},
+        {"max_seats": 400, "sistema": "mr", "mr_seats": 400, "rp_seats": 0},
+    ]
+    serial = procesar_diputados_batch(escenarios=escenarios, **base)
+
+    spec = (base["path_parquet"], base["anio"], base["path_siglado"])
+    with ScenarioExecutor(workers=2, precargar=[spec]) as ex:
+        paralelo = procesar_diputados_batch(escenarios=escenarios, executor=ex, **base)
+        asincrono = asyncio.run(ex.evaluar_diputados_async(
+            base["path_parquet"], base["anio"], escenarios, path_siglado=base["path_siglado"]))
+
+    for a, b, c in zip(serial, paralelo, asincrono):
+        assert a["tot"] == b["tot"] == c["tot"]
+
+
+def test_workers_default_acotado_y_cierre_del_executor_compartido(monkeypatch):
+    monkeypatch.delenv("SCENARIO_WORKERS", raising=False)
+    monkeypatch.setattr(scenario_executor.os, "cpu_count", lambda: 32)
+    assert scenario_executor.workers_default() == 2
+    monkeypatch.setenv("SCENARIO_WORKERS", "6")
+    assert scenario_executor.workers_default() == 6
+
+    ex = scenario_executor.obtener_executor()
+    scenario_executor.cerrar_executor()
+    assert scenario_executor.obtener_executor() is not ex
+    scenario_executor.cerrar_executor()
+
+
+def test_sin_pool_mapear_async_pasa_por_motor(monkeypatch):
+    import pytest
+
+    from engine import motor_executor
+    from engine.motor_executor import MotorExecutor, MotorSaturado
+
+    motor = MotorExecutor(max_concurrencia=1, max_cola=0)
+    monkeypatch.setattr(motor_executor, "MOTOR", motor)
+    ex = ScenarioExecutor(workers=1)
+    assert asyncio.run(ex.mapear_async(abs, [-1, 2, -3])) == [1, 2, 3]
+    assert motor.stats()["completadas"] == 1
+
+    monkeypatch.setattr(motor, "_corriendo", 1)  # motor ocupado y sin cola
+    with pytest.raises(MotorSaturado):
+        asyncio.run(ex.mapear_async(abs, [1]))
@@ -0,0 +1,37 @@
+import pandas as pd
+
+from engine import dataset_store
+from redistritacion.modulos.distritacion import (
+    cargar_secciones_ine,
+    obtener_secciones_ine,
+    poblacion_por_estado,
+)
+
+
+def test_almacen_secciones_compacto_y_agregados(tmp_path):
+    path = str(tmp_path / "INE_SECCION_2020.parquet")
+    pd.DataFrame({
+        "ID": [1, 2, 3, 4],
+        "ENTIDAD": [1, 1, 9, 9],
+        "DISTRITO": [1, 2, 1, 1],
+        "MUNICIPIO": [1, 1, 2, 3],
+        "SECCION": [10, 11, 500, 501],
+        "POBTOT": [100.0, 50.0, None, 70.0],
+        "OTRA": ["x", "y", "z", "w"],
+    }).to_parquet(path)
+
+    store = obtener_secciones_ine(path)
+    assert obtener_secciones_ine(path) is store  # una sola carga por proceso
+    assert list(store.secciones.columns) == ["ID", "ENTIDAD", "DISTRITO", "MUNICIPIO", "SECCION", "POBTOT"]
+    assert str(store.secciones["POBTOT"].dtype) == "int32"
+    assert store.secciones["ENTIDAD"].dtype.itemsize <= 2
+
+    assert poblacion_por_estado(path) == {1: 150, 9: 70}
+    assert store.poblacion_municipio == {(1, 1): 150, (9, 3): 70}
+    assert store.secciones_estado == {1: 2, 9: 1}
+
+    # cargar_secciones_ine devuelve copias: mutarlas no ensucia el almacén
+    df = cargar_secciones_ine(path)
+    df.loc[:, "POBTOT"] = 0
+    assert int(obtener_secciones_ine(path).secciones["POBTOT"].sum()) == 220
+    dataset_store.invalidar(path)
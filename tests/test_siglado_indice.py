@@ -0,0 +1,53 @@
+import os
+
+from engine import siglado_indice
+from engine.siglado_indice import cargar_indice, ruta_artefacto
+
+CSV = (
+    '"entidad","entidad_ascii","distrito","coalicion","grupo_parlamentario","partido_origen"\n'
+    '"MÉXICO","MEXICO",1,"JUNTOS HAREMOS HISTORIA","PT",\\N\n'
+    '"MÉXICO","MEXICO",1,"POR MEXICO AL FRENTE","PRD",\\N\n'
+    '"MÉXICO","MEXICO",2,"JUNTOS HAREMOS HISTORIA","MORENA",MORENA\n'
+    '"CDMX","CDMX",2,"POR MEXICO AL FRENTE","",PAN\n'
+)
+
+
+def test_indice_resuelve_dominante_nominadores_y_coaliciones(tmp_path):
+    path = tmp_path / "siglado-diputados-2018.csv"
+    path.write_text(CSV, encoding="utf-8")
+    idx = cargar_indice(str(path))
+
+    assert idx.dominante("MEXICO", 1) == "PT"
+    assert idx.dominante("MEXICO", 1, "POR MEXICO AL FRENTE") == "PRD"
+    assert idx.dominante("MEXICO", 9) == ""
+    # sin grupo parlamentario: el único nominador; \N cuenta como vacío
+    assert idx.dominante("CDMX", 2) == "PAN"
+    mapa = idx.por_distrito()
+    assert mapa[("MEXICO", 1)] == {"nominadores_set": set(), "ppn_gp": ""}
+    assert mapa[("MEXICO", 2)] == {"nominadores_set": {"MORENA"}, "ppn_gp": "MORENA"}
+    assert mapa[("CIUDAD DE MEXICO", 2)]["nominadores_set"] == {"PAN"}
+    # coalición con un solo grupo parlamentario no cuenta
+    assert idx.coaliciones_con_partidos() == {"JUNTOS_HAREMOS_HISTORIA": ["MORENA", "PT"]}
+    assert list(idx.como_dataframe()["dominante"]) == ["PT", "PRD", "MORENA", "PAN"]
+
+
+def test_artefacto_se_reutiliza_y_se_recompila_si_cambia_el_checksum(tmp_path, monkeypatch):
+    path = tmp_path / "siglado-diputados-2024.csv"
+    path.write_text(CSV, encoding="utf-8")
+    compilaciones = []
+    compilar = siglado_indice.compilar
+    monkeypatch.setattr(siglado_indice, "compilar", lambda *a: compilaciones.append(1) or compilar(*a))
+
+    cargar_indice(str(path))
+    assert os.path.exists(ruta_artefacto(str(path)))
+    assert cargar_indice(str(path)).dominante("MEXICO", 2) == "MORENA"
+    assert len(compilaciones) == 1
+
+    path.write_text(CSV.replace('"MORENA",MORENA', '"PES",PES'), encoding="utf-8")
+    assert cargar_indice(str(path)).dominante("MEXICO", 2) == "PES"
+    assert len(compilaciones) == 2
+
+    tmp = tmp_path / "tmp_siglado_x.csv"
+    tmp.write_text(CSV, encoding="utf-8")
+    cargar_indice(str(tmp))
+    assert not os.path.exists(ruta_artefacto(str(tmp)))
@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from engine import dataset_store, recomposicion, snapshot
+
+
+def test_snapshot_siembra_caches_y_descarta_origenes_cambiados(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "calentar", lambda: None)
+    dataset_store.invalidar()
+    recomposicion.clear_recomposition_cache()
+
+    boletas, siglado = tmp_path / "boletas.parquet", tmp_path / "siglado.csv"
+    boletas.write_bytes(b"v1")
+    siglado.write_bytes(b"s1")
+    df = pd.DataFrame({
+        "ENTIDAD": ["MEXICO", "JALISCO"], "DISTRITO": np.array([1, 2], dtype=np.int64),
+        "PAN": [10.0, 3.5], "SECCION": pd.Categorical(["a", "b"]),
+    })
+    dataset_store.obtener(str(boletas), "boletas", lambda p: df)
+    dataset_store.obtener(str(siglado), "coaliciones_dip", lambda p: {"VA_POR_MEXICO": ["PAN", "PRI"]})
+    dataset_store.obtener(str(siglado), "no_serializable", lambda p: {("A", 1): {"PAN"}})
+    recomposicion.sembrar_recomposicion((2024, "diputados", "regla", None, "huella"), df)
+
+    destino = str(tmp_path / "snap.npz")
+    conteo = snapshot.generar(destino)
+    assert conteo == {"entradas": 2, "recomposiciones": 1, "omitidas": 1}
+
+    dataset_store.invalidar()
+    recomposicion.clear_recomposition_cache()
+    boletas.write_bytes(b"v2")  # origen cambiado (mismo tamaño, otro mtime): su entrada se descarta
+    st = os.stat(boletas)
+    os.utime(boletas, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    hasheados = []
+    sha1_real = snapshot._sha1
+    monkeypatch.setattr(snapshot, "_sha1", lambda p: hasheados.append(os.path.basename(p)) or sha1_real(p))
+    assert snapshot.cargar_snapshot(destino) == {"entradas": 1, "recomposiciones": 1, "descartadas": 1}
+    assert hasheados == ["boletas.parquet"]  # el siglado intacto se valida solo con stat
+
+    cargadas = {tipo: valor for tipo, _, valor in dataset_store.entradas()}
+    assert cargadas == {"coaliciones_dip": {"VA_POR_MEXICO": ["PAN", "PRI"]}}
+    (clave, rec), = recomposicion.entradas_recomposicion()
+    assert clave == (2024, "diputados", "regla", None, "huella")
+    pd.testing.assert_frame_equal(rec, df, check_exact=True)
+    # columnas numéricas y códigos: vistas de solo lectura sobre el mmap, sin copia
+    assert not rec["DISTRITO"].to_numpy().flags.writeable and not rec["PAN"].to_numpy().flags.writeable
+    assert not rec["SECCION"].cat.codes.to_numpy().flags.writeable
+    assert snapshot.cargar_snapshot(str(tmp_path / "no_existe.npz"))["entradas"] == 0
+    dataset_store.invalidar()
+    recomposicion.clear_recomposition_cache()
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from engine.tensor_electoral import ElectionTensor
+
+
+def _tensor():
+    df = pd.DataFrame({
+        "ENTIDAD": ["B", "A", "B"], "DISTRITO": [1, 1, 2],
+        "PAN": [10.0, 3.0, 4.0], "PRI": [10.0, 9.0, 1.0], "MORENA": [2.0, 8.0, 6.0], "CI": [1.0, 0.0, 0.0],
+    })
+    return ElectionTensor.desde_dataframe(df, 2024, "diputados")
+
+
+def test_tensor_denso_entero_con_partidos_ausentes_en_cero():
+    t = _tensor()
+    assert t.votos.dtype == np.int64 and t.votos.shape == (3, 8)
+    assert not t.votos.flags.writeable
+    assert t.entidades == ("B", "A") and t.entidad_id.tolist() == [0, 1, 0]
+    assert t.totales(["PAN", "PT", "CI"]) == {"PAN": 17, "PT": 0, "CI": 1}
+    assert t.fila(0, ["PAN", "PT"]) == {"PAN": 10.0}  # PT no tiene columna en el origen
+    assert t.distritos_por_entidad() == {"B": 2, "A": 1}
+
+
+def test_ganadores_segundos_y_conteos_por_entidad():
+    t = _tensor()
+    partidos = ["PAN", "PRI", "MORENA"]
+    ganadores = t.ganadores(partidos)
+    assert ganadores.tolist() == [0, 1, 2]  # empate PAN-PRI: gana el primero
+    assert t.segundos(partidos).tolist() == [1, 2, 0]
+    assert t.conteo(ganadores, partidos) == {"PAN": 1, "PRI": 1, "MORENA": 1}
+    assert t.conteo_por_entidad(ganadores, partidos) == {
+        "B": {"PAN": 1, "PRI": 0, "MORENA": 1}, "A": {"PAN": 0, "PRI": 1, "MORENA": 0},
+    }
+    coal = t.sumas([["PAN", "PRI"], ["MORENA", "PT"]])
+    assert coal.tolist() == [[20, 2], [12, 8], [5, 6]]
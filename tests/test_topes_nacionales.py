@@ -0,0 +1,102 @@
+import numpy as np
+
+from engine.core import apply_caps_national, largest_remainder
+from engine.procesar_diputados_v2 import _reinyectar_sobrantes, aplicar_topes_nacionales
+
+
+def _reinyeccion_por_escano(v_nacional, capped, s_rp, s_tot, lim_max, sobrantes):
+    """PASO 2 original: un escaño por vuelta."""
+    while sobrantes > 0:
+        v_eff = v_nacional.copy()
+        v_eff[capped] = 0.0
+        if np.sum(v_eff) <= 0:
+            break
+        residuos = v_eff % (np.sum(v_eff) / sobrantes)
+        cand = [p for p in range(len(v_eff)) if not capped[p] and v_eff[p] > 0]
+        if not cand:
+            break
+        p = max(cand, key=lambda i: (residuos[i], -i))
+        if s_tot[p] >= lim_max[p]:
+            capped[p] = True
+            continue
+        s_rp[p] += 1
+        s_tot[p] += 1
+        sobrantes -= 1
+        if s_tot[p] >= lim_max[p]:
+            capped[p] = True
+    return sobrantes
+
+
+def _topes_iterativos(s_mr, s_rp, v_nac, S, max_pp, max_seats, iter_max=100):
+    """apply_caps_national previo (sin el ajuste final por delta)."""
+    ok = v_nac > 0
+    cap = np.floor((v_nac + max_pp) * S).astype(int)
+    cap[~ok] = s_mr[~ok]
+    lim = np.minimum(np.maximum(s_mr, cap), max_seats)
+    rp_total = max(0, int(S - s_mr.sum()))
+    s_rp = s_rp.copy()
+    for _ in range(iter_max):
+        over = s_mr + s_rp > lim
+        if not over.any():
+            return s_rp, True
+        s_rp[over] = np.maximum(0, lim - s_mr)[over]
+        fixed = over | ~ok
+        v_eff = np.where(fixed, 0, v_nac)
+        n_rest = max(0, rp_total - int(np.maximum(0, lim - s_mr)[fixed].sum()))
+        if n_rest == 0 or v_eff.sum() <= 0:
+            s_rp[~fixed] = 0
+        else:
+            s_rp = np.where(fixed, np.maximum(0, lim - s_mr), largest_remainder(v_eff, n_rest, "hare"))
+    return s_rp, not (s_mr + s_rp > lim).any()
+
+
+def test_reinyeccion_en_bloque_igual_a_escano_por_escano():
+    rng = np.random.default_rng(3)
+    for _ in range(500):
+        n = int(rng.integers(2, 9))
+        v = rng.dirichlet(np.ones(n))
+        v[rng.random(n) < 0.2] = 0.0
+        s_tot = rng.integers(0, 120, size=n)
+        lim = s_tot + rng.integers(0, 6, size=n)
+        capped = rng.random(n) < 0.3
+        sobrantes = int(rng.integers(0, 60))
+        a = [v, capped.copy(), np.zeros(n, dtype=int), s_tot.copy(), lim]
+        b = [v, capped.copy(), np.zeros(n, dtype=int), s_tot.copy(), lim]
+        assert _reinyectar_sobrantes(*a, sobrantes) == _reinyeccion_por_escano(*b, sobrantes)
+        for x, y in zip(a[1:4], b[1:4]):
+            assert np.array_equal(x, y)
+
+
+def test_topes_core_igual_al_metodo_iterativo_convergido():
+    rng = np.random.default_rng(11)
+    for _ in range(400):
+        n = int(rng.integers(2, 9))
+        S = int(rng.choice([300, 400, 500]))
+        v = rng.dirichlet(np.ones(n))
+        v[rng.random(n) < 0.15] = 0.0
+        v = v / v.sum() if v.sum() > 0 else np.eye(n)[0]
+        s_mr = rng.multinomial(int(S * rng.uniform(0.3, 0.7)), rng.dirichlet(np.ones(n) * 0.5))
+        s_rp = largest_remainder(v, S - int(s_mr.sum()), "hare")
+        esperado, convergio = _topes_iterativos(s_mr, s_rp, v, S, 0.08, 300)
+        s_rp_cap, s_tot = apply_caps_national(s_mr, s_rp, v, S, 0.08, 300)
+        if convergio and int((s_mr + esperado).sum()) == S:
+            assert np.array_equal(s_rp_cap, esperado)
+
+
+def test_ajuste_final_completa_o_recorta_hasta_S_sin_romper_topes():
+    # core: sin partidos sobre el tope, el ajuste ±1 cuadra un s_rp que no suma S - MR
+    v = np.array([0.45, 0.35, 0.2])
+    s_mr = np.array([1, 1, 1])
+    s_rp, s_tot = apply_caps_national(s_mr, np.array([4, 3, 1]), v, 10, 0.08, 300)
+    assert s_rp.tolist() == [3, 3, 1] and s_tot.sum() == 10
+    s_rp, s_tot = apply_caps_national(s_mr, np.array([2, 2, 1]), v, 10, 0.08, 300)
+    assert s_rp.tolist() == [3, 3, 1] and (s_tot <= [5, 4, 2]).all()
+
+    # procesar_diputados_v2 (PASO 3): faltan escaños -> a quien tiene margen, por votos
+    v = np.array([0.6, 0.4])
+    s_mr = np.array([3, 2])
+    r = aplicar_topes_nacionales(s_mr, np.array([2, 1]), v, 10)
+    assert r["s_rp"].tolist() == [3, 2] and r["s_tot"].tolist() == [6, 4]
+    # sobran escaños (sin tope de %) -> se quitan a quien tiene más RP
+    r = aplicar_topes_nacionales(s_mr, np.array([4, 3]), v, 10, max_pp=None)
+    assert r["s_rp"].tolist() == [3, 2] and r["s_tot"].tolist() == [6, 4]
@@ -0,0 +1,46 @@
+from engine.calcular_mayoria_forzada_v2 import (
+    VOTOS_BASE_2024,
+    _evaluar_punto,
+    calcular_mayoria_forzada,
+    votos_minimos_para_escanos,
+)
+
+
+def test_votos_minimos_es_un_cruce_exacto_de_la_asignacion_real():
+    for mr_total, rp_total, topes in [(300, 100, True), (64, 64, True), (137, 61, False)]:
+        objetivo = (mr_total + rp_total) // 2 + 1
+        sol = votos_minimos_para_escanos("MORENA", objetivo, mr_total, rp_total, topes, precision=0.1)
+        config = ("MORENA", mr_total, rp_total, topes, True, 2024, tuple(VOTOS_BASE_2024.items()), 0.1)
+        k = round(sol["pct"] / 0.1)
+        assert sol["total"] == _evaluar_punto(config, k)[2] >= objetivo
+        assert _evaluar_punto(config, k - 1)[2] < objetivo
+        assert sol["evaluaciones"] <= 12
+
+
+def test_mayoria_forzada_personalizada_devuelve_pct_razonable():
+    res = calcular_mayoria_forzada("MORENA", "simple", mr_total=64, rp_total=64, precision=0.1)
+    assert res["viable"] and res["objetivo_escanos"] == 65
+    assert 0 < res["detalle"]["pct_votos"] < 100
+    assert res["detalle"]["mr_ganados"] + res["detalle"]["rp_esperado"] >= 65
+
+
+def test_error_transitorio_de_la_base_geografica_no_queda_en_cache(monkeypatch):
+    from engine import calcular_mayoria_forzada_v2 as mf
+
+    fallas = [RuntimeError("parquet ocupado")]
+
+    def reparto(poblacion_estados, n_distritos, piso_constitucional):
+        if fallas:
+            raise fallas.pop()
+        return {i: n_distritos // 32 for i in range(1, 33)}
+
+    monkeypatch.setattr(mf, "REDISTRITACION_DISPONIBLE", True)
+    monkeypatch.setattr(mf, "_poblacion_por_estado", lambda: {}, raising=False)
+    monkeypatch.setattr(mf, "repartir_distritos_hare", reparto, raising=False)
+    mf._base_geografica_calculada.cache_clear()
+    try:
+        assert mf._base_geografica(320, 2024) is None
+        base = mf._base_geografica(320, 2024)
+        assert base is not None and sum(d for d, _ in base) == 320
+    finally:
+        mf._base_geografica_calculada.cache_clear()